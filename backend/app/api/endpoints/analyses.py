@@ -1,25 +1,36 @@
 """
 Burnout analysis API endpoints.
 """
+import base64
 import logging
 import os
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Union
 from collections import defaultdict
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Text, and_, cast, or_
+from sqlalchemy.orm import Session, defer
 
 from ...models import get_db, User, Analysis, RootlyIntegration, SlackIntegration, GitHubIntegration
 from ...auth.dependencies import get_current_active_user
 from ...services.unified_burnout_analyzer import UnifiedBurnoutAnalyzer
+from ...services.analysis_results_store import AnalysisResultsStore
 from ...core.rate_limiting import analysis_rate_limit, general_rate_limit
+from ...core.http_caching import analysis_etag, etag_matches, private_cache_headers
+from ...core.json_codec import dumps_bytes, dumps_with_raw
+from ...core.analysis_results import member_email as get_member_email, parse_fields, project_fields
+from ...core.daily_health import DailyHealthSeries, HAS_DATA
 from ...core.input_validation import AnalysisRequest as ValidatedAnalysisRequest, AnalysisFilterRequest
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Validate stored results against AnalysisResponse on every read (debugging aid; also ?strict=true)
+STRICT_RESPONSE_VALIDATION = os.getenv("STRICT_RESPONSE_VALIDATION", "false").lower() == "true"
+
 
 class RunAnalysisRequest(BaseModel):
     integration_id: Union[int, str]  # Allow both int (regular) and str (beta) IDs
@@ -50,6 +61,13 @@ class AnalysisResponse(BaseModel):
 class AnalysisListResponse(BaseModel):
     analyses: List[AnalysisResponse]
     total: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
+
+
+class AnalysisMembersResponse(BaseModel):
+    members: List[Dict[str, Any]]
+    total: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
 
 
 class DailyTrendPoint(BaseModel):
@@ -284,26 +302,53 @@ async def run_burnout_analysis(
         )
 
 
+def _encode_list_cursor(analysis: Analysis) -> str:
+    """Opaque keyset cursor for the position after this analysis (created_at desc, id desc)."""
+    raw = f"{analysis.created_at.isoformat() if analysis.created_at else ''}|{analysis.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_list_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, analysis_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(analysis_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 @router.get("", response_model=AnalysisListResponse)
 @analysis_rate_limit("analysis_list")
 async def list_analyses(
     request: Request,
     integration_id: Optional[int] = Query(None, gt=0, description="Filter by integration ID"),
     limit: int = Query(20, gt=0, le=100, description="Results per page"),
-    offset: int = Query(0, ge=0, description="Results offset"),
+    offset: int = Query(0, ge=0, description="Results offset (ignored when cursor is given)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_data: bool = Query(False, description="Include analysis_data and config (large)"),
     status: Optional[str] = Query(None, regex="^(pending|running|completed|failed)$", description="Filter by status"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """List all previous analyses for the current user."""
+    """
+    List all previous analyses for the current user.
+
+    Only ids, status and timestamps are loaded unless include_data is set.
+    Pages are fetched by keyset (created_at, id) when a cursor is given.
+    """
     # Simplified: Filter by user_id only (no organization_id requirement)
     # TODO: Re-enable organization_id filtering after multi-tenant migration is stable
     query = db.query(Analysis).filter(Analysis.user_id == current_user.id)
+    if not include_data:
+        query = query.options(defer(Analysis.results), defer(Analysis.config))
 
     # Filter by integration if specified
     if integration_id:
         # Verify the integration belongs to current user
-        integration = db.query(RootlyIntegration).filter(
+        integration = db.query(RootlyIntegration.id).filter(
             RootlyIntegration.id == integration_id,
             RootlyIntegration.user_id == current_user.id
         ).first()
@@ -318,16 +363,34 @@ async def list_analyses(
 
     # Fast check: if offset is 0, first check if any analyses exist
     # This optimizes the common case of new users with no analyses
-    if offset == 0:
+    if offset == 0 and not cursor:
         exists = db.query(query.exists()).scalar()
         if not exists:
             return AnalysisListResponse(analyses=[], total=0)
 
     # Get total count
-    total = query.count()
+    total = query.order_by(None).count()
 
     # Apply pagination and ordering
-    analyses = query.order_by(Analysis.created_at.desc()).offset(offset).limit(limit).all()
+    query = query.order_by(Analysis.created_at.desc(), Analysis.id.desc())
+    if cursor:
+        cursor_created_at, cursor_id = _decode_list_cursor(cursor)
+        if cursor_created_at is None:
+            # NULL created_at sorts first in descending order
+            query = query.filter(or_(
+                and_(Analysis.created_at.is_(None), Analysis.id < cursor_id),
+                Analysis.created_at.isnot(None)
+            ))
+        else:
+            query = query.filter(or_(
+                Analysis.created_at < cursor_created_at,
+                and_(Analysis.created_at == cursor_created_at, Analysis.id < cursor_id)
+            ))
+    else:
+        query = query.offset(offset)
+    analyses = query.limit(limit + 1).all()
+    next_cursor = _encode_list_cursor(analyses[limit - 1]) if len(analyses) > limit else None
+    analyses = analyses[:limit]
     
     # Convert to response format
     response_analyses = []
@@ -346,20 +409,111 @@ async def list_analyses(
                 created_at=analysis.created_at,
                 completed_at=analysis.completed_at,
                 time_range=analysis.time_range or 30,
-                analysis_data=analysis.results,
-                config=analysis.config
+                analysis_data=analysis.results if include_data else None,
+                config=analysis.config if include_data else None
             )
         )
     
     return AnalysisListResponse(
         analyses=response_analyses,
-        total=total
+        total=total,
+        next_cursor=next_cursor
+    )
+
+
+def _finished_results(analysis: Analysis) -> Optional[dict]:
+    """Results of a finished analysis; pending/running analyses have none, so the deferred column is not loaded."""
+    if analysis.status not in ("completed", "failed"):
+        return None
+    return analysis.results
+
+
+def _check_not_modified(analysis: Analysis, resource: str, request: Request, response: Response) -> Optional[Response]:
+    """
+    Add ETag/private caching headers for a completed analysis.
+
+    Returns a 304 response when the client's If-None-Match is still current, so
+    callers can return before touching the results. Other analyses stay uncached.
+    """
+    if analysis.status != "completed":
+        return None
+    headers = private_cache_headers(analysis_etag(analysis.id, analysis.results_version, resource))
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _project_results(db: Session, analysis_id: int, paths: List[List[str]]) -> dict:
+    """Requested paths of an analysis' results, reading only the top-level keys they start with."""
+    top_keys = list(dict.fromkeys(path[0] for path in paths))
+    row = db.query(*[Analysis.results[key] for key in top_keys]).filter(Analysis.id == analysis_id).first()
+    document = {key: value for key, value in zip(top_keys, row or ()) if value is not None}
+    return project_fields(document, paths)
+
+
+def _analysis_response(analysis: Analysis, db: Session, response: Response, strict: bool = False, fields: Optional[str] = None):
+    """
+    Single-analysis response with the stored results passed through as JSON text.
+
+    Results come from our own analyzer and are already in final form, so by
+    default only the envelope is encoded and results are spliced in unparsed.
+    fields= narrows the results to the given paths. strict=True builds a
+    validated AnalysisResponse instead.
+    """
+    paths = parse_fields(fields)
+    finished = analysis.status in ("completed", "failed")
+    projected = _project_results(db, analysis.id, paths) if finished and paths else None
+
+    if strict:
+        return AnalysisResponse(
+            id=analysis.id,
+            uuid=getattr(analysis, 'uuid', None),
+            integration_id=analysis.rootly_integration_id,
+            integration_name=analysis.integration_name,
+            platform=analysis.platform,
+            status=analysis.status,
+            created_at=analysis.created_at,
+            completed_at=analysis.completed_at,
+            time_range=analysis.time_range or 30,
+            analysis_data=projected if paths else _finished_results(analysis),
+            config=analysis.config
+        )
+
+    raw_results = None
+    if projected is not None:
+        raw_results = dumps_bytes(projected)
+    elif finished:
+        # Text of the json column as stored, without decoding it
+        raw_results = db.query(cast(Analysis.results, Text)).filter(Analysis.id == analysis.id).scalar()
+    envelope = {
+        "id": analysis.id,
+        "uuid": getattr(analysis, 'uuid', None),
+        "integration_id": analysis.rootly_integration_id,
+        "integration_name": analysis.integration_name,
+        "platform": analysis.platform,
+        "status": analysis.status,
+        "created_at": analysis.created_at,
+        "completed_at": analysis.completed_at,
+        "time_range": analysis.time_range or 30,
+        "config": analysis.config,
+    }
+    # Headers set on the injected response (ETag, caching) are only applied to model returns
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return Response(
+        content=dumps_with_raw(envelope, {"analysis_data": raw_results}),
+        media_type="application/json",
+        headers=headers
     )
 
 
 @router.get("/uuid/{analysis_uuid}", response_model=AnalysisResponse)
 async def get_analysis_by_uuid(
     analysis_uuid: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated results paths to return, e.g. team_health,team_analysis.members.burnout_score"),
+    strict: bool = Query(STRICT_RESPONSE_VALIDATION, description="Validate results against AnalysisResponse (debugging)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -371,7 +525,7 @@ async def get_analysis_by_uuid(
                 detail="User must be part of an organization to view analyses"
             )
 
-        analysis = db.query(Analysis).filter(
+        analysis = db.query(Analysis).options(defer(Analysis.results)).filter(
             Analysis.uuid == analysis_uuid,
             Analysis.organization_id == current_user.organization_id
         ).first()
@@ -384,86 +538,68 @@ async def get_analysis_by_uuid(
     
     if not analysis:
         # Get the most recent analysis for this user to suggest as alternative
-        most_recent = db.query(Analysis).filter(
+        most_recent = db.query(Analysis.id, Analysis.uuid).filter(
             Analysis.organization_id == current_user.organization_id,
             Analysis.status == "completed"
         ).order_by(Analysis.created_at.desc()).first()
         
         error_detail = "Analysis not found"
         if most_recent:
-            most_recent_id = getattr(most_recent, 'uuid', None) or most_recent.id
+            most_recent_id = most_recent.uuid or most_recent.id
             error_detail = f"Analysis not found. Most recent analysis available: {most_recent_id}"
         
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_detail
         )
-    
-    return AnalysisResponse(
-        id=analysis.id,
-        uuid=getattr(analysis, 'uuid', None),
-        integration_id=analysis.rootly_integration_id,
-        
-        # Include new integration fields
-        integration_name=analysis.integration_name,
-        platform=analysis.platform,
-        
-        status=analysis.status,
-        created_at=analysis.created_at,
-        completed_at=analysis.completed_at,
-        time_range=analysis.time_range or 30,
-        analysis_data=analysis.results,
-        config=analysis.config
-    )
+
+    not_modified = _check_not_modified(analysis, "analysis", request, response)
+    if not_modified:
+        return not_modified
+
+    return _analysis_response(analysis, db, response, strict, fields)
 
 
 @router.get("/{analysis_id}", response_model=AnalysisResponse)
 async def get_analysis(
     analysis_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated results paths to return, e.g. team_health,team_analysis.members.burnout_score"),
+    strict: bool = Query(STRICT_RESPONSE_VALIDATION, description="Validate results against AnalysisResponse (debugging)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific analysis result."""
     # Simplified: Filter by user_id only (no organization_id requirement)
     # TODO: Re-enable organization_id filtering after multi-tenant migration is stable
-    analysis = db.query(Analysis).filter(
+    analysis = db.query(Analysis).options(defer(Analysis.results)).filter(
         Analysis.id == analysis_id,
         Analysis.user_id == current_user.id
     ).first()
 
     if not analysis:
         # Get the most recent analysis for this user to suggest as alternative
-        most_recent = db.query(Analysis).filter(
+        most_recent = db.query(Analysis.id, Analysis.uuid).filter(
             Analysis.user_id == current_user.id,
             Analysis.status == "completed"
         ).order_by(Analysis.created_at.desc()).first()
 
         error_detail = "Analysis not found"
         if most_recent:
-            most_recent_id = getattr(most_recent, 'uuid', None) or most_recent.id
+            most_recent_id = most_recent.uuid or most_recent.id
             error_detail = f"Analysis not found. Most recent analysis available: {most_recent_id}"
 
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_detail
         )
-    
-    return AnalysisResponse(
-        id=analysis.id,
-        uuid=getattr(analysis, 'uuid', None),
-        integration_id=analysis.rootly_integration_id,
-        
-        # Include new integration fields
-        integration_name=analysis.integration_name,
-        platform=analysis.platform,
-        
-        status=analysis.status,
-        created_at=analysis.created_at,
-        completed_at=analysis.completed_at,
-        time_range=analysis.time_range or 30,
-        analysis_data=analysis.results,
-        config=analysis.config
-    )
+
+    not_modified = _check_not_modified(analysis, "analysis", request, response)
+    if not_modified:
+        return not_modified
+
+    return _analysis_response(analysis, db, response, strict, fields)
 
 
 def is_uuid(value: str) -> bool:
@@ -479,6 +615,10 @@ def is_uuid(value: str) -> bool:
 @router.get("/by-id/{analysis_identifier}", response_model=AnalysisResponse)
 async def get_analysis_by_identifier(
     analysis_identifier: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated results paths to return, e.g. team_health,team_analysis.members.burnout_score"),
+    strict: bool = Query(STRICT_RESPONSE_VALIDATION, description="Validate results against AnalysisResponse (debugging)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -494,7 +634,7 @@ async def get_analysis_by_identifier(
     # Try UUID first if it looks like a UUID
     if is_uuid(analysis_identifier):
         try:
-            analysis = db.query(Analysis).filter(
+            analysis = db.query(Analysis).options(defer(Analysis.results)).filter(
                 Analysis.uuid == analysis_identifier,
                 Analysis.organization_id == current_user.organization_id
             ).first()
@@ -506,7 +646,7 @@ async def get_analysis_by_identifier(
     if not analysis:
         try:
             analysis_id = int(analysis_identifier)
-            analysis = db.query(Analysis).filter(
+            analysis = db.query(Analysis).options(defer(Analysis.results)).filter(
                 Analysis.id == analysis_id,
                 Analysis.organization_id == current_user.organization_id
             ).first()
@@ -516,36 +656,110 @@ async def get_analysis_by_identifier(
     
     if not analysis:
         # Get the most recent analysis for this user to suggest as alternative
-        most_recent = db.query(Analysis).filter(
+        most_recent = db.query(Analysis.id, Analysis.uuid).filter(
             Analysis.organization_id == current_user.organization_id,
             Analysis.status == "completed"
         ).order_by(Analysis.created_at.desc()).first()
         
         error_detail = "Analysis not found"
         if most_recent:
-            most_recent_id = getattr(most_recent, 'uuid', None) or most_recent.id
+            most_recent_id = most_recent.uuid or most_recent.id
             error_detail = f"Analysis not found. Most recent analysis available: {most_recent_id}"
         
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_detail
         )
-    
-    return AnalysisResponse(
-        id=analysis.id,
-        uuid=getattr(analysis, 'uuid', None),
-        integration_id=analysis.rootly_integration_id,
-        
-        # Include new integration fields
-        integration_name=analysis.integration_name,
-        platform=analysis.platform,
-        
-        status=analysis.status,
-        created_at=analysis.created_at,
-        completed_at=analysis.completed_at,
-        time_range=analysis.time_range or 30,
-        analysis_data=analysis.results,
-        config=analysis.config
+
+    not_modified = _check_not_modified(analysis, "analysis", request, response)
+    if not_modified:
+        return not_modified
+
+    return _analysis_response(analysis, db, response, strict, fields)
+
+
+def _encode_members_cursor(keyset) -> str:
+    raw = "|".join(repr(float(value)) for value in keyset)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_members_cursor(cursor: str) -> List[float]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        return [float(value) for value in raw.split("|")]
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/{analysis_id}/members", response_model=AnalysisMembersResponse)
+async def list_analysis_members(
+    analysis_id: int,
+    request: Request,
+    response: Response,
+    sort: str = Query("position", regex="^(position|score|risk)$", description="Original order, burnout_score, or risk level then score"),
+    order: Optional[str] = Query(None, regex="^(asc|desc)$", description="Defaults to desc for score/risk and asc for position"),
+    risk_level: Optional[str] = Query(None, description="Comma-separated risk levels to include, e.g. high,critical"),
+    limit: int = Query(50, gt=0, le=500, description="Members per page"),
+    offset: int = Query(0, ge=0, description="Members offset (ignored when cursor is given)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated member fields to return, e.g. user_name,burnout_score"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Page through an analysis' team members, sorted and filtered in the database.
+
+    Reads only the member rows of the page, e.g. the top 20 by burnout score:
+    ?sort=score&limit=20&fields=user_name,user_email,burnout_score,risk_level
+    """
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
+        Analysis.id == analysis_id,
+        Analysis.organization_id == current_user.organization_id
+    ).first()
+
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found"
+        )
+
+    not_modified = _check_not_modified(analysis, "members", request, response)
+    if not_modified:
+        return not_modified
+
+    store = AnalysisResultsStore(db)
+    if analysis.status != "completed" or not store.ensure(analysis_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Analysis is not completed or has no results"
+        )
+
+    descending = order == "desc" if order else sort != "position"
+    risk_levels = [level.strip() for level in (risk_level or "").split(",") if level.strip()]
+    try:
+        members, total, next_keyset = store.page_members(
+            analysis_id,
+            sort=sort,
+            descending=descending,
+            risk_levels=risk_levels,
+            limit=limit,
+            offset=offset,
+            after=_decode_members_cursor(cursor) if cursor else None
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    paths = parse_fields(fields)
+    return AnalysisMembersResponse(
+        members=[project_fields(member, paths) for member in members],
+        total=total,
+        next_cursor=_encode_members_cursor(next_keyset) if next_keyset else None
     )
 
 
@@ -583,7 +797,7 @@ async def regenerate_analysis_trends(
     db: Session = Depends(get_db)
 ):
     """Regenerate daily trends data for an existing analysis."""
-    analysis = db.query(Analysis).filter(
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
         Analysis.id == analysis_id,
         Analysis.organization_id == current_user.organization_id
     ).first()
@@ -600,24 +814,29 @@ async def regenerate_analysis_trends(
             detail="Can only regenerate trends for completed analyses"
         )
     
+    store = AnalysisResultsStore(db)
     try:
-        import json
-        analysis_data = analysis.results if isinstance(analysis.results, dict) else json.loads(analysis.results)
+        if not store.ensure(analysis_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Analysis results not available"
+            )
         
         # Check if we already have daily trends
-        if analysis_data.get("daily_trends") and len(analysis_data["daily_trends"]) > 0:
-            logger.info(f"Analysis {analysis_id} already has {len(analysis_data['daily_trends'])} daily trends data points")
+        existing_trends = store.get_team_daily(analysis_id)
+        if existing_trends:
+            logger.info(f"Analysis {analysis_id} already has {len(existing_trends)} daily trends data points")
             return {
                 "message": "Daily trends already exist",
-                "trends_count": len(analysis_data["daily_trends"]),
+                "trends_count": len(existing_trends),
                 "regenerated": False
             }
         
         # Get the original metadata and team analysis
-        metadata = analysis_data.get("metadata", {})
-        team_analysis = analysis_data.get("team_analysis", {})
+        summary = store.get_summary(analysis_id) or {}
+        metadata = summary.get("metadata", {})
         
-        if not metadata or not team_analysis:
+        if not metadata or "team_analysis" not in summary:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Analysis missing required metadata or team_analysis data"
@@ -635,9 +854,7 @@ async def regenerate_analysis_trends(
         import random
         
         # If we have team members with incidents, distribute them across days
-        members = team_analysis.get("members", [])
-        if isinstance(team_analysis, list):
-            members = team_analysis
+        members = store.get_members(analysis_id)
         
         # Calculate some basic metrics from existing data
         total_members = len(members)
@@ -698,11 +915,15 @@ async def regenerate_analysis_trends(
                 random_day = random.randint(0, len(daily_trends) - 1)
                 daily_trends[random_day]["incident_count"] += 1
         
-        # Update analysis data with daily trends
+        # Update analysis data with daily trends (the only path here that loads the full results)
+        analysis_data = dict(analysis.results or {})
         analysis_data["daily_trends"] = daily_trends
         
         # Save back to database
         analysis.results = analysis_data
+        analysis.results_version = (analysis.results_version or 1) + 1  # Invalidates cached responses
+        store.replace_team_daily(analysis_id, daily_trends)
+        store.replace_member_health(analysis_id, analysis_data)
         db.commit()
         
         logger.info(f"Successfully regenerated {len(daily_trends)} daily trends for analysis {analysis_id}")
@@ -715,6 +936,8 @@ async def regenerate_analysis_trends(
             "date_range": f"{daily_trends[0]['date']} to {daily_trends[-1]['date']}"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to regenerate trends for analysis {analysis_id}: {str(e)}")
         raise HTTPException(
@@ -730,7 +953,7 @@ async def verify_analysis_consistency(
     db: Session = Depends(get_db)
 ):
     """Verify data consistency for an analysis across all components."""
-    analysis = db.query(Analysis).filter(
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
         Analysis.id == analysis_id,
         Analysis.organization_id == current_user.organization_id
     ).first()
@@ -747,9 +970,15 @@ async def verify_analysis_consistency(
             detail="Can only verify consistency for completed analyses"
         )
     
+    store = AnalysisResultsStore(db)
+    if not store.ensure(analysis_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Analysis results not available"
+        )
+    
     try:
-        import json
-        analysis_data = analysis.results if isinstance(analysis.results, dict) else json.loads(analysis.results)
+        analysis_data = store.get_summary(analysis_id) or {}
         
         # Initialize consistency report
         consistency_report = {
@@ -765,14 +994,11 @@ async def verify_analysis_consistency(
         
         # Extract data components
         metadata = analysis_data.get("metadata", {})
-        team_analysis = analysis_data.get("team_analysis", {})
-        daily_trends = analysis_data.get("daily_trends", [])
+        daily_trends = store.get_team_daily(analysis_id)
         team_health = analysis_data.get("team_health", {})
         
-        # Get team members (handle both array and object formats)
-        members = team_analysis.get("members", []) if isinstance(team_analysis, dict) else team_analysis
-        if not isinstance(members, list):
-            members = []
+        # Get team members (both array and object formats are normalized by the store)
+        members = store.get_members(analysis_id)
         
         # === Check 1: Incident Totals Consistency ===
         metadata_total = metadata.get("total_incidents", 0)
@@ -923,7 +1149,7 @@ async def get_historical_trends(
         )
 
     # Find the most recent completed analysis
-    query = db.query(Analysis).filter(
+    query = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
         Analysis.organization_id == current_user.organization_id,
         Analysis.status == "completed",
         Analysis.results.isnot(None)
@@ -968,7 +1194,8 @@ async def get_historical_trends(
         )
     
     # Extract daily trends from the analysis results
-    results = analysis.results
+    store = AnalysisResultsStore(db)
+    results = store.get_summary(analysis.id) if store.ensure(analysis.id) else None
     if not results or not isinstance(results, dict):
         # Fallback to empty response
         end_date = datetime.now()
@@ -989,7 +1216,7 @@ async def get_historical_trends(
         )
     
     # Get daily trends from analysis results
-    analysis_daily_trends = results.get("daily_trends", [])
+    analysis_daily_trends = store.get_team_daily(analysis.id)
     if not analysis_daily_trends or not isinstance(analysis_daily_trends, list):
         # Fallback to empty response
         metadata = results.get("metadata", {})
@@ -1301,13 +1528,15 @@ class DailyIncidentTrendsResponse(BaseModel):
 @router.get("/{analysis_id}/daily-trends", response_model=DailyIncidentTrendsResponse)
 async def get_analysis_daily_trends(
     analysis_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get daily incident trends from a specific analysis."""
     
     # Get the analysis
-    analysis = db.query(Analysis).filter(
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
         Analysis.id == analysis_id,
         Analysis.organization_id == current_user.organization_id
     ).first()
@@ -1317,15 +1546,19 @@ async def get_analysis_daily_trends(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Analysis not found"
         )
+
+    not_modified = _check_not_modified(analysis, "daily-trends", request, response)
+    if not_modified:
+        return not_modified
     
-    if analysis.status != "completed" or not analysis.results:
+    store = AnalysisResultsStore(db)
+    if analysis.status != "completed" or not store.ensure(analysis_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Analysis is not completed or has no results"
         )
     
-    results = analysis.results
-    daily_trends_data = results.get("daily_trends", [])
+    daily_trends_data = store.get_team_daily(analysis_id)
     
     if not daily_trends_data:
         # Return empty trends if no daily data available
@@ -1413,16 +1646,18 @@ async def get_analysis_daily_trends(
 async def get_user_github_daily_commits(
     user_email: str,
     analysis_id: int = Query(..., description="Analysis ID to get date range from"),
+    timezone: Optional[str] = Query(None, description="IANA timezone for day boundaries and working hours (default: commit author offsets)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Get daily GitHub commit data for a specific user during an analysis period.
     
-    This endpoint fetches real-time GitHub commit data aggregated by day.
+    Finished days are served from stored daily histograms; only missing days
+    and today are fetched from GitHub.
     """
     # Get the analysis to determine the date range
-    analysis = db.query(Analysis).filter(
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
         Analysis.id == analysis_id,
         Analysis.organization_id == current_user.organization_id
     ).first()
@@ -1474,8 +1709,10 @@ async def get_user_github_daily_commits(
     from datetime import datetime, timedelta
     
     # Try to get dates from analysis results metadata
-    if analysis.results and isinstance(analysis.results, dict):
-        metadata = analysis.results.get("metadata", {})
+    store = AnalysisResultsStore(db)
+    analysis_summary = store.get_summary(analysis_id) if store.ensure(analysis_id) else None
+    if analysis_summary:
+        metadata = analysis_summary.get("metadata", {})
         start_date_str = metadata.get("start_date")
         end_date_str = metadata.get("end_date")
         
@@ -1496,7 +1733,8 @@ async def get_user_github_daily_commits(
         username=github_username,
         start_date=start_date,
         end_date=end_date,
-        github_token=github_token
+        github_token=github_token,
+        timezone_name=timezone
     )
     
     if daily_commits is None:
@@ -1539,6 +1777,7 @@ async def get_user_github_daily_commits(
 @router.get("/{analysis_id}/github-commits-timeline")
 async def get_analysis_github_commits_timeline(
     analysis_id: int,
+    timezone: Optional[str] = Query(None, description="IANA timezone for day boundaries and working hours (default: commit author offsets)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -1546,10 +1785,11 @@ async def get_analysis_github_commits_timeline(
     Get aggregated daily GitHub commit data for all team members in an analysis.
     
     This endpoint returns commit data suitable for displaying a timeline chart,
-    similar to the incidents health trends chart.
+    similar to the incidents health trends chart. Missing days are filled into the
+    stored daily histograms first; the timeline itself is aggregated in the database.
     """
     # Get the analysis
-    analysis = db.query(Analysis).filter(
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
         Analysis.id == analysis_id,
         Analysis.organization_id == current_user.organization_id
     ).first()
@@ -1565,7 +1805,9 @@ async def get_analysis_github_commits_timeline(
         }
     
     # Extract team members with GitHub data from analysis results
-    if not analysis.results or not isinstance(analysis.results, dict):
+    store = AnalysisResultsStore(db)
+    analysis_summary = store.get_summary(analysis_id) if store.ensure(analysis_id) else None
+    if not analysis_summary:
         return {
             "status": "error",
             "message": "Analysis results not available",
@@ -1573,14 +1815,11 @@ async def get_analysis_github_commits_timeline(
         }
     
     # Get GitHub insights to find ALL contributors (not just those in team_analysis)
-    github_insights = analysis.results.get("github_insights", {})
+    github_insights = analysis_summary.get("github_insights", {})
     top_contributors = github_insights.get("top_contributors", [])
     
     # Also check team_analysis for additional members
-    team_analysis = analysis.results.get("team_analysis", {})
-    members = team_analysis.get("members", [])
-    if isinstance(team_analysis, list):
-        members = team_analysis
+    members = store.get_members(analysis_id)
     
     # Combine contributors from both sources
     github_members = []
@@ -1666,7 +1905,7 @@ async def get_analysis_github_commits_timeline(
     import asyncio
     
     # Get dates from analysis metadata
-    metadata = analysis.results.get("metadata", {})
+    metadata = analysis_summary.get("metadata", {})
     start_date_str = metadata.get("start_date")
     end_date_str = metadata.get("end_date")
     
@@ -1690,25 +1929,40 @@ async def get_analysis_github_commits_timeline(
     # Fetch daily commit data for more members (increase from 5 to 10)
     for member in github_members[:10]:  # Increased limit to get better coverage
         if member["username"]:
-            task = collector.fetch_daily_commit_data(
+            task = collector.fetch_daily_commit_days(
                 username=member["username"],
                 start_date=start_date,
                 end_date=end_date,
-                github_token=github_token
+                github_token=github_token,
+                timezone_name=timezone
             )
             tasks.append((member["username"], task))
     
     # Execute all tasks concurrently
     results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
     
-    # Process results
-    for i, (username, result) in enumerate(zip([t[0] for t in tasks], results)):
+    fetched = {}
+    all_stored = True
+    for username, result in zip([t[0] for t in tasks], results):
         if isinstance(result, Exception):
             logger.warning(f"Failed to fetch data for {username}: {result}")
-            continue
-        
-        if result:
-            for day_data in result:
+        elif result is not None:
+            fetched[username], stored = result
+            all_stored = all_stored and stored
+    
+    # When every fetched member's days are stored, the timeline is one GROUP BY
+    daily_timeline = None
+    if all_stored:
+        from ...services.github_commit_history import GitHubCommitHistoryStore, window_days
+        history_store = GitHubCommitHistoryStore(timezone)
+        daily_timeline = await asyncio.to_thread(
+            history_store.team_timeline, list(fetched), window_days(start_date, end_date, history_store.tz_name)
+        )
+    
+    if daily_timeline is None:
+        # Store unavailable or missing some days: merge the per-member results in memory
+        for username, member_days in fetched.items():
+            for day_data in member_days:
                 date = day_data['date']
                 if date not in all_daily_data:
                     all_daily_data[date] = {
@@ -1724,18 +1978,18 @@ async def get_analysis_github_commits_timeline(
                 all_daily_data[date]['weekend_commits'] += day_data['weekend_commits']
                 if day_data['commits'] > 0:
                     all_daily_data[date]['contributors'].add(username)
-    
-    # Convert to sorted list and calculate contributor counts
-    daily_timeline = []
-    for date in sorted(all_daily_data.keys()):
-        day = all_daily_data[date]
-        daily_timeline.append({
-            'date': date,
-            'commits': day['commits'],
-            'after_hours_commits': day['after_hours_commits'],
-            'weekend_commits': day['weekend_commits'],
-            'unique_contributors': len(day['contributors'])
-        })
+        
+        # Convert to sorted list and calculate contributor counts
+        daily_timeline = []
+        for date in sorted(all_daily_data.keys()):
+            day = all_daily_data[date]
+            daily_timeline.append({
+                'date': date,
+                'commits': day['commits'],
+                'after_hours_commits': day['after_hours_commits'],
+                'weekend_commits': day['weekend_commits'],
+                'unique_contributors': len(day['contributors'])
+            })
     
     # Calculate summary statistics
     total_commits = sum(day['commits'] for day in daily_timeline)
@@ -1846,10 +2100,91 @@ def _generate_daily_tooltip(incident_count, severity_breakdown, daily_summary, d
         return f"{day_name}: {severity_text}"
 
 
+@router.get("/{analysis_id}/daily-health")
+async def get_team_daily_health(
+    analysis_id: int,
+    request: Request,
+    response: Response,
+    stream: bool = Query(False, description="Stream one JSON object per member (application/x-ndjson)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Daily health series for every team member, in the format of
+    /members/{member_email}/daily-health.
+
+    Members, their daily rows and (for old analyses) the team series are each
+    read once. With stream=true members are encoded as they are computed.
+    """
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
+        Analysis.id == analysis_id,
+        Analysis.organization_id == current_user.organization_id
+    ).first()
+
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    if analysis.status != 'completed':
+        return {
+            "status": "error",
+            "message": "Analysis not completed yet",
+            "data": None
+        }
+
+    not_modified = _check_not_modified(analysis, "team-daily-health", request, response)
+    if not_modified:
+        return not_modified
+
+    store = AnalysisResultsStore(db)
+    if not store.ensure(analysis_id):
+        return {
+            "status": "error",
+            "message": "Analysis results not available",
+            "data": None
+        }
+
+    members = [(get_member_email(member), member) for member in store.get_members(analysis_id)]
+    members = [(email, member) for email, member in members if email]
+    members_daily = store.get_members_daily(analysis_id)
+    members_health = store.get_members_health(analysis_id)
+    days_analyzed = (store.get_summary(analysis_id) or {}).get("period_summary", {}).get("days_analyzed", 30)
+    # The team series only scores members without a stored series and without pre-calculated
+    # health; load it up front since the session may be closed while a response is streamed
+    needs_team_daily = any(
+        not any(day.get("health_score") is not None for day in members_daily[email].values())
+        for email, _ in members if email in members_daily and email not in members_health
+    )
+    team_daily = store.get_team_daily(analysis_id) if needs_team_daily else []
+
+    def member_series():
+        for email, member in members:
+            user_daily_data = members_daily.get(email) or _fallback_member_daily_data(email, member, days_analyzed)
+            series = members_health.get(email) if email in members_daily else None
+            yield _build_member_daily_health(email, member, user_daily_data, lambda: team_daily, series=series)
+
+    logger.info(f"📈 Team daily health for analysis {analysis_id}: {len(members)} members, stream={stream}")
+    # Headers set on the injected response (ETag, caching) are only applied to model returns
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    if stream:
+        # Everything was read above; the generator only computes and encodes
+        return StreamingResponse(
+            (dumps_bytes(series) + b"\n" for series in member_series()),
+            media_type="application/x-ndjson",
+            headers=headers
+        )
+    return Response(
+        content=dumps_bytes({"status": "success", "data": {"members": list(member_series()), "total_members": len(members)}}),
+        media_type="application/json",
+        headers=headers
+    )
+
+
 @router.get("/{analysis_id}/members/{member_email}/daily-health")
 async def get_member_daily_health(
     analysis_id: int,
     member_email: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -1867,7 +2202,7 @@ async def get_member_daily_health(
     logger.error(f"🚨 DAILY_HEALTH_API_CALLED: analysis_id={analysis_id}, member_email={member_email}")
     
     # Get the analysis
-    analysis = db.query(Analysis).filter(
+    analysis = db.query(Analysis).options(defer(Analysis.results), defer(Analysis.config)).filter(
         Analysis.id == analysis_id,
         Analysis.organization_id == current_user.organization_id
     ).first()
@@ -1881,9 +2216,14 @@ async def get_member_daily_health(
             "message": "Analysis not completed yet",
             "data": None
         }
+
+    not_modified = _check_not_modified(analysis, "daily-health", request, response)
+    if not_modified:
+        return not_modified
     
-    # Extract analysis data
-    if not analysis.results or not isinstance(analysis.results, dict):
+    # Extract analysis data (only this member's rows are read)
+    store = AnalysisResultsStore(db)
+    if not store.ensure(analysis_id):
         return {
             "status": "error", 
             "message": "Analysis results not available",
@@ -1891,16 +2231,7 @@ async def get_member_daily_health(
         }
     
     # Find the specific member in the analysis results
-    team_analysis = analysis.results.get("team_analysis", {})
-    members = team_analysis.get("members", [])
-    if isinstance(team_analysis, list):
-        members = team_analysis
-        
-    member_data = None
-    for member in members:
-        if member.get("user_email", "").lower() == member_email.lower():
-            member_data = member
-            break
+    member_data = store.get_member(analysis_id, member_email)
             
     if not member_data:
         return {
@@ -1910,8 +2241,8 @@ async def get_member_daily_health(
         }
     
     # Get individual daily data from analysis results
-    individual_daily_data = analysis.results.get("individual_daily_data", {})
-    daily_trends = analysis.results.get("daily_trends", [])
+    member_daily_data = store.get_member_daily(analysis_id, member_email)
+    individual_daily_data = {member_email.lower(): member_daily_data} if member_daily_data else {}
     
     user_key = member_email.lower()
     
@@ -1930,16 +2261,7 @@ async def get_member_daily_health(
         total_incidents_daily = sum(day_data.get('incident_count', 0) for day_data in user_daily_data.values())
         
         # Get the team analysis incident count for comparison
-        team_analysis = analysis.results.get("team_analysis", {})
-        members = team_analysis.get("members", [])
-        if isinstance(team_analysis, list):
-            members = team_analysis
-        
-        team_incident_count = 0
-        for member in members:
-            if member.get("user_email", "").lower() == member_email.lower():
-                team_incident_count = member.get("incident_count", 0)
-                break
+        team_incident_count = member_data.get("incident_count", 0)
         
         print(f"🚨 DATA_CONSISTENCY_CHECK: {member_email}")
         print(f"🚨 Team Analysis Incidents: {team_incident_count}")
@@ -1953,9 +2275,10 @@ async def get_member_daily_health(
             logger.error(f"🚨 REBUILDING_FROM_REAL_DATA: {member_email} - {team_incident_count} incidents")
             
             # Get raw incident data from analysis
-            raw_incidents = analysis.results.get("raw_incidents", [])
+            analysis_summary = store.get_summary(analysis_id) or {}
+            raw_incidents = analysis_summary.get("raw_incidents", [])
             if not raw_incidents:
-                raw_incidents = analysis.results.get("incidents", [])
+                raw_incidents = analysis_summary.get("incidents", [])
             
             print(f"🚨 RAW_INCIDENT_DATA: Found {len(raw_incidents)} total raw incidents in analysis")
             logger.error(f"🚨 RAW_INCIDENT_DATA: Found {len(raw_incidents)} total raw incidents")
@@ -2130,101 +2453,14 @@ async def get_member_daily_health(
         
     if user_key not in individual_daily_data:
         
-        # Get team member data to check if this user has incidents
-        team_analysis = analysis.results.get("team_analysis", {})
-        members = team_analysis.get("members", [])
-        if isinstance(team_analysis, list):
-            members = team_analysis
-            
-        # Find this specific member in team analysis
-        member_data = None
-        for member in members:
-            if member.get("user_email", "").lower() == member_email.lower() or \
-               member.get("email", "").lower() == member_email.lower():
-                member_data = member
-                break
-        
-        if not member_data:
-            logger.error(f"🚨 Member {member_email} not found in team analysis - cannot generate fallback data")
-            return {
-                "status": "error",
-                "message": f"Member {member_email} not found in analysis results",
-                "data": None
-            }
-        
         # Log the member data we found to check incident count
         print(f"🚨 FOUND_MEMBER_DATA: {member_email} has {member_data.get('incident_count', 0)} incidents")
         logger.error(f"🚨 FOUND_MEMBER_DATA: {member_email} has {member_data.get('incident_count', 0)} incidents")
         
-        # Create fallback daily structure with realistic data
-        days_analyzed = analysis.results.get("period_summary", {}).get("days_analyzed", 30)
-        user_daily_data = {}
-        
-        # Get incident count to determine if user should have health data
-        member_incident_count = member_data.get("incident_count", 0)
-        
-        logger.info(f"🔍 FALLBACK: {member_email} has {member_incident_count} total incidents, generating {days_analyzed} days of data")
+        days_analyzed = (store.get_summary(analysis_id) or {}).get("period_summary", {}).get("days_analyzed", 30)
         
-        # Generate fallback daily data
-        from datetime import datetime, timedelta
-        import random
-        incidents_distributed = 0
-        
-        for day_offset in range(days_analyzed):
-            date_obj = datetime.now() - timedelta(days=days_analyzed - day_offset - 1)
-            date_str = date_obj.strftime('%Y-%m-%d')
-            
-            # Distribute incidents across days (simple approach)
-            day_incident_count = 0
-            has_data = False
-            health_score = 88  # Default healthy day
-            
-            if member_incident_count > 0 and incidents_distributed < member_incident_count:
-                # Ensure all incidents get distributed
-                remaining_incidents = member_incident_count - incidents_distributed
-                remaining_days = days_analyzed - day_offset
-                
-                # Calculate probability to ensure all incidents are distributed
-                if remaining_days > 0:
-                    incidents_per_remaining_day = remaining_incidents / remaining_days
-                    probability = min(0.6, max(0.1, incidents_per_remaining_day))  # 10-60% chance
-                    
-                    if random.random() < probability:
-                        day_incident_count = min(random.randint(1, 4), remaining_incidents)
-                        incidents_distributed += day_incident_count
-                        has_data = True
-                        # Calculate burnout score based on incident count (CONSISTENT with CBI)
-                        # Higher incidents = higher burnout score
-                        health_score = min(70, day_incident_count * 15)
-                
-                # Force remaining incidents on last few days if needed
-                elif remaining_days <= 3 and remaining_incidents > 0:
-                    day_incident_count = min(random.randint(1, 4), remaining_incidents)
-                    incidents_distributed += day_incident_count  
-                    has_data = True
-                    # Calculate burnout score based on incident count (CONSISTENT with CBI)  
-                    # Higher incidents = higher burnout score
-                    health_score = min(70, day_incident_count * 15)
-            
-            user_daily_data[date_str] = {
-                "date": date_str,
-                "incident_count": day_incident_count,
-                "severity_weighted_count": day_incident_count * 3.0,  # Estimate
-                "after_hours_count": 0,
-                "weekend_count": 0,
-                "response_times": [],
-                "has_data": has_data,
-                "health_score": health_score,
-                "team_health": 75,  # Estimate
-                "day_name": date_obj.strftime("%a, %b %d"),
-                "incidents": [],
-                "high_severity_count": 0
-            }
-            
-        logger.info(f"🔍 FALLBACK: Generated data with {sum(1 for d in user_daily_data.values() if d['has_data'])} incident days")
-            
         # Set this as the user's data for the rest of the function
-        individual_daily_data[user_key] = user_daily_data
+        individual_daily_data[user_key] = _fallback_member_daily_data(member_email, member_data, days_analyzed)
     
     user_daily_data = individual_daily_data[user_key]
     
@@ -2235,14 +2471,107 @@ async def get_member_daily_health(
             "data": None
         }
     
-    # Use pre-calculated individual daily health scores from analyzer
-    daily_health_scores = []
+    return {
+        "status": "success",
+        "data": _build_member_daily_health(
+            member_email, member_data, user_daily_data, lambda: store.get_team_daily(analysis_id),
+            series=store.get_member_health(analysis_id, member_email) if member_daily_data else None
+        )
+    }
+
+
+def _fallback_member_daily_data(member_email: str, member_data: dict, days_analyzed: int) -> Dict[str, dict]:
+    """Daily structure for old analyses without individual_daily_data, spreading the member's incidents over the period."""
+    user_daily_data = {}
     
-    # Check if we have pre-calculated health scores (new analyses)
-    has_precalculated_scores = any(
-        day_data.get("health_score") is not None 
-        for day_data in user_daily_data.values()
-    )
+    # Get incident count to determine if user should have health data
+    member_incident_count = member_data.get("incident_count", 0)
+    
+    logger.info(f"🔍 FALLBACK: {member_email} has {member_incident_count} total incidents, generating {days_analyzed} days of data")
+    
+    # Generate fallback daily data
+    from datetime import datetime, timedelta
+    import random
+    incidents_distributed = 0
+    
+    for day_offset in range(days_analyzed):
+        date_obj = datetime.now() - timedelta(days=days_analyzed - day_offset - 1)
+        date_str = date_obj.strftime('%Y-%m-%d')
+        
+        # Distribute incidents across days (simple approach)
+        day_incident_count = 0
+        has_data = False
+        health_score = 88  # Default healthy day
+        
+        if member_incident_count > 0 and incidents_distributed < member_incident_count:
+            # Ensure all incidents get distributed
+            remaining_incidents = member_incident_count - incidents_distributed
+            remaining_days = days_analyzed - day_offset
+            
+            # Calculate probability to ensure all incidents are distributed
+            if remaining_days > 0:
+                incidents_per_remaining_day = remaining_incidents / remaining_days
+                probability = min(0.6, max(0.1, incidents_per_remaining_day))  # 10-60% chance
+                
+                if random.random() < probability:
+                    day_incident_count = min(random.randint(1, 4), remaining_incidents)
+                    incidents_distributed += day_incident_count
+                    has_data = True
+                    # Calculate burnout score based on incident count (CONSISTENT with CBI)
+                    # Higher incidents = higher burnout score
+                    health_score = min(70, day_incident_count * 15)
+            
+            # Force remaining incidents on last few days if needed
+            elif remaining_days <= 3 and remaining_incidents > 0:
+                day_incident_count = min(random.randint(1, 4), remaining_incidents)
+                incidents_distributed += day_incident_count  
+                has_data = True
+                # Calculate burnout score based on incident count (CONSISTENT with CBI)  
+                # Higher incidents = higher burnout score
+                health_score = min(70, day_incident_count * 15)
+        
+        user_daily_data[date_str] = {
+            "date": date_str,
+            "incident_count": day_incident_count,
+            "severity_weighted_count": day_incident_count * 3.0,  # Estimate
+            "after_hours_count": 0,
+            "weekend_count": 0,
+            "response_times": [],
+            "has_data": has_data,
+            "health_score": health_score,
+            "team_health": 75,  # Estimate
+            "day_name": date_obj.strftime("%a, %b %d"),
+            "incidents": [],
+            "high_severity_count": 0
+        }
+        
+    logger.info(f"🔍 FALLBACK: Generated data with {sum(1 for d in user_daily_data.values() if d['has_data'])} incident days")
+
+    return user_daily_data
+
+
+def _build_member_daily_health(member_email: str, member_data: dict, user_daily_data: Dict[str, dict], load_daily_trends, series: Optional[DailyHealthSeries] = None) -> dict:
+    """
+    Daily health series and summary for one member (the "data" of the daily-health endpoints).
+
+    Scores come from the member's stored series; without one they are computed
+    from user_daily_data, and load_daily_trends() is only called for old analyses
+    without pre-calculated health scores.
+    """
+    if series is None:
+        has_precalculated_scores = any(
+            day_data.get("health_score") is not None
+            for day_data in user_daily_data.values()
+        )
+        # Team series is only needed to score days without pre-calculated health
+        team_health_by_date = {}
+        if not has_precalculated_scores:
+            for day in load_daily_trends():
+                team_health_by_date[day.get("date")] = day.get("overall_score", 0)
+        series = DailyHealthSeries.from_daily_data(user_daily_data, team_health_by_date)
+    scores = series.by_date() if series else {}
+
+    daily_health_scores = []
     
     # FOCUSED DEBUG: Check if user has incidents but wrong scores
     total_incidents = sum(day_data.get("incident_count", 0) for day_data in user_daily_data.values())
@@ -2250,75 +2579,19 @@ async def get_member_daily_health(
         sample_scores = [day_data.get("health_score") for day_data in user_daily_data.values() if day_data.get("health_score") is not None]
         if sample_scores and all(score < 10 for score in sample_scores[:5]):
             logger.error(f"🚨 SCORE_BUG: {member_email} has {total_incidents} total incidents but all scores are low: {sample_scores[:5]}")
-            logger.error(f"   has_precalculated_scores: {has_precalculated_scores}")
     
     for date_str, day_data in user_daily_data.items():
+        if date_str not in scores:
+            continue
+        health_score, team_health, factor_bits = scores[date_str]
         incident_count = day_data.get("incident_count", 0)
-        has_data = day_data.get("has_data", False)
-        
-        # Use pre-calculated health score if available, otherwise fallback to old calculation
-        if has_precalculated_scores and day_data.get("health_score") is not None:
-            # NEW: Use pre-calculated health score from UnifiedBurnoutAnalyzer
-            health_score = day_data.get("health_score", 88)  # Already 0-100 scale
-            team_health = day_data.get("team_health", 88)     # Already 0-100 scale
-            day_name = day_data.get("day_name", "")
-        else:
-            # FALLBACK: Old calculation for backwards compatibility
-            if has_data:
-                severity_weighted = day_data.get("severity_weighted_count", 0)
-                after_hours_count = day_data.get("after_hours_count", 0) 
-                high_severity_count = day_data.get("high_severity_count", 0)
-                
-                # Individual scoring
-                base_score = 8.5
-                
-                # Incident volume penalty
-                if incident_count > 0:
-                    incident_penalty = min(incident_count * 1.0, 3.0)
-                    base_score -= incident_penalty
-                
-                # Severity penalty
-                if severity_weighted > incident_count:
-                    severity_penalty = min((severity_weighted - incident_count) * 0.8, 2.0)
-                    base_score -= severity_penalty
-                
-                # After-hours penalty
-                if after_hours_count > 0:
-                    after_hours_penalty = min(after_hours_count * 0.7, 1.5)
-                    base_score -= after_hours_penalty
-                
-                # High severity penalty
-                if high_severity_count > 0:
-                    high_sev_penalty = min(high_severity_count * 1.0, 2.0)
-                    base_score -= high_sev_penalty
-                
-                # Floor at 1.0
-                daily_health_score = max(base_score, 1.0)
-                
-                # Convert to 0-100 scale
-                health_score = round(daily_health_score * 10)
-            else:
-                # NO FAKE DATA: Only use real incident data
-                # If no incidents, use baseline low burnout score (no randomization)
-                # CONSISTENT with CBI methodology: higher = more burnout
-                health_score = 0
-                logger.error(f"🚨 FALLBACK_SCORE: {member_email} on {date_str} - no incidents, using score 0")
-                
-            # Calculate team health (fallback)
-            team_health_by_date = {}
-            for day in daily_trends:
-                team_health_by_date[day.get("date")] = day.get("overall_score", 0)
-            team_health = round(team_health_by_date.get(date_str, 8.5) * 10)
-            
-            # Generate day name
-            from datetime import datetime
-            day_name = datetime.strptime(date_str, '%Y-%m-%d').strftime("%a, %b %d")
+        has_data = bool(factor_bits & HAS_DATA)
+        day_name = day_data.get("day_name") or datetime.strptime(date_str, '%Y-%m-%d').strftime("%a, %b %d")
         
         # Build factors for detailed tooltips (consistent regardless of calculation method)
         severity_weighted = day_data.get("severity_weighted_count", 0.0)
         after_hours_count = day_data.get("after_hours_count", 0)
         weekend_count = day_data.get("weekend_count", 0)
-        high_severity_count = day_data.get("high_severity_count", 0)
         
         factors = {
             "severity_load": min(100, int(severity_weighted * 8)) if has_data else 0,
@@ -2357,19 +2630,16 @@ async def get_member_daily_health(
     
     
     return {
-        "status": "success",
-        "data": {
-            "member_email": member_email,
-            "member_name": member_data.get("user_name", "Unknown"),
-            "daily_health": daily_health_scores,
-            "summary": {
-                "total_days": len(daily_health_scores),
-                "days_with_data": len(days_with_data),
-                "days_without_data": len(days_without_data),
-                "avg_health_score": round(sum(d["health_score"] for d in days_with_data) / len(days_with_data)) if days_with_data else 0,
-                "lowest_health_day": min(days_with_data, key=lambda x: x["health_score"]) if days_with_data else None,
-                "highest_health_day": max(days_with_data, key=lambda x: x["health_score"]) if days_with_data else None
-            }
+        "member_email": member_email,
+        "member_name": member_data.get("user_name", "Unknown"),
+        "daily_health": daily_health_scores,
+        "summary": {
+            "total_days": len(daily_health_scores),
+            "days_with_data": len(days_with_data),
+            "days_without_data": len(days_without_data),
+            "avg_health_score": round(sum(d["health_score"] for d in days_with_data) / len(days_with_data)) if days_with_data else 0,
+            "lowest_health_day": min(days_with_data, key=lambda x: x["health_score"]) if days_with_data else None,
+            "highest_health_day": max(days_with_data, key=lambda x: x["health_score"]) if days_with_data else None
         }
     }
 
@@ -2655,6 +2925,7 @@ async def run_analysis_task(
                 analysis.results = results
                 analysis.completed_at = datetime.now()
                 db.commit()
+                AnalysisResultsStore(db).save(analysis_id, results)
                 logger.info(f"BACKGROUND_TASK: Successfully saved results for analysis {analysis_id}")
             else:
                 logger.error(f"BACKGROUND_TASK: Analysis {analysis_id} not found when trying to save results")
@@ -15,6 +15,7 @@ from ...core.rootly_client import RootlyAPIClient
 from ...services.unified_burnout_analyzer import UnifiedBurnoutAnalyzer
 from ...services.github_only_burnout_analyzer import GitHubOnlyBurnoutAnalyzer
 from ...services.slack_token_service import get_slack_token_for_user, SlackTokenService
+from ...services.analysis_results_store import AnalysisResultsStore
 from ...core.rate_limiting import analysis_rate_limit
 from ...core.input_validation import AnalysisRequest as ValidatedAnalysisRequest
 
@@ -494,6 +495,7 @@ async def _run_analysis_task_impl(db, analysis_id: int, integration_id: int, day
         analysis.results = results
         analysis.completed_at = datetime.now()
         db.commit()
+        AnalysisResultsStore(db).save(analysis_id, results)
         
         logger.info(f"Analysis {analysis_id} completed successfully")
         
@@ -578,6 +580,7 @@ async def run_github_only_analysis_task(analysis_id: int, days_back: int, team_e
         analysis.results = results
         analysis.completed_at = datetime.now()
         db.commit()
+        AnalysisResultsStore(db).save(analysis_id, results)
         
         logger.info(f"GitHub-only analysis {analysis_id} completed successfully")
         
@@ -0,0 +1,120 @@
+"""
+Split an analysis results document into the parts endpoints read separately.
+
+The analyzer produces one nested document (team health, every member,
+daily_trends, individual_daily_data, insights, AI output). Endpoints that
+return one member or one series should not have to parse all of it, so
+completed results are also stored as a summary, member rows, per-member
+daily rows and team daily rows (see models.analysis_results).
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+# Keys moved out of the summary into their own rows
+SPLIT_KEYS = ("daily_trends", "individual_daily_data")
+
+
+def parse_day(value: Any) -> Optional[date]:
+    """Parse a 'YYYY-MM-DD' (or ISO timestamp) day key, None if it is not a date."""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def member_email(member: Dict[str, Any]) -> Optional[str]:
+    """Lowercased email of a team_analysis member entry."""
+    email = member.get("user_email") or member.get("email") or ""
+    return email.lower() or None
+
+
+def team_members(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Members of team_analysis, which is either {"members": [...]} or a bare list in old analyses."""
+    team_analysis = results.get("team_analysis") or {}
+    members = team_analysis if isinstance(team_analysis, list) else team_analysis.get("members", [])
+    return [member for member in members or [] if isinstance(member, dict)]
+
+
+def split_analysis_results(results: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split results into (summary, members, member_daily, team_daily) row dicts.
+
+    - summary: the document without members, daily_trends and individual_daily_data
+    - members: {position, member_email, user_name, risk_level, burnout_score, incident_count, data}
+    - member_daily: {member_email, date, data}, one per (lowercased email, date)
+    - team_daily: {date, data}, one per distinct date (later entries win)
+    """
+    summary = {key: value for key, value in results.items() if key not in SPLIT_KEYS}
+    team_analysis = results.get("team_analysis")
+    if isinstance(team_analysis, dict):
+        summary["team_analysis"] = {key: value for key, value in team_analysis.items() if key != "members"}
+    elif isinstance(team_analysis, list):
+        summary["team_analysis"] = {}
+
+    members = []
+    for position, member in enumerate(team_members(results)):
+        score = member.get("burnout_score")
+        incidents = member.get("incident_count")
+        members.append({
+            "position": position,
+            "member_email": member_email(member),
+            "user_name": (member.get("user_name") or "")[:255] or None,
+            "risk_level": (member.get("risk_level") or "")[:20] or None,
+            "burnout_score": float(score) if isinstance(score, (int, float)) else None,
+            "incident_count": int(incidents) if isinstance(incidents, (int, float)) else None,
+            "data": member,
+        })
+
+    member_daily: Dict[Tuple[str, date], Dict[str, Any]] = {}
+    individual_daily_data = results.get("individual_daily_data") or {}
+    if isinstance(individual_daily_data, dict):
+        for email, days in individual_daily_data.items():
+            if not email or not isinstance(days, dict):
+                continue
+            for day_key, day_data in days.items():
+                day = parse_day(day_key)
+                if day is not None and isinstance(day_data, dict):
+                    member_daily[(email.lower(), day)] = day_data
+
+    team_daily: Dict[date, Dict[str, Any]] = {}
+    for trend in results.get("daily_trends") or []:
+        day = parse_day(trend.get("date")) if isinstance(trend, dict) else None
+        if day is not None:
+            team_daily[day] = trend
+
+    return (
+        summary,
+        members,
+        [{"member_email": email, "date": day, "data": day_data} for (email, day), day_data in member_daily.items()],
+        [{"date": day, "data": trend} for day, trend in sorted(team_daily.items())],
+    )
+
+
+def parse_fields(fields: Optional[str]) -> List[List[str]]:
+    """Parse a fields= projection ("team_health,team_analysis.members.burnout_score") into key paths."""
+    paths = []
+    for field in (fields or "").split(","):
+        path = [key for key in field.strip().split(".") if key]
+        if path and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def project_fields(value: Any, paths: List[List[str]]) -> Any:
+    """
+    Keep only the given key paths of a results document.
+
+    Lists are projected item by item, so "team_analysis.members.burnout_score"
+    keeps each member's score. A path that covers a whole subtree keeps it as is;
+    keys that are not present are left out.
+    """
+    if not paths or any(not path for path in paths):
+        return value
+    if isinstance(value, list):
+        return [project_fields(item, paths) for item in value]
+    if not isinstance(value, dict):
+        return value
+    by_key: Dict[str, List[List[str]]] = {}
+    for path in paths:
+        by_key.setdefault(path[0], []).append(path[1:])
+    return {key: project_fields(value[key], rest) for key, rest in by_key.items() if key in value}
@@ -0,0 +1,224 @@
+"""
+Async token-bucket rate limiter for outbound integration API calls.
+
+Every call to GitHub, Slack, Rootly or PagerDuty awaits a permit from a bucket
+keyed by (provider, token, bucket). Buckets refill at the provider's documented
+pace and are corrected from the Retry-After / X-RateLimit-* headers returned by
+the provider, so callers run as fast as allowed instead of sleeping blindly.
+"""
+import hashlib
+import logging
+import threading
+import time
+import asyncio
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# (capacity, refill tokens per second) per provider bucket.
+# Capacity + refill over a window never exceeds the provider's limit for that window.
+BUCKET_LIMITS: Dict[Tuple[str, str], Tuple[float, float]] = {
+    # GitHub: 5000 requests/hour for REST core, search has its own 30/minute bucket
+    ("github", "core"): (100, 4900 / 3600),
+    ("github", "search"): (5, 25 / 60),
+    # GraphQL has a separate 5000 points/hour budget; batched queries cost a few points each
+    ("github", "graphql"): (20, 4000 / 3600),
+    # Slack Web API tiers (per method family, per workspace)
+    ("slack", "tier2"): (3, 17 / 60),
+    ("slack", "tier3"): (5, 45 / 60),
+    ("slack", "tier4"): (10, 90 / 60),
+    # Rootly and PagerDuty REST APIs
+    ("rootly", "core"): (20, 10.0),
+    ("pagerduty", "core"): (20, 900 / 60),
+}
+DEFAULT_BUCKET_LIMIT = (10, 5.0)
+
+# Never honour a single Retry-After / reset longer than this (keeps analyses inside their timeout)
+MAX_BLOCK_SECONDS = 300
+
+
+class TokenBucket:
+    """Token bucket with an optional hard block (from Retry-After or an exhausted quota)."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take a token if one is available; otherwise return the seconds to wait before retrying."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.refill_per_second
+
+    def block_for(self, seconds: float, now: Optional[float] = None) -> None:
+        """Refuse permits for the next `seconds` (never shortens an existing block)."""
+        now = time.monotonic() if now is None else now
+        seconds = min(max(0.0, seconds), MAX_BLOCK_SECONDS)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+
+    def cap_tokens(self, remaining: float) -> None:
+        """Never hand out more tokens than the provider says are left."""
+        self.tokens = min(self.tokens, max(0.0, remaining))
+
+
+class IntegrationRateLimiter:
+    """
+    Shared limiter for all outbound integration calls.
+
+    Features:
+    - One token bucket per (provider, token fingerprint, bucket)
+    - Separate GitHub search bucket (30/min) and Slack tier buckets
+    - Retry-After and X-RateLimit-Remaining/Reset header feedback
+    - Thread-safe, and not bound to a single event loop
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[str, str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.metrics = {"permits": 0, "waits": 0, "seconds_waited": 0.0, "throttled_responses": 0}
+
+    @staticmethod
+    def _fingerprint(token: Optional[str]) -> str:
+        if not token:
+            return "anonymous"
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+    def _get_bucket(self, provider: str, token: Optional[str], bucket: str) -> TokenBucket:
+        key = (provider, self._fingerprint(token), bucket)
+        existing = self._buckets.get(key)
+        if existing:
+            return existing
+        capacity, refill = BUCKET_LIMITS.get((provider, bucket), DEFAULT_BUCKET_LIMIT)
+        return self._buckets.setdefault(key, TokenBucket(capacity, refill))
+
+    async def acquire(self, provider: str, token: Optional[str], bucket: str = "core") -> float:
+        """Wait until a permit is available. Returns the total seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                wait = self._get_bucket(provider, token, bucket).reserve()
+            if wait <= 0:
+                self.metrics["permits"] += 1
+                if waited:
+                    self.metrics["waits"] += 1
+                    self.metrics["seconds_waited"] += waited
+                return waited
+            if wait > 5:
+                logger.info(f"⏳ RATE LIMITER: {provider}/{bucket} waiting {wait:.1f}s for a permit")
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def refund(self, provider: str, token: Optional[str], bucket: str = "core") -> None:
+        """Return a permit for a request the provider did not charge (e.g. a 304 to a conditional GET)."""
+        with self._lock:
+            limiter_bucket = self._get_bucket(provider, token, bucket)
+            limiter_bucket.tokens = min(limiter_bucket.capacity, limiter_bucket.tokens + 1)
+
+    def penalize(self, provider: str, token: Optional[str], bucket: str, seconds: float) -> None:
+        """Block a bucket for a number of seconds (e.g. after transport errors or a 429 without headers)."""
+        with self._lock:
+            self._get_bucket(provider, token, bucket).block_for(seconds)
+
+    def record_response(
+        self,
+        provider: str,
+        token: Optional[str],
+        bucket: str,
+        status: int,
+        headers: Optional[Mapping[str, Any]]
+    ) -> Optional[float]:
+        """
+        Update a bucket from a provider response.
+
+        Returns the number of seconds to wait before retrying if the response was
+        throttled (429, or 403 with an exhausted quota), otherwise None.
+        """
+        headers = headers or {}
+        retry_after = parse_retry_after(headers.get("Retry-After") or headers.get("retry-after"))
+        remaining = _to_float(headers.get("X-RateLimit-Remaining") or headers.get("x-ratelimit-remaining"))
+        reset_in = parse_rate_limit_reset(headers.get("X-RateLimit-Reset") or headers.get("x-ratelimit-reset"))
+
+        throttled = status == 429 or (status == 403 and (retry_after is not None or remaining == 0))
+        with self._lock:
+            limiter_bucket = self._get_bucket(provider, token, bucket)
+            if remaining is not None:
+                limiter_bucket.cap_tokens(remaining)
+            if retry_after is not None and (throttled or remaining == 0):
+                limiter_bucket.block_for(retry_after)
+            elif remaining == 0 and reset_in is not None:
+                limiter_bucket.block_for(reset_in)
+            elif status == 429:
+                # Throttled without any guidance: back off for a minute
+                limiter_bucket.block_for(60)
+
+            if not throttled:
+                return None
+            self.metrics["throttled_responses"] += 1
+            wait = max(0.0, limiter_bucket.blocked_until - time.monotonic())
+
+        logger.warning(f"🚦 RATE LIMITER: {provider}/{bucket} throttled (HTTP {status}), retry in {wait:.1f}s")
+        return wait
+
+    def get_status(self) -> Dict[str, Any]:
+        """Snapshot of bucket state for health endpoints and debugging."""
+        now = time.monotonic()
+        with self._lock:
+            buckets = {
+                f"{provider}/{bucket}/{fingerprint[:6]}": {
+                    "tokens": round(b.tokens, 2),
+                    "capacity": b.capacity,
+                    "blocked_for_seconds": round(max(0.0, b.blocked_until - now), 1),
+                }
+                for (provider, fingerprint, bucket), b in self._buckets.items()
+            }
+        return {"buckets": buckets, "metrics": dict(self.metrics)}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    seconds = _to_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    if not value:
+        return None
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_reset(value: Any) -> Optional[float]:
+    """Parse X-RateLimit-Reset as seconds from now (accepts epoch seconds or a relative delay)."""
+    reset = _to_float(value)
+    if reset is None:
+        return None
+    if reset > 1_000_000_000:  # Epoch timestamp (GitHub style)
+        return max(0.0, reset - time.time())
+    return max(0.0, reset)
+
+
+# Global instance shared by all integration clients
+integration_rate_limiter = IntegrationRateLimiter()
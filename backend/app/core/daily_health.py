@@ -0,0 +1,174 @@
+"""
+Per-member daily health series in compact form.
+
+Daily health used to be recomputed from individual_daily_data on every
+daily-health request (and, for old analyses, partly at random). The series is
+now computed once when results are stored: one float64 health value, one
+float64 team health value and one factor bitmask byte per day, starting at a
+fixed date. Reads look up or slice days instead of re-scoring them.
+"""
+import math
+import sys
+from array import array
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .analysis_results import parse_day
+
+# Factor bits set for a day (DailyHealthSeries.factors)
+HAS_DATA = 1
+INCIDENTS = 2
+HIGH_SEVERITY = 4
+SEVERITY_LOAD = 8  # severity-weighted load above the incident count
+AFTER_HOURS = 16
+WEEKEND = 32
+
+
+def incident_health_score(day_data: Dict[str, Any]) -> float:
+    """
+    Health on a 1.0-8.5 scale from one day's incident load.
+
+    Used by days without a pre-calculated health_score (analyses from before the
+    analyzer stored one) and by UnifiedBurnoutAnalyzer.calculate_individual_daily_health.
+    """
+    incident_count = day_data.get("incident_count", 0) or 0
+    severity_weighted = day_data.get("severity_weighted_count", 0.0) or 0.0
+    after_hours_count = day_data.get("after_hours_count", 0) or 0
+    high_severity_count = day_data.get("high_severity_count", 0) or 0
+
+    base_score = 8.5
+    if incident_count > 0:
+        base_score -= min(incident_count * 1.0, 3.0)
+    if severity_weighted > incident_count:
+        base_score -= min((severity_weighted - incident_count) * 0.8, 2.0)
+    if after_hours_count > 0:
+        base_score -= min(after_hours_count * 0.7, 1.5)
+    if high_severity_count > 0:
+        base_score -= min(high_severity_count * 1.0, 2.0)
+    return max(base_score, 1.0)
+
+
+def factor_mask(day_data: Dict[str, Any]) -> int:
+    """Bitmask of the factors present on a day."""
+    if not day_data.get("has_data", False):
+        return 0
+    incident_count = day_data.get("incident_count", 0) or 0
+    mask = HAS_DATA
+    if incident_count > 0:
+        mask |= INCIDENTS
+    if (day_data.get("high_severity_count", 0) or 0) > 0:
+        mask |= HIGH_SEVERITY
+    if (day_data.get("severity_weighted_count", 0.0) or 0.0) > incident_count:
+        mask |= SEVERITY_LOAD
+    if (day_data.get("after_hours_count", 0) or 0) > 0:
+        mask |= AFTER_HOURS
+    if (day_data.get("weekend_count", 0) or 0) > 0:
+        mask |= WEEKEND
+    return mask
+
+
+def day_health(day_data: Dict[str, Any], uses_precalculated: bool, team_health_by_date: Dict[str, float], day_key: str) -> Tuple[float, float]:
+    """
+    (health_score, team_health) on the 0-100 scale, as the daily-health endpoints report them.
+
+    uses_precalculated is True when any day of the member has a health_score from
+    the analyzer; otherwise days are scored from their incident load and team
+    health comes from daily_trends (0-10 scale).
+    """
+    if uses_precalculated and day_data.get("health_score") is not None:
+        return day_data.get("health_score", 88), day_data.get("team_health", 88)
+    health_score = round(incident_health_score(day_data) * 10) if day_data.get("has_data", False) else 0
+    return health_score, round(team_health_by_date.get(day_key, 8.5) * 10)
+
+
+class DailyHealthSeries:
+    """
+    One member's daily health as parallel arrays from `start` onwards.
+
+    Features:
+    - health and team_health are float64 arrays (NaN for days without data), so scores
+      come back exactly as computed
+    - factors holds one bitmask byte per day (HAS_DATA, INCIDENTS, ...)
+    - to_bytes()/from_bytes() round-trip through LargeBinary columns
+    """
+
+    def __init__(self, start: date, health: array, team_health: array, factors: array):
+        self.start = start
+        self.health = health
+        self.team_health = team_health
+        self.factors = factors
+
+    def __len__(self) -> int:
+        return len(self.health)
+
+    @classmethod
+    def from_daily_data(cls, user_daily_data: Dict[str, Dict[str, Any]], team_health_by_date: Optional[Dict[str, float]] = None) -> Optional["DailyHealthSeries"]:
+        """Score every day of a member's individual_daily_data; None if it has no dated days."""
+        days = {}
+        for day_key, day_data in (user_daily_data or {}).items():
+            day = parse_day(day_key)
+            if day is not None and isinstance(day_data, dict):
+                days[day] = (day_key, day_data)
+        if not days:
+            return None
+
+        uses_precalculated = any(day_data.get("health_score") is not None for _, day_data in days.values())
+        start, end = min(days), max(days)
+        length = (end - start).days + 1
+        health = array("d", [math.nan]) * length
+        team_health = array("d", [math.nan]) * length
+        factors = array("B", [0]) * length
+        for day, (day_key, day_data) in days.items():
+            i = (day - start).days
+            day_score, team_score = day_health(day_data, uses_precalculated, team_health_by_date or {}, day_key)
+            health[i] = math.nan if day_score is None else day_score
+            team_health[i] = math.nan if team_score is None else team_score
+            factors[i] = factor_mask(day_data)
+        return cls(start, health, team_health, factors)
+
+    def to_bytes(self) -> Dict[str, Any]:
+        """Column values for AnalysisMemberHealth (little-endian float64 / uint8)."""
+        return {
+            "start_date": self.start,
+            "health": _little_endian(self.health).tobytes(),
+            "team_health": _little_endian(self.team_health).tobytes(),
+            "factors": self.factors.tobytes(),
+        }
+
+    @classmethod
+    def from_bytes(cls, start_date: date, health: bytes, team_health: bytes, factors: bytes) -> "DailyHealthSeries":
+        return cls(start_date, _from_little_endian("d", health), _from_little_endian("d", team_health), _from_little_endian("B", factors))
+
+    def days(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[Tuple[date, Optional[float], Optional[float], int]]:
+        """(day, health, team_health, factors) for the days in [start, end], skipping days without a score."""
+        first = max(0, (start - self.start).days) if start else 0
+        last = min(len(self) - 1, (end - self.start).days) if end else len(self) - 1
+        for i in range(first, last + 1):
+            if math.isnan(self.health[i]):
+                continue
+            yield self.start + timedelta(days=i), _number(self.health[i]), _number(self.team_health[i]), self.factors[i]
+
+    def by_date(self) -> Dict[str, Tuple[Optional[float], Optional[float], int]]:
+        """{'YYYY-MM-DD': (health, team_health, factors)} for scored days."""
+        return {day.isoformat(): (health, team, mask) for day, health, team, mask in self.days()}
+
+
+def _number(value: float) -> Optional[float]:
+    """Stored value back as an int when whole."""
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == "little" or values.itemsize == 1:
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(bytes(data))
+    return _little_endian(values)
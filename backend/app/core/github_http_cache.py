@@ -0,0 +1,168 @@
+"""
+Conditional-request cache for GitHub REST GETs.
+
+Responses that carry an ETag or Last-Modified validator are kept per
+(token, URL, Accept) and revalidated with If-None-Match / If-Modified-Since.
+A 304 reuses the stored parsed body and GitHub does not charge it against the
+rate limit, so repeated profile, org-member and user-existence lookups across
+mapping runs become nearly free.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Mapping, Optional
+
+from .api_rate_limiter import integration_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """
+    Stand-in for an aiohttp response whose body was already read and parsed.
+
+    Callers use it exactly like the real response (status, headers, await json()).
+    The parsed body is shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, status: int, headers: Mapping[str, Any], data: Any, not_modified: bool = False):
+        self.status = status
+        self.headers = headers
+        self.data = data
+        self.not_modified = not_modified
+
+    async def json(self, **kwargs) -> Any:
+        return self.data
+
+    async def text(self, **kwargs) -> str:
+        return json.dumps(self.data)
+
+
+class GitHubHTTPCache:
+    """
+    Bounded LRU of validated GitHub responses.
+
+    Features:
+    - Keyed by token fingerprint, URL and Accept header (tokens can see different private data)
+    - Bounded by entry count (GITHUB_HTTP_CACHE_MAX_ENTRIES, default 5000)
+      and body size (GITHUB_HTTP_CACHE_MAX_MB, default 64); least recently used entries are evicted first
+    - Thread-safe, shared by every GitHub caller in the process; kept in memory only, so each
+      worker warms its own copy and a restart starts cold
+    """
+
+    MAX_ENTRIES = int(os.getenv("GITHUB_HTTP_CACHE_MAX_ENTRIES", "5000"))
+    MAX_BYTES = int(os.getenv("GITHUB_HTTP_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(token: Optional[str], url: str, accept: Optional[str] = None) -> str:
+        token_key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16] if token else "anonymous"
+        return f"{token_key}|{accept or ''}|{url}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, data: Any, size: int, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        if not (etag or last_modified) or size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous["size"]
+            self._entries[key] = {"etag": etag, "last_modified": last_modified, "data": data, "size": size}
+            self._bytes += size
+            self.metrics["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["size"]
+                self.metrics["evictions"] += 1
+
+    def record_lookup(self, hit: bool) -> None:
+        """Count a revalidation as a hit (304 served from cache) or a miss."""
+        with self._lock:
+            self.metrics["hits" if hit else "misses"] += 1
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.metrics["hits"] + self.metrics["misses"]
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": (self.metrics["hits"] / lookups * 100) if lookups else 0,
+                **self.metrics,
+            }
+
+
+# Global instance shared by the collectors, the matcher and the API manager
+github_http_cache = GitHubHTTPCache()
+
+
+@asynccontextmanager
+async def github_conditional_get(session, url: str, token: Optional[str], headers: Dict[str, str], bucket: str = "core", **kwargs):
+    """
+    GET a GitHub URL through the shared rate limiter, revalidating any cached copy.
+
+    Yields either the live aiohttp response or a CachedResponse with status 200
+    (served from cache on 304, or wrapping a freshly stored body).
+    """
+    key = github_http_cache.make_key(token, url, headers.get("Accept"))
+    entry = github_http_cache.get(key)
+    request_headers = {**headers, **github_http_cache.conditional_headers(entry)}
+
+    await integration_rate_limiter.acquire("github", token, bucket)
+    async with session.get(url, headers=request_headers, **kwargs) as resp:
+        integration_rate_limiter.record_response("github", token, bucket, resp.status, resp.headers)
+
+        if resp.status == 304 and entry is not None:
+            # Not modified: GitHub doesn't charge the request, so neither does the limiter
+            integration_rate_limiter.refund("github", token, bucket)
+            github_http_cache.record_lookup(hit=True)
+            yield CachedResponse(200, resp.headers, entry["data"], not_modified=True)
+            return
+
+        github_http_cache.record_lookup(hit=False)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if resp.status != 200 or not (etag or last_modified):
+            yield resp
+            return
+
+        raw = await resp.read()
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            yield resp  # aiohttp keeps the body, so the caller can still read it
+            return
+        github_http_cache.put(key, data, len(raw), etag=etag, last_modified=last_modified)
+        yield CachedResponse(200, resp.headers, data)
@@ -0,0 +1,46 @@
+"""
+Conditional GET support for responses that only change when their data does.
+
+A completed analysis is immutable except for explicit rewrites (which bump
+Analysis.results_version), so its responses carry a strong ETag built from
+(analysis id, results version). Clients revalidate with If-None-Match and get
+a 304 without the server loading or serializing the results.
+"""
+from typing import Dict, Optional
+
+# Browsers may keep a private copy but must revalidate it on every use
+PRIVATE_REVALIDATE = "private, no-cache"
+
+# Bump when the shape of cached responses changes so clients refetch after a deploy
+RESPONSE_FORMAT_VERSION = 2
+
+
+def analysis_etag(analysis_id: int, results_version: Optional[int], resource: str = "analysis") -> str:
+    """Strong ETag for one representation ("analysis", "daily-trends", ...) of an analysis."""
+    return f'"analysis-{analysis_id}-r{results_version or 1}-f{RESPONSE_FORMAT_VERSION}-{resource}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored and "*" matches anything."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def private_cache_headers(etag: str) -> Dict[str, str]:
+    """Headers letting only the requesting user's browser cache the response."""
+    return {
+        "ETag": etag,
+        "Cache-Control": PRIVATE_REVALIDATE,
+        # Credentials come from either the Authorization header or the auth cookie
+        "Vary": "Authorization, Cookie",
+    }
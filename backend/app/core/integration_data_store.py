@@ -0,0 +1,270 @@
+"""
+Persistent per-integration store for upstream incident, user and shift records.
+
+Analyses read from this store first and only ask Rootly/PagerDuty for records
+created or updated after the store's high-water mark, so upstream traffic grows
+with new data instead of with the number of analyses that are run.
+"""
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an upstream ISO-8601 timestamp into an aware UTC datetime."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except (ValueError, TypeError):
+        return None
+
+
+class IntegrationDataStore:
+    """
+    Postgres-backed store of raw upstream records for one integration.
+
+    Features:
+    - Records keyed by (token fingerprint, record type, upstream ID)
+    - Sync state per record type: coverage start and high-water mark
+    - Bulk upserts so reruns and overlapping windows never duplicate rows
+    - All failures are logged and reported as "no store" so callers fall back to upstream
+    - Methods are blocking; the async collectors run them with asyncio.to_thread
+    """
+
+    UPSERT_CHUNK_SIZE = 500
+    USER_REFRESH_MINUTES = int(os.getenv("INTEGRATION_STORE_USER_REFRESH_MINUTES", "60"))
+
+    def __init__(self, platform: str, api_token: str):
+        self.platform = platform
+        self.integration_key = hashlib.sha256(api_token.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """The store can be disabled for debugging with INTEGRATION_DATA_STORE_ENABLED=false."""
+        return os.getenv("INTEGRATION_DATA_STORE_ENABLED", "true").lower() == "true"
+
+    @classmethod
+    def for_client(cls, platform: str, api_token: str) -> Optional["IntegrationDataStore"]:
+        """Return a store for the given integration, or None when it is disabled."""
+        if not api_token or not cls.is_enabled():
+            return None
+        return cls(platform, api_token)
+
+    def _session(self):
+        from ..models import SessionLocal
+        return SessionLocal()
+
+    def get_sync_state(self, record_type: str) -> Optional[Dict[str, Any]]:
+        """Get the sync state for a record type, or None if it was never synced."""
+        from ..models import IntegrationSyncState
+        db = self._session()
+        try:
+            state = db.query(IntegrationSyncState).filter(
+                IntegrationSyncState.integration_key == self.integration_key,
+                IntegrationSyncState.record_type == record_type
+            ).first()
+            if not state:
+                return None
+            return {
+                "coverage_start": parse_timestamp(state.coverage_start),
+                "high_water_mark": parse_timestamp(state.high_water_mark),
+                "last_synced_at": parse_timestamp(state.last_synced_at),
+            }
+        except Exception as e:
+            logger.warning(f"📦 DATA STORE: Could not read {self.platform} {record_type} sync state: {e}")
+            return None
+        finally:
+            db.close()
+
+    def update_sync_state(
+        self,
+        record_type: str,
+        high_water_mark: datetime,
+        coverage_start: Optional[datetime] = None,
+        fetched_since: Optional[datetime] = None
+    ) -> None:
+        """
+        Advance the high-water mark and optionally extend coverage further back.
+
+        fetched_since is where the upstream fetch that ends at high_water_mark
+        started (defaults to coverage_start). The stored range only grows when the
+        new span touches it: a fetch starting after the current high-water mark, or
+        ending before the current coverage start, would otherwise leave a hole that
+        later windows are served from.
+        """
+        fetched_since = fetched_since or coverage_start
+        from ..models import IntegrationSyncState
+        db = self._session()
+        try:
+            state = db.query(IntegrationSyncState).filter(
+                IntegrationSyncState.integration_key == self.integration_key,
+                IntegrationSyncState.record_type == record_type
+            ).first()
+            if not state:
+                state = IntegrationSyncState(
+                    integration_key=self.integration_key,
+                    platform=self.platform,
+                    record_type=record_type
+                )
+                db.add(state)
+
+            current_hwm = parse_timestamp(state.high_water_mark)
+            current_coverage = parse_timestamp(state.coverage_start)
+            if current_hwm is not None and fetched_since is not None and fetched_since > current_hwm:
+                logger.warning(
+                    f"📦 DATA STORE: Not advancing {self.platform} {record_type} sync state, "
+                    f"fetch from {fetched_since} leaves a gap after {current_hwm}"
+                )
+                db.rollback()
+                return
+            # Never move the high-water mark backwards (e.g. after a historical-window fetch)
+            if current_hwm is None or high_water_mark > current_hwm:
+                state.high_water_mark = high_water_mark
+            extends_coverage = coverage_start and (current_coverage is None or coverage_start < current_coverage)
+            if extends_coverage and (current_coverage is None or high_water_mark >= current_coverage):
+                state.coverage_start = coverage_start
+            state.last_synced_at = datetime.now(timezone.utc)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"📦 DATA STORE: Could not update {self.platform} {record_type} sync state: {e}")
+        finally:
+            db.close()
+
+    def upsert_records(self, record_type: str, records: List[Dict[str, Any]]) -> bool:
+        """
+        Insert or update records in bulk.
+
+        Each record is a dict with record_id, occurred_at, source_updated_at and payload.
+        Returns False if the write failed so callers don't advance their sync state.
+        """
+        if not records:
+            return True
+
+        from sqlalchemy.dialects.postgresql import insert
+        from sqlalchemy.sql import func
+        from ..models import IntegrationRecord
+
+        # Last write wins for duplicate IDs inside one batch (ON CONFLICT can't touch a row twice)
+        unique_rows = {}
+        for record in records:
+            if not record.get("record_id"):
+                continue
+            unique_rows[str(record["record_id"])] = {
+                "integration_key": self.integration_key,
+                "platform": self.platform,
+                "record_type": record_type,
+                "record_id": str(record["record_id"]),
+                "occurred_at": parse_timestamp(record.get("occurred_at")),
+                "source_updated_at": parse_timestamp(record.get("source_updated_at")),
+                "payload": record["payload"],
+            }
+        rows = list(unique_rows.values())
+
+        db = self._session()
+        try:
+            for i in range(0, len(rows), self.UPSERT_CHUNK_SIZE):
+                stmt = insert(IntegrationRecord).values(rows[i:i + self.UPSERT_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_integration_record",
+                    set_={
+                        "occurred_at": stmt.excluded.occurred_at,
+                        "source_updated_at": stmt.excluded.source_updated_at,
+                        "payload": stmt.excluded.payload,
+                        "synced_at": func.now(),
+                    }
+                )
+                db.execute(stmt)
+            db.commit()
+            logger.info(f"📦 DATA STORE: Upserted {len(rows)} {self.platform} {record_type} records")
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"📦 DATA STORE: Failed to upsert {self.platform} {record_type} records: {e}")
+            return False
+        finally:
+            db.close()
+
+    def replace_records(self, record_type: str, records: List[Dict[str, Any]]) -> bool:
+        """Upsert a complete snapshot and delete stored records that are no longer upstream."""
+        if not self.upsert_records(record_type, records):
+            return False
+
+        from ..models import IntegrationRecord
+        keep_ids = {str(r["record_id"]) for r in records if r.get("record_id")}
+        db = self._session()
+        try:
+            stale_query = db.query(IntegrationRecord).filter(
+                IntegrationRecord.integration_key == self.integration_key,
+                IntegrationRecord.record_type == record_type
+            )
+            if keep_ids:
+                stale_query = stale_query.filter(~IntegrationRecord.record_id.in_(keep_ids))
+            removed = stale_query.delete(synchronize_session=False)
+            db.commit()
+            if removed:
+                logger.info(f"📦 DATA STORE: Removed {removed} stale {self.platform} {record_type} records")
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"📦 DATA STORE: Failed to prune {self.platform} {record_type} records: {e}")
+            return False
+        finally:
+            db.close()
+
+    def load_records(
+        self,
+        record_type: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load stored payloads, newest first, optionally bounded by occurred_at.
+
+        Returns None (not an empty list) if the store could not be read.
+        """
+        from ..models import IntegrationRecord
+        db = self._session()
+        try:
+            query = db.query(IntegrationRecord.payload).filter(
+                IntegrationRecord.integration_key == self.integration_key,
+                IntegrationRecord.record_type == record_type
+            )
+            if since is not None:
+                query = query.filter(IntegrationRecord.occurred_at >= since)
+            if until is not None:
+                query = query.filter(IntegrationRecord.occurred_at <= until)
+            query = query.order_by(IntegrationRecord.occurred_at.desc())
+            if limit:
+                query = query.limit(limit)
+            return [row[0] for row in query.all()]
+        except Exception as e:
+            logger.warning(f"📦 DATA STORE: Failed to load {self.platform} {record_type} records: {e}")
+            return None
+        finally:
+            db.close()
+
+    def covers(self, state: Optional[Dict[str, Any]], window_start: datetime) -> bool:
+        """True if the store already holds every record back to window_start."""
+        return bool(
+            state
+            and state.get("high_water_mark")
+            and state.get("coverage_start")
+            and state["coverage_start"] <= window_start
+        )
+
+    def users_are_fresh(self, state: Optional[Dict[str, Any]]) -> bool:
+        """Users have no cheap upstream delta, so a full snapshot is reused for a short TTL."""
+        if not state or not state.get("high_water_mark"):
+            return False
+        age = datetime.now(timezone.utc) - state["high_water_mark"]
+        return age < timedelta(minutes=self.USER_REFRESH_MINUTES)
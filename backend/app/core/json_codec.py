@@ -0,0 +1,85 @@
+"""
+Fast JSON encoding/decoding shared by the database engine and API responses.
+
+Analysis results run to several MB and are serialized on every write and read.
+orjson (installed with fastapi[all]) is used when available, otherwise the
+stdlib json module, with the same handling of the types the analyzer emits.
+"""
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+    HAS_ORJSON = False
+
+# Non-string dict keys (ints, dates) are stringified like stdlib json does; NumPy is serialized natively
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if HAS_ORJSON else 0
+
+
+def _default(obj: Any) -> Any:
+    """Convert types neither encoder handles on its own."""
+    if isinstance(obj, (set, frozenset)):
+        # e.g. daily users_involved; sorted so the same set always encodes the same way
+        try:
+            return sorted(obj)
+        except TypeError:
+            return list(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    # NumPy scalars and arrays, without importing numpy
+    if type(obj).__module__ == "numpy":
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Encode to compact UTF-8 JSON."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Encode to a JSON string (SQLAlchemy json_serializer)."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Decode JSON text or bytes (SQLAlchemy json_deserializer)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps_with_raw(obj: Dict[str, Any], raw_fields: Dict[str, Optional[Union[str, bytes]]]) -> bytes:
+    """
+    Encode a dict plus fields whose values are already JSON text.
+
+    Lets an endpoint return stored results as they are, wrapping them in a small
+    envelope without decoding, validating and re-encoding them. None encodes as null.
+    """
+    parts = []
+    for key, value in raw_fields.items():
+        if value is None:
+            value = b"null"
+        elif isinstance(value, str):
+            value = value.encode("utf-8")
+        parts.append(dumps_bytes(key) + b":" + value)
+    body = dumps_bytes(obj)
+    if body != b"{}":
+        parts.append(body[1:-1])
+    return b"{" + b",".join(parts) + b"}"
@@ -0,0 +1,114 @@
+"""
+Blocking index for person-name matching.
+
+Matching every responder against every org member with an expensive similarity
+function is O(responders x members). NameIndex keeps token and trigram posting
+lists so each query only scores the few entries that share enough of the name.
+"""
+import heapq
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Lowercase a person's name and collapse punctuation/whitespace for index lookups."""
+    return re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).strip()
+
+
+def name_trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded like pg_trgm so short words and word edges still match."""
+    grams = set()
+    for word in normalize_name(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """
+    Top-k candidate lookup over a set of names.
+
+    Features:
+    - Exact lookup by normalized name, with first/last-name permutations ("cheng spencer")
+    - Token and initial+last-name ("s cheng") blocking keys
+    - Trigram posting lists for typos, nicknames and usernames ("spencerhcheng")
+    - Entries carry an arbitrary hashable key, several names may map to one key
+    """
+
+    # Trigrams shared by more than this share of entries are too common to block on
+    MAX_POSTING_SHARE = 0.5
+
+    def __init__(self, entries: Optional[Iterable[Tuple[Hashable, str]]] = None):
+        self._exact: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._tokens: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._trigrams: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._names: Dict[Hashable, Set[str]] = defaultdict(set)
+        for key, name in entries or []:
+            self.add(key, name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, key: Hashable, name: str) -> None:
+        normalized = normalize_name(name)
+        if not normalized:
+            return
+        self._names[key].add(name)
+        words = normalized.split()
+        self._exact[normalized].add(key)
+        if len(words) >= 2:
+            self._exact[" ".join([words[-1]] + words[:-1])].add(key)
+            self._tokens[f"{words[0][0]} {words[-1]}"].add(key)
+        for word in words:
+            self._tokens[word].add(key)
+        for gram in name_trigrams(normalized):
+            self._trigrams[gram].add(key)
+
+    def names_for(self, key: Hashable) -> Set[str]:
+        """Names indexed for a key, as they were added."""
+        return self._names.get(key, set())
+
+    def exact(self, name: str) -> Set[Hashable]:
+        """Keys whose name matches exactly (ignoring case, punctuation and first/last order)."""
+        return set(self._exact.get(normalize_name(name), ()))
+
+    def candidates(self, name: str, k: int = 20) -> List[Hashable]:
+        """Up to k keys most likely to match, ranked by shared tokens then shared trigrams."""
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+        words = normalized.split()
+        scores: Dict[Hashable, float] = defaultdict(float)
+
+        for key in self._exact.get(normalized, ()):
+            scores[key] += 100
+        block_keys = list(words)
+        if len(words) >= 2:
+            block_keys.append(f"{words[0][0]} {words[-1]}")
+        for token in block_keys:
+            for key in self._tokens.get(token, ()):
+                scores[key] += 10
+
+        max_posting = max(1, int(len(self._names) * self.MAX_POSTING_SHARE))
+        for gram in name_trigrams(normalized):
+            posting = self._trigrams.get(gram)
+            if posting and len(posting) <= max_posting:
+                for key in posting:
+                    scores[key] += 1
+
+        return [key for key, _ in heapq.nlargest(k, scores.items(), key=lambda item: item[1])]
+
+    def best_matches(self, name: str, scorer: Callable[[str, str], float], k: int = 20, threshold: float = 0.0) -> List[Tuple[Hashable, float, str]]:
+        """
+        Score only the top-k candidates with an expensive scorer(query, candidate_name).
+
+        Returns (key, score, matched_name) sorted by score, best name per key, above threshold.
+        """
+        results = []
+        for key in self.candidates(name, k):
+            best_score, best_name = max((scorer(name, candidate), candidate) for candidate in self._names[key])
+            if best_score > threshold:
+                results.append((key, best_score, best_name))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
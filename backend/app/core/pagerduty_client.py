@@ -9,6 +9,9 @@ from typing import Any, Dict, List, Optional
 import aiohttp
 import pytz
 
+from .api_rate_limiter import integration_rate_limiter
+from .integration_data_store import IntegrationDataStore, parse_timestamp
+
 logger = logging.getLogger(__name__)
 
 class PagerDutyAPIClient:
@@ -22,6 +25,8 @@ class PagerDutyAPIClient:
             "Accept": "application/vnd.pagerduty+json;version=2",
             "Content-Type": "application/json"
         }
+        # Lets the data store only advance its high-water mark after a full fetch
+        self.last_incident_fetch_complete = False
         
         # 🎯 RAILWAY DEBUG: Token identification for debugging
         token_suffix = api_token[-4:] if len(api_token) > 4 else "***"
@@ -30,6 +35,77 @@ class PagerDutyAPIClient:
         import time
         logger.info(f"🎯 PAGERDUTY CLIENT: On-call methods deployed - Build {int(time.time())}")
         
+    @staticmethod
+    def _project_reference(ref: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Keep only the identifying fields of a PagerDuty reference object."""
+        if not ref or not isinstance(ref, dict):
+            return None
+        return {key: ref[key] for key in ("id", "type", "summary", "name") if ref.get(key) is not None}
+
+    @classmethod
+    def project_incident(cls, incident: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Project a raw PagerDuty incident down to the fields the analyzer uses.
+        
+        Participants (assignees, acknowledgers, responders, status changer and
+        escalation targets), timestamps, severity inputs, title and status are kept;
+        everything else from the API response and include[] expansions is dropped.
+        """
+        escalation_policy = incident.get("escalation_policy") or {}
+        escalation_target_ids = []
+        for rule in escalation_policy.get("escalation_rules", []) or []:
+            for target in rule.get("targets", []) or []:
+                if target.get("type") in ("user", "user_reference") and target.get("id"):
+                    escalation_target_ids.append(target["id"])
+        
+        acknowledgements = incident.get("acknowledgements") or incident.get("acknowledgments") or []
+        return {
+            "id": incident.get("id"),
+            "incident_number": incident.get("incident_number"),
+            "title": incident.get("title", ""),
+            "status": incident.get("status"),
+            "urgency": incident.get("urgency"),
+            "created_at": incident.get("created_at"),
+            "updated_at": incident.get("updated_at"),
+            "last_status_change_at": incident.get("last_status_change_at"),
+            "resolved_at": incident.get("resolved_at"),
+            "priority": cls._project_reference(incident.get("priority")),
+            "service": cls._project_reference(incident.get("service")) or {},
+            "escalation_policy": {
+                "summary": escalation_policy.get("summary", ""),
+                "target_user_ids": escalation_target_ids
+            },
+            "teams": [cls._project_reference(team) for team in incident.get("teams", []) or [] if team],
+            "assignments": [
+                {"assignee": cls._project_reference(a.get("assignee"))}
+                for a in incident.get("assignments", []) or [] if a.get("assignee")
+            ],
+            "acknowledgements": [
+                {"acknowledger": cls._project_reference(a.get("acknowledger"))}
+                for a in acknowledgements if a.get("acknowledger")
+            ],
+            "incidents_responders": [
+                {"user": cls._project_reference(r.get("user"))}
+                for r in incident.get("incidents_responders", []) or [] if r.get("user")
+            ],
+            "last_status_change_by": cls._project_reference(incident.get("last_status_change_by")),
+        }
+
+    @classmethod
+    def project_user(cls, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Project a raw PagerDuty user down to the fields used for normalization."""
+        return {
+            "id": user.get("id"),
+            "name": user.get("name"),
+            "summary": user.get("summary"),
+            "email": user.get("email", ""),
+            "time_zone": user.get("time_zone"),
+            "role": user.get("role"),
+            "job_title": user.get("job_title"),
+            "teams": [cls._project_reference(team) for team in user.get("teams", []) or [] if team],
+            "contact_methods": [{"id": cm.get("id")} for cm in user.get("contact_methods", []) or []],
+        }
+
     async def test_connection(self) -> Dict[str, Any]:
         """Test the PagerDuty API connection and get account info."""
         try:
@@ -148,15 +224,16 @@ class PagerDutyAPIClient:
                     request_count += 1
                     logger.info(f"🔍 PD GET_USERS: API Request #{request_count}, offset={offset}")
                     
+                    await integration_rate_limiter.acquire("pagerduty", self.api_token, "core")
                     async with session.get(
                         f"{self.base_url}/users",
                         headers=self.headers,
                         params={
                             "limit": min(limit, 100),
-                            "offset": offset,
-                            "include[]": ["contact_methods", "teams"]
+                            "offset": offset
                         }
                     ) as response:
+                        integration_rate_limiter.record_response("pagerduty", self.api_token, "core", response.status, response.headers)
                         if response.status != 200:
                             error_text = await response.text()
                             logger.error(f"🔍 PD GET_USERS: API ERROR - HTTP {response.status}: {error_text}")
@@ -164,7 +241,8 @@ class PagerDutyAPIClient:
                             
                         data = await response.json()
                         users = data.get("users", [])
-                        all_users.extend(users)
+                        # Team and contact method references already carry what normalization needs
+                        all_users.extend(self.project_user(user) for user in users)
                         
                         logger.info(f"🔍 PD GET_USERS: Fetched {len(users)} users in batch, total: {len(all_users)}")
                         
@@ -213,6 +291,7 @@ class PagerDutyAPIClient:
         logger.info(f"🔍 PD GET_INCIDENTS: Starting incident fetch")
         logger.info(f"🔍 PD GET_INCIDENTS: Date range: {since.isoformat()} to {until.isoformat() if until else 'now'}")
         logger.info(f"🔍 PD GET_INCIDENTS: Requested limit: {limit}")
+        self.last_incident_fetch_complete = False
         
         try:
             if until is None:
@@ -235,6 +314,7 @@ class PagerDutyAPIClient:
                     
                     # Add timeout to prevent hanging
                     timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout per request
+                    await integration_rate_limiter.acquire("pagerduty", self.api_token, "core")
                     async with session.get(
                         f"{self.base_url}/incidents",
                         headers=self.headers,
@@ -244,11 +324,14 @@ class PagerDutyAPIClient:
                             "until": until_str,
                             "limit": min(100, limit - len(all_incidents)),
                             "offset": offset,
-                            "include[]": ["users", "services", "teams", "escalation_policies", "priorities"],
+                            # Service, team, priority and user references already carry their summaries;
+                            # escalation policies are expanded only for their user targets
+                            "include[]": ["escalation_policies"],
                             "statuses[]": ["triggered", "acknowledged", "resolved"]
                         }
                     ) as response:
                         request_count += 1
+                        integration_rate_limiter.record_response("pagerduty", self.api_token, "core", response.status, response.headers)
                         
                         if response.status != 200:
                             error_text = await response.text()
@@ -306,13 +389,14 @@ class PagerDutyAPIClient:
                                         acknowledger = ack.get("acknowledger", {})
                                         logger.info(f"     - Ack #{j+1}: {acknowledger.get('summary', 'Unknown')} ({acknowledger.get('id')})")
                         
-                        all_incidents.extend(incidents)
+                        all_incidents.extend(self.project_incident(incident) for incident in incidents)
                         
                         logger.info(f"🔍 PD GET_INCIDENTS: Fetched {len(incidents)} incidents in batch #{request_count}, total: {len(all_incidents)}")
                         
                         # Check if we have more pages
                         if not data.get("more", False) or len(incidents) == 0:
                             logger.info(f"🔍 PD GET_INCIDENTS: No more incidents to fetch (more={data.get('more')}, batch_size={len(incidents)})")
+                            self.last_incident_fetch_complete = True
                             break
                             
                         offset += len(incidents)
@@ -344,7 +428,7 @@ class PagerDutyAPIClient:
                                     unique_assigned_user_ids.add(assignee["id"])
                         
                         # Check acknowledgments  
-                        acknowledgments = incident.get("acknowledgments", [])
+                        acknowledgments = incident.get("acknowledgements", [])
                         if acknowledgments:
                             incidents_with_acknowledgments += 1
                             for ack in acknowledgments:
@@ -636,8 +720,104 @@ class PagerDutyAPIClient:
 class PagerDutyDataCollector:
     """Collects and processes data from PagerDuty for burnout analysis."""
     
+    # PagerDuty only filters incidents by created_at, so recently created incidents are
+    # re-read on every sync to pick up status changes (acknowledged/resolved)
+    INCIDENT_REFRESH_DAYS = 3
+    
     def __init__(self, api_token: str):
         self.client = PagerDutyAPIClient(api_token)
+        self.store = None
+        self.last_store_sync: Dict[str, Any] = {}
+        try:
+            self.store = IntegrationDataStore.for_client("pagerduty", api_token)
+        except Exception as e:
+            logger.warning(f"📦 DATA STORE: Unavailable, falling back to upstream API: {e}")
+    
+    async def _get_users_with_store(self, limit: int) -> List[Dict[str, Any]]:
+        """Get users from the data store while the last snapshot is fresh, else from PagerDuty."""
+        if self.store is None:
+            return await self.client.get_users(limit=limit)
+        
+        state = await asyncio.to_thread(self.store.get_sync_state, "user")
+        if self.store.users_are_fresh(state):
+            stored = await asyncio.to_thread(self.store.load_records, "user", limit=limit)
+            if stored:
+                logger.info(f"📦 DATA STORE: Serving {len(stored)} PagerDuty users from store")
+                self.last_store_sync["users"] = {"source": "store", "served": len(stored)}
+                return stored
+        
+        sync_started = datetime.now(pytz.UTC)
+        users = await self.client.get_users(limit=limit)
+        # get_users returns [] on errors, so only a non-empty, untruncated list replaces the snapshot
+        if users and len(users) < limit:
+            records = [{"record_id": user.get("id"), "payload": user} for user in users]
+            if await asyncio.to_thread(self.store.replace_records, "user", records):
+                await asyncio.to_thread(self.store.update_sync_state, "user", high_water_mark=sync_started)
+        self.last_store_sync["users"] = {"source": "upstream", "served": len(users)}
+        return users
+    
+    async def _get_incidents_with_store(self, since: datetime, until: datetime) -> List[Dict[str, Any]]:
+        """
+        Get incidents for the analysis window, reading the data store first.
+        
+        Only incidents created after the high-water mark (minus a refresh overlap, and
+        back to the oldest stored incident that was still open) are requested, plus a
+        backfill when the window reaches further back than the store.
+        """
+        if self.store is None:
+            return await self.client.get_incidents(since=since, until=until)
+        
+        state = await asyncio.to_thread(self.store.get_sync_state, "incident")
+        fetched = []
+        mode = "full"
+        fetch_since = since
+        
+        if state and state.get("high_water_mark") and state.get("coverage_start"):
+            mode = "delta"
+            fetch_since = state["high_water_mark"] - timedelta(days=self.INCIDENT_REFRESH_DAYS)
+            stored_window = await asyncio.to_thread(self.store.load_records, "incident", since=max(since, state["coverage_start"])) or []
+            open_created = [
+                parse_timestamp(incident.get("created_at"))
+                for incident in stored_window
+                if incident.get("status") != "resolved"
+            ]
+            open_created = [created for created in open_created if created]
+            if open_created:
+                fetch_since = min(fetch_since, min(open_created))
+            # Not clamped to the window: starting after the high-water mark would leave a hole
+            
+            fetched.extend(await self.client.get_incidents(since=fetch_since, until=until))
+            complete = self.client.last_incident_fetch_complete
+            
+            if state["coverage_start"] > since:
+                mode = "delta+backfill"
+                fetched.extend(await self.client.get_incidents(since=since, until=state["coverage_start"]))
+                complete = complete and self.client.last_incident_fetch_complete
+        else:
+            fetched = await self.client.get_incidents(since=since, until=until)
+            complete = self.client.last_incident_fetch_complete
+        
+        records = [{
+            "record_id": incident.get("id"),
+            "occurred_at": incident.get("created_at"),
+            "source_updated_at": incident.get("updated_at"),
+            "payload": incident
+        } for incident in fetched if isinstance(incident, dict)]
+        if await asyncio.to_thread(self.store.upsert_records, "incident", records) and complete:
+            await asyncio.to_thread(
+                self.store.update_sync_state, "incident",
+                high_water_mark=until,
+                coverage_start=since,
+                fetched_since=fetch_since
+            )
+        
+        incidents = await asyncio.to_thread(self.store.load_records, "incident", since=since, until=until, limit=1000)
+        if incidents is None:
+            incidents = fetched
+        
+        logger.info(f"📦 DATA STORE: {mode} sync fetched {len(fetched)} PagerDuty incidents, serving {len(incidents)}")
+        self.last_store_sync["incidents"] = {"mode": mode, "fetched_upstream": len(fetched), "served": len(incidents)}
+        return incidents
         
     async def collect_all_data(self, days_back: int = 30) -> Dict[str, Any]:
         """Collect all necessary data for burnout analysis."""
@@ -652,8 +832,8 @@ class PagerDutyDataCollector:
         logger.info(f"🎯 PAGERDUTY COLLECTION: Date range {since.isoformat()} to {until.isoformat()}")
         
         # Fetch data in parallel (no limits for complete data collection)
-        users_task = self.client.get_users(limit=1000)
-        incidents_task = self.client.get_incidents(since=since, until=until)
+        users_task = self._get_users_with_store(limit=1000)
+        incidents_task = self._get_incidents_with_store(since=since, until=until)
         
         logger.info(f"🎯 PAGERDUTY COLLECTION: Starting parallel API calls...")
         users, incidents = await asyncio.gather(users_task, incidents_task)
@@ -704,7 +884,8 @@ class PagerDutyDataCollector:
             "assignment_stats": metadata.get("assignment_stats", {}),
             "total_incidents": len(incidents),
             "total_users": len(users),
-            "incidents_with_valid_emails": incidents_with_emails
+            "incidents_with_valid_emails": incidents_with_emails,
+            "data_store": self.last_store_sync
         }
         
         logger.info(f"🎯 PAGERDUTY COLLECTION: COMPLETE - Returning enhanced data")
@@ -805,14 +986,14 @@ class PagerDutyDataCollector:
                 "updated_at": incident.get("last_status_change_at") or incident.get("updated_at"),
                 "resolved_at": incident.get("resolved_at") if incident.get("status") == "resolved" else None,
                 "assigned_to": assigned_user_info,
-                "service": incident.get("service", {}).get("summary", ""),
-                "urgency": incident.get("urgency", "low"),
+                "participant_ids": self._extract_participant_ids(incident),
+                "service": (incident.get("service") or {}).get("summary", ""),
+                "urgency": incident.get("urgency") or "low",
                 "source": "pagerduty",
-                "raw_data": incident,  # Keep for debugging
                 # Enhanced fields
                 "incident_number": incident.get("incident_number"),
-                "escalation_policy": incident.get("escalation_policy", {}).get("summary", ""),
-                "teams": [team.get("summary", "") for team in incident.get("teams", [])],
+                "escalation_policy": (incident.get("escalation_policy") or {}).get("summary", ""),
+                "teams": [team.get("summary", "") for team in incident.get("teams", []) if team],
                 "priority_name": incident.get("priority", {}).get("summary", "") if incident.get("priority") else ""
             }
             
@@ -931,9 +1112,33 @@ class PagerDutyDataCollector:
         
         return None  # No assignment found
     
+    def _extract_participant_ids(self, incident: Dict[str, Any]) -> List[str]:
+        """
+        All user IDs involved in an incident, used when no single assignee is found.
+        
+        Mirrors the analyzer's fallback order: every assignee, every acknowledger,
+        then escalation policy user targets.
+        """
+        participant_ids = []
+        for assignment in incident.get("assignments", []) or []:
+            assignee = assignment.get("assignee") or {}
+            if assignee.get("id"):
+                participant_ids.append(str(assignee["id"]))
+        
+        acknowledgements = incident.get("acknowledgements") or incident.get("acknowledgments") or []
+        for ack in acknowledgements:
+            acknowledger = ack.get("acknowledger") or {}
+            if acknowledger.get("id"):
+                participant_ids.append(str(acknowledger["id"]))
+        
+        escalation_policy = incident.get("escalation_policy") or {}
+        participant_ids.extend(str(uid) for uid in escalation_policy.get("target_user_ids", []) or [])
+        
+        return list(dict.fromkeys(participant_ids))
+    
     def _map_priority_to_severity(self, incident: Dict[str, Any]) -> str:
         """Map PagerDuty priority/urgency to severity level."""
-        urgency = incident.get("urgency", "low").lower()
+        urgency = (incident.get("urgency") or "low").lower()
 
         # Check priority first for more specific classification
         priority = incident.get("priority")
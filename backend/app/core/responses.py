@@ -0,0 +1,15 @@
+"""
+Response classes for the API.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from .json_codec import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the shared fast codec (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
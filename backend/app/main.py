@@ -9,6 +9,7 @@ from slowapi.errors import RateLimitExceeded
 from .models import create_tables
 from .core.config import settings
 from .core.rate_limiting import limiter, custom_rate_limit_exceeded_handler
+from .core.responses import FastJSONResponse
 from .middleware.security import security_middleware
 from .api.endpoints import auth, rootly, analysis, analyses, pagerduty, github, slack, llm, mappings, manual_mappings, debug_mappings, migrate, admin, notifications, invitations, surveys
 
@@ -37,6 +38,7 @@ app = FastAPI(
     title="Rootly Burnout Detector API",
     description="API for detecting burnout risk in engineering teams using Rootly incident data",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
     swagger_ui_parameters={
         "defaultModelsExpandDepth": 1,  # Don't expand schemas deeply
         "syntaxHighlight.theme": "monokai",
@@ -112,8 +114,10 @@ app.add_middleware(
         "Authorization",
         "X-Requested-With",
         "Cache-Control",
-        "Pragma"
+        "Pragma",
+        "If-None-Match"
     ],  # Specific headers only
+    expose_headers=["ETag"],
 )
 
 @app.get("/")
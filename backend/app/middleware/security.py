@@ -163,6 +163,12 @@ async def security_middleware(request: Request, call_next: Callable) -> Response
                           request_path.startswith("/docs/") or
                           request_path == "/redoc")
 
+        # Endpoints may opt in to per-user caching by sending a private Cache-Control with an ETag
+        is_private_cacheable = (
+            "etag" in response.headers and
+            response.headers.get("cache-control", "").startswith("private")
+        )
+
         for header, value in SECURITY_HEADERS.items():
             # Skip restrictive CSP for Swagger UI - set relaxed one instead
             if header == "Content-Security-Policy" and is_swagger_route:
@@ -180,7 +186,12 @@ async def security_middleware(request: Request, call_next: Callable) -> Response
 
             # Don't override caching for cacheable routes
             if header in ["Cache-Control", "Pragma", "Expires"]:
-                if any(route in request_path for route in CACHEABLE_ROUTES):
+                if any(request_path == route or (route != "/" and request_path.startswith(route + "/"))
+                       for route in CACHEABLE_ROUTES):
+                    continue
+
+                # Keep an endpoint's own private policy (ETag-validated completed analyses)
+                if is_private_cacheable:
                     continue
 
                 # Force no-cache for sensitive routes
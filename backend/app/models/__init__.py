@@ -16,10 +16,17 @@ from .integration_mapping import IntegrationMapping
 from .user_mapping import UserMapping
 from .user_burnout_report import UserBurnoutReport
 from .slack_workspace_mapping import SlackWorkspaceMapping
+from .integration_record import IntegrationRecord, IntegrationSyncState
+from .slack_history import SlackChannelCursor, SlackMessageMetadata
+from .github_daily_commits import GitHubDailyCommits
+from .github_member_profile import GitHubMemberProfile
+from .analysis_results import AnalysisSummary, AnalysisMember, AnalysisMemberDaily, AnalysisTeamDaily, AnalysisMemberHealth
 
 __all__ = [
     "Base", "get_db", "create_tables", "SessionLocal", "Organization", "OrganizationInvitation", "UserNotification", "User", "Analysis",
     "RootlyIntegration", "OAuthProvider", "UserEmail", "GitHubIntegration",
     "SlackIntegration", "UserCorrelation", "IntegrationMapping", "UserMapping",
-    "UserBurnoutReport", "SlackWorkspaceMapping"
+    "UserBurnoutReport", "SlackWorkspaceMapping", "IntegrationRecord", "IntegrationSyncState",
+    "SlackChannelCursor", "SlackMessageMetadata", "GitHubDailyCommits", "GitHubMemberProfile",
+    "AnalysisSummary", "AnalysisMember", "AnalysisMemberDaily", "AnalysisTeamDaily", "AnalysisMemberHealth"
 ]
\ No newline at end of file
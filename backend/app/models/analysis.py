@@ -2,7 +2,7 @@
 Analysis model for storing burnout analysis results.
 """
 import uuid
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -24,6 +24,7 @@ class Analysis(Base):
     status = Column(String(50), default="pending")  # pending, running, completed, failed
     config = Column(JSON, nullable=True)  # Analysis configuration (additional settings)
     results = Column(JSON, nullable=True)  # Analysis results (team scores, member details)
+    results_version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped whenever results are rewritten (ETags)
     error_message = Column(Text, nullable=True)  # Error details if failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -34,5 +35,12 @@ class Analysis(Base):
     rootly_integration = relationship("RootlyIntegration", back_populates="analyses")
     integration_mappings = relationship("IntegrationMapping", back_populates="analysis")
     
+    __table_args__ = (
+        # Keyset pagination of a user's analyses (created_at desc, id desc)
+        Index('ix_analyses_user_created', 'user_id', 'created_at', 'id'),
+        # "Most recent completed analysis" lookups per organization
+        Index('ix_analyses_org_status_created', 'organization_id', 'status', 'created_at'),
+    )
+    
     def __repr__(self):
         return f"<Analysis(id={self.id}, user_id={self.user_id}, status='{self.status}')>"
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Normalized copies of a completed analysis' results.
+
+Analysis.results stays the full document; these tables split out the parts
+that endpoints read on their own (summary, members, per-member and team daily
+series) so a request deserializes only the slice it returns.
+"""
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, UniqueConstraint, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class AnalysisSummary(Base):
+    __tablename__ = "analysis_summaries"
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    # Everything in results except team_analysis.members, daily_trends and individual_daily_data
+    summary = Column(JSONB, nullable=False)
+    member_count = Column(Integer, nullable=False, default=0)
+    stored_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<AnalysisSummary(analysis_id={self.analysis_id}, members={self.member_count})>"
+
+
+class AnalysisMember(Base):
+    __tablename__ = "analysis_members"
+
+    id = Column(Integer, primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # Order within team_analysis.members
+    member_email = Column(String(255), nullable=True)  # Lowercased user_email
+    user_name = Column(String(255), nullable=True)
+    risk_level = Column(String(20), nullable=True)
+    burnout_score = Column(Float, nullable=True)
+    incident_count = Column(Integer, nullable=True)
+    data = Column(JSONB, nullable=False)  # The member entry as produced by the analyzer
+
+    __table_args__ = (
+        UniqueConstraint('analysis_id', 'position', name='uq_analysis_member_position'),
+        Index('ix_analysis_members_email', 'analysis_id', 'member_email'),
+    )
+
+    def __repr__(self):
+        return f"<AnalysisMember(analysis_id={self.analysis_id}, email='{self.member_email}')>"
+
+
+class AnalysisMemberDaily(Base):
+    __tablename__ = "analysis_member_daily"
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    member_email = Column(String(255), primary_key=True)  # Lowercased key of individual_daily_data
+    date = Column(Date, primary_key=True)
+    data = Column(JSONB, nullable=False)  # individual_daily_data[email][date]
+
+    def __repr__(self):
+        return f"<AnalysisMemberDaily(analysis_id={self.analysis_id}, email='{self.member_email}', date={self.date})>"
+
+
+class AnalysisTeamDaily(Base):
+    __tablename__ = "analysis_team_daily"
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    data = Column(JSONB, nullable=False)  # The daily_trends entry for this date
+
+    def __repr__(self):
+        return f"<AnalysisTeamDaily(analysis_id={self.analysis_id}, date={self.date})>"
+
+
+class AnalysisMemberHealth(Base):
+    __tablename__ = "analysis_member_health"
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    member_email = Column(String(255), primary_key=True)  # Lowercased key of individual_daily_data
+    start_date = Column(Date, nullable=False)  # Day of index 0
+    health = Column(LargeBinary, nullable=False)  # float64 per day, little-endian (core.daily_health)
+    team_health = Column(LargeBinary, nullable=False)  # same width as health
+    factors = Column(LargeBinary, nullable=False)  # uint8 factor bitmask per day
+
+    def __repr__(self):
+        return f"<AnalysisMemberHealth(analysis_id={self.analysis_id}, email='{self.member_email}', start={self.start_date})>"
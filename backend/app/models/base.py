@@ -6,6 +6,8 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
+from ..core.json_codec import dumps as json_dumps, loads as json_loads
+
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -22,7 +24,9 @@ engine = create_engine(
     pool_pre_ping=True,     # Test connections before use
     pool_recycle=300,       # Recycle connections every 5 minutes
     pool_timeout=60,        # Wait up to 60 seconds for connection
-    echo_pool=False         # Set to True for debugging pool issues
+    echo_pool=False,        # Set to True for debugging pool issues
+    json_serializer=json_dumps,      # Fast codec for JSON/JSONB columns (analysis results)
+    json_deserializer=json_loads
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,35 @@
+"""
+Per-day GitHub commit histograms, stored once per (GitHub username, timezone, date).
+
+Past days never change, so daily-commit and timeline endpoints only ask
+GitHub for days that are missing or not yet final (today, yesterday).
+"""
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class GitHubDailyCommits(Base):
+    __tablename__ = "github_daily_commits"
+
+    id = Column(Integer, primary_key=True, index=True)
+    github_username = Column(String(100), nullable=False)  # Lowercased login
+    # IANA zone the day boundaries and working hours were computed in, or "author_local"
+    # for the committer's own UTC offset as recorded in the commit
+    timezone = Column(String(50), nullable=False, default="author_local")
+    date = Column(Date, nullable=False)
+
+    commits = Column(Integer, nullable=False, default=0)
+    after_hours_commits = Column(Integer, nullable=False, default=0)
+    weekend_commits = Column(Integer, nullable=False, default=0)
+
+    # False while the day can still gain commits (or the search result was truncated)
+    is_final = Column(Boolean, nullable=False, default=False)
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('github_username', 'timezone', 'date', name='uq_github_daily_commits'),
+    )
+
+    def __repr__(self):
+        return f"<GitHubDailyCommits(username='{self.github_username}', date={self.date}, commits={self.commits})>"
@@ -0,0 +1,32 @@
+"""
+Crawled GitHub organization member profiles, shared by all workers.
+
+Rows record which logins belong to an organization (seen_at) and the public
+profile fields used for name matching, so name-based GitHub mapping starts warm
+after restarts instead of re-crawling every member profile.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from .base import Base
+
+
+class GitHubMemberProfile(Base):
+    __tablename__ = "github_member_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    organization = Column(String(100), nullable=False)
+    login = Column(String(100), nullable=False)
+
+    # Public profile fields (email is usually private, so often empty)
+    name = Column(String(255), nullable=True)
+    public_email = Column(String(255), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)  # GitHub's profile updated_at
+
+    seen_at = Column(DateTime(timezone=True), nullable=False)  # Last time the login was in the org member list
+    profile_fetched_at = Column(DateTime(timezone=True), nullable=True)  # Null until the profile is crawled
+
+    __table_args__ = (
+        UniqueConstraint('organization', 'login', name='uq_github_member_profile'),
+    )
+
+    def __repr__(self):
+        return f"<GitHubMemberProfile(organization='{self.organization}', login='{self.login}', name='{self.name}')>"
@@ -2,7 +2,7 @@
 Integration mapping model for tracking successful and failed user mapping attempts.
 Supports both automatic (AI-detected) and manual (user-created) mappings.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -45,6 +45,16 @@ class IntegrationMapping(Base):
     analysis = relationship("Analysis", back_populates="integration_mappings")
     # created_by = relationship("User", foreign_keys=[created_by_user_id], post_update=True)  # TEMPORARILY COMMENTED OUT
     
+    __table_args__ = (
+        # Latest mapping per source identifier (DISTINCT ON source_identifier ORDER BY created_at DESC)
+        Index('ix_integration_mappings_latest', 'user_id', 'target_platform', 'source_identifier', created_at.desc()),
+        # One row per attempt key, so batched recording can upsert with ON CONFLICT
+        Index('uq_integration_mappings_attempt', 'user_id', 'analysis_id', 'source_platform', 'source_identifier',
+              'target_platform', unique=True, postgresql_where=text('analysis_id IS NOT NULL')),
+        Index('uq_integration_mappings_attempt_no_analysis', 'user_id', 'source_platform', 'source_identifier',
+              'target_platform', unique=True, postgresql_where=text('analysis_id IS NULL')),
+    )
+    
     def __repr__(self):
         status = "✓" if self.mapping_successful else "✗"
         return f"<IntegrationMapping({status} {self.source_platform}:{self.source_identifier} -> {self.target_platform}:{self.target_identifier})>"
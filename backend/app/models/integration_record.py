@@ -0,0 +1,55 @@
+"""
+Persistent store of upstream records (incidents, users, shifts) per integration.
+
+Records are keyed by a fingerprint of the integration's API token so the same
+Rootly/PagerDuty account shares one store across analyses and time ranges.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class IntegrationRecord(Base):
+    __tablename__ = "integration_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    integration_key = Column(String(64), nullable=False)  # sha256 of the API token
+    platform = Column(String(20), nullable=False)  # "rootly", "pagerduty"
+    record_type = Column(String(20), nullable=False)  # "incident", "user", "shift"
+    record_id = Column(String(100), nullable=False)  # Upstream record ID
+
+    occurred_at = Column(DateTime(timezone=True), nullable=True)  # created_at / starts_at upstream
+    source_updated_at = Column(DateTime(timezone=True), nullable=True)  # updated_at upstream
+    payload = Column(JSON, nullable=False)
+
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('integration_key', 'record_type', 'record_id', name='uq_integration_record'),
+        Index('ix_integration_records_window', 'integration_key', 'record_type', 'occurred_at'),
+    )
+
+    def __repr__(self):
+        return f"<IntegrationRecord({self.platform}:{self.record_type}:{self.record_id})>"
+
+
+class IntegrationSyncState(Base):
+    __tablename__ = "integration_sync_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    integration_key = Column(String(64), nullable=False)
+    platform = Column(String(20), nullable=False)
+    record_type = Column(String(20), nullable=False)
+
+    # Oldest point in time the store is known to hold every upstream record for
+    coverage_start = Column(DateTime(timezone=True), nullable=True)
+    # Upstream was fully synced up to this point (start of the last successful fetch)
+    high_water_mark = Column(DateTime(timezone=True), nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('integration_key', 'record_type', name='uq_integration_sync_state'),
+    )
+
+    def __repr__(self):
+        return f"<IntegrationSyncState({self.platform}:{self.record_type} hwm={self.high_water_mark})>"
@@ -0,0 +1,57 @@
+"""
+Incremental Slack history: per-channel harvest cursors and compact message metadata.
+
+Both are scoped to a SlackWorkspaceMapping so repeated analyses of the same
+workspace only fetch messages posted since the previous harvest.
+"""
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, Text, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class SlackChannelCursor(Base):
+    __tablename__ = "slack_channel_cursors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_mapping_id = Column(Integer, ForeignKey("slack_workspace_mappings.id", ondelete="CASCADE"), nullable=False)
+    channel_id = Column(String(20), nullable=False)  # C01234567
+
+    # Every message in [coverage_start_ts, latest_ts] is in slack_message_metadata (Slack epoch seconds)
+    coverage_start_ts = Column(Float, nullable=True)
+    latest_ts = Column(Float, nullable=True)
+    last_harvested_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('workspace_mapping_id', 'channel_id', name='uq_slack_channel_cursor'),
+    )
+
+    def __repr__(self):
+        return f"<SlackChannelCursor(workspace_mapping_id={self.workspace_mapping_id}, channel='{self.channel_id}', latest_ts={self.latest_ts})>"
+
+
+class SlackMessageMetadata(Base):
+    __tablename__ = "slack_message_metadata"
+
+    id = Column(BigInteger, primary_key=True)
+    workspace_mapping_id = Column(Integer, ForeignKey("slack_workspace_mappings.id", ondelete="CASCADE"), nullable=False)
+    channel_id = Column(String(20), nullable=False)
+    ts = Column(String(20), nullable=False)  # Slack message ts, unique within a channel
+    sent_at = Column(DateTime(timezone=True), nullable=False)
+
+    user_id = Column(String(20), nullable=True)  # Author, absent for bot messages
+    bot_id = Column(String(20), nullable=True)
+    thread_ts = Column(String(20), nullable=True)
+    author_name = Column(String(255), nullable=True)  # Name extracted from bot-posted messages
+
+    # Scored at ingest so message text never has to be kept
+    sentiment = Column(Float, nullable=True)  # VADER compound score
+    stress_indicator = Column(Boolean, default=False)  # NULL: not scored (author was not analysed)
+    text = Column(Text, nullable=True)  # Only stored when communication patterns are enabled
+
+    __table_args__ = (
+        UniqueConstraint('workspace_mapping_id', 'channel_id', 'ts', name='uq_slack_message_metadata'),
+        Index('ix_slack_message_metadata_window', 'workspace_mapping_id', 'sent_at'),
+    )
+
+    def __repr__(self):
+        return f"<SlackMessageMetadata(channel='{self.channel_id}', ts='{self.ts}', user='{self.user_id}')>"
@@ -0,0 +1,253 @@
+"""
+Read/write access to the normalized analysis result tables.
+
+Completed results are written here next to Analysis.results; analyses that
+finished before these tables existed are split on first access.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.analysis_results import split_analysis_results
+from ..core.daily_health import DailyHealthSeries
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultsStore:
+    """
+    Summary, member, member-daily, team-daily and member health rows for one session.
+
+    Features:
+    - save() replaces every row of an analysis in one transaction
+    - Readers return only the requested slice, as the dicts the analyzer produced
+    - ensure() backfills older analyses from Analysis.results once
+    - page_members() sorts, filters and pages members in SQL
+    - Member daily health is scored once on save and stored as compact series
+    """
+
+    INSERT_CHUNK_SIZE = 1000
+
+    # Sort order of risk_level values when paging members by risk
+    RISK_LEVEL_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save(self, analysis_id: int, results: Any) -> bool:
+        """Replace the stored rows for an analysis. Returns False if results are unusable or the write failed."""
+        if not isinstance(results, dict):
+            return False
+        try:
+            self._replace(analysis_id, results)
+            return True
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Failed to store normalized results for analysis {analysis_id}: {e}")
+            return False
+
+    def _replace(self, analysis_id: int, results: Dict[str, Any]) -> None:
+        """Delete and rewrite every row of an analysis and commit; raises on failure without rolling back."""
+        from ..models import AnalysisSummary, AnalysisMember, AnalysisMemberDaily, AnalysisTeamDaily, AnalysisMemberHealth
+
+        summary, members, member_daily, team_daily = split_analysis_results(results)
+        member_health = self._health_rows(results, team_daily)
+        for model in (AnalysisMemberHealth, AnalysisMemberDaily, AnalysisTeamDaily, AnalysisMember, AnalysisSummary):
+            self.db.query(model).filter(model.analysis_id == analysis_id).delete(synchronize_session=False)
+        self.db.add(AnalysisSummary(analysis_id=analysis_id, summary=summary, member_count=len(members)))
+        self.db.flush()
+        for model, rows in ((AnalysisMember, members), (AnalysisMemberDaily, member_daily),
+                            (AnalysisTeamDaily, team_daily), (AnalysisMemberHealth, member_health)):
+            self._insert(model, [{"analysis_id": analysis_id, **row} for row in rows])
+        self.db.commit()
+        logger.info(f"📦 Stored analysis {analysis_id} results: {len(members)} members, "
+                    f"{len(member_daily)} member days, {len(team_daily)} team days, "
+                    f"{len(member_health)} health series")
+
+    @staticmethod
+    def _health_rows(results: Dict[str, Any], team_daily: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score every member's individual_daily_data into a compact series row."""
+        individual_daily_data = results.get("individual_daily_data") or {}
+        if not isinstance(individual_daily_data, dict):
+            return []
+        team_health_by_date = {row["date"].isoformat(): row["data"].get("overall_score", 0) for row in team_daily}
+        rows = {}
+        for email, days in individual_daily_data.items():
+            if not email or not isinstance(days, dict):
+                continue
+            series = DailyHealthSeries.from_daily_data(days, team_health_by_date)
+            if series is not None:
+                rows[email.lower()] = {"member_email": email.lower(), **series.to_bytes()}
+        return list(rows.values())
+
+    def _insert(self, model, rows: List[Dict[str, Any]]) -> None:
+        for i in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+            self.db.execute(model.__table__.insert(), rows[i:i + self.INSERT_CHUNK_SIZE])
+
+    def replace_team_daily(self, analysis_id: int, daily_trends: List[Dict[str, Any]]) -> None:
+        """Rewrite the team daily series (caller commits)."""
+        from ..models import AnalysisTeamDaily
+        _, _, _, team_daily = split_analysis_results({"daily_trends": daily_trends})
+        self.db.query(AnalysisTeamDaily).filter(AnalysisTeamDaily.analysis_id == analysis_id).delete(synchronize_session=False)
+        self._insert(AnalysisTeamDaily, [{"analysis_id": analysis_id, **row} for row in team_daily])
+
+    def replace_member_health(self, analysis_id: int, results: Dict[str, Any]) -> None:
+        """Rescore the member health series, e.g. after daily_trends changed (caller commits)."""
+        from ..models import AnalysisMemberHealth
+        _, _, _, team_daily = split_analysis_results({"daily_trends": results.get("daily_trends")})
+        self.db.query(AnalysisMemberHealth).filter(AnalysisMemberHealth.analysis_id == analysis_id).delete(synchronize_session=False)
+        self._insert(AnalysisMemberHealth, [{"analysis_id": analysis_id, **row} for row in self._health_rows(results, team_daily)])
+
+    def ensure(self, analysis_id: int) -> bool:
+        """
+        True once the analysis has stored rows, splitting Analysis.results the first time if needed.
+
+        Runs from read endpoints, so concurrent first reads may backfill the same
+        analysis at once; the loser's summary insert hits the primary key and it
+        re-reads the winner's rows instead of failing.
+        """
+        from ..models import Analysis
+        try:
+            if self._has_summary(analysis_id):
+                return True
+            row = self.db.query(Analysis.results).filter(Analysis.id == analysis_id).first()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Normalized results unavailable for analysis {analysis_id}: {e}")
+            return False
+        if not row or not isinstance(row.results, dict):
+            return False
+        logger.info(f"🔄 Backfilling normalized results for analysis {analysis_id}")
+        try:
+            self._replace(analysis_id, row.results)
+            return True
+        except IntegrityError:
+            self.db.rollback()
+            logger.info(f"Analysis {analysis_id} results were backfilled by a concurrent request")
+            try:
+                return self._has_summary(analysis_id)
+            except Exception as e:
+                self.db.rollback()
+                logger.warning(f"Normalized results unavailable for analysis {analysis_id}: {e}")
+                return False
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Failed to store normalized results for analysis {analysis_id}: {e}")
+            return False
+
+    def _has_summary(self, analysis_id: int) -> bool:
+        from ..models import AnalysisSummary
+        return self.db.query(AnalysisSummary.analysis_id).filter(AnalysisSummary.analysis_id == analysis_id).first() is not None
+
+    def get_summary(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        from ..models import AnalysisSummary
+        row = self.db.query(AnalysisSummary.summary).filter(AnalysisSummary.analysis_id == analysis_id).first()
+        return row.summary if row else None
+
+    def get_members(self, analysis_id: int) -> List[Dict[str, Any]]:
+        """Member entries in their original order."""
+        from ..models import AnalysisMember
+        rows = self.db.query(AnalysisMember.data).filter(
+            AnalysisMember.analysis_id == analysis_id
+        ).order_by(AnalysisMember.position).all()
+        return [row.data for row in rows]
+
+    def get_member(self, analysis_id: int, email: str) -> Optional[Dict[str, Any]]:
+        from ..models import AnalysisMember
+        row = self.db.query(AnalysisMember.data).filter(
+            AnalysisMember.analysis_id == analysis_id,
+            AnalysisMember.member_email == email.lower()
+        ).order_by(AnalysisMember.position).first()
+        return row.data if row else None
+
+    def page_members(
+        self,
+        analysis_id: int,
+        sort: str = "position",
+        descending: bool = False,
+        risk_levels: Optional[Sequence[str]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Sequence[float]] = None
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[Tuple[float, ...]]]:
+        """
+        One page of members and the filtered total.
+
+        sort is "position" (original order), "score" (burnout_score) or "risk"
+        (risk level, then score); ties keep the original order. `after` is the
+        keyset returned for the previous page and replaces offset. Returns
+        (members, total, next_after), next_after being None on the last page.
+        """
+        from ..models import AnalysisMember
+        if sort == "position":
+            keys = [AnalysisMember.position]
+        else:
+            score = func.coalesce(AnalysisMember.burnout_score, -1.0)
+            keys = [score] if sort == "score" else [
+                case(self.RISK_LEVEL_RANK, value=func.lower(AnalysisMember.risk_level), else_=0), score
+            ]
+            keys.append(-AnalysisMember.position if descending else AnalysisMember.position)
+
+        query = self.db.query(
+            AnalysisMember.data, *[key.label(f"k{i}") for i, key in enumerate(keys)]
+        ).filter(AnalysisMember.analysis_id == analysis_id)
+        if risk_levels:
+            query = query.filter(func.lower(AnalysisMember.risk_level).in_([level.lower() for level in risk_levels]))
+        total = query.count()
+
+        if after is not None:
+            if len(after) != len(keys):
+                raise ValueError("Cursor does not match the requested sort")
+            row, bound = tuple_(*keys), tuple_(*after)
+            query = query.filter(row < bound if descending else row > bound)
+        else:
+            query = query.offset(offset)
+        rows = query.order_by(*[key.desc() if descending else key.asc() for key in keys]).limit(limit + 1).all()
+        next_after = tuple(rows[limit - 1][1:]) if len(rows) > limit else None
+        return [row.data for row in rows[:limit]], total, next_after
+
+    def get_member_daily(self, analysis_id: int, email: str) -> Dict[str, Dict[str, Any]]:
+        """One member's individual_daily_data, keyed by 'YYYY-MM-DD' in date order."""
+        from ..models import AnalysisMemberDaily
+        rows = self.db.query(AnalysisMemberDaily.date, AnalysisMemberDaily.data).filter(
+            AnalysisMemberDaily.analysis_id == analysis_id,
+            AnalysisMemberDaily.member_email == email.lower()
+        ).order_by(AnalysisMemberDaily.date).all()
+        return {row.date.isoformat(): row.data for row in rows}
+
+    def get_members_daily(self, analysis_id: int) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """individual_daily_data for every member in one query: {email: {'YYYY-MM-DD': data}}."""
+        from ..models import AnalysisMemberDaily
+        rows = self.db.query(AnalysisMemberDaily.member_email, AnalysisMemberDaily.date, AnalysisMemberDaily.data).filter(
+            AnalysisMemberDaily.analysis_id == analysis_id
+        ).order_by(AnalysisMemberDaily.member_email, AnalysisMemberDaily.date).all()
+        daily: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for row in rows:
+            daily.setdefault(row.member_email, {})[row.date.isoformat()] = row.data
+        return daily
+
+    def get_member_health(self, analysis_id: int, email: str) -> Optional[DailyHealthSeries]:
+        """One member's stored daily health series, None for analyses stored before series existed."""
+        from ..models import AnalysisMemberHealth
+        row = self.db.query(AnalysisMemberHealth).filter(
+            AnalysisMemberHealth.analysis_id == analysis_id,
+            AnalysisMemberHealth.member_email == email.lower()
+        ).first()
+        return DailyHealthSeries.from_bytes(row.start_date, row.health, row.team_health, row.factors) if row else None
+
+    def get_members_health(self, analysis_id: int) -> Dict[str, DailyHealthSeries]:
+        """Stored daily health series of every member, keyed by lowercased email."""
+        from ..models import AnalysisMemberHealth
+        rows = self.db.query(AnalysisMemberHealth).filter(AnalysisMemberHealth.analysis_id == analysis_id).all()
+        return {row.member_email: DailyHealthSeries.from_bytes(row.start_date, row.health, row.team_health, row.factors) for row in rows}
+
+    def get_team_daily(self, analysis_id: int) -> List[Dict[str, Any]]:
+        """daily_trends in date order."""
+        from ..models import AnalysisTeamDaily
+        rows = self.db.query(AnalysisTeamDaily.data).filter(
+            AnalysisTeamDaily.analysis_id == analysis_id
+        ).order_by(AnalysisTeamDaily.date).all()
+        return [row.data for row in rows]
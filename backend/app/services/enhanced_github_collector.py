@@ -6,7 +6,7 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from .github_collector import collect_team_github_data as original_collect_team_github_data
-from .mapping_recorder import MappingRecorder
+from .mapping_recorder import BatchMappingRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +17,14 @@ async def collect_team_github_data_with_mapping(
     user_id: Optional[int] = None,
     analysis_id: Optional[int] = None,
     source_platform: str = "rootly",
-    email_to_name: Optional[Dict[str, str]] = None
+    email_to_name: Optional[Dict[str, str]] = None,
+    use_cache: bool = True
 ) -> Dict[str, Dict]:
     """
     Enhanced version of collect_team_github_data that records mapping attempts.
     
     Phase 2: Uses smart caching service when enabled, falls back to original logic.
+    The caching service itself calls back with use_cache=False for its cache misses.
     """
     # Phase 2: Check if smart caching is enabled
     use_smart_caching = os.getenv('USE_SMART_GITHUB_CACHING', 'true').lower() == 'true'
@@ -55,7 +57,7 @@ async def collect_team_github_data_with_mapping(
         
         return github_data
     
-    if use_smart_caching and user_id:
+    if use_smart_caching and use_cache and user_id:
         logger.info(f"🧠 SMART CACHING: Using GitHubMappingService for {len(team_emails)} emails")
         try:
             from .github_mapping_service import GitHubMappingService
@@ -75,30 +77,16 @@ async def collect_team_github_data_with_mapping(
     
     # Original logic (Phase 1) - fallback or when smart caching disabled
     logger.info(f"📦 ORIGINAL LOGIC: Using enhanced collector for {len(team_emails)} emails")
-    recorder = MappingRecorder() if user_id else None
+    recorder = BatchMappingRecorder() if user_id else None
     
     # Phase 1.3: Track processed emails to prevent duplicates within this analysis session
     processed_emails = set()
     
     # Call original function with user_id for manual mapping support
     # Pass email_to_name mapping for better GitHub username matching
-    from .github_collector import GitHubCollector
-    collector = GitHubCollector()
-    github_data = {}
-    
-    for email in team_emails:
-        try:
-            # Get full name for this email if available
-            full_name = email_to_name.get(email) if email_to_name else None
-            
-            # Collect data with full name for better matching
-            user_data = await collector.collect_github_data_for_user(
-                email, days, github_token, user_id, full_name=full_name
-            )
-            if user_data:
-                github_data[email] = user_data
-        except Exception as e:
-            logger.error(f"Failed to collect GitHub data for {email}: {e}")
+    github_data = await original_collect_team_github_data(
+        team_emails, days, github_token, user_id, email_to_name=email_to_name
+    )
     
     # Record mapping attempts if we have user context
     if recorder and user_id:
@@ -181,4 +169,9 @@ async def collect_team_github_data_with_mapping(
                 )
                 logger.info(f"✗ Recorded failed GitHub mapping: {email} -> no data found")
     
+        try:
+            recorder.flush()
+        except Exception as e:
+            logger.warning(f"Failed to record GitHub mapping attempts: {e}")
+    
     return github_data
\ No newline at end of file
@@ -3,17 +3,17 @@ Enhanced GitHub username matching algorithm with multiple strategies.
 """
 import re
 import logging
-import asyncio
 from typing import Optional, Dict, List, Set, Tuple
 from difflib import SequenceMatcher
 import aiohttp
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
-logger = logging.getLogger(__name__)
+from ..core.github_http_cache import github_conditional_get
+from .github_profile_crawler import GitHubOrgProfileCrawler
+from ..core.name_index import NameIndex
 
-# Global cache to persist across matcher instances
-_GLOBAL_ORG_CACHE = {}
-_GLOBAL_MEMBER_PROFILES_CACHE = {}
+logger = logging.getLogger(__name__)
 
 class EnhancedGitHubMatcher:
     """
@@ -27,19 +27,50 @@ class EnhancedGitHubMatcher:
     6. Organization member search
     """
     
-    def __init__(self, github_token: str, organizations: List[str] = None):
+    # Candidates from the name index that get the full similarity scoring
+    NAME_CANDIDATES = 25
+    
+    # Per-request timeout for member listing and profiles, applied on shared sessions too
+    REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+    
+    def __init__(self, github_token: str, organizations: List[str] = None, session: Optional[aiohttp.ClientSession] = None):
         self.github_token = github_token
         self.organizations = organizations or []
+        self._shared_session = session  # Reused across users during team collection
         self.headers = {
             'Authorization': f'token {github_token}',
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'Rootly-Burnout-Detector'
         }
         
-        # Use global cache to persist across instances
         self._user_cache = {}
         self._email_cache = {}
-        self._org_members_cache = _GLOBAL_ORG_CACHE
+        # Member lists and profiles are persisted by the crawler; this only avoids re-reading them per lookup
+        self._org_members_cache: Dict[str, Set[str]] = {}
+        self._profile_crawler = GitHubOrgProfileCrawler(github_token, self.headers, timeout=self.REQUEST_TIMEOUT)
+        self._member_profiles: Optional[List[Dict]] = None
+        self._member_index: Optional[Tuple[int, NameIndex]] = None
+        self._username_index: Optional[NameIndex] = None
+        
+    @asynccontextmanager
+    async def _client_session(self, **kwargs):
+        """
+        Yield the caller's shared session if one was given, otherwise a short-lived session.
+        
+        kwargs only configure a new session; options that must also hold on the shared
+        session (such as timeouts) are passed per request.
+        """
+        if self._shared_session is not None and not self._shared_session.closed:
+            yield self._shared_session
+        else:
+            async with aiohttp.ClientSession(**kwargs) as session:
+                yield session
+    
+    @asynccontextmanager
+    async def _github_get(self, session, url: str, bucket: str = "core", headers: Optional[Dict] = None, **kwargs):
+        """GET a GitHub URL through the shared rate limiter, revalidating cached responses with ETags."""
+        async with github_conditional_get(session, url, self.github_token, headers or self.headers, bucket, **kwargs) as resp:
+            yield resp
         
     async def match_email_to_github(self, email: str, full_name: Optional[str] = None) -> Optional[str]:
         """
@@ -79,10 +110,10 @@ class EnhancedGitHubMatcher:
             List of organization names the token can access
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 # Get organizations the authenticated user belongs to
                 orgs_url = "https://api.github.com/user/orgs"
-                async with session.get(orgs_url, headers=self.headers) as resp:
+                async with self._github_get(session, orgs_url) as resp:
                     if resp.status == 200:
                         orgs_data = await resp.json()
                         org_names = [org['login'] for org in orgs_data]
@@ -93,14 +124,14 @@ class EnhancedGitHubMatcher:
                         
                 # If user orgs fails, try to get organizations the token can access via user
                 user_url = "https://api.github.com/user"
-                async with session.get(user_url, headers=self.headers) as resp:
+                async with self._github_get(session, user_url) as resp:
                     if resp.status == 200:
                         user_data = await resp.json()
                         username = user_data.get('login')
                         if username:
                             # Get organizations for this user
                             user_orgs_url = f"https://api.github.com/users/{username}/orgs"
-                            async with session.get(user_orgs_url, headers=self.headers) as resp:
+                            async with self._github_get(session, user_orgs_url) as resp:
                                 if resp.status == 200:
                                     orgs_data = await resp.json()
                                     org_names = [org['login'] for org in orgs_data]
@@ -133,9 +164,8 @@ class EnhancedGitHubMatcher:
         
         # OPTIMIZED APPROACH: Get all org members first, then match against them
         try:
-            # Add timeout to prevent connection issues
-            timeout = aiohttp.ClientTimeout(total=30, connect=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            # Add timeout to prevent connection issues (the crawler also passes it per request)
+            async with self._client_session(timeout=self.REQUEST_TIMEOUT) as session:
                 # Get all organization members (with retry logic)
                 all_members = await self._get_all_org_members_with_profiles(session)
                 
@@ -160,61 +190,27 @@ class EnhancedGitHubMatcher:
         return None
     
     async def _get_all_org_members_with_profiles(self, session) -> List[Dict]:
-        """Get all organization members with their profile information."""
+        """Get all organization members with their profile information (stored profiles, crawling only stale ones)."""
+        if self._member_profiles is not None:
+            return self._member_profiles
         all_members = []
         
-        try:
-            if not self.organizations:
-                logger.warning("No organizations configured for member fetching")
-                return all_members
-                
-            for org in self.organizations:
-                try:
-                    logger.info(f"🔄 Fetching members from organization: {org}")
-                    
-                    # Get org members list
-                    if org not in self._org_members_cache:
-                        members = await self._get_org_members(org, session)
-                        self._org_members_cache[org] = members
-                        logger.info(f"📥 Cached {len(members)} usernames for {org}")
-                    else:
-                        logger.info(f"📦 Using cached members for {org}: {len(self._org_members_cache[org])} members")
-                    
-                    # Get profiles for each member (with rate limiting)
-                    member_count = 0
-                    profiles_loaded = 0
-                    
-                    for username in self._org_members_cache[org]:
-                        try:
-                            # Add rate limiting to prevent API overload
-                            if member_count > 0 and member_count % 5 == 0:
-                                await asyncio.sleep(1)  # Pause every 5 requests
-                            
-                            profile = await self._get_github_user_profile(username, session)
-                            if profile:
-                                # Only store name, skip email since GitHub emails are often private
-                                profile_name = profile.get('name', '') or ''
-                                all_members.append({
-                                    'username': username,
-                                    'name': profile_name.lower() if profile_name else '',
-                                    'organization': org
-                                })
-                                profiles_loaded += 1
-                            member_count += 1
-                            
-                        except Exception as e:
-                            logger.debug(f"Error fetching profile for {username}: {e}")
-                            continue  # Skip this user and continue with others
-                            
-                    logger.info(f"✅ Loaded {profiles_loaded} profiles from {org} ({member_count} total members)")
-                    
-                except Exception as org_error:
-                    logger.error(f"Error fetching members for org {org}: {org_error}")
-                    continue  # Skip this org and continue with others
-                
-        except Exception as e:
-            logger.error(f"Critical error in member fetching: {e}")
+        if not self.organizations:
+            logger.warning("No organizations configured for member fetching")
+            return all_members
             
+        for org in self.organizations:
+            try:
+                members = await self._profile_crawler.get_member_profiles(org, session)
+                self._org_members_cache[org] = {member['username'] for member in members}
+                all_members.extend(members)
+                logger.info(f"✅ Loaded {len(members)} profiles from {org}")
+            except Exception as org_error:
+                logger.error(f"Error fetching members for org {org}: {org_error}")
+                continue  # Skip this org and continue with others
+        
+        if all_members:
+            self._member_profiles = all_members
         return all_members
     
     async def _match_name_against_members(self, full_name: str, members: List[Dict], fallback_email: Optional[str] = None) -> Optional[str]:
@@ -227,26 +223,27 @@ class EnhancedGitHubMatcher:
         last_name = name_parts.get('last', '').lower()
         
         candidates = []
-        
-        # Strategy 1: High similarity name matching (instead of exact)
-        for member in members:
-            if not member['name']:
-                continue
-                
-            # Calculate similarity between names
-            similarity = self._calculate_name_similarity(full_name_lower, member['name'], first_name, last_name)
-            
+        index = self._get_member_index(members)
+        
+        # Strategy 1: High similarity name matching (instead of exact), scoring only the indexed top candidates
+        scored = index.best_matches(
+            full_name_lower,
+            lambda query, member_name: self._calculate_name_similarity(query, member_name, first_name, last_name),
+            k=self.NAME_CANDIDATES,
+            threshold=0.6
+        )
+        for username, similarity, member_name in scored:
             # Very high similarity (95%+) - likely the same person
             if similarity > 0.95:
-                logger.info(f"🎯 HIGH SIMILARITY match: '{full_name}' ~= '{member['name']}' (score: {similarity:.2f}) -> {member['username']}")
-                return member['username']
+                logger.info(f"🎯 HIGH SIMILARITY match: '{full_name}' ~= '{member_name}' (score: {similarity:.2f}) -> {username}")
+                return username
             
             # Good similarity for candidate list
-            elif similarity > 0.6:
-                candidates.append((member['username'], similarity, member['name']))
+            candidates.append((username, similarity, member_name))
         
         # Strategy 2: Username pattern matching (based on name parts)
         if first_name and last_name:
+            members_by_username = {member['username'].lower(): member['username'] for member in members}
             # Try common username patterns based on name
             patterns = [
                 f"{first_name}{last_name}",           # spencercheng
@@ -259,10 +256,9 @@ class EnhancedGitHubMatcher:
             ]
             
             for pattern in patterns:
-                for member in members:
-                    if member['username'].lower() == pattern:
-                        logger.info(f"🎯 USERNAME PATTERN match: '{full_name}' -> {pattern} -> {member['username']}")
-                        return member['username']
+                if pattern in members_by_username:
+                    logger.info(f"🎯 USERNAME PATTERN match: '{full_name}' -> {pattern} -> {members_by_username[pattern]}")
+                    return members_by_username[pattern]
         
         # Strategy 3: Return best candidate if we have good matches
         if candidates:
@@ -291,6 +287,13 @@ class EnhancedGitHubMatcher:
             
         return None
     
+    def _get_member_index(self, members: List[Dict]) -> NameIndex:
+        """Name index over member profiles, built once per member list."""
+        if self._member_index is None or self._member_index[0] != id(members):
+            index = NameIndex((member['username'], member['name']) for member in members if member.get('name'))
+            self._member_index = (id(members), index)
+        return self._member_index[1]
+    
     def _extract_name_parts_from_full_name(self, full_name: str) -> Dict[str, str]:
         """Extract name components from full name."""
         # Clean the name (allow word characters, spaces, hyphens, and dots)
@@ -365,15 +368,12 @@ class EnhancedGitHubMatcher:
             return None
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 all_members = set()
                 
                 # Get all organization members
                 for org in self.organizations:
-                    if org not in self._org_members_cache:
-                        members = await self._get_org_members(org, session)
-                        self._org_members_cache[org] = members
-                    all_members.update(self._org_members_cache[org])
+                    all_members.update(await self._get_cached_org_members(org, session))
                 
                 if not all_members:
                     return None
@@ -419,12 +419,12 @@ class EnhancedGitHubMatcher:
     async def _search_github_by_name(self, name_parts: Dict[str, str], full_name: str, fallback_email: Optional[str] = None) -> Optional[str]:
         """Search GitHub users by name using the search API."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 # Search for users by name
                 search_query = full_name.replace(' ', '+')
                 search_url = f"https://api.github.com/search/users?q={search_query}+in:fullname"
                 
-                async with session.get(search_url, headers=self.headers) as resp:
+                async with self._github_get(session, search_url, bucket="search") as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         if data.get('total_count', 0) > 0:
@@ -452,7 +452,7 @@ class EnhancedGitHubMatcher:
         """Get GitHub user profile information."""
         try:
             url = f"https://api.github.com/users/{username}"
-            async with session.get(url, headers=self.headers) as resp:
+            async with self._github_get(session, url) as resp:
                 if resp.status == 200:
                     return await resp.json()
         except Exception as e:
@@ -515,7 +515,7 @@ class EnhancedGitHubMatcher:
     async def _verify_username_matches_name(self, username: str, full_name: str) -> bool:
         """Verify that a username reasonably matches the given full name."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 user_profile = await self._get_github_user_profile(username, session)
                 if user_profile and user_profile.get('name'):
                     github_name = user_profile['name'].lower()
@@ -531,10 +531,10 @@ class EnhancedGitHubMatcher:
     async def _search_by_email_api(self, email: str) -> Optional[str]:
         """Search GitHub users by email using the search API."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 # Search users by email
                 search_url = f"https://api.github.com/search/users?q={email}+in:email"
-                async with session.get(search_url, headers=self.headers) as resp:
+                async with self._github_get(session, search_url, bucket="search") as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         if data.get('total_count', 0) > 0:
@@ -549,7 +549,7 @@ class EnhancedGitHubMatcher:
                 headers_with_preview = self.headers.copy()
                 headers_with_preview['Accept'] = 'application/vnd.github.cloak-preview+json'
                 
-                async with session.get(search_url, headers=headers_with_preview) as resp:
+                async with self._github_get(session, search_url, bucket="search", headers=headers_with_preview) as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         if data.get('total_count', 0) > 0:
@@ -624,15 +624,12 @@ class EnhancedGitHubMatcher:
             return None
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 all_members = set()
                 
                 # Get all organization members
                 for org in self.organizations:
-                    if org not in self._org_members_cache:
-                        members = await self._get_org_members(org, session)
-                        self._org_members_cache[org] = members
-                    all_members.update(self._org_members_cache[org])
+                    all_members.update(await self._get_cached_org_members(org, session))
                 
                 # Skip email verification since GitHub emails are usually private
                 # Instead, focus on name and username pattern matching
@@ -673,11 +670,11 @@ class EnhancedGitHubMatcher:
             return None
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 for org in self.organizations:
                     # Get recent repos with activity
                     repos_url = f"https://api.github.com/orgs/{org}/repos?sort=pushed&per_page=10"
-                    async with session.get(repos_url, headers=self.headers) as resp:
+                    async with self._github_get(session, repos_url) as resp:
                         if resp.status != 200:
                             continue
                             
@@ -687,7 +684,7 @@ class EnhancedGitHubMatcher:
                             # Search commits by email
                             commits_url = f"https://api.github.com/repos/{repo['full_name']}/commits"
                             
-                            async with session.get(commits_url, headers=self.headers) as resp:
+                            async with self._github_get(session, commits_url) as resp:
                                 if resp.status != 200:
                                     continue
                                     
@@ -720,18 +717,18 @@ class EnhancedGitHubMatcher:
             return None
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 # Collect all members
                 all_members = set()
                 for org in self.organizations:
-                    if org in self._org_members_cache:
-                        all_members.update(self._org_members_cache[org])
-                    else:
-                        members = await self._get_org_members(org, session)
-                        all_members.update(members)
+                    all_members.update(await self._get_cached_org_members(org, session))
                 
-                # Score each member
-                for username in all_members:
+                if self._username_index is None:
+                    self._username_index = NameIndex((username, username) for username in all_members)
+                
+                # Score only the usernames sharing the most trigrams with the name
+                query = f"{firstname} {lastname}".strip()
+                for username in self._username_index.candidates(query, self.NAME_CANDIDATES):
                     username_lower = username.lower()
                     
                     # Calculate similarity scores
@@ -766,14 +763,9 @@ class EnhancedGitHubMatcher:
             return True  # No org restrictions configured
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 for org in self.organizations:
-                    # Get org members (use cache if available)
-                    if org not in self._org_members_cache:
-                        members = await self._get_org_members(org, session)
-                        self._org_members_cache[org] = members
-                    
-                    if username in self._org_members_cache[org]:
+                    if username in await self._get_cached_org_members(org, session):
                         logger.info(f"✅ User {username} verified as member of {org}")
                         return True
                         
@@ -790,9 +782,9 @@ class EnhancedGitHubMatcher:
             return self._user_cache[username]
             
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 url = f"https://api.github.com/users/{username}"
-                async with session.get(url, headers=self.headers) as resp:
+                async with self._github_get(session, url) as resp:
                     exists = resp.status == 200
                     self._user_cache[username] = exists
                     return exists
@@ -803,10 +795,10 @@ class EnhancedGitHubMatcher:
     async def _verify_user_email(self, username: str, email: str) -> bool:
         """Verify if a GitHub user has a specific email."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 # Check public profile
                 url = f"https://api.github.com/users/{username}"
-                async with session.get(url, headers=self.headers) as resp:
+                async with self._github_get(session, url) as resp:
                     if resp.status == 200:
                         data = await resp.json()
                         if data.get('email', '').lower() == email.lower():
@@ -822,10 +814,10 @@ class EnhancedGitHubMatcher:
     async def _check_user_commits_for_email(self, username: str, email: str) -> bool:
         """Check if a user has commits with a specific email."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 # Get user's recent events
                 events_url = f"https://api.github.com/users/{username}/events?per_page=10"
-                async with session.get(events_url, headers=self.headers) as resp:
+                async with self._github_get(session, events_url) as resp:
                     if resp.status != 200:
                         return False
                         
@@ -840,7 +832,7 @@ class EnhancedGitHubMatcher:
                     # Check commits in recent repos
                     for repo in list(repos)[:2]:  # Check top 2 repos
                         commits_url = f"https://api.github.com/repos/{repo}/commits?author={username}&per_page=5"
-                        async with session.get(commits_url, headers=self.headers) as resp:
+                        async with self._github_get(session, commits_url) as resp:
                             if resp.status == 200:
                                 commits = await resp.json()
                                 for commit in commits:
@@ -853,29 +845,16 @@ class EnhancedGitHubMatcher:
             
         return False
     
+    async def _get_cached_org_members(self, org: str, session) -> Set[str]:
+        """Organization members, read from the crawler's store once per matcher instance."""
+        if org not in self._org_members_cache:
+            self._org_members_cache[org] = await self._get_org_members(org, session)
+        return self._org_members_cache[org]
+    
     async def _get_org_members(self, org: str, session) -> Set[str]:
         """Get all members of an organization."""
-        members = set()
         try:
-            page = 1
-            while True:
-                url = f"https://api.github.com/orgs/{org}/members?per_page=100&page={page}"
-                async with session.get(url, headers=self.headers) as resp:
-                    if resp.status != 200:
-                        break
-                        
-                    data = await resp.json()
-                    if not data:
-                        break
-                        
-                    members.update(member['login'] for member in data)
-                    
-                    # Check if there are more pages
-                    if len(data) < 100:
-                        break
-                    page += 1
-                    
+            return await self._profile_crawler.get_org_members(org, session)
         except Exception as e:
             logger.error(f"Error getting members for {org}: {e}")
-            
-        return members
\ No newline at end of file
+            return set()
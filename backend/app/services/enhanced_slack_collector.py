@@ -4,7 +4,7 @@ Enhanced Slack collector that records mapping data.
 import logging
 from typing import Dict, List, Optional
 from .slack_collector import collect_team_slack_data as original_collect_team_slack_data
-from .mapping_recorder import MappingRecorder
+from .mapping_recorder import BatchMappingRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +21,7 @@ async def collect_team_slack_data_with_mapping(
     """
     Enhanced version of collect_team_slack_data that records mapping attempts.
     """
-    recorder = MappingRecorder() if user_id else None
+    recorder = BatchMappingRecorder() if user_id else None
     
     # Call original function
     slack_data = await original_collect_team_slack_data(team_identifiers, days, slack_token, mock_mode, use_names)
@@ -98,4 +98,9 @@ async def collect_team_slack_data_with_mapping(
                 )
                 logger.info(f"✗ Recorded failed Slack mapping: {identifier} -> no data found")
     
+        try:
+            recorder.flush()
+        except Exception as e:
+            logger.warning(f"Failed to record Slack mapping attempts: {e}")
+    
     return slack_data
\ No newline at end of file
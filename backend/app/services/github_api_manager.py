@@ -12,6 +12,8 @@ from typing import Dict, Any, Optional, Callable
 from enum import Enum
 import aiohttp
 
+from ..core.github_http_cache import github_http_cache, github_conditional_get
+
 logger = logging.getLogger(__name__)
 
 
@@ -243,6 +245,7 @@ class GitHubAPIManager:
                 "rate_limited_requests": self.metrics["rate_limited_requests"],
                 "circuit_breaker_blocks": self.metrics["circuit_breaker_blocks"]
             },
+            "http_cache": github_http_cache.get_stats(),
             "failure_metrics": {
                 "consecutive_failures": self.failure_count,
                 "time_since_last_failure": (
@@ -286,7 +289,7 @@ class GitHubAPIManager:
                 url = f'https://api.github.com/users/{username}'
                 logger.info(f"🔍 Validating GitHub user: {username}")
                 
-                async with session.get(url, headers=headers) as response:
+                async with github_conditional_get(session, url, token, headers) as response:
                     if response.status == 200:
                         user_data = await response.json()
                         logger.info(f"✅ Found GitHub user: {user_data.get('login')} ({user_data.get('name', 'No name')})")
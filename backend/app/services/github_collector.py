@@ -4,13 +4,18 @@ GitHub data collector for web app burnout analysis.
 
 import json
 import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import requests
 import asyncio
 import os
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+
+from ..core.api_rate_limiter import integration_rate_limiter
+from ..core.github_http_cache import github_conditional_get
 # from sqlalchemy.orm import Session
 # from ..models import GitHubIntegration
 
@@ -27,10 +32,6 @@ class GitHubCollector:
         # Business hours configuration
         self.business_hours = {'start': 9, 'end': 17}
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
-        
         # GitHub organizations to search
         self.organizations = ["Rootly-AI-Labs", "rootlyhq"]
         
@@ -54,6 +55,19 @@ class GitHubCollector:
         # Cache for email mapping
         self._email_mapping_cache = None
         
+        # aiohttp session shared by all requests while collecting for a team (see collect_team_github_data)
+        self._shared_session = None
+    
+    @asynccontextmanager
+    async def _client_session(self):
+        """Yield the shared team session if one is open, otherwise a short-lived session."""
+        if self._shared_session is not None and not self._shared_session.closed:
+            yield self._shared_session
+        else:
+            import aiohttp
+            async with aiohttp.ClientSession() as session:
+                yield session
+        
     async def _correlate_email_to_github(self, email: str, token: str, user_id: Optional[int] = None, full_name: Optional[str] = None) -> Optional[str]:
         """
         Correlate an email address to a GitHub username using multiple strategies.
@@ -90,7 +104,7 @@ class GitHubCollector:
             # THIRD: Use enhanced matching algorithm with name-based fallback
             try:
                 from .enhanced_github_matcher import EnhancedGitHubMatcher
-                matcher = EnhancedGitHubMatcher(token, self.organizations)
+                matcher = EnhancedGitHubMatcher(token, self.organizations, session=self._shared_session)
                 
                 # Try email-based matching first
                 username = await matcher.match_email_to_github(email, full_name)
@@ -140,6 +154,9 @@ class GitHubCollector:
         """
         Check user_mappings table for manual GitHub mappings.
         
+        The query runs in a worker thread on the application's pooled engine, so
+        concurrent correlations neither block the event loop nor open engines.
+        
         Args:
             email: The email address to look up
             user_id: The user ID who owns the mappings
@@ -148,47 +165,42 @@ class GitHubCollector:
             GitHub username if found, None otherwise
         """
         try:
-            database_url = os.getenv('DATABASE_URL')
-            if not database_url:
-                logger.warning("DATABASE_URL not set, cannot check manual mappings")
-                return None
-            
-            engine = create_engine(database_url)
-            conn = engine.connect()
-            
-            # Query for manual mapping
-            query = """
-                SELECT target_identifier
-                FROM user_mappings
-                WHERE user_id = :user_id
-                  AND source_platform = 'rootly'
-                  AND source_identifier = :email
-                  AND target_platform = 'github'
-                  AND target_identifier IS NOT NULL
-                  AND target_identifier != ''
-                ORDER BY created_at DESC
-                LIMIT 1
-            """
-            
-            result = conn.execute(
-                text(query),
-                {'user_id': user_id, 'email': email}
-            )
-            row = result.fetchone()
-            conn.close()
-            
-            if row:
-                username = row[0]
+            username = await asyncio.to_thread(self._query_manual_mapping, email, user_id)
+            if username:
                 logger.info(f"Found manual GitHub mapping: {email} -> {username}")
-                return username
             else:
                 logger.debug(f"No manual GitHub mapping found for {email}")
-                return None
+            return username
                 
         except Exception as e:
             logger.error(f"Error checking manual mappings: {e}")
             return None
     
+    @staticmethod
+    def _query_manual_mapping(email: str, user_id: int) -> Optional[str]:
+        """Latest manual Rootly email -> GitHub username mapping of a user (blocking)."""
+        from ..models import SessionLocal
+        
+        # Query for manual mapping
+        query = """
+            SELECT target_identifier
+            FROM user_mappings
+            WHERE user_id = :user_id
+              AND source_platform = 'rootly'
+              AND source_identifier = :email
+              AND target_platform = 'github'
+              AND target_identifier IS NOT NULL
+              AND target_identifier != ''
+            ORDER BY created_at DESC
+            LIMIT 1
+        """
+        db = SessionLocal()
+        try:
+            row = db.execute(text(query), {'user_id': user_id, 'email': email}).fetchone()
+            return row[0] if row else None
+        finally:
+            db.close()
+    
     async def _build_email_mapping(self, token: str) -> Dict[str, str]:
         """
         Build mapping of email addresses to GitHub usernames by discovering org members
@@ -202,8 +214,7 @@ class GitHubCollector:
         }
         
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
+            async with self._client_session() as session:
                 # Get all GitHub users from organizations
                 github_users = set()
                 
@@ -211,7 +222,7 @@ class GitHubCollector:
                     try:
                         # Get organization members
                         members_url = f"https://api.github.com/orgs/{org}/members"
-                        async with session.get(members_url, headers=headers) as resp:
+                        async with github_conditional_get(session, members_url, token, headers) as resp:
                             if resp.status == 200:
                                 members_data = await resp.json()
                                 org_members = [member['login'] for member in members_data]
@@ -227,7 +238,7 @@ class GitHubCollector:
                 # For each user, try to discover their email from recent commits
                 for username in list(github_users):  # Process all users
                     try:
-                        emails = await self._get_user_emails(username, session, headers)
+                        emails = await self._get_user_emails(username, session, headers, token)
                         for email in emails:
                             email_lower = email.lower()
                             if email_lower not in email_to_username:
@@ -243,14 +254,14 @@ class GitHubCollector:
             logger.error(f"Error building email mapping: {e}")
             return {}
     
-    async def _get_user_emails(self, username: str, session, headers) -> set:
+    async def _get_user_emails(self, username: str, session, headers, token: Optional[str] = None) -> set:
         """Get email addresses used by a GitHub user in recent commits."""
         emails = set()
         
         try:
             # Get user's public profile email first
             user_url = f"https://api.github.com/users/{username}"
-            async with session.get(user_url, headers=headers) as resp:
+            async with github_conditional_get(session, user_url, token, headers) as resp:
                 if resp.status == 200:
                     user_data = await resp.json()
                     if user_data.get('email'):
@@ -259,7 +270,7 @@ class GitHubCollector:
             # Get user's recent events to find repositories they've contributed to
             # Reduced from 100 to 30 to minimize API calls
             events_url = f"https://api.github.com/users/{username}/events?per_page=30"
-            async with session.get(events_url, headers=headers) as resp:
+            async with github_conditional_get(session, events_url, token, headers) as resp:
                 if resp.status == 200:
                     events_data = await resp.json()
                     
@@ -276,7 +287,7 @@ class GitHubCollector:
                         try:
                             # Reduced from 100 to 10 commits per repo
                             commits_url = f"https://api.github.com/repos/{repo_name}/commits?author={username}&per_page=10"
-                            async with session.get(commits_url, headers=headers) as resp:
+                            async with github_conditional_get(session, commits_url, token, headers) as resp:
                                 if resp.status == 200:
                                     commits_data = await resp.json()
                                     for commit in commits_data:
@@ -320,12 +331,18 @@ class GitHubCollector:
             # Make resilient API calls with rate limiting and circuit breaker
             async def fetch_commits():
                 import aiohttp
-                async with aiohttp.ClientSession() as session:
+                async with self._client_session() as session:
+                    # Search API has its own 30/minute bucket, separate from the core REST quota
+                    await integration_rate_limiter.acquire("github", token, "search")
                     async with session.get(commits_url, headers=headers) as resp:
+                        retry_in = integration_rate_limiter.record_response("github", token, "search", resp.status, resp.headers)
                         if resp.status == 200:
                             return await resp.json()
                         elif resp.status == 401:
                             raise aiohttp.ClientError(f"GitHub API authentication failed (401) - token may be expired or invalid")
+                        elif retry_in is not None:
+                            # Throttled: the limiter now blocks the search bucket until the reset
+                            raise aiohttp.ClientError(f"GitHub search API rate limited ({resp.status}), retry in {retry_in:.0f}s")
                         elif resp.status == 403:
                             raise aiohttp.ClientError(f"GitHub API forbidden (403) - token needs 'repo' permission for private repos")
                         else:
@@ -333,12 +350,18 @@ class GitHubCollector:
             
             async def fetch_prs():
                 import aiohttp
-                async with aiohttp.ClientSession() as session:
+                async with self._client_session() as session:
+                    # Search API has its own 30/minute bucket, separate from the core REST quota
+                    await integration_rate_limiter.acquire("github", token, "search")
                     async with session.get(prs_url, headers=headers) as resp:
+                        retry_in = integration_rate_limiter.record_response("github", token, "search", resp.status, resp.headers)
                         if resp.status == 200:
                             return await resp.json()
                         elif resp.status == 401:
                             raise aiohttp.ClientError(f"GitHub API authentication failed (401) - token may be expired or invalid")
+                        elif retry_in is not None:
+                            # Throttled: the limiter now blocks the search bucket until the reset
+                            raise aiohttp.ClientError(f"GitHub search API rate limited ({resp.status}), retry in {retry_in:.0f}s")
                         elif resp.status == 403:
                             raise aiohttp.ClientError(f"GitHub API forbidden (403) - token needs 'repo' permission for private repos") 
                         else:
@@ -353,196 +376,257 @@ class GitHubCollector:
             
             logger.info(f"📊 GitHub API calls completed - Commits: {total_commits}, PRs: {total_prs}")
             
-            # For now, estimate other metrics based on commits/PRs
-            # In a full implementation, we'd make additional API calls
-            after_hours_commits = int(total_commits * 0.15)  # Estimate 15% after hours
-            weekend_commits = int(total_commits * 0.1)       # Estimate 10% weekend
-            total_reviews = int(total_prs * 1.5)             # Estimate 1.5 reviews per PR
-            
-            days_analyzed = (end_date - start_date).days
-            weeks = days_analyzed / 7
-            
-            # Calculate percentages
-            after_hours_percentage = (after_hours_commits / total_commits) if total_commits > 0 else 0
-            weekend_percentage = (weekend_commits / total_commits) if total_commits > 0 else 0
-            
-            # Generate burnout indicators
-            commits_per_week = total_commits / weeks if weeks > 0 else 0
-            burnout_indicators = {
-                "excessive_commits": commits_per_week > 15,
-                "late_night_activity": after_hours_percentage > 0.25,
-                "weekend_work": weekend_percentage > 0.15,
-                "large_prs": total_prs > 0 and (total_commits / max(total_prs, 1)) > 10
-            }
-            
-            return {
-                'username': username,
-                'email': email,
-                'analysis_period': {
-                    'start': start_date.isoformat(),
-                    'end': end_date.isoformat(),
-                    'days': days_analyzed
-                },
-                'metrics': {
-                    'total_commits': total_commits,
-                    'total_pull_requests': total_prs,
-                    'total_reviews': total_reviews,
-                    'commits_per_week': round(commits_per_week, 2),
-                    'prs_per_week': round(total_prs / weeks if weeks > 0 else 0, 2),
-                    'after_hours_commit_percentage': round(after_hours_percentage, 3),
-                    'weekend_commit_percentage': round(weekend_percentage, 3),
-                    'repositories_touched': 3,  # Estimate
-                    'avg_pr_size': int(total_commits / max(total_prs, 1)) if total_prs > 0 else 50,
-                    'clustered_commits': 0  # Would need more detailed analysis
-                },
-                'burnout_indicators': burnout_indicators,
-                'activity_data': {
-                    'commits_count': total_commits,
-                    'pull_requests_count': total_prs,
-                    'reviews_count': total_reviews,
-                    'after_hours_commits': after_hours_commits,
-                    'weekend_commits': weekend_commits,
-                    'avg_pr_size': int(total_commits / max(total_prs, 1)) if total_prs > 0 else 50,
-                    'burnout_indicators': burnout_indicators
-                }
-            }
+            # The search API only returns counts, so timing and review figures are estimated here
+            return self._build_github_activity(
+                username, email, start_date, end_date,
+                total_commits=total_commits,
+                total_prs=total_prs,
+                total_reviews=int(total_prs * 1.5),               # Estimate 1.5 reviews per PR
+                after_hours_commits=int(total_commits * 0.15),    # Estimate 15% after hours
+                weekend_commits=int(total_commits * 0.1),         # Estimate 10% weekend
+                repositories_touched=3,                           # Estimate
+                data_source="rest_search_estimates"
+            )
             
         except Exception as e:
             logger.error(f"Error fetching real GitHub data for {username}: {e}")
             # Don't fall back to mock data - return None to indicate failure
             return None
         
-    async def fetch_daily_commit_data(self, username: str, start_date: datetime, end_date: datetime, github_token: str) -> Optional[List[Dict]]:
+    def _build_github_activity(
+        self,
+        username: str,
+        email: str,
+        start_date: datetime,
+        end_date: datetime,
+        total_commits: int,
+        total_prs: int,
+        total_reviews: int,
+        after_hours_commits: int,
+        weekend_commits: int,
+        repositories_touched: int,
+        data_source: str
+    ) -> Dict:
+        """Assemble the GitHub activity payload used by the analyzers."""
+        days_analyzed = (end_date - start_date).days
+        weeks = days_analyzed / 7
+        
+        # Calculate percentages
+        after_hours_percentage = (after_hours_commits / total_commits) if total_commits > 0 else 0
+        weekend_percentage = (weekend_commits / total_commits) if total_commits > 0 else 0
+        
+        # Generate burnout indicators
+        commits_per_week = total_commits / weeks if weeks > 0 else 0
+        burnout_indicators = {
+            "excessive_commits": commits_per_week > 15,
+            "late_night_activity": after_hours_percentage > 0.25,
+            "weekend_work": weekend_percentage > 0.15,
+            "large_prs": total_prs > 0 and (total_commits / max(total_prs, 1)) > 10
+        }
+        
+        return {
+            'username': username,
+            'email': email,
+            'analysis_period': {
+                'start': start_date.isoformat(),
+                'end': end_date.isoformat(),
+                'days': days_analyzed
+            },
+            'metrics': {
+                'total_commits': total_commits,
+                'total_pull_requests': total_prs,
+                'total_reviews': total_reviews,
+                'commits_per_week': round(commits_per_week, 2),
+                'prs_per_week': round(total_prs / weeks if weeks > 0 else 0, 2),
+                'after_hours_commit_percentage': round(after_hours_percentage, 3),
+                'weekend_commit_percentage': round(weekend_percentage, 3),
+                'repositories_touched': repositories_touched,
+                'avg_pr_size': int(total_commits / max(total_prs, 1)) if total_prs > 0 else 50,
+                'clustered_commits': 0  # Would need more detailed analysis
+            },
+            'burnout_indicators': burnout_indicators,
+            'activity_data': {
+                'commits_count': total_commits,
+                'pull_requests_count': total_prs,
+                'reviews_count': total_reviews,
+                'after_hours_commits': after_hours_commits,
+                'weekend_commits': weekend_commits,
+                'avg_pr_size': int(total_commits / max(total_prs, 1)) if total_prs > 0 else 50,
+                'burnout_indicators': burnout_indicators
+            },
+            'data_source': data_source
+        }
+    
+    def _build_activity_from_contributions(self, username: str, email: str, start_date: datetime, end_date: datetime, contributions: Dict) -> Dict:
+        """Build the activity payload from a GraphQL contributionsCollection summary."""
+        total_commits = contributions['total_commits']
+        daily_commits = contributions['daily_commits']
+        
+        weekend_commits = sum(
+            count for day, count in daily_commits.items()
+            if datetime.fromisoformat(day).weekday() >= 5  # Saturday = 5, Sunday = 6
+        )
+        
+        # Commit contributions have no time of day; use the after-hours share of timestamped
+        # PR and review activity, and the old estimate only when there is none
+        timestamps = contributions['activity_timestamps']
+        if timestamps:
+            after_hours_share = sum(1 for ts in timestamps if ts.hour < 9 or ts.hour >= 17) / len(timestamps)
+        else:
+            after_hours_share = 0.15
+        
+        return self._build_github_activity(
+            username, email, start_date, end_date,
+            total_commits=total_commits,
+            total_prs=contributions['total_pull_requests'],
+            total_reviews=contributions['total_reviews'],
+            after_hours_commits=int(round(total_commits * after_hours_share)),
+            weekend_commits=weekend_commits,
+            repositories_touched=contributions['repositories_touched'],
+            data_source="graphql_contributions"
+        )
+    
+    async def fetch_daily_commit_data(self, username: str, start_date: datetime, end_date: datetime, github_token: str, timezone_name: Optional[str] = None) -> Optional[List[Dict]]:
         """
         Fetch daily commit data for a GitHub user over a specified period.
         
+        Finished days are served from github_daily_commits; only missing days and
+        days that can still change are searched on GitHub.
+        
         Args:
             username: GitHub username
             start_date: Start date for the analysis period
             end_date: End date for the analysis period
             github_token: GitHub API token
+            timezone_name: IANA timezone for day boundaries and working hours
+                (default: each commit author's own UTC offset)
             
         Returns:
             List of daily commit data or None if error
         """
+        fetched = await self.fetch_daily_commit_days(username, start_date, end_date, github_token, timezone_name)
+        return fetched[0] if fetched is not None else None
+    
+    async def fetch_daily_commit_days(self, username: str, start_date: datetime, end_date: datetime, github_token: str, timezone_name: Optional[str] = None) -> Optional[Tuple[List[Dict], bool]]:
+        """
+        Same as fetch_daily_commit_data, plus whether every returned day is in github_daily_commits.
+        
+        Returns (daily data, stored) or None if error. stored is False when the days
+        fetched from GitHub could not be written, so callers that aggregate in the
+        database must use the returned data instead.
+        """
+        from .github_commit_history import GitHubCommitHistoryStore, window_days
+        
+        try:
+            store = GitHubCommitHistoryStore(timezone_name)
+            days = window_days(start_date, end_date, store.tz_name)
+            if not days:
+                return [], True
+            
+            stored = (await asyncio.to_thread(store.load_days, [username], days)).get(username.lower(), {})
+            missing = store.missing_days(stored, days)
+            saved = True
+            
+            if missing:
+                fetched = await self._search_daily_commits(username, missing, github_token, store.tz_name)
+                if fetched is None:
+                    return None
+                histogram, complete = fetched
+                saved = await asyncio.to_thread(store.save_days, username, missing, histogram, complete)
+                for day in missing:
+                    stored[day] = histogram.get(day, {'commits': 0, 'after_hours_commits': 0, 'weekend_commits': 0})
+                logger.info(f"Fetched {len(missing)} of {len(days)} days of commits for {username} from GitHub")
+            else:
+                logger.info(f"Served {len(days)} days of commits for {username} from stored histograms")
+            
+            return [
+                {
+                    'date': day.isoformat(),
+                    'commits': stored[day]['commits'],
+                    'after_hours_commits': stored[day]['after_hours_commits'],
+                    'weekend_commits': stored[day]['weekend_commits']
+                }
+                for day in days
+            ], saved
+                
+        except Exception as e:
+            logger.error(f"Error fetching daily commit data for {username}: {e}")
+            return None
+    
+    async def _search_daily_commits(self, username: str, missing_days: List, github_token: str, tz_name: str):
+        """
+        Search a user's commits covering the missing days and bucket them per day.
+        
+        Returns (histogram, complete) where complete is False if the search hit GitHub's
+        1000-result cap, or None if GitHub could not be queried.
+        """
+        from .github_commit_history import build_histogram, search_range_for
+        
         headers = {
             'Authorization': f'token {github_token}',
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'Rootly-Burnout-Detector'
         }
-        
-        try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                # Check rate limit before starting
-                rate_check_url = "https://api.github.com/rate_limit"
-                async with session.get(rate_check_url, headers=headers) as resp:
-                    if resp.status == 200:
-                        rate_data = await resp.json()
-                        remaining = rate_data['rate']['remaining']
-                        reset_time = rate_data['rate']['reset']
-                        logger.info(f"GitHub API rate limit: {remaining} calls remaining, resets at {datetime.fromtimestamp(reset_time)}")
-                        
-                        if remaining < 50:
-                            logger.warning(f"Low GitHub API rate limit: only {remaining} calls remaining!")
-                            if remaining < 10:
-                                logger.error("Critical GitHub API rate limit! Aborting to prevent hitting limit.")
-                                return None
-                
-                # Initialize daily data structure
-                daily_commits = {}
-                current_date = start_date
-                
-                while current_date <= end_date:
-                    date_str = current_date.strftime('%Y-%m-%d')
-                    daily_commits[date_str] = {
-                        'date': date_str,
-                        'commits': 0,
-                        'after_hours_commits': 0,
-                        'weekend_commits': 0
-                    }
-                    current_date += timedelta(days=1)
+        search_start, search_end = search_range_for(missing_days)
+        search_url = "https://api.github.com/search/commits"
+        query = f"author:{username} author-date:{search_start.isoformat()}..{search_end.isoformat()}"
+        
+        commit_times = []
+        complete = True
+        page = 1
+        per_page = 100
+        total_fetched = 0
+        throttled_retries = 0
+        
+        async with self._client_session() as session:
+            while True:
+                params = {
+                    'q': query,
+                    'sort': 'author-date',
+                    'order': 'asc',
+                    'page': page,
+                    'per_page': per_page
+                }
                 
-                # Fetch commits using search API
-                search_url = f"https://api.github.com/search/commits"
-                query = f"author:{username} author-date:{start_date.strftime('%Y-%m-%d')}..{end_date.strftime('%Y-%m-%d')}"
+                await integration_rate_limiter.acquire("github", github_token, "search")
+                async with session.get(search_url, headers=headers, params=params) as resp:
+                    retry_in = integration_rate_limiter.record_response("github", github_token, "search", resp.status, resp.headers)
+                    if retry_in is not None and throttled_retries < 3:
+                        # The limiter blocks the bucket until GitHub's reset; retry the same page
+                        throttled_retries += 1
+                        continue
+                    if resp.status == 401:
+                        logger.error(f"GitHub API authentication failed for user {username} - token may be expired or invalid")
+                        return None
+                    elif resp.status == 403:
+                        logger.error("GitHub API rate limit exceeded or forbidden")
+                        return None
+                    elif resp.status != 200:
+                        logger.error(f"GitHub API error: {resp.status}")
+                        return None
+                    data = await resp.json()
                 
-                page = 1
-                per_page = 100
-                total_fetched = 0
+                items = data.get('items', [])
+                if not items:
+                    break
                 
-                while True:
-                    params = {
-                        'q': query,
-                        'sort': 'author-date',
-                        'order': 'asc',
-                        'page': page,
-                        'per_page': per_page
-                    }
-                    
-                    async with session.get(search_url, headers=headers, params=params) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            items = data.get('items', [])
-                            
-                            if not items:
-                                break
-                                
-                            # Process each commit
-                            for commit_item in items:
-                                commit = commit_item.get('commit', {})
-                                author = commit.get('author', {})
-                                date_str = author.get('date', '')
-                                
-                                if date_str:
-                                    # Parse commit datetime
-                                    commit_dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                                    commit_date = commit_dt.strftime('%Y-%m-%d')
-                                    
-                                    if commit_date in daily_commits:
-                                        daily_commits[commit_date]['commits'] += 1
-                                        
-                                        # Check if after hours (before 9am or after 5pm local time)
-                                        hour = commit_dt.hour
-                                        if hour < 9 or hour >= 17:
-                                            daily_commits[commit_date]['after_hours_commits'] += 1
-                                            
-                                        # Check if weekend
-                                        if commit_dt.weekday() >= 5:  # Saturday = 5, Sunday = 6
-                                            daily_commits[commit_date]['weekend_commits'] += 1
-                            
-                            total_fetched += len(items)
-                            
-                            # Check if we've fetched all results
-                            if total_fetched >= data.get('total_count', 0):
-                                break
-                                
-                            page += 1
-                            
-                            # GitHub search API has a limit of 1000 results
-                            if total_fetched >= 1000:
-                                logger.warning(f"Reached GitHub search API limit of 1000 results for {username}")
-                                break
-                                
-                        elif resp.status == 401:
-                            logger.error(f"GitHub API authentication failed for user {username} - token may be expired or invalid")
-                            return None
-                        elif resp.status == 403:
-                            logger.error("GitHub API rate limit exceeded or forbidden")
-                            return None
-                        else:
-                            logger.error(f"GitHub API error: {resp.status}")
-                            return None
+                for commit_item in items:
+                    date_str = commit_item.get('commit', {}).get('author', {}).get('date', '')
+                    if date_str:
+                        commit_times.append(datetime.fromisoformat(date_str.replace('Z', '+00:00')))
                 
-                # Convert to list sorted by date
-                daily_data = sorted(daily_commits.values(), key=lambda x: x['date'])
+                total_fetched += len(items)
+                if total_fetched >= data.get('total_count', 0):
+                    break
                 
-                logger.info(f"Fetched {total_fetched} commits for {username} from {start_date} to {end_date}")
-                return daily_data
-                
-        except Exception as e:
-            logger.error(f"Error fetching daily commit data for {username}: {e}")
-            return None
+                # GitHub search API has a limit of 1000 results
+                if total_fetched >= 1000:
+                    logger.warning(f"Reached GitHub search API limit of 1000 results for {username}")
+                    complete = False
+                    break
+                page += 1
+        
+        return build_histogram(commit_times, tz_name), complete
     
     async def collect_github_data_for_user(self, user_email: str, days: int = 30, github_token: str = None, user_id: Optional[int] = None, full_name: Optional[str] = None) -> Optional[Dict]:
         """
@@ -573,6 +657,12 @@ class GitHubCollector:
         # Use real GitHub API if token provided
         if github_token:
             logger.info(f"Using real GitHub API for {github_username} with token: {github_token[:10]}...")
+            from .github_graphql_collector import GitHubGraphQLCollector
+            contributions = await GitHubGraphQLCollector(github_token, self._shared_session).fetch_contributions(
+                [github_username], start_date, end_date
+            )
+            if github_username in contributions:
+                return self._build_activity_from_contributions(github_username, user_email, start_date, end_date, contributions[github_username])
             return await self._fetch_real_github_data(github_username, user_email, start_date, end_date, github_token)
         else:
             # No GitHub token available, use mock data for now
@@ -657,41 +747,133 @@ class GitHubCollector:
             self.business_hours['start'] <= dt.hour < self.business_hours['end']
         )
     
-    def _rate_limit(self):
-        """Simple rate limiting to avoid hitting GitHub API limits."""
-        import time
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        
-        self.last_request_time = time.time()
 
 
-async def collect_team_github_data(team_emails: List[str], days: int = 30, github_token: str = None, user_id: Optional[int] = None) -> Dict[str, Dict]:
+async def collect_team_github_data(
+    team_emails: List[str],
+    days: int = 30,
+    github_token: str = None,
+    user_id: Optional[int] = None,
+    email_to_name: Optional[Dict[str, str]] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    known_usernames: Optional[Dict[str, str]] = None
+) -> Dict[str, Dict]:
     """
     Collect GitHub data for all team members.
     
+    Usernames are resolved concurrently (GITHUB_TEAM_CONCURRENCY, default 8) over one shared
+    aiohttp session, contribution data is fetched in batched GraphQL queries, and the REST
+    search API covers users GraphQL could not. Each user step is bounded by
+    GITHUB_USER_TIMEOUT_SECONDS (default 90).
+    
     Args:
         team_emails: List of team member emails
         days: Number of days to analyze
         github_token: GitHub API token for real data collection
         user_id: User ID for checking manual mappings
+        email_to_name: Optional email -> full name map for name-based matching
+        progress_callback: Optional callable(completed, total) invoked as users finish
+        known_usernames: Optional email -> GitHub username map (e.g. cached mappings); these emails skip resolution
         
     Returns:
         Dict mapping email -> github_activity_data
     """
+    import aiohttp
+    
     collector = GitHubCollector()
     github_data = {}
+    concurrency = max(1, int(os.getenv("GITHUB_TEAM_CONCURRENCY", "8")))
+    user_timeout = float(os.getenv("GITHUB_USER_TIMEOUT_SECONDS", "90"))
+    semaphore = asyncio.Semaphore(concurrency)
+    total = len(team_emails)
+    completed = 0
+    timed_out = []
+    started_at = time.monotonic()
+    
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    
+    def report_progress():
+        nonlocal completed
+        completed += 1
+        if completed % 10 == 0 or completed == total:
+            logger.info(f"📊 GitHub collection progress: {completed}/{total} users ({time.monotonic() - started_at:.1f}s)")
+        if progress_callback:
+            try:
+                progress_callback(completed, total)
+            except Exception as e:
+                logger.debug(f"GitHub progress callback failed: {e}")
+    
+    async def bounded(email: str, coroutine):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(coroutine, timeout=user_timeout)
+            except asyncio.TimeoutError:
+                timed_out.append(email)
+                logger.warning(f"GitHub collection for {email} timed out after {user_timeout:.0f}s")
+            except Exception as e:
+                logger.error(f"Failed to collect GitHub data for {email}: {e}")
+            return None
+    
+    async def collect_one(email: str):
+        full_name = email_to_name.get(email) if email_to_name else None
+        user_data = await bounded(email, collector.collect_github_data_for_user(email, days, github_token, user_id, full_name=full_name))
+        if user_data:
+            github_data[email] = user_data
+        report_progress()
+    
+    async def resolve_username(email: str):
+        full_name = email_to_name.get(email) if email_to_name else None
+        username = await bounded(email, collector._correlate_email_to_github(email, github_token, user_id, full_name))
+        if not username:
+            logger.warning(f"No GitHub username found for email {email}")
+            report_progress()
+        return email, username
+    
+    async def fetch_rest(email: str, username: str):
+        user_data = await bounded(email, collector._fetch_real_github_data(username, email, start_date, end_date, github_token))
+        if user_data:
+            github_data[email] = user_data
+        report_progress()
     
-    for email in team_emails:
+    async with aiohttp.ClientSession() as session:
+        collector._shared_session = session
         try:
-            user_data = await collector.collect_github_data_for_user(email, days, github_token, user_id)
-            if user_data:
-                github_data[email] = user_data
-        except Exception as e:
-            logger.error(f"Failed to collect GitHub data for {email}: {e}")
+            if not github_token:
+                # Mock data path: nothing to batch
+                await asyncio.gather(*(collect_one(email) for email in team_emails))
+            else:
+                # 1. Resolve GitHub usernames concurrently (known usernames are taken as-is)
+                known_usernames = known_usernames or {}
+                resolved = dict(await asyncio.gather(
+                    *(resolve_username(email) for email in team_emails if not known_usernames.get(email))
+                ))
+                resolved.update({email: known_usernames[email] for email in team_emails if known_usernames.get(email)})
+                email_to_username = {email: username for email, username in resolved.items() if username}
+                
+                # 2. One GraphQL round-trip per batch of users for contribution data
+                from .github_graphql_collector import GitHubGraphQLCollector
+                contributions = await GitHubGraphQLCollector(github_token, session).fetch_contributions(
+                    list(email_to_username.values()), start_date, end_date
+                )
+                rest_fallback = []
+                for email, username in email_to_username.items():
+                    if username in contributions:
+                        github_data[email] = collector._build_activity_from_contributions(
+                            username, email, start_date, end_date, contributions[username]
+                        )
+                        report_progress()
+                    else:
+                        rest_fallback.append((email, username))
+                
+                # 3. REST search for anyone GraphQL couldn't cover (not found, failed batch, over budget)
+                if rest_fallback:
+                    logger.info(f"GitHub REST fallback for {len(rest_fallback)} users")
+                    await asyncio.gather(*(fetch_rest(email, username) for email, username in rest_fallback))
+        finally:
+            collector._shared_session = None
     
-    logger.info(f"Collected GitHub data for {len(github_data)} users out of {len(team_emails)}")
-    return github_data
\ No newline at end of file
+    if timed_out:
+        logger.warning(f"GitHub collection timed out for {len(timed_out)} users: {timed_out[:10]}")
+    logger.info(f"Collected GitHub data for {len(github_data)} users out of {len(team_emails)} in {time.monotonic() - started_at:.1f}s")
+    return github_data
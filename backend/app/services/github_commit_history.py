@@ -0,0 +1,220 @@
+"""
+Stored per-day GitHub commit histograms.
+
+Each (username, timezone, day) is fetched from the search API until it has
+settled and answered from github_daily_commits afterwards; only days that are
+missing or were still recent when fetched (or came from a truncated search)
+are fetched again.
+"""
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+AUTHOR_LOCAL_TZ = "author_local"
+
+
+def resolve_timezone(timezone_name: Optional[str]) -> str:
+    """Normalize a requested timezone: a valid IANA name, or AUTHOR_LOCAL_TZ for the committer's own offset."""
+    if not timezone_name or timezone_name == AUTHOR_LOCAL_TZ:
+        return AUTHOR_LOCAL_TZ
+    try:
+        return pytz.timezone(timezone_name).zone
+    except pytz.UnknownTimeZoneError:
+        logger.warning(f"Unknown timezone '{timezone_name}', using commit author offsets")
+        return AUTHOR_LOCAL_TZ
+
+
+def localize_commit_time(commit_dt: datetime, tz_name: str) -> datetime:
+    """Express a commit's author date in the histogram timezone (author dates keep their own offset)."""
+    if commit_dt.tzinfo is None:
+        commit_dt = commit_dt.replace(tzinfo=timezone.utc)
+    if tz_name == AUTHOR_LOCAL_TZ:
+        return commit_dt
+    return commit_dt.astimezone(pytz.timezone(tz_name))
+
+
+def window_days(start_date: datetime, end_date: datetime, tz_name: str) -> List[date]:
+    """Calendar days covered by [start_date, end_date], never past today."""
+    def to_day(value: datetime) -> date:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        if tz_name != AUTHOR_LOCAL_TZ:
+            value = value.astimezone(pytz.timezone(tz_name))
+        return value.date()
+
+    first = to_day(start_date)
+    last = min(to_day(end_date), to_day(datetime.now(timezone.utc)))
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def build_histogram(commit_times: Iterable[datetime], tz_name: str) -> Dict[date, Dict[str, int]]:
+    """Bucket commit author dates into per-day totals, after-hours (before 9 / from 17) and weekend counts."""
+    histogram: Dict[date, Dict[str, int]] = {}
+    for commit_dt in commit_times:
+        local = localize_commit_time(commit_dt, tz_name)
+        day = histogram.setdefault(local.date(), {"commits": 0, "after_hours_commits": 0, "weekend_commits": 0})
+        day["commits"] += 1
+        if local.hour < 9 or local.hour >= 17:
+            day["after_hours_commits"] += 1
+        if local.weekday() >= 5:
+            day["weekend_commits"] += 1
+    return histogram
+
+
+class GitHubCommitHistoryStore:
+    """
+    Read/write access to github_daily_commits for one timezone.
+
+    Features:
+    - A day is final only if it was FINAL_AFTER_DAYS old when fetched: search indexes
+      commits late, and the latest days can still change in other offsets
+    - Zero-commit days are stored too, so "no commits" is a cache hit
+    - All failures are logged and treated as "nothing stored" so callers fall back to GitHub
+    - Methods are blocking; async callers run them with asyncio.to_thread
+    """
+
+    INSERT_CHUNK_SIZE = 1000
+    FINAL_AFTER_DAYS = int(os.getenv("GITHUB_COMMIT_DAYS_FINAL_AFTER", "3"))
+
+    def __init__(self, timezone_name: Optional[str] = None):
+        self.tz_name = resolve_timezone(timezone_name)
+
+    def load_days(self, usernames: List[str], days: List[date]) -> Dict[str, Dict[date, Dict[str, Any]]]:
+        """Stored rows per lowercased username and day."""
+        if not usernames or not days:
+            return {}
+        from ..models import SessionLocal, GitHubDailyCommits
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                GitHubDailyCommits.github_username, GitHubDailyCommits.date, GitHubDailyCommits.commits,
+                GitHubDailyCommits.after_hours_commits, GitHubDailyCommits.weekend_commits, GitHubDailyCommits.is_final
+            ).filter(
+                GitHubDailyCommits.github_username.in_([u.lower() for u in usernames]),
+                GitHubDailyCommits.timezone == self.tz_name,
+                GitHubDailyCommits.date >= days[0],
+                GitHubDailyCommits.date <= days[-1]
+            ).all()
+            stored: Dict[str, Dict[date, Dict[str, Any]]] = {}
+            for row in rows:
+                stored.setdefault(row.github_username, {})[row.date] = {
+                    "commits": row.commits,
+                    "after_hours_commits": row.after_hours_commits,
+                    "weekend_commits": row.weekend_commits,
+                    "is_final": row.is_final,
+                }
+            return stored
+        except Exception as e:
+            logger.warning(f"Could not load stored GitHub commit days: {e}")
+            return {}
+        finally:
+            db.close()
+
+    @staticmethod
+    def missing_days(stored: Dict[date, Dict[str, Any]], days: List[date]) -> List[date]:
+        """Days in the window that have no final stored row."""
+        return [day for day in days if not stored.get(day, {}).get("is_final")]
+
+    def is_settled(self, day: date, fetched_at: datetime) -> bool:
+        """Whether a day fetched at fetched_at is old enough that its count will no longer change."""
+        return (fetched_at.astimezone(timezone.utc).date() - day).days >= self.FINAL_AFTER_DAYS
+
+    def day_rows(self, username: str, days: List[date], histogram: Dict[date, Dict[str, int]],
+                 complete: bool, fetched_at: datetime) -> List[Dict[str, Any]]:
+        """github_daily_commits rows for a fetch (zeros for days without commits)."""
+        return [
+            {
+                "github_username": username.lower(),
+                "timezone": self.tz_name,
+                "date": day,
+                "commits": histogram.get(day, {}).get("commits", 0),
+                "after_hours_commits": histogram.get(day, {}).get("after_hours_commits", 0),
+                "weekend_commits": histogram.get(day, {}).get("weekend_commits", 0),
+                "is_final": complete and self.is_settled(day, fetched_at),
+                "fetched_at": fetched_at,
+            }
+            for day in days
+        ]
+
+    def save_days(self, username: str, days: List[date], histogram: Dict[date, Dict[str, int]], complete: bool = True) -> bool:
+        """Upsert the given days (zeros for days without commits). Returns False if the write failed."""
+        if not days:
+            return True
+        from sqlalchemy.dialects.postgresql import insert
+        from ..models import SessionLocal, GitHubDailyCommits
+
+        rows = self.day_rows(username, days, histogram, complete, datetime.now(timezone.utc))
+
+        db = SessionLocal()
+        try:
+            for i in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+                stmt = insert(GitHubDailyCommits).values(rows[i:i + self.INSERT_CHUNK_SIZE])
+                db.execute(stmt.on_conflict_do_update(
+                    constraint="uq_github_daily_commits",
+                    set_={
+                        "commits": stmt.excluded.commits,
+                        "after_hours_commits": stmt.excluded.after_hours_commits,
+                        "weekend_commits": stmt.excluded.weekend_commits,
+                        "is_final": stmt.excluded.is_final,
+                        "fetched_at": stmt.excluded.fetched_at,
+                    }
+                ))
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to store GitHub commit days for {username}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def team_timeline(self, usernames: List[str], days: List[date]) -> Optional[List[Dict[str, Any]]]:
+        """Per-day totals across users, aggregated in the database. None if the store could not be read."""
+        if not usernames or not days:
+            return []
+        from sqlalchemy import func, case
+        from ..models import SessionLocal, GitHubDailyCommits
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                GitHubDailyCommits.date,
+                func.sum(GitHubDailyCommits.commits).label("commits"),
+                func.sum(GitHubDailyCommits.after_hours_commits).label("after_hours_commits"),
+                func.sum(GitHubDailyCommits.weekend_commits).label("weekend_commits"),
+                func.sum(case((GitHubDailyCommits.commits > 0, 1), else_=0)).label("unique_contributors")
+            ).filter(
+                GitHubDailyCommits.github_username.in_([u.lower() for u in usernames]),
+                GitHubDailyCommits.timezone == self.tz_name,
+                GitHubDailyCommits.date >= days[0],
+                GitHubDailyCommits.date <= days[-1]
+            ).group_by(GitHubDailyCommits.date).order_by(GitHubDailyCommits.date).all()
+            return [
+                {
+                    "date": row.date.isoformat(),
+                    "commits": int(row.commits or 0),
+                    "after_hours_commits": int(row.after_hours_commits or 0),
+                    "weekend_commits": int(row.weekend_commits or 0),
+                    "unique_contributors": int(row.unique_contributors or 0),
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            logger.warning(f"Failed to aggregate stored GitHub commit days: {e}")
+            return None
+        finally:
+            db.close()
+
+
+def search_range_for(missing: List[date]) -> Tuple[date, date]:
+    """
+    Author-date range to search for a set of missing days.
+
+    Search qualifiers are evaluated in UTC, so the range is padded by a day on each side
+    to catch commits that fall on a missing local day but a neighbouring UTC day.
+    """
+    return missing[0] - timedelta(days=1), missing[-1] + timedelta(days=1)
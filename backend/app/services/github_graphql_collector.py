@@ -0,0 +1,228 @@
+"""
+Batched GitHub contribution collection through the GraphQL API.
+
+One query fetches contributionsCollection for several users at once using
+field aliases, replacing two REST search calls per user and the fixed
+after-hours / weekend / review estimates with real per-day data.
+
+Days are bucketed in the user's own timezone, as the REST commit histograms
+bucket by each commit's author offset: commit contributions are reported at
+local midnight, which also gives the offset used for PR and review hours.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from ..core.api_rate_limiter import integration_rate_limiter, parse_rate_limit_reset
+
+logger = logging.getLogger(__name__)
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Logins are interpolated into the query, so only valid GitHub login characters are accepted
+VALID_LOGIN = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$")
+
+CONTRIBUTIONS_FRAGMENT = """
+fragment BurnoutContributions on User {
+  login
+  contributionsCollection(from: $from, to: $to) {
+    totalCommitContributions
+    totalPullRequestContributions
+    totalPullRequestReviewContributions
+    totalRepositoriesWithContributedCommits
+    commitContributionsByRepository(maxRepositories: 100) {
+      contributions(first: 100) {
+        nodes { occurredAt commitCount }
+      }
+    }
+    pullRequestContributions(first: 100) {
+      nodes { occurredAt }
+    }
+    pullRequestReviewContributions(first: 100) {
+      nodes { occurredAt }
+    }
+  }
+}
+"""
+
+
+class GitHubGraphQLCollector:
+    """
+    Fetches contribution data for batches of GitHub users in single GraphQL round-trips.
+
+    Features:
+    - Aliased user(login:) fields, GITHUB_GRAPHQL_BATCH_SIZE users per query (default 10)
+    - Point budget per run (GITHUB_GRAPHQL_POINT_BUDGET, default 500); users beyond it are
+      left for the REST fallback
+    - rateLimit feedback into the shared limiter's GraphQL bucket
+    - Users whose per-day commits don't add up to totalCommitContributions (more
+      repositories or days than one page returns) are left for the REST fallback
+    """
+
+    BATCH_SIZE = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "10"))
+    POINT_BUDGET = int(os.getenv("GITHUB_GRAPHQL_POINT_BUDGET", "500"))
+
+    def __init__(self, github_token: str, session=None):
+        self.github_token = github_token
+        self.session = session
+        self.points_spent = 0
+        self.headers = {
+            'Authorization': f'bearer {github_token}',
+            'Content-Type': 'application/json',
+            'User-Agent': 'Rootly-Burnout-Detector'
+        }
+
+    @staticmethod
+    def _build_query(aliases: Dict[str, str]) -> str:
+        fields = "\n".join(f'  {alias}: user(login: "{login}") {{ ...BurnoutContributions }}' for alias, login in aliases.items())
+        return (
+            "query($from: DateTime!, $to: DateTime!) {\n"
+            f"{fields}\n"
+            "  rateLimit { cost remaining resetAt }\n"
+            "}\n" + CONTRIBUTIONS_FRAGMENT
+        )
+
+    async def _run_batch(self, session, logins: List[str], start_date: datetime, end_date: datetime) -> Optional[Dict[str, Any]]:
+        aliases = {f"u{i}": login for i, login in enumerate(logins)}
+        payload = {
+            "query": self._build_query(aliases),
+            "variables": {"from": _to_iso(start_date), "to": _to_iso(end_date)},
+        }
+
+        await integration_rate_limiter.acquire("github", self.github_token, "graphql")
+        async with session.post(GITHUB_GRAPHQL_URL, headers=self.headers, json=payload) as resp:
+            integration_rate_limiter.record_response("github", self.github_token, "graphql", resp.status, resp.headers)
+            if resp.status != 200:
+                logger.warning(f"GitHub GraphQL batch failed with HTTP {resp.status}")
+                return None
+            body = await resp.json()
+
+        data = body.get("data") or {}
+        rate_limit = data.get("rateLimit") or {}
+        self.points_spent += rate_limit.get("cost") or 1
+        if rate_limit.get("remaining") == 0 and rate_limit.get("resetAt"):
+            reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace('Z', '+00:00')).timestamp()
+            integration_rate_limiter.penalize("github", self.github_token, "graphql", parse_rate_limit_reset(reset_at) or 0)
+
+        # Unknown logins come back as null with a NOT_FOUND error; the rest of the batch is still valid
+        for error in body.get("errors") or []:
+            logger.debug(f"GitHub GraphQL error: {error.get('message')}")
+
+        results = {}
+        for alias, user in data.items():
+            if alias not in aliases or not user or not user.get("contributionsCollection"):
+                continue
+            summary = _summarize_contributions(user["contributionsCollection"])
+            daily_total = sum(summary["daily_commits"].values())
+            if daily_total != summary["total_commits"]:
+                logger.info(
+                    f"GitHub GraphQL daily commits for {aliases[alias]} are truncated "
+                    f"({daily_total} of {summary['total_commits']}), using REST"
+                )
+                continue
+            results[aliases[alias]] = summary
+        return results
+
+    async def fetch_contributions(self, logins: List[str], start_date: datetime, end_date: datetime) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch contribution summaries for many users.
+
+        Returns login -> summary for every user that was fetched; logins that are missing
+        (not found, failed batch or over budget) should be collected another way.
+        """
+        unique_logins = list(dict.fromkeys(login for login in logins if login and VALID_LOGIN.match(login)))
+        results: Dict[str, Dict[str, Any]] = {}
+        if not unique_logins or not self.github_token:
+            return results
+
+        started_at = time.monotonic()
+        if self.session is None:
+            import aiohttp
+            async with aiohttp.ClientSession() as session:
+                await self._fetch_batches(session, unique_logins, start_date, end_date, results)
+        else:
+            await self._fetch_batches(self.session, unique_logins, start_date, end_date, results)
+
+        logger.info(
+            f"📊 GitHub GraphQL: {len(results)}/{len(unique_logins)} users in {time.monotonic() - started_at:.1f}s "
+            f"({self.points_spent} points)"
+        )
+        return results
+
+    async def _fetch_batches(self, session, logins: List[str], start_date: datetime, end_date: datetime, results: Dict) -> None:
+        for i in range(0, len(logins), self.BATCH_SIZE):
+            if self.points_spent >= self.POINT_BUDGET:
+                logger.warning(f"GitHub GraphQL point budget ({self.POINT_BUDGET}) reached; {len(logins) - i} users left for REST")
+                return
+            batch = logins[i:i + self.BATCH_SIZE]
+            try:
+                batch_results = await self._run_batch(session, batch, start_date, end_date)
+            except Exception as e:
+                logger.warning(f"GitHub GraphQL batch of {len(batch)} users failed: {e}")
+                batch_results = None
+            if batch_results:
+                results.update(batch_results)
+
+
+def _to_iso(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.astimezone(timezone.utc)
+    return value.isoformat()
+
+
+def _parse_occurred_at(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _local_midnight_offset(occurred_at: datetime) -> timedelta:
+    """
+    UTC offset of a commit contribution, which GitHub reports at midnight in the user's timezone.
+
+    Offsets are taken in (-12h, +12h], so e.g. 23:00Z is midnight at UTC+1 and 08:00Z at UTC-8.
+    """
+    if occurred_at.utcoffset():
+        return occurred_at.utcoffset()
+    minutes = occurred_at.hour * 60 + occurred_at.minute
+    return timedelta(minutes=24 * 60 - minutes if minutes >= 12 * 60 else -minutes)
+
+
+def _summarize_contributions(collection: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a contributionsCollection to totals, per-day commits and activity times in the user's timezone."""
+    daily_commits: Dict[str, int] = {}
+    offsets: Counter = Counter()
+    for repo in collection.get("commitContributionsByRepository") or []:
+        for node in (repo.get("contributions") or {}).get("nodes") or []:
+            occurred_at = _parse_occurred_at(node.get("occurredAt"))
+            if occurred_at:
+                offset = _local_midnight_offset(occurred_at)
+                offsets[offset] += 1
+                day = (occurred_at.astimezone(timezone.utc) + offset).date().isoformat()
+                daily_commits[day] = daily_commits.get(day, 0) + (node.get("commitCount") or 0)
+
+    # Commit contributions are day-granular; PRs and reviews carry real timestamps, shifted into
+    # the user's timezone. Without commits there is no offset, so hours are left to the estimate.
+    timestamped = []
+    user_offset = offsets.most_common(1)[0][0] if offsets else None
+    if user_offset is not None:
+        local_tz = timezone(user_offset)
+        for key in ("pullRequestContributions", "pullRequestReviewContributions"):
+            for node in (collection.get(key) or {}).get("nodes") or []:
+                occurred_at = _parse_occurred_at(node.get("occurredAt"))
+                if occurred_at:
+                    timestamped.append(occurred_at.astimezone(local_tz))
+
+    return {
+        "total_commits": collection.get("totalCommitContributions") or 0,
+        "total_pull_requests": collection.get("totalPullRequestContributions") or 0,
+        "total_reviews": collection.get("totalPullRequestReviewContributions") or 0,
+        "repositories_touched": collection.get("totalRepositoriesWithContributedCommits") or 0,
+        "daily_commits": daily_commits,
+        "activity_timestamps": timestamped,
+    }
@@ -9,7 +9,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from sqlalchemy.orm import Session
 
-from .mapping_recorder import MappingRecorder
+from .mapping_recorder import MappingRecorder, BatchMappingRecorder
 from .github_collector import GitHubCollector, collect_team_github_data
 from ..models import get_db
 
@@ -31,6 +31,7 @@ class GitHubMappingService:
     MAPPING_CACHE_DAYS = 7      # Username mappings stable for week
     FAILED_RETRY_HOURS = 24     # Retry failed mappings daily
     ACTIVITY_REFRESH_ALWAYS = True  # Always get fresh activity data
+    LOOKUP_CHUNK_SIZE = 1000    # Emails per cached-mapping query
     
     def __init__(self, db: Session = None):
         self.db = db or next(get_db())
@@ -44,14 +45,15 @@ class GitHubMappingService:
         github_token: str = None,
         user_id: Optional[int] = None,
         analysis_id: Optional[int] = None,
-        source_platform: str = "rootly"
+        source_platform: str = "rootly",
+        email_to_name: Optional[Dict[str, str]] = None
     ) -> Dict[str, Dict]:
         """
         Smart GitHub data collection with intelligent caching.
         
         Strategy:
-        1. Check for recent successful mappings (reuse if < 7 days old)
-        2. For cached mappings: refresh activity data only
+        1. Check for recent successful mappings (reuse if < 7 days old), one query for all emails
+        2. For cached mappings: refresh activity data only, batched for all cached usernames
         3. For missing/stale mappings: attempt new mapping
         4. For failed mappings: retry if > 24 hours old
         """
@@ -62,9 +64,10 @@ class GitHubMappingService:
         emails_needing_activity_refresh = []
         cache_stats = {"hits": 0, "misses": 0, "refreshes": 0, "retries": 0}
         
-        # Phase 1: Analyze cache status for each email
+        # Phase 1: Analyze cache status for each email (latest mappings loaded in one query)
+        cached_mappings = self._get_cached_mappings(team_emails, user_id)
         for email in team_emails:
-            cached_mapping = self._get_cached_mapping(email, user_id)
+            cached_mapping = cached_mappings.get(email)
             
             if cached_mapping and self._is_mapping_fresh(cached_mapping):
                 # Cache HIT: Reuse mapping, refresh activity only
@@ -96,25 +99,31 @@ class GitHubMappingService:
         # Phase 2: Refresh activity data for cached mappings
         if emails_needing_activity_refresh:
             logger.info(f"🔄 ACTIVITY REFRESH: Processing {len(emails_needing_activity_refresh)} cached mappings")
-            for email, cached_mapping in emails_needing_activity_refresh:
-                try:
-                    refreshed_data = await self._refresh_activity_data(
-                        email, cached_mapping, days, github_token, analysis_id
-                    )
+            try:
+                refreshed = await self._refresh_activity_data_bulk(
+                    dict(emails_needing_activity_refresh), days, github_token, user_id, email_to_name
+                )
+                batch_recorder = BatchMappingRecorder(self.db)
+                for email, cached_mapping in emails_needing_activity_refresh:
+                    refreshed_data = refreshed.get(email)
                     if refreshed_data:
                         results[email] = refreshed_data
                         # Update mapping record with fresh data points
-                        self._update_mapping_data_points(cached_mapping, refreshed_data, analysis_id)
+                        self._update_mapping_data_points(cached_mapping, refreshed_data, analysis_id, batch_recorder)
+                try:
+                    batch_recorder.flush()
                 except Exception as e:
-                    logger.warning(f"Failed to refresh activity for {email}: {e}")
-                    # Fall back to creating new mapping
-                    emails_needing_mapping.append(email)
+                    logger.warning(f"Failed to record refreshed mapping data points: {e}")
+            except Exception as e:
+                logger.warning(f"Failed to refresh activity for cached mappings: {e}")
+                # Fall back to creating new mappings
+                emails_needing_mapping.extend(email for email, _ in emails_needing_activity_refresh)
         
         # Phase 3: Create new mappings for cache misses
         if emails_needing_mapping:
             logger.info(f"🆕 NEW MAPPINGS: Processing {len(emails_needing_mapping)} emails")
             new_results = await self._create_new_mappings(
-                emails_needing_mapping, days, github_token, user_id, analysis_id, source_platform
+                emails_needing_mapping, days, github_token, user_id, analysis_id, source_platform, email_to_name
             )
             results.update(new_results)
         
@@ -129,12 +138,25 @@ class GitHubMappingService:
     
     def _get_cached_mapping(self, email: str, user_id: int) -> Optional[Any]:
         """Get the most recent mapping for an email."""
+        return self._get_cached_mappings([email], user_id).get(email)
+    
+    def _get_cached_mappings(self, emails: List[str], user_id: int) -> Dict[str, Any]:
+        """Get the most recent mapping for each email with one DISTINCT ON query per chunk of emails."""
         from ..models import IntegrationMapping
-        return self.db.query(IntegrationMapping).filter(
-            IntegrationMapping.user_id == user_id,
-            IntegrationMapping.source_identifier == email,
-            IntegrationMapping.target_platform == "github"
-        ).order_by(IntegrationMapping.created_at.desc()).first()
+        latest = {}
+        unique_emails = list(dict.fromkeys(emails))
+        for i in range(0, len(unique_emails), self.LOOKUP_CHUNK_SIZE):
+            rows = self.db.query(IntegrationMapping).filter(
+                IntegrationMapping.user_id == user_id,
+                IntegrationMapping.source_identifier.in_(unique_emails[i:i + self.LOOKUP_CHUNK_SIZE]),
+                IntegrationMapping.target_platform == "github"
+            ).distinct(IntegrationMapping.source_identifier).order_by(
+                IntegrationMapping.source_identifier, IntegrationMapping.created_at.desc()
+            ).all()
+            # Rows come newest first per email, so the first one seen is the latest
+            for row in rows:
+                latest.setdefault(row.source_identifier, row)
+        return latest
     
     def _is_mapping_fresh(self, mapping) -> bool:
         """Check if mapping is fresh (successful and < 7 days old)."""
@@ -161,42 +183,44 @@ class GitHubMappingService:
         """Get age of mapping in days."""
         return (datetime.utcnow() - mapping.created_at).total_seconds() / 86400
     
-    async def _refresh_activity_data(
-        self, 
-        email: str, 
-        cached_mapping, 
-        days: int, 
+    async def _refresh_activity_data_bulk(
+        self,
+        cached_mappings: Dict[str, Any],
+        days: int,
         github_token: str,
-        analysis_id: int
-    ) -> Optional[Dict]:
+        user_id: Optional[int],
+        email_to_name: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict]:
         """
-        Refresh activity data for a cached mapping.
-        Reuse the username but get fresh commits/PRs/reviews.
+        Refresh activity data for cached mappings.
+        Reuse the cached usernames (no re-correlation) and collect fresh commits/PRs/reviews for
+        all of them together: batched GraphQL, with concurrent REST fallback.
         """
-        username = cached_mapping.target_identifier
-        if not username or username == "unknown":
-            return None
-            
-        logger.debug(f"🔄 Refreshing activity for {email} -> {username}")
+        known_usernames = {
+            email: mapping.target_identifier
+            for email, mapping in cached_mappings.items()
+            if mapping.target_identifier and mapping.target_identifier != "unknown"
+        }
+        if not known_usernames:
+            return {}
         
-        try:
-            # Get fresh activity data using cached username
-            user_data = await self.github_collector.collect_github_data_for_user(
-                email, days, github_token
-            )
-            
+        team_data = await collect_team_github_data(
+            list(known_usernames), days, github_token, user_id,
+            email_to_name=email_to_name, known_usernames=known_usernames
+        )
+        
+        refreshed = {}
+        for email, user_data in team_data.items():
             if user_data and isinstance(user_data, dict):
                 # Ensure username matches cached mapping
-                user_data['username'] = username
+                user_data['username'] = known_usernames[email]
                 user_data['email'] = email
-                return user_data
-            else:
-                logger.warning(f"No activity data returned for {email} -> {username}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Failed to refresh activity data for {email}: {e}")
-            return None
+                refreshed[email] = user_data
+        
+        missing = len(known_usernames) - len(refreshed)
+        if missing:
+            logger.warning(f"No activity data returned for {missing} cached mappings")
+        return refreshed
     
     async def _create_new_mappings(
         self,
@@ -205,7 +229,8 @@ class GitHubMappingService:
         github_token: str,
         user_id: int,
         analysis_id: int,
-        source_platform: str
+        source_platform: str,
+        email_to_name: Optional[Dict[str, str]] = None
     ) -> Dict[str, Dict]:
         """Create new mappings using the enhanced GitHub collector."""
         from .enhanced_github_collector import collect_team_github_data_with_mapping
@@ -219,14 +244,16 @@ class GitHubMappingService:
                 github_token=github_token,
                 user_id=user_id,
                 analysis_id=analysis_id,
-                source_platform=source_platform
+                source_platform=source_platform,
+                email_to_name=email_to_name,
+                use_cache=False
             )
         except Exception as e:
             logger.error(f"Failed to create new mappings: {e}")
             return {}
     
-    def _update_mapping_data_points(self, mapping, refreshed_data: Dict, analysis_id: int):
-        """Update mapping record with fresh data points count."""
+    def _update_mapping_data_points(self, mapping, refreshed_data: Dict, analysis_id: int, recorder: Optional[MappingRecorder] = None):
+        """Update mapping record with fresh data points count (buffered when given a BatchMappingRecorder)."""
         try:
             if isinstance(refreshed_data, dict):
                 metrics = refreshed_data.get("metrics", {})
@@ -237,7 +264,7 @@ class GitHubMappingService:
                 )
                 
                 # Create new mapping record for this analysis with updated data points
-                self.recorder.record_successful_mapping(
+                (recorder or self.recorder).record_successful_mapping(
                     user_id=mapping.user_id,
                     analysis_id=analysis_id,
                     source_platform=mapping.source_platform,
@@ -0,0 +1,211 @@
+"""
+Concurrent, persisted crawl of GitHub organization member profiles.
+
+Member lists and public profiles are kept in github_member_profiles with
+TTLs, so only new or stale members are fetched again and every worker
+shares the same warm data.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from ..core.github_http_cache import github_conditional_get
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubOrgProfileCrawler:
+    """
+    Keeps organization member lists and public profiles fresh in the database.
+
+    Features:
+    - Member lists re-listed after GITHUB_ORG_MEMBERS_TTL_MINUTES (default 60); departed members are dropped
+    - Profiles re-fetched after GITHUB_PROFILE_TTL_HOURS (default 168), only for new or stale members
+    - Profile requests run GITHUB_PROFILE_CONCURRENCY at a time (default 8), paced by the shared rate limiter
+    - Database reads and writes run in a worker thread so they don't block the event loop
+    - Falls back to an in-memory crawl when the database is unavailable
+    """
+
+    MEMBERS_TTL_SECONDS = int(os.getenv("GITHUB_ORG_MEMBERS_TTL_MINUTES", "60")) * 60
+    PROFILE_TTL_SECONDS = int(os.getenv("GITHUB_PROFILE_TTL_HOURS", "168")) * 3600
+    CONCURRENCY = int(os.getenv("GITHUB_PROFILE_CONCURRENCY", "8"))
+
+    def __init__(self, github_token: str, headers: Dict[str, str], timeout: Optional[Any] = None):
+        self.github_token = github_token
+        self.headers = headers
+        # aiohttp.ClientTimeout for each request, so it holds on sessions the crawler didn't create
+        self._request_kwargs = {"timeout": timeout} if timeout is not None else {}
+
+    async def _fetch_org_logins(self, org: str, session) -> Optional[Set[str]]:
+        """List an organization's members. None if the list could not be fetched completely."""
+        members = set()
+        page = 1
+        while True:
+            url = f"https://api.github.com/orgs/{org}/members?per_page=100&page={page}"
+            async with github_conditional_get(session, url, self.github_token, self.headers, **self._request_kwargs) as resp:
+                if resp.status != 200:
+                    logger.warning(f"Failed to list members of {org}: HTTP {resp.status}")
+                    return None
+                data = await resp.json()
+            members.update(member['login'] for member in data if member.get('login'))
+            if len(data) < 100:
+                return members
+            page += 1
+
+    async def _fetch_profile(self, login: str, session) -> Optional[Dict[str, Any]]:
+        url = f"https://api.github.com/users/{login}"
+        try:
+            async with github_conditional_get(session, url, self.github_token, self.headers, **self._request_kwargs) as resp:
+                if resp.status == 200:
+                    return await resp.json()
+        except Exception as e:
+            logger.debug(f"Error fetching profile for {login}: {e}")
+        return None
+
+    def _load_rows(self, org: str) -> Optional[List[Any]]:
+        from ..models import SessionLocal, GitHubMemberProfile
+        db = SessionLocal()
+        try:
+            return db.query(
+                GitHubMemberProfile.login, GitHubMemberProfile.name, GitHubMemberProfile.public_email,
+                GitHubMemberProfile.seen_at, GitHubMemberProfile.profile_fetched_at
+            ).filter(GitHubMemberProfile.organization == org.lower()).all()
+        except Exception as e:
+            logger.warning(f"Could not load stored GitHub profiles for {org}: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _save_members(self, org: str, logins: Set[str]) -> None:
+        """Upsert the current member list and drop members that left the organization."""
+        from sqlalchemy.dialects.postgresql import insert
+        from ..models import SessionLocal, GitHubMemberProfile
+        now = datetime.now(timezone.utc)
+        rows = [{"organization": org.lower(), "login": login, "seen_at": now} for login in logins]
+        db = SessionLocal()
+        try:
+            for i in range(0, len(rows), 1000):
+                stmt = insert(GitHubMemberProfile).values(rows[i:i + 1000])
+                db.execute(stmt.on_conflict_do_update(
+                    constraint="uq_github_member_profile", set_={"seen_at": stmt.excluded.seen_at}
+                ))
+            db.query(GitHubMemberProfile).filter(
+                GitHubMemberProfile.organization == org.lower(),
+                GitHubMemberProfile.seen_at < now
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to store GitHub member list for {org}: {e}")
+        finally:
+            db.close()
+
+    def _save_profiles(self, org: str, profiles: Dict[str, Dict[str, Any]]) -> None:
+        from sqlalchemy.dialects.postgresql import insert
+        from ..models import SessionLocal, GitHubMemberProfile
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "organization": org.lower(),
+                "login": login,
+                "name": (profile.get("name") or "")[:255] or None,
+                "public_email": (profile.get("email") or "")[:255] or None,
+                "updated_at": _parse_github_time(profile.get("updated_at")),
+                "seen_at": now,
+                "profile_fetched_at": now,
+            }
+            for login, profile in profiles.items()
+        ]
+        if not rows:
+            return
+        db = SessionLocal()
+        try:
+            for i in range(0, len(rows), 1000):
+                stmt = insert(GitHubMemberProfile).values(rows[i:i + 1000])
+                db.execute(stmt.on_conflict_do_update(
+                    constraint="uq_github_member_profile",
+                    set_={
+                        "name": stmt.excluded.name,
+                        "public_email": stmt.excluded.public_email,
+                        "updated_at": stmt.excluded.updated_at,
+                        "profile_fetched_at": stmt.excluded.profile_fetched_at,
+                    }
+                ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to store GitHub profiles for {org}: {e}")
+        finally:
+            db.close()
+
+    async def get_org_members(self, org: str, session) -> Set[str]:
+        """Current member logins, re-listed from GitHub only when the stored list is stale."""
+        return await self._current_members(org, session, await asyncio.to_thread(self._load_rows, org))
+
+    async def _current_members(self, org: str, session, rows: Optional[List[Any]]) -> Set[str]:
+        now = datetime.now(timezone.utc)
+        if rows and max(row.seen_at for row in rows) > now - timedelta(seconds=self.MEMBERS_TTL_SECONDS):
+            return {row.login for row in rows}
+
+        logins = await self._fetch_org_logins(org, session)
+        if logins is None:
+            # Listing failed: a stale list beats none
+            return {row.login for row in rows or []}
+        if rows is not None:
+            await asyncio.to_thread(self._save_members, org, logins)
+        return logins
+
+    async def get_member_profiles(self, org: str, session) -> List[Dict[str, Any]]:
+        """
+        Members of an organization with their public name and email.
+
+        Only members without a fresh stored profile are fetched from GitHub.
+        """
+        stored_rows = await asyncio.to_thread(self._load_rows, org)
+        store_available = stored_rows is not None
+        logins = await self._current_members(org, session, stored_rows)
+        rows = {row.login: row for row in stored_rows or []}
+        profile_cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.PROFILE_TTL_SECONDS)
+
+        profiles: Dict[str, Dict[str, Any]] = {}
+        to_fetch = []
+        for login in logins:
+            row = rows.get(login)
+            if row is not None and row.profile_fetched_at and row.profile_fetched_at > profile_cutoff:
+                profiles[login] = {"name": row.name, "email": row.public_email}
+            else:
+                to_fetch.append(login)
+
+        if to_fetch:
+            logger.info(f"🔄 Crawling {len(to_fetch)} of {len(logins)} member profiles for {org}")
+            semaphore = asyncio.Semaphore(self.CONCURRENCY)
+
+            async def bounded_fetch(login: str):
+                async with semaphore:
+                    return login, await self._fetch_profile(login, session)
+
+            fetched = {login: profile for login, profile in await asyncio.gather(*[bounded_fetch(login) for login in to_fetch]) if profile}
+            if store_available:
+                await asyncio.to_thread(self._save_profiles, org, fetched)
+            profiles.update({login: {"name": p.get("name"), "email": p.get("email")} for login, p in fetched.items()})
+        else:
+            logger.info(f"📦 Using stored profiles for {org}: {len(profiles)} members")
+
+        return [
+            {
+                "username": login,
+                "name": (profile.get("name") or "").lower(),
+                "email": (profile.get("email") or "").lower(),
+                "organization": org
+            }
+            for login, profile in profiles.items()
+        ]
+
+
+def _parse_github_time(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+    except ValueError:
+        return None
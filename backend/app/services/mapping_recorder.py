@@ -2,9 +2,9 @@
 Service for recording integration mapping attempts and results.
 """
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from ..models import IntegrationMapping, get_db
 
 logger = logging.getLogger(__name__)
@@ -239,4 +239,110 @@ class MappingRecorder:
         ).delete()
         self.db.commit()
         logger.info(f"Cleaned up {deleted_count} mappings older than {days_old} days")
-        return deleted_count
\ No newline at end of file
+        return deleted_count
+
+
+class BatchMappingRecorder(MappingRecorder):
+    """
+    Collects mapping attempts during a collection stage and writes them in one go.
+
+    Features:
+    - Same record_* API as MappingRecorder; attempts are buffered instead of written
+    - Later attempts for the same (user, analysis, source, target) replace earlier ones
+    - flush() checks users and analyses once, then upserts with INSERT ... ON CONFLICT DO UPDATE
+    """
+
+    INSERT_CHUNK_SIZE = 1000
+
+    def __init__(self, db: Session = None):
+        super().__init__(db)
+        self._pending: Dict[Tuple, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record_mapping_attempt(
+        self,
+        user_id: int,
+        analysis_id: Optional[int],
+        source_platform: str,
+        source_identifier: str,
+        target_platform: str,
+        mapping_successful: bool = False,
+        target_identifier: Optional[str] = None,
+        mapping_method: Optional[str] = None,
+        error_message: Optional[str] = None,
+        data_collected: bool = False,
+        data_points_count: Optional[int] = None
+    ) -> None:
+        """Buffer a mapping attempt until flush()."""
+        key = (user_id, analysis_id, source_platform, source_identifier, target_platform)
+        self._pending[key] = {
+            "user_id": user_id,
+            "analysis_id": analysis_id,
+            "source_platform": source_platform,
+            "source_identifier": source_identifier,
+            "target_platform": target_platform,
+            "mapping_successful": mapping_successful,
+            "target_identifier": target_identifier,
+            "mapping_method": mapping_method,
+            "error_message": error_message,
+            "data_collected": data_collected,
+            "data_points_count": data_points_count,
+        }
+
+    def flush(self) -> int:
+        """Write all buffered attempts. Returns the number of rows upserted."""
+        if not self._pending:
+            return 0
+        from sqlalchemy.dialects.postgresql import insert
+        from ..models import User, Analysis
+
+        rows = list(self._pending.values())
+        self._pending.clear()
+
+        # Verify users and analyses exist once per batch to prevent foreign key violations
+        user_ids = {row["user_id"] for row in rows}
+        analysis_ids = {row["analysis_id"] for row in rows if row["analysis_id"] is not None}
+        known_users = {uid for (uid,) in self.db.query(User.id).filter(User.id.in_(user_ids)).all()}
+        known_analyses = {aid for (aid,) in self.db.query(Analysis.id).filter(Analysis.id.in_(analysis_ids)).all()} if analysis_ids else set()
+
+        valid_rows = [
+            row for row in rows
+            if row["user_id"] in known_users and (row["analysis_id"] is None or row["analysis_id"] in known_analyses)
+        ]
+        if len(valid_rows) < len(rows):
+            logger.warning(f"Skipping {len(rows) - len(valid_rows)} mapping records - user or analysis does not exist")
+
+        # Rows with and without an analysis are covered by different partial unique indexes
+        with_analysis = [row for row in valid_rows if row["analysis_id"] is not None]
+        without_analysis = [row for row in valid_rows if row["analysis_id"] is None]
+        try:
+            self._upsert(insert, with_analysis, IntegrationMapping.analysis_id.isnot(None),
+                         ["user_id", "analysis_id", "source_platform", "source_identifier", "target_platform"])
+            self._upsert(insert, without_analysis, IntegrationMapping.analysis_id.is_(None),
+                         ["user_id", "source_platform", "source_identifier", "target_platform"])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Recorded {len(valid_rows)} mappings in one batch")
+        return len(valid_rows)
+
+    def _upsert(self, insert, rows: List[Dict[str, Any]], index_where, index_elements: List[str]) -> None:
+        for i in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+            stmt = insert(IntegrationMapping).values(rows[i:i + self.INSERT_CHUNK_SIZE])
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                index_where=index_where,
+                set_={
+                    "mapping_successful": stmt.excluded.mapping_successful,
+                    "target_identifier": stmt.excluded.target_identifier,
+                    "mapping_method": stmt.excluded.mapping_method,
+                    "error_message": stmt.excluded.error_message,
+                    "data_collected": stmt.excluded.data_collected,
+                    "data_points_count": stmt.excluded.data_points_count,
+                    "updated_at": func.now(),
+                }
+            ))
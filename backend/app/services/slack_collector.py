@@ -4,21 +4,125 @@ Slack data collector for web app burnout analysis.
 
 import json
 import logging
+import math
+import os
+import re
+import statistics
 import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from ..core.api_rate_limiter import integration_rate_limiter
+from .slack_membership_index import SlackMembershipIndex, prune_channels_by_membership
+from .slack_history_store import SlackHistoryStore
+from .slack_directory import SlackWorkspaceDirectory
 # from sqlalchemy.orm import Session
 # from ..models import SlackIntegration
 
 logger = logging.getLogger(__name__)
 
 
+class SlackActivityAccumulator:
+    """Running per-author counters, so per-user results never rescan the harvested messages."""
+    
+    MAX_REPLY_SAMPLES = 500
+    
+    def __init__(self):
+        self.total = 0
+        self.after_hours = 0
+        self.weekend = 0
+        self.hourly = [0] * 24
+        self.sentiment_count = 0
+        self.sentiment_sum = 0.0
+        self.sentiment_sq_sum = 0.0
+        self.negative = 0
+        self.positive = 0
+        self.neutral = 0
+        self.stress = 0
+        self.reply_minutes: List[float] = []
+    
+    def add(self, msg: Dict, msg_dt: datetime) -> None:
+        self.total += 1
+        self.hourly[msg_dt.hour] += 1
+        
+        # Check if after hours (before 9 AM or after 5 PM)
+        if msg_dt.hour < 9 or msg_dt.hour >= 17:
+            self.after_hours += 1
+        
+        # Check if weekend (Saturday=5, Sunday=6)
+        if msg_dt.weekday() >= 5:
+            self.weekend += 1
+        
+        # Sentiment was scored when the message was harvested
+        compound_score = msg.get('sentiment')
+        if compound_score is not None:
+            self.sentiment_count += 1
+            self.sentiment_sum += compound_score
+            self.sentiment_sq_sum += compound_score * compound_score
+            if compound_score <= -0.05:
+                self.negative += 1
+            elif compound_score >= 0.05:
+                self.positive += 1
+            else:
+                self.neutral += 1
+            if msg.get('stress_indicator'):
+                self.stress += 1
+        
+        # Thread replies: minutes between the parent message and this reply
+        thread_ts = msg.get('thread_ts')
+        if thread_ts and thread_ts != msg.get('ts') and len(self.reply_minutes) < self.MAX_REPLY_SAMPLES:
+            self.reply_minutes.append(max(0.0, (float(msg.get('ts', 0)) - float(thread_ts)) / 60))
+    
+    def merge(self, other: Optional["SlackActivityAccumulator"]) -> None:
+        if other is None:
+            return
+        for field in ('total', 'after_hours', 'weekend', 'sentiment_count', 'sentiment_sum',
+                      'sentiment_sq_sum', 'negative', 'positive', 'neutral', 'stress'):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        self.hourly = [mine + theirs for mine, theirs in zip(self.hourly, other.hourly)]
+        self.reply_minutes = (self.reply_minutes + other.reply_minutes)[:self.MAX_REPLY_SAMPLES]
+    
+    def sentiment_stdev(self) -> float:
+        """Sample standard deviation of the sentiment scores."""
+        n = self.sentiment_count
+        if n < 2:
+            return 0.0
+        variance = (self.sentiment_sq_sum - self.sentiment_sum * self.sentiment_sum / n) / (n - 1)
+        return math.sqrt(max(0.0, variance))
+    
+    def median_reply_minutes(self) -> Optional[float]:
+        if not self.reply_minutes:
+            return None
+        return round(statistics.median(self.reply_minutes), 1)
+
+
 class SlackCollector:
     """Collects Slack communication data for burnout analysis."""
     
+    # Channels harvested concurrently; the tier 3 limiter bucket bounds the actual request rate
+    HISTORY_CONCURRENCY = int(os.getenv("SLACK_HISTORY_CONCURRENCY", "4"))
+    HISTORY_MAX_RETRIES = 3
+    # Channels without an analyzed member that are still harvested (0 = only member channels)
+    IDLE_CHANNEL_CAP = int(os.getenv("SLACK_IDLE_CHANNEL_CAP", "0"))
+    
+    STRESS_KEYWORDS = (
+        'overwhelmed', 'exhausted', 'burned out', 'burnt out', 'swamped', 'drowning',
+        'stressed', 'urgent', 'asap', 'emergency', 'crisis', 'help', 'stuck',
+        'frustrated', 'tired', 'deadline', 'overloaded', 'pressure', 'fire'
+    )
+    
+    # Name formats used by bot-posted messages, tried in order (see _extract_name_from_slack_message)
+    NAME_PATTERNS = (
+        re.compile(r'\*\*([^*]+)\*\*'),
+        re.compile(r'(?:^|\s)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+here\b'),
+        re.compile(r'(?:^|\s)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+jumping\s+in\b'),
+        re.compile(r'(?:^|[.!?]\s+)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+here(?:\s*[-–—]|\s*\.|\s*,|\s*$)'),
+    )
+    NAME_FALSE_POSITIVES = frozenset({'team', 'everyone', 'all', 'someone'})
+    
     def __init__(self):
         self.cache_dir = Path('.slack_cache')
         self.cache_dir.mkdir(exist_ok=True)
@@ -42,6 +146,10 @@ class SlackCollector:
             "Quentin Rousseau": "Quentin Rousseau",  # Name-based matching
             # Add more mappings as needed based on actual Slack users
         }
+        # Reverse lookup (first name wins, as with a linear scan)
+        self._slack_id_to_name = {}
+        for name, slack_id in self.name_to_slack_mappings.items():
+            self._slack_id_to_name.setdefault(slack_id, name)
         
         # Keep email mappings as fallback for backward compatibility
         self.email_to_slack_mappings = {
@@ -81,42 +189,20 @@ class SlackCollector:
         Returns:
             Extracted name or None if not found
         """
-        import re
-        
-        # Pattern 1: **Name** | Team format
-        pattern1 = r'\*\*([^*]+)\*\*'
-        match = re.search(pattern1, message_text)
-        if match:
-            return match.group(1).strip()
-        
-        # Pattern 2: "Name here" format - look for "Name here" after various prefixes
-        # Examples: "Jasmeet here", "Spencer here", "Sylvain here"
-        pattern2 = r'(?:^|\s)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+here\b'
-        match = re.search(pattern2, message_text)
-        if match:
-            potential_name = match.group(1).strip()
-            # Filter out common false positives
-            if potential_name.lower() not in ['team', 'everyone', 'all', 'someone']:
-                return potential_name
-        
-        # Pattern 3: "Name jumping in" format
-        pattern3 = r'(?:^|\s)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+jumping\s+in\b'
-        match = re.search(pattern3, message_text)
-        if match:
-            potential_name = match.group(1).strip()
-            if potential_name.lower() not in ['team', 'everyone', 'all', 'someone']:
-                return potential_name
-        
-        # Pattern 4: Look for names in common introduction patterns
-        # "Thanks for the PR. Jasmeet here", "Sorry team - Sylvain here"
-        pattern4 = r'(?:^|[.!?]\s+)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+here(?:\s*[-–—]|\s*\.|\s*,|\s*$)'
-        match = re.search(pattern4, message_text)
-        if match:
+        for i, pattern in enumerate(self.NAME_PATTERNS):
+            match = pattern.search(message_text)
+            if not match:
+                continue
             potential_name = match.group(1).strip()
-            if potential_name.lower() not in ['team', 'everyone', 'all', 'someone']:
+            # Filter out common false positives (the **Name** format is always a name)
+            if i == 0 or potential_name.lower() not in self.NAME_FALSE_POSITIVES:
                 return potential_name
         
         return None
+    
+    def _display_name_for(self, user_id: str) -> Optional[str]:
+        """Known responder name for a Slack user ID (or for a name-based ID, the name itself)."""
+        return self._slack_id_to_name.get(user_id)
         
     def _correlate_slack_message_to_user(self, message_text: str) -> Optional[str]:
         """
@@ -146,8 +232,15 @@ class SlackCollector:
         """
         logger.info(f"Slack correlation attempt for {user_identifier} (is_name: {is_name}), token={'present' if token else 'missing'}")
         
-        # For names, just return the name as the "user ID" for bot message matching
+        # For names, return the name itself as the "user ID" for bot message matching,
+        # unless the workspace directory knows a real Slack user by that name
         if is_name:
+            if token and user_identifier not in self.name_to_slack_mappings:
+                directory = await SlackWorkspaceDirectory.for_token(token)
+                slack_user_id = directory.lookup_name(user_identifier) if directory else None
+                if slack_user_id:
+                    logger.info(f"Found Slack correlation via workspace directory: {user_identifier} -> {slack_user_id}")
+                    return slack_user_id
             logger.info(f"Using name-based matching for {user_identifier}")
             return user_identifier  # Return the name itself as the "user ID"
         else:
@@ -160,9 +253,19 @@ class SlackCollector:
             else:
                 logger.warning(f"No email mapping found for {user_identifier}")
             
-            # If we have a token, try API-based discovery
+            # If we have a token, look the email up in the workspace directory (one bulk users.list per TTL),
+            # or per user when the directory could not list users
             if token:
                 try:
+                    directory = await SlackWorkspaceDirectory.for_token(token)
+                    if directory and directory.users_loaded:
+                        slack_user_id = directory.lookup_email(user_identifier)
+                        if slack_user_id:
+                            logger.info(f"Found Slack correlation via workspace directory: {user_identifier} -> {slack_user_id}")
+                            return slack_user_id
+                        logger.warning(f"No Slack correlation found for {user_identifier}")
+                        return None
+                    
                     logger.info(f"Attempting API-based discovery for {user_identifier}")
                     slack_user_id = await self._discover_slack_user_by_email(user_identifier, token)
                     if slack_user_id:
@@ -194,7 +297,9 @@ class SlackCollector:
                 lookup_url = "https://slack.com/api/users.lookupByEmail"
                 params = {'email': email}
                 
+                await integration_rate_limiter.acquire("slack", token, "tier3")
                 async with session.get(lookup_url, headers=headers, params=params) as resp:
+                    integration_rate_limiter.record_response("slack", token, "tier3", resp.status, resp.headers)
                     if resp.status == 200:
                         data = await resp.json()
                         if data.get('ok') and data.get('user'):
@@ -349,15 +454,135 @@ class SlackCollector:
             }
         }
     
-    async def _fetch_all_slack_messages(self, token: str, start_date: datetime, end_date: datetime) -> Dict:
-        """Fetch all messages from all accessible channels once."""
+    async def _fetch_channel_history(self, session, headers: Dict, token: str, channel_id: str, channel_name: str, oldest: float, latest: float) -> Dict:
+        """
+        Page through conversations.history for one channel.
+        
+        Rate-limited pages are retried once the tier 3 bucket reopens (Retry-After),
+        up to HISTORY_MAX_RETRIES times per channel.
+        """
+        history_url = "https://slack.com/api/conversations.history"
+        messages = []
+        cursor = None
+        retries = 0
+        
+        while True:
+            history_params = {
+                'channel': channel_id,
+                'oldest': oldest,
+                'latest': latest,
+                'limit': 1000
+            }
+            if cursor:
+                history_params['cursor'] = cursor
+            
+            # conversations.history is Tier 3; the shared limiter paces every in-flight channel
+            await integration_rate_limiter.acquire("slack", token, "tier3")
+            async with session.get(history_url, headers=headers, params=history_params) as hist_resp:
+                retry_in = integration_rate_limiter.record_response("slack", token, "tier3", hist_resp.status, hist_resp.headers)
+                if hist_resp.status == 429:
+                    retries += 1
+                    if retries > self.HISTORY_MAX_RETRIES:
+                        logger.warning(f"Rate limited for #{channel_name} after {self.HISTORY_MAX_RETRIES} retries, giving up")
+                        return {"messages": messages, "rate_limited": True, "error": None}
+                    logger.warning(f"Rate limited for #{channel_name}, retrying in {retry_in or 0:.0f} seconds")
+                    continue
+                if hist_resp.status != 200:
+                    logger.error(f"HTTP error {hist_resp.status} for #{channel_name}")
+                    return {"messages": messages, "rate_limited": False, "error": f"HTTP {hist_resp.status} for #{channel_name}"}
+                
+                history_data = await hist_resp.json()
+            
+            if not history_data.get('ok'):
+                logger.error(f"Slack API error for #{channel_name}: {history_data.get('error', 'unknown')}")
+                return {"messages": messages, "rate_limited": False, "error": None}
+            
+            messages.extend(history_data.get('messages', []))
+            
+            # Check if there are more pages
+            cursor = history_data.get('response_metadata', {}).get('next_cursor')
+            if not (history_data.get('has_more') and cursor):
+                return {"messages": messages, "rate_limited": False, "error": None}
+    
+    async def _iter_channel_histories(self, session, headers: Dict, token: str, channels: List[Dict], windows: Dict[str, Tuple[float, float]]):
+        """
+        Harvest history for many channels concurrently, yielding (channel, result) as each completes.
+        
+        windows maps channel ID -> (oldest, latest) range to fetch. At most HISTORY_CONCURRENCY
+        channels are in flight; the tier 3 bucket keeps the combined request rate inside Slack's limits.
+        """
+        semaphore = asyncio.Semaphore(self.HISTORY_CONCURRENCY)
+        
+        async def harvest(channel: Dict) -> Tuple[Dict, Dict]:
+            channel_name = channel.get('name', 'unknown')
+            oldest, latest = windows[channel['id']]
+            async with semaphore:
+                try:
+                    result = await self._fetch_channel_history(session, headers, token, channel['id'], channel_name, oldest, latest)
+                except Exception as e:
+                    logger.error(f"Error getting messages from #{channel_name}: {e}")
+                    result = {"messages": [], "rate_limited": False, "error": f"Exception for #{channel_name}: {str(e)}"}
+            return channel, result
+        
+        tasks = [asyncio.ensure_future(harvest(channel)) for channel in channels if channel.get('id') in windows]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _compact_message(self, msg: Dict, keep_text: bool = False, members: Optional[set] = None) -> Dict:
+        """
+        Reduce a Slack message to the metadata the analysis uses.
+        
+        Bot-message author names, sentiment and stress indicators are derived here so the
+        text itself can be dropped. When members (Slack user IDs) is given, only their
+        messages and bot messages naming a responder are scored; others keep
+        sentiment and stress_indicator as None.
+        """
+        text = msg.get('text') or ''
+        author_name = self._extract_name_from_slack_message(text) if msg.get('bot_id') and text else None
+        compact = {
+            'ts': msg.get('ts'),
+            'user': msg.get('user'),
+            'bot_id': msg.get('bot_id'),
+            'thread_ts': msg.get('thread_ts'),
+            'author_name': author_name,
+            'sentiment': None,
+            'stress_indicator': None,
+        }
+        if members is None or msg.get('user') in members or author_name:
+            compact['sentiment'] = self.sentiment_analyzer.polarity_scores(text)['compound'] if text else None
+            compact['stress_indicator'] = bool(text) and any(keyword in text.lower() for keyword in self.STRESS_KEYWORDS)
+        if keep_text:
+            compact['text'] = text
+        return compact
+    
+    async def _prune_channels(self, session, headers: Dict, token: str, channels: List[Dict], member_ids: Optional[set]) -> List[Dict]:
+        """Drop channels that none of member_ids belong to (keeps everything if membership is unknown)."""
+        if not member_ids:
+            return channels
+        channel_ids = [channel['id'] for channel in channels if channel.get('id')]
+        relevant_ids = await SlackMembershipIndex(token).get_relevant_channel_ids(session, headers, set(member_ids), channel_ids)
+        pruned = prune_channels_by_membership(channels, relevant_ids, self.IDLE_CHANNEL_CAP)
+        if len(pruned) < len(channels):
+            logger.info(f"Membership pruning: harvesting {len(pruned)} of {len(channels)} channels")
+        return pruned
+    
+    async def _fetch_all_slack_messages(self, token: str, start_date: datetime, end_date: datetime, member_ids: Optional[set] = None) -> Dict:
+        """
+        Fetch all messages from all accessible channels once.
+        
+        When member_ids (real Slack user IDs) are given, only channels with at least one
+        of those members are harvested.
+        """
         
         headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
         }
         
-        base_url = "https://slack.com/api"
         all_messages = {}
         rate_limited_channels = []
         errors = []
@@ -365,92 +590,72 @@ class SlackCollector:
         try:
             import aiohttp
             async with aiohttp.ClientSession() as session:
-                # Get all channels the bot has access to
-                channels_url = f"{base_url}/conversations.list"
-                channels_params = {'types': 'public_channel', 'limit': 1000}
+                # Get all channels the bot has access to (every page, cached per workspace)
+                directory = await SlackWorkspaceDirectory.for_token(token, session)
                 
-                async with session.get(channels_url, headers=headers, params=channels_params) as resp:
-                    if resp.status == 200:
-                        channels_data = await resp.json()
-                        if channels_data.get('ok'):
-                            channels = channels_data.get('channels', [])
-                            logger.info(f"Successfully retrieved {len(channels)} channels")
-                            
-                            # Convert dates to timestamps for Slack API
-                            buffer_days = 60  # Look back 60 days for demo messages
-                            buffered_start_date = start_date - timedelta(days=buffer_days)
-                            start_ts = buffered_start_date.timestamp()
-                            end_ts = end_date.timestamp()
-                            
-                            logger.info(f"Fetching messages from {start_ts} to {end_ts} (buffered by {buffer_days} days)")
-                            
-                            # Fetch messages from all accessible channels
-                            for channel in channels:
-                                channel_id = channel.get('id')
-                                channel_name = channel.get('name', 'unknown')
-                                
-                                if not channel_id:
-                                    continue
-                                    
-                                try:
-                                    await asyncio.sleep(2)  # Increased rate limiting delay
-                                    
-                                    logger.info(f"Fetching messages from #{channel_name}")
-                                    
-                                    history_url = f"{base_url}/conversations.history"
-                                    all_channel_messages = []
-                                    cursor = None
-                                    
-                                    # Handle pagination
-                                    while True:
-                                        history_params = {
-                                            'channel': channel_id,
-                                            'oldest': start_ts,
-                                            'latest': end_ts,
-                                            'limit': 1000
-                                        }
-                                        if cursor:
-                                            history_params['cursor'] = cursor
-                                        
-                                        async with session.get(history_url, headers=headers, params=history_params) as hist_resp:
-                                            if hist_resp.status == 200:
-                                                history_data = await hist_resp.json()
-                                                if history_data.get('ok'):
-                                                    messages = history_data.get('messages', [])
-                                                    all_channel_messages.extend(messages)
-                                                    
-                                                    # Check if there are more pages
-                                                    if history_data.get('has_more') and history_data.get('response_metadata', {}).get('next_cursor'):
-                                                        cursor = history_data['response_metadata']['next_cursor']
-                                                        await asyncio.sleep(1)  # Rate limiting between pages
-                                                    else:
-                                                        break
-                                                else:
-                                                    logger.error(f"Slack API error for #{channel_name}: {history_data.get('error', 'unknown')}")
-                                                    break
-                                            elif hist_resp.status == 429:
-                                                retry_after = hist_resp.headers.get('Retry-After', '60')
-                                                wait_time = int(retry_after)
-                                                logger.warning(f"Rate limited for #{channel_name}, waiting {wait_time} seconds...")
-                                                rate_limited_channels.append(channel_name)
-                                                await asyncio.sleep(wait_time)
-                                                break
-                                            else:
-                                                logger.error(f"HTTP error {hist_resp.status} for #{channel_name}")
-                                                break
-                                    
-                                    logger.info(f"Found {len(all_channel_messages)} total messages in #{channel_name}")
-                                    all_messages[channel_name] = all_channel_messages
-                                                
-                                except Exception as e:
-                                    logger.error(f"Error getting messages from #{channel_name}: {e}")
-                                    errors.append(f"Exception for #{channel_name}: {str(e)}")
-                                    continue
-                                    
-                        else:
-                            logger.warning(f"Slack API error for channels: {channels_data.get('error')}")
-                    else:
-                        logger.warning(f"Slack API HTTP error for channels: {resp.status}")
+                if directory:
+                    channels = directory.channels
+                    logger.info(f"Successfully retrieved {len(channels)} channels")
+                    channels = [channel for channel in await self._prune_channels(session, headers, token, channels, member_ids) if channel.get('id')]
+                    
+                    # Convert dates to timestamps for Slack API
+                    start_ts = start_date.timestamp()
+                    end_ts = end_date.timestamp()
+                    channel_ids = [channel['id'] for channel in channels]
+                    
+                    # Only fetch what the workspace's history store doesn't already hold
+                    store = await SlackHistoryStore.for_token(session, headers, token)
+                    cursors = await asyncio.to_thread(store.get_cursors, channel_ids) if store else {}
+                    # Stored messages by members that an earlier analysis left unscored are harvested again
+                    unscored = await asyncio.to_thread(store.unscored_channels, channel_ids, member_ids, start_ts, end_ts) \
+                        if store and member_ids else set()
+                    windows = {}
+                    for channel_id in channel_ids:
+                        window = (start_ts, end_ts) if channel_id in unscored else \
+                            SlackHistoryStore.plan_fetch(cursors.get(channel_id), start_ts, end_ts)
+                        if window:
+                            windows[channel_id] = window
+                    keep_text = bool(store and store.store_text)
+                    
+                    logger.info(
+                        f"Fetching messages from {start_ts} to {end_ts}: {len(windows)} of {len(channel_ids)} channels need Slack calls "
+                        f"({len(channel_ids) - len(windows)} fully stored), {self.HISTORY_CONCURRENCY} channels in flight"
+                    )
+                    
+                    fetched = {}
+                    async for channel, result in self._iter_channel_histories(session, headers, token, channels, windows):
+                        channel_name = channel.get('name', 'unknown')
+                        messages = [self._compact_message(msg, keep_text, member_ids or None) for msg in result["messages"]]
+                        logger.info(f"Found {len(messages)} new messages in #{channel_name}")
+                        if result["rate_limited"]:
+                            rate_limited_channels.append(channel_name)
+                        if result["error"]:
+                            errors.append(result["error"])
+                        
+                        # A partial harvest must not advance the cursor, or the gap would never be refetched
+                        complete = not result["rate_limited"] and not result["error"]
+                        if not (store and complete and await asyncio.to_thread(store.save_harvest, channel['id'], messages, *windows[channel['id']])):
+                            fetched[channel['id']] = messages
+                    
+                    stored = {}
+                    if store:
+                        await asyncio.to_thread(store.prune_expired_if_due)
+                        stored = await asyncio.to_thread(store.load_messages, channel_ids, start_ts, end_ts)
+                        if stored is None:
+                            logger.warning("Could not read stored Slack history, using only messages fetched in this run")
+                            stored = {}
+                    
+                    for channel in channels:
+                        channel_messages = stored.get(channel['id'], [])
+                        if channel['id'] in fetched:
+                            # Unsaved fetches (partial harvests or store write failures) are merged in memory;
+                            # fetched copies win since they may carry scores the stored rows lack
+                            fetched_ts = {msg['ts'] for msg in fetched[channel['id']]}
+                            channel_messages = [msg for msg in channel_messages if msg['ts'] not in fetched_ts] + fetched[channel['id']]
+                        all_messages[channel.get('name', 'unknown')] = channel_messages
+                else:
+                    logger.warning("Could not list Slack channels")
+                    errors.append("Could not list Slack channels")
                         
         except Exception as e:
             logger.error(f"Error fetching Slack messages: {e}")
@@ -462,97 +667,60 @@ class SlackCollector:
             "errors": errors
         }
     
-    def _process_user_messages(self, user_id: str, email: str, start_date: datetime, end_date: datetime, all_messages: Dict) -> Dict:
-        """Process cached messages for a specific user."""
+
+    def _aggregate_messages_by_user(self, all_messages: Dict) -> Dict[Tuple[str, str], "SlackActivityAccumulator"]:
+        """
+        Single pass over harvested messages, grouped by author.
         
-        days_analyzed = (end_date - start_date).days
-        total_messages = 0
-        after_hours_messages = 0
-        weekend_messages = 0
+        Keys are ('user', slack_user_id) for messages posted by a user and ('name', author_name)
+        for bot messages that name a responder.
+        """
+        accumulators: Dict[Tuple[str, str], SlackActivityAccumulator] = {}
+        for messages in all_messages.values():
+            for msg in messages:
+                keys = []
+                if msg.get('user'):
+                    keys.append(('user', msg['user']))
+                if msg.get('bot_id') and msg.get('author_name'):
+                    keys.append(('name', msg['author_name']))
+                if not keys:
+                    continue
+                msg_dt = datetime.fromtimestamp(float(msg.get('ts', 0)))
+                for key in keys:
+                    accumulator = accumulators.get(key)
+                    if accumulator is None:
+                        accumulator = accumulators[key] = SlackActivityAccumulator()
+                    accumulator.add(msg, msg_dt)
+        return accumulators
+    
+    def _process_user_messages(self, user_id: str, email: str, start_date: datetime, end_date: datetime,
+                               accumulators: Dict[Tuple[str, str], "SlackActivityAccumulator"], channel_diversity: int) -> Dict:
+        """Build a user's activity data from the pre-aggregated per-author accumulators."""
         
-        # Sentiment tracking
-        sentiment_scores = []
-        negative_messages = 0
-        positive_messages = 0
-        neutral_messages = 0
-        stress_indicators = 0
+        days_analyzed = (end_date - start_date).days
         
         # Get the display name for this user_id
-        user_display_name = None
-        for name, slack_id in self.name_to_slack_mappings.items():
-            if slack_id == user_id:
-                user_display_name = name
-                break
+        user_display_name = self._display_name_for(user_id)
         
         # Check if this is name-based matching (user_id is the same as the display name)
         is_name_based_user = user_id == user_display_name
         
         logger.info(f"Processing messages for {user_display_name} (name-based: {is_name_based_user})")
         
-        # Process messages from all channels
-        for channel_name, messages in all_messages.items():
-            channel_user_messages = []
-            
-            # Include direct user messages (only for real users with actual Slack IDs)
-            if not is_name_based_user:
-                for msg in messages:
-                    if msg.get('user') == user_id:
-                        channel_user_messages.append(msg)
-            
-            # Include bot messages that contain this user's exact name
-            if user_display_name:
-                for msg in messages:
-                    if msg.get('bot_id') and msg.get('text'):
-                        extracted_name = self._extract_name_from_slack_message(msg.get('text', ''))
-                        if extracted_name and extracted_name == user_display_name:
-                            channel_user_messages.append(msg)
-                            logger.info(f"Found bot message for {user_display_name} in #{channel_name}")
-            
-            channel_message_count = len(channel_user_messages)
-            total_messages += channel_message_count
-            
-            if channel_message_count > 0:
-                logger.info(f"Channel #{channel_name}: {channel_message_count} messages for {user_display_name}")
-                
-                # Analyze timing for after-hours and weekend activity
-                for msg in channel_user_messages:
-                    msg_ts = float(msg.get('ts', 0))
-                    msg_dt = datetime.fromtimestamp(msg_ts)
-                    
-                    # Check if after hours (before 9 AM or after 5 PM)
-                    if msg_dt.hour < 9 or msg_dt.hour >= 17:
-                        after_hours_messages += 1
-                    
-                    # Check if weekend (Saturday=5, Sunday=6)
-                    if msg_dt.weekday() >= 5:
-                        weekend_messages += 1
-                    
-                    # Sentiment analysis for messages with text
-                    text = msg.get('text', '')
-                    if text:
-                        # Perform sentiment analysis using VADER
-                        sentiment = self.sentiment_analyzer.polarity_scores(text)
-                        compound_score = sentiment['compound']
-                        sentiment_scores.append(compound_score)
-                        
-                        # Categorize sentiment
-                        if compound_score <= -0.05:
-                            negative_messages += 1
-                        elif compound_score >= 0.05:
-                            positive_messages += 1
-                        else:
-                            neutral_messages += 1
-                        
-                        # Check for stress indicators
-                        stress_keywords = [
-                            'overwhelmed', 'exhausted', 'burned out', 'burnt out', 'swamped', 'drowning',
-                            'stressed', 'urgent', 'asap', 'emergency', 'crisis', 'help', 'stuck',
-                            'frustrated', 'tired', 'deadline', 'overloaded', 'pressure', 'fire'
-                        ]
-                        
-                        text_lower = text.lower()
-                        if any(keyword in text_lower for keyword in stress_keywords):
-                            stress_indicators += 1
+        # Direct user messages (only for real users with actual Slack IDs) plus bot messages naming the user
+        activity = SlackActivityAccumulator()
+        if not is_name_based_user:
+            activity.merge(accumulators.get(('user', user_id)))
+        if user_display_name:
+            activity.merge(accumulators.get(('name', user_display_name)))
+        
+        total_messages = activity.total
+        after_hours_messages = activity.after_hours
+        weekend_messages = activity.weekend
+        negative_messages = activity.negative
+        positive_messages = activity.positive
+        neutral_messages = activity.neutral
+        stress_indicators = activity.stress
         
         logger.info(f"Final message counts for {user_display_name}: total={total_messages}, after_hours={after_hours_messages}, weekend={weekend_messages}")
         
@@ -564,16 +732,13 @@ class SlackCollector:
         messages_per_day = total_messages / days_analyzed if days_analyzed > 0 else 0
         
         # Calculate sentiment metrics
-        avg_sentiment = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0.0
+        avg_sentiment = activity.sentiment_sum / activity.sentiment_count if activity.sentiment_count else 0.0
         negative_sentiment_ratio = (negative_messages / total_messages) if total_messages > 0 else 0.0
         positive_sentiment_ratio = (positive_messages / total_messages) if total_messages > 0 else 0.0
         stress_indicator_ratio = (stress_indicators / total_messages) if total_messages > 0 else 0.0
         
         # Calculate sentiment volatility (standard deviation of sentiment scores)
-        sentiment_volatility = 0.0
-        if len(sentiment_scores) > 1:
-            import statistics
-            sentiment_volatility = statistics.stdev(sentiment_scores)
+        sentiment_volatility = activity.sentiment_stdev()
         
         # Generate burnout indicators
         burnout_indicators = {
@@ -597,7 +762,7 @@ class SlackCollector:
                 'messages_per_day': round(messages_per_day, 1),
                 'after_hours_percentage': round(after_hours_percentage, 3),
                 'weekend_percentage': round(weekend_percentage, 3),
-                'channel_diversity': len([ch for ch, msgs in all_messages.items() if msgs]),
+                'channel_diversity': channel_diversity,
                 'dm_ratio': 0.2,  # Would need actual DM analysis
                 'thread_participation_rate': 0.4,  # Would need actual thread analysis
                 'avg_message_length': 50,  # Would need actual message content analysis
@@ -612,7 +777,7 @@ class SlackCollector:
             'burnout_indicators': burnout_indicators,
             'activity_data': {
                 'messages_sent': total_messages,
-                'channels_active': len([ch for ch, msgs in all_messages.items() if msgs]),
+                'channels_active': channel_diversity,
                 'after_hours_messages': after_hours_messages,
                 'weekend_messages': weekend_messages,
                 'avg_response_time_minutes': 0,  # Would need response time analysis
@@ -621,7 +786,9 @@ class SlackCollector:
                 'positive_messages': positive_messages,
                 'neutral_messages': neutral_messages,
                 'stress_indicators': stress_indicators,
-                'burnout_indicators': burnout_indicators
+                'burnout_indicators': burnout_indicators,
+                'hourly_distribution': activity.hourly,
+                'median_thread_reply_minutes': activity.median_reply_minutes()
             }
         }
     
@@ -642,7 +809,9 @@ class SlackCollector:
                 user_info_url = f"{base_url}/users.info"
                 user_params = {'user': user_id}
                 
+                await integration_rate_limiter.acquire("slack", token, "tier4")
                 async with session.get(user_info_url, headers=headers, params=user_params) as resp:
+                    integration_rate_limiter.record_response("slack", token, "tier4", resp.status, resp.headers)
                     if resp.status == 200:
                         user_data = await resp.json()
                         if not user_data.get('ok'):
@@ -651,21 +820,15 @@ class SlackCollector:
                         logger.warning(f"Slack API HTTP error for user info: {resp.status}")
                 
                 # Get all channels the bot has access to (not just user's channels)
-                channels_url = f"{base_url}/conversations.list"
-                channels_params = {'types': 'public_channel', 'limit': 1000}
-                
                 total_channels = 0
                 channels_data = {}
-                async with session.get(channels_url, headers=headers, params=channels_params) as resp:
-                    if resp.status == 200:
-                        channels_data = await resp.json()
-                        if channels_data.get('ok'):
-                            total_channels = len(channels_data.get('channels', []))
-                            logger.info(f"Successfully retrieved {total_channels} channels")
-                        else:
-                            logger.warning(f"Slack API error for channels: {channels_data.get('error')}")
-                    else:
-                        logger.warning(f"Slack API HTTP error for channels: {resp.status}")
+                directory = await SlackWorkspaceDirectory.for_token(token, session)
+                if directory:
+                    channels_data = {'ok': True, 'channels': directory.channels}
+                    total_channels = len(directory.channels)
+                    logger.info(f"Successfully retrieved {total_channels} channels")
+                else:
+                    logger.warning("Could not list Slack channels")
                 
                 # Get actual message counts from channels
                 days_analyzed = (end_date - start_date).days
@@ -677,16 +840,16 @@ class SlackCollector:
                 # Get user's channels and count real messages
                 if channels_data.get('ok'):
                     channels = channels_data.get('channels', [])
+                    # Name-based users only appear in bot messages, so membership can't narrow their channels
+                    if user_id not in self.name_to_slack_mappings:
+                        channels = await self._prune_channels(session, headers, token, channels, {user_id})
                     logger.info(f"Processing {len(channels)} channels for user {user_id}")
                     
                     # Convert dates to timestamps for Slack API
-                    # Add buffer time to catch more demo messages
-                    buffer_days = 60  # Look back 60 days for demo messages
-                    buffered_start_date = start_date - timedelta(days=buffer_days)
-                    start_ts = buffered_start_date.timestamp()
+                    start_ts = start_date.timestamp()
                     end_ts = end_date.timestamp()
                     
-                    logger.info(f"Slack timestamp range: {start_ts} to {end_ts} (buffered by {buffer_days} days)")
+                    logger.info(f"Slack timestamp range: {start_ts} to {end_ts}")
                     logger.info(f"Starting channel loop with {len(channels)} channels")
                     
                     for channel in channels:  # Scan all channels the bot has access to
@@ -698,9 +861,6 @@ class SlackCollector:
                             continue
                             
                         try:
-                            # Add rate limiting - wait 1 second between requests
-                            await asyncio.sleep(1)
-                            
                             logger.info(f"Requesting messages from #{channel_name} ({channel_id})")
                             
                             # Get message history for this channel
@@ -712,7 +872,9 @@ class SlackCollector:
                                 'limit': 1000  # Max messages per channel
                             }
                             
+                            await integration_rate_limiter.acquire("slack", token, "tier3")
                             async with session.get(history_url, headers=headers, params=history_params) as hist_resp:
+                                retry_in = integration_rate_limiter.record_response("slack", token, "tier3", hist_resp.status, hist_resp.headers)
                                 if hist_resp.status == 200:
                                     history_data = await hist_resp.json()
                                     if history_data.get('ok'):
@@ -723,11 +885,7 @@ class SlackCollector:
                                         user_messages = []
                                         
                                         # Get the display name for this user_id
-                                        user_display_name = None
-                                        for name, slack_id in self.name_to_slack_mappings.items():
-                                            if slack_id == user_id:
-                                                user_display_name = name
-                                                break
+                                        user_display_name = self._display_name_for(user_id)
                                         
                                         # Check if this is name-based matching (user_id is the same as the display name)
                                         is_name_based_user = user_id == user_display_name
@@ -776,8 +934,8 @@ class SlackCollector:
                                         else:
                                             logger.warning(f"Slack API error for channel #{channel_name}: {error_msg}")
                                 elif hist_resp.status == 429:
-                                    logger.warning(f"Rate limited for channel #{channel_name}, waiting 5 seconds...")
-                                    await asyncio.sleep(5)  # Wait for rate limit reset
+                                    # The next acquire() waits out Retry-After before touching tier 3 again
+                                    logger.warning(f"Rate limited for channel #{channel_name}, tier 3 paused for {retry_in or 0:.0f} seconds")
                                 else:
                                     logger.warning(f"Slack API HTTP error for channel #{channel_name}: {hist_resp.status}")
                                     
@@ -1007,10 +1165,25 @@ async def collect_team_slack_data(team_identifiers: List[str], days: int = 30, s
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
+    # Resolve Slack IDs first so history is only harvested from channels the team belongs to
+    identifier_to_user_id = {}
+    for identifier in team_identifiers:
+        try:
+            identifier_to_user_id[identifier] = await collector._correlate_user_to_slack(identifier, slack_token, use_names)
+        except Exception as e:
+            logger.error(f"Failed to correlate {identifier} to Slack: {e}")
+            identifier_to_user_id[identifier] = None
+    
+    # Name-based users are matched through bot messages in any channel, so pruning only
+    # applies when every identifier resolved to a real Slack ID
+    resolved = {identifier: uid for identifier, uid in identifier_to_user_id.items() if uid}
+    name_based = use_names and any(uid == identifier for identifier, uid in resolved.items())
+    member_ids = None if name_based else set(resolved.values())
+    
     logger.info(f"Fetching all Slack messages once for {len(team_identifiers)} users")
-    fetch_result = await collector._fetch_all_slack_messages(slack_token, start_date, end_date)
+    fetch_result = await collector._fetch_all_slack_messages(slack_token, start_date, end_date, member_ids)
     
-    all_messages = fetch_result.get("messages", {})
+    all_messages = fetch_result.pop("messages", {})
     rate_limited_channels = fetch_result.get("rate_limited_channels", [])
     errors = fetch_result.get("errors", [])
     
@@ -1020,15 +1193,19 @@ async def collect_team_slack_data(team_identifiers: List[str], days: int = 30, s
     if errors:
         logger.error(f"Slack fetch errors: {errors}")
     
-    # Process each user against the cached messages
+    # One pass over all messages; per-user results below are accumulator lookups
+    accumulators = collector._aggregate_messages_by_user(all_messages)
+    channel_diversity = len([ch for ch, msgs in all_messages.items() if msgs])
+    del all_messages
+    
     for identifier in team_identifiers:
         try:
             # Get user ID for this identifier
-            user_id = await collector._correlate_user_to_slack(identifier, slack_token, use_names)
+            user_id = identifier_to_user_id.get(identifier)
             
             if user_id:
                 logger.info(f"Processing {identifier} -> {user_id}")
-                user_data = collector._process_user_messages(user_id, identifier, start_date, end_date, all_messages)
+                user_data = collector._process_user_messages(user_id, identifier, start_date, end_date, accumulators, channel_diversity)
                 
                 # Add error information to user data
                 user_data["fetch_errors"] = {
@@ -1098,7 +1275,6 @@ async def process_slack_messages_with_name_correlation(messages: List[str], days
                 urgent_indicators += 1
             
             # Time-based analysis (look for time stamps in messages)
-            import re
             time_pattern = r'(\d{1,2}:\d{2}\s*(?:AM|PM))'
             time_match = re.search(time_pattern, message)
             if time_match:
@@ -1172,8 +1348,6 @@ def parse_structured_slack_messages(message_block: str) -> List[Dict[str, str]]:
     Returns:
         List of parsed message dictionaries
     """
-    import re
-    
     messages = []
     
     # Split by the separator lines (---)
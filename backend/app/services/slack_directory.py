@@ -0,0 +1,161 @@
+"""
+Workspace directory for Slack: every public channel and user, loaded once per TTL.
+
+Replaces single-page conversations.list calls and per-user lookups with
+paginated bulk listings and in-memory email / name indexes.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from ..core.api_rate_limiter import integration_rate_limiter
+from ..core.name_index import normalize_name
+
+logger = logging.getLogger(__name__)
+
+SLACK_API_BASE_URL = "https://slack.com/api"
+
+# Global cache that persists across analyses: token fingerprint -> loaded directory
+_GLOBAL_DIRECTORY_CACHE: Dict[str, "SlackWorkspaceDirectory"] = {}
+
+
+async def paginate_slack_method(session, token: str, headers: Dict, method: str, bucket: str,
+                                params: Dict, key: str, max_retries: int = 3) -> Optional[List[Any]]:
+    """
+    Collect every page of a cursor-paginated Slack Web API method.
+
+    Pages are paced by the shared limiter bucket for the method's tier; 429s are retried
+    once the bucket reopens. Returns None if any page fails.
+    """
+    items = []
+    cursor = None
+    throttled = 0
+    while True:
+        page_params = dict(params)
+        if cursor:
+            page_params["cursor"] = cursor
+        await integration_rate_limiter.acquire("slack", token, bucket)
+        async with session.get(f"{SLACK_API_BASE_URL}/{method}", headers=headers, params=page_params) as resp:
+            integration_rate_limiter.record_response("slack", token, bucket, resp.status, resp.headers)
+            if resp.status == 429 and throttled < max_retries:
+                throttled += 1
+                continue  # The bucket is blocked until Retry-After; retry the same page
+            if resp.status != 200:
+                logger.warning(f"Slack {method} HTTP error: {resp.status}")
+                return None
+            data = await resp.json()
+        if not data.get("ok"):
+            logger.warning(f"Slack {method} error: {data.get('error', 'unknown')}")
+            return None
+        items.extend(data.get(key, []))
+        cursor = data.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return items
+
+
+class SlackWorkspaceDirectory:
+    """
+    Channels and users of one workspace with O(1) identity lookups.
+
+    Features:
+    - conversations.list and users.list paged concurrently (Tier 2 buckets)
+    - email -> user ID and normalized name -> user ID indexes
+    - Cached per token for SLACK_DIRECTORY_TTL_MINUTES (default 30)
+    - If users.list fails the channels are still served; users_loaded is False and
+      callers fall back to per-user lookups
+    """
+
+    TTL_SECONDS = int(os.getenv("SLACK_DIRECTORY_TTL_MINUTES", "30")) * 60
+
+    def __init__(self, channels: List[Dict[str, Any]], users: Optional[List[Dict[str, Any]]]):
+        self.loaded_at = time.time()
+        self.channels = channels
+        self.users_loaded = users is not None
+        self.users_by_email: Dict[str, str] = {}
+        self.users_by_name: Dict[str, str] = {}
+
+        for user in users or []:
+            if user.get("deleted") or user.get("is_bot") or user.get("id") == "USLACKBOT":
+                continue
+            profile = user.get("profile") or {}
+            email = (profile.get("email") or "").strip().lower()
+            if email:
+                self.users_by_email[email] = user["id"]
+            for name in (profile.get("real_name"), profile.get("display_name"), user.get("real_name"), user.get("name")):
+                normalized = normalize_name(name)
+                if normalized:
+                    # First writer wins so a display name can't shadow someone's real name
+                    self.users_by_name.setdefault(normalized, user["id"])
+
+    def is_fresh(self) -> bool:
+        return time.time() - self.loaded_at < self.TTL_SECONDS
+
+    def lookup_email(self, email: str) -> Optional[str]:
+        return self.users_by_email.get((email or "").strip().lower())
+
+    def lookup_name(self, name: str) -> Optional[str]:
+        return self.users_by_name.get(normalize_name(name))
+
+    @classmethod
+    async def for_token(cls, token: str, session=None) -> Optional["SlackWorkspaceDirectory"]:
+        """Return the cached directory for a token, (re)loading it when stale. None if Slack can't be listed."""
+        if not token:
+            return None
+        token_key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        cached = _GLOBAL_DIRECTORY_CACHE.get(token_key)
+        if cached and cached.is_fresh():
+            return cached
+
+        try:
+            if session is None:
+                import aiohttp
+                async with aiohttp.ClientSession() as own_session:
+                    directory = await cls._load(own_session, token)
+            else:
+                directory = await cls._load(session, token)
+        except Exception as e:
+            logger.error(f"Error loading Slack workspace directory: {e}")
+            directory = None
+
+        if directory is None:
+            # Keep serving a stale directory rather than nothing
+            return cached
+        if not directory.users_loaded and cached and cached.users_loaded:
+            # Fresh channels, but the previous user indexes beat per-user lookups
+            directory.users_loaded = True
+            directory.users_by_email = cached.users_by_email
+            directory.users_by_name = cached.users_by_name
+        _GLOBAL_DIRECTORY_CACHE[token_key] = directory
+        return directory
+
+    @classmethod
+    async def _load(cls, session, token: str) -> Optional["SlackWorkspaceDirectory"]:
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        }
+        channels, users = await asyncio.gather(
+            paginate_slack_method(
+                session, token, headers, "conversations.list", "tier2",
+                {"types": "public_channel", "limit": 1000}, "channels"
+            ),
+            paginate_slack_method(session, token, headers, "users.list", "tier2", {"limit": 200}, "members"),
+        )
+        if channels is None:
+            return None
+        if users is None:
+            logger.warning("Slack users.list failed, identities will be looked up per user")
+
+        compact_channels = [
+            {"id": c.get("id"), "name": c.get("name", "unknown"), "updated": c.get("updated", 0), "num_members": c.get("num_members")}
+            for c in channels if c.get("id")
+        ]
+        directory = cls(compact_channels, users)
+        logger.info(
+            f"Loaded Slack directory: {len(compact_channels)} channels, {len(directory.users_by_email)} users with email"
+            + ("" if directory.users_loaded else " (user listing failed)")
+        )
+        return directory
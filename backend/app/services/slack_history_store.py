@@ -0,0 +1,294 @@
+"""
+Persistent, incremental Slack channel history for a workspace.
+
+Keeps a per-channel cursor (the range of time already harvested) and compact
+metadata for each message, so each analysis only asks Slack for messages
+posted after the previous harvest.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..core.api_rate_limiter import integration_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Token fingerprint -> Slack team ID, so auth.test runs once per token per process
+_GLOBAL_TEAM_ID_CACHE: Dict[str, str] = {}
+
+# Workspace mapping ID -> time.monotonic() of the last retention prune in this process
+_GLOBAL_LAST_PRUNE: Dict[int, float] = {}
+
+
+class SlackHistoryStore:
+    """
+    Message metadata store scoped to one SlackWorkspaceMapping.
+
+    Features:
+    - Per-channel cursors: [coverage_start_ts, latest_ts] is fully harvested
+    - Compact rows (author, ts, thread, sentiment score), text only when communication patterns are enabled
+    - Only analysed members' messages are scored; unscored rows (stress_indicator NULL) are
+      scored when a later harvest of the same range includes their author
+    - Retention window (SLACK_MESSAGE_RETENTION_DAYS, default 180), pruned at most every
+      SLACK_HISTORY_PRUNE_INTERVAL_HOURS (default 24) per workspace
+    - Methods are blocking; async callers run them with asyncio.to_thread
+    - All failures are logged and reported as "no store" so callers fetch from Slack directly
+    """
+
+    INSERT_CHUNK_SIZE = 1000
+    RETENTION_DAYS = int(os.getenv("SLACK_MESSAGE_RETENTION_DAYS", "180"))
+    PRUNE_INTERVAL_SECONDS = int(os.getenv("SLACK_HISTORY_PRUNE_INTERVAL_HOURS", "24")) * 3600
+
+    def __init__(self, workspace_mapping_id: int, store_text: bool = False):
+        self.workspace_mapping_id = workspace_mapping_id
+        self.store_text = store_text
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """The store can be disabled for debugging with SLACK_HISTORY_STORE_ENABLED=false."""
+        return os.getenv("SLACK_HISTORY_STORE_ENABLED", "true").lower() == "true"
+
+    @classmethod
+    async def for_token(cls, session, headers: Dict, token: str) -> Optional["SlackHistoryStore"]:
+        """Resolve the token's workspace to its active SlackWorkspaceMapping, or None."""
+        if not token or not cls.is_enabled():
+            return None
+
+        token_key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        team_id = _GLOBAL_TEAM_ID_CACHE.get(token_key)
+        if not team_id:
+            try:
+                await integration_rate_limiter.acquire("slack", token, "tier4")
+                async with session.get("https://slack.com/api/auth.test", headers=headers) as resp:
+                    integration_rate_limiter.record_response("slack", token, "tier4", resp.status, resp.headers)
+                    data = await resp.json() if resp.status == 200 else {}
+                team_id = data.get("team_id") if data.get("ok") else None
+            except Exception as e:
+                logger.warning(f"Slack auth.test failed, history store disabled for this run: {e}")
+                return None
+            if not team_id:
+                return None
+            _GLOBAL_TEAM_ID_CACHE[token_key] = team_id
+
+        return await asyncio.to_thread(cls._for_team, team_id)
+
+    @classmethod
+    def _for_team(cls, team_id: str) -> Optional["SlackHistoryStore"]:
+        from ..models import SessionLocal, SlackWorkspaceMapping
+        db = SessionLocal()
+        try:
+            mapping = db.query(SlackWorkspaceMapping).filter(
+                SlackWorkspaceMapping.workspace_id == team_id,
+                SlackWorkspaceMapping.status == 'active'
+            ).first()
+            if not mapping:
+                logger.info(f"No active workspace mapping for Slack team {team_id}, history store disabled")
+                return None
+            return cls(mapping.id, store_text=bool(mapping.communication_patterns_enabled))
+        except Exception as e:
+            logger.warning(f"Could not resolve Slack workspace mapping for team {team_id}: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def plan_fetch(cursor: Optional[Dict[str, float]], start_ts: float, end_ts: float) -> Optional[Tuple[float, float]]:
+        """
+        Return the (oldest, latest) range still missing for a channel, or None if it is fully stored.
+
+        Only the tail after the cursor is fetched when the cursor already covers the window start;
+        otherwise the whole window is fetched again.
+        """
+        if cursor and cursor.get("coverage_start_ts") is not None and cursor.get("latest_ts") is not None:
+            if cursor["coverage_start_ts"] <= start_ts <= cursor["latest_ts"]:
+                if cursor["latest_ts"] >= end_ts:
+                    return None
+                return cursor["latest_ts"], end_ts
+        return start_ts, end_ts
+
+    def get_cursors(self, channel_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """Load the cursors for the given channels (missing channels have never been harvested)."""
+        if not channel_ids:
+            return {}
+        from ..models import SessionLocal, SlackChannelCursor
+        db = SessionLocal()
+        try:
+            rows = db.query(SlackChannelCursor).filter(
+                SlackChannelCursor.workspace_mapping_id == self.workspace_mapping_id,
+                SlackChannelCursor.channel_id.in_(channel_ids)
+            ).all()
+            return {
+                row.channel_id: {"coverage_start_ts": row.coverage_start_ts, "latest_ts": row.latest_ts}
+                for row in rows
+            }
+        except Exception as e:
+            logger.warning(f"Could not load Slack channel cursors: {e}")
+            return {}
+        finally:
+            db.close()
+
+    def save_harvest(self, channel_id: str, messages: List[Dict[str, Any]], oldest: float, latest: float) -> bool:
+        """
+        Store compact messages for a fully harvested range and advance the channel cursor.
+
+        Returns False if the write failed so the caller keeps using the fetched messages.
+        """
+        from sqlalchemy.dialects.postgresql import insert
+        from ..models import SessionLocal, SlackChannelCursor, SlackMessageMetadata
+
+        rows = [
+            {
+                "workspace_mapping_id": self.workspace_mapping_id,
+                "channel_id": channel_id,
+                "ts": msg["ts"],
+                "sent_at": datetime.fromtimestamp(float(msg["ts"]), tz=timezone.utc),
+                "user_id": msg.get("user"),
+                "bot_id": msg.get("bot_id"),
+                "thread_ts": msg.get("thread_ts"),
+                "author_name": msg.get("author_name"),
+                "sentiment": msg.get("sentiment"),
+                "stress_indicator": msg.get("stress_indicator"),
+                "text": msg.get("text") if self.store_text else None,
+            }
+            for msg in messages if msg.get("ts")
+        ]
+
+        db = SessionLocal()
+        try:
+            for i in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+                # Messages are immutable once harvested; re-fetched overlaps only fill in missing scores
+                stmt = insert(SlackMessageMetadata).values(rows[i:i + self.INSERT_CHUNK_SIZE])
+                db.execute(stmt.on_conflict_do_update(
+                    constraint="uq_slack_message_metadata",
+                    set_={"sentiment": stmt.excluded.sentiment, "stress_indicator": stmt.excluded.stress_indicator},
+                    where=SlackMessageMetadata.stress_indicator.is_(None) & stmt.excluded.stress_indicator.isnot(None)
+                ))
+
+            cursor = db.query(SlackChannelCursor).filter(
+                SlackChannelCursor.workspace_mapping_id == self.workspace_mapping_id,
+                SlackChannelCursor.channel_id == channel_id
+            ).first()
+            if not cursor:
+                db.add(SlackChannelCursor(
+                    workspace_mapping_id=self.workspace_mapping_id,
+                    channel_id=channel_id,
+                    coverage_start_ts=oldest,
+                    latest_ts=latest
+                ))
+            elif cursor.latest_ts is not None and cursor.coverage_start_ts is not None \
+                    and oldest <= cursor.latest_ts and latest >= cursor.coverage_start_ts:
+                # Contiguous with what is stored: extend the covered range
+                cursor.coverage_start_ts = min(cursor.coverage_start_ts, oldest)
+                cursor.latest_ts = max(cursor.latest_ts, latest)
+            elif cursor.latest_ts is None or latest > cursor.latest_ts:
+                # Gap between the stored range and this harvest: only the newer range is known complete
+                cursor.coverage_start_ts = oldest
+                cursor.latest_ts = latest
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to store Slack history for channel {channel_id}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def unscored_channels(self, channel_ids: List[str], user_ids: Set[str], start_ts: float, end_ts: float) -> Set[str]:
+        """Channels holding messages by user_ids in the window that were stored without a sentiment score."""
+        if not channel_ids or not user_ids:
+            return set()
+        from ..models import SessionLocal, SlackMessageMetadata
+        db = SessionLocal()
+        try:
+            rows = db.query(SlackMessageMetadata.channel_id).filter(
+                SlackMessageMetadata.workspace_mapping_id == self.workspace_mapping_id,
+                SlackMessageMetadata.channel_id.in_(channel_ids),
+                SlackMessageMetadata.user_id.in_(list(user_ids)),
+                SlackMessageMetadata.stress_indicator.is_(None),
+                SlackMessageMetadata.sent_at >= datetime.fromtimestamp(start_ts, tz=timezone.utc),
+                SlackMessageMetadata.sent_at <= datetime.fromtimestamp(end_ts, tz=timezone.utc)
+            ).distinct().all()
+            return {row.channel_id for row in rows}
+        except Exception as e:
+            logger.warning(f"Could not check stored Slack history for unscored messages: {e}")
+            return set()
+        finally:
+            db.close()
+
+    def load_messages(self, channel_ids: List[str], start_ts: float, end_ts: float) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Load compact messages per channel for a window. Returns None if the store could not be read."""
+        if not channel_ids:
+            return {}
+        from ..models import SessionLocal, SlackMessageMetadata
+        db = SessionLocal()
+        try:
+            columns = [
+                SlackMessageMetadata.channel_id, SlackMessageMetadata.ts, SlackMessageMetadata.user_id,
+                SlackMessageMetadata.bot_id, SlackMessageMetadata.thread_ts, SlackMessageMetadata.author_name,
+                SlackMessageMetadata.sentiment, SlackMessageMetadata.stress_indicator
+            ]
+            if self.store_text:
+                columns.append(SlackMessageMetadata.text)
+            rows = db.query(*columns).filter(
+                SlackMessageMetadata.workspace_mapping_id == self.workspace_mapping_id,
+                SlackMessageMetadata.channel_id.in_(channel_ids),
+                SlackMessageMetadata.sent_at >= datetime.fromtimestamp(start_ts, tz=timezone.utc),
+                SlackMessageMetadata.sent_at <= datetime.fromtimestamp(end_ts, tz=timezone.utc)
+            ).all()
+
+            messages: Dict[str, List[Dict[str, Any]]] = {channel_id: [] for channel_id in channel_ids}
+            for row in rows:
+                msg = {
+                    "ts": row.ts,
+                    "user": row.user_id,
+                    "bot_id": row.bot_id,
+                    "thread_ts": row.thread_ts,
+                    "author_name": row.author_name,
+                    "sentiment": row.sentiment,
+                    "stress_indicator": row.stress_indicator,
+                }
+                if self.store_text:
+                    msg["text"] = row.text
+                messages[row.channel_id].append(msg)
+            return messages
+        except Exception as e:
+            logger.warning(f"Failed to load stored Slack history: {e}")
+            return None
+        finally:
+            db.close()
+
+    def prune_expired_if_due(self) -> None:
+        """Run prune_expired() unless this workspace was pruned within PRUNE_INTERVAL_SECONDS."""
+        now = time.monotonic()
+        last = _GLOBAL_LAST_PRUNE.get(self.workspace_mapping_id)
+        if last is not None and now - last < self.PRUNE_INTERVAL_SECONDS:
+            return
+        _GLOBAL_LAST_PRUNE[self.workspace_mapping_id] = now
+        self.prune_expired()
+
+    def prune_expired(self) -> None:
+        """Drop metadata older than the retention window and shrink cursor coverage to match."""
+        from ..models import SessionLocal, SlackChannelCursor, SlackMessageMetadata
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.RETENTION_DAYS)
+        db = SessionLocal()
+        try:
+            removed = db.query(SlackMessageMetadata).filter(
+                SlackMessageMetadata.workspace_mapping_id == self.workspace_mapping_id,
+                SlackMessageMetadata.sent_at < cutoff
+            ).delete(synchronize_session=False)
+            db.query(SlackChannelCursor).filter(
+                SlackChannelCursor.workspace_mapping_id == self.workspace_mapping_id,
+                SlackChannelCursor.coverage_start_ts < cutoff.timestamp()
+            ).update({SlackChannelCursor.coverage_start_ts: cutoff.timestamp()}, synchronize_session=False)
+            db.commit()
+            if removed:
+                logger.info(f"Removed {removed} Slack messages older than {self.RETENTION_DAYS} days")
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to prune expired Slack history: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,130 @@
+"""
+Channel membership index for Slack workspaces.
+
+Used to skip conversations.history for channels that none of the analyzed
+responders belong to. Memberships are cached per workspace (bot tokens are
+workspace-scoped, so the token fingerprint identifies the workspace).
+"""
+import hashlib
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from .slack_directory import paginate_slack_method
+
+logger = logging.getLogger(__name__)
+
+# Global cache that persists across analyses: workspace key -> membership data
+_GLOBAL_MEMBERSHIP_CACHE: Dict[str, Dict] = {}
+
+
+class SlackMembershipIndex:
+    """
+    Maps Slack users to the public channels they are members of.
+
+    Features:
+    - users.conversations for a few users, conversations.members when most channels are needed anyway
+    - Per-workspace cache with a TTL (SLACK_MEMBERSHIP_TTL_MINUTES, default 60)
+    - Paginated, rate limited through the shared Slack tier buckets
+    """
+
+    TTL_SECONDS = int(os.getenv("SLACK_MEMBERSHIP_TTL_MINUTES", "60")) * 60
+    MAX_RETRIES = 3
+
+    def __init__(self, token: str):
+        self.token = token
+        self.workspace_key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        self._cache = _GLOBAL_MEMBERSHIP_CACHE.setdefault(
+            self.workspace_key, {"channel_members": {}, "channel_members_built_at": 0.0, "user_channels": {}}
+        )
+
+    def _is_fresh(self, built_at: float) -> bool:
+        return time.time() - built_at < self.TTL_SECONDS
+
+    async def _paginate(self, session, headers: Dict, method: str, bucket: str, params: Dict, key: str) -> Optional[List]:
+        return await paginate_slack_method(session, self.token, headers, method, bucket, params, key, self.MAX_RETRIES)
+
+    async def _fetch_user_channels(self, session, headers: Dict, user_id: str) -> Optional[Set[str]]:
+        channels = await self._paginate(
+            session, headers, "users.conversations", "tier3",
+            {"user": user_id, "types": "public_channel", "exclude_archived": "true", "limit": 1000},
+            "channels"
+        )
+        if channels is None:
+            return None
+        return {channel["id"] for channel in channels if channel.get("id")}
+
+    async def _build_channel_members(self, session, headers: Dict, channel_ids: Iterable[str]) -> None:
+        channel_members = {}
+        for channel_id in channel_ids:
+            members = await self._paginate(
+                session, headers, "conversations.members", "tier4",
+                {"channel": channel_id, "limit": 1000}, "members"
+            )
+            if members is None:
+                # Unknown membership: keep the channel rather than silently dropping its history
+                return
+            channel_members[channel_id] = set(members)
+        self._cache["channel_members"] = channel_members
+        self._cache["channel_members_built_at"] = time.time()
+
+    async def get_relevant_channel_ids(self, session, headers: Dict, user_ids: Set[str], channel_ids: List[str]) -> Optional[Set[str]]:
+        """
+        Return the subset of channel_ids that at least one of user_ids is a member of.
+
+        Returns None when membership could not be determined, so callers keep every channel.
+        """
+        if not user_ids or not channel_ids:
+            return None
+
+        try:
+            full_index_fresh = self._is_fresh(self._cache["channel_members_built_at"])
+            missing_users = [
+                uid for uid in user_ids
+                if not self._is_fresh(self._cache["user_channels"].get(uid, (0.0, None))[0])
+            ]
+
+            # Per-user lookups cost one Tier 3 call each; a full index costs one Tier 4 call per channel
+            if missing_users and not full_index_fresh and len(missing_users) * 2 >= len(channel_ids):
+                logger.info(f"Building Slack membership index for {len(channel_ids)} channels")
+                await self._build_channel_members(session, headers, channel_ids)
+                full_index_fresh = self._is_fresh(self._cache["channel_members_built_at"])
+
+            relevant = set()
+            if full_index_fresh:
+                for channel_id in channel_ids:
+                    members = self._cache["channel_members"].get(channel_id)
+                    if members is None or members & user_ids:
+                        relevant.add(channel_id)
+                return relevant
+
+            for uid in user_ids:
+                cached_at, channels = self._cache["user_channels"].get(uid, (0.0, None))
+                if not self._is_fresh(cached_at):
+                    channels = await self._fetch_user_channels(session, headers, uid)
+                    if channels is None:
+                        return None
+                    self._cache["user_channels"][uid] = (time.time(), channels)
+                relevant |= channels
+            return relevant & set(channel_ids)
+        except Exception as e:
+            logger.warning(f"Slack membership lookup failed, keeping all channels: {e}")
+            return None
+
+
+def prune_channels_by_membership(channels: List[Dict], relevant_ids: Optional[Set[str]], idle_channel_cap: int = 0) -> List[Dict]:
+    """
+    Keep channels with an analyzed member, plus up to idle_channel_cap channels without one.
+
+    Idle channels are kept most recently updated first, since bot-posted messages can name
+    responders in channels they never joined.
+    """
+    if relevant_ids is None:
+        return channels
+    kept = [channel for channel in channels if channel.get("id") in relevant_ids]
+    if idle_channel_cap > 0:
+        idle = [channel for channel in channels if channel.get("id") not in relevant_ids]
+        idle.sort(key=lambda channel: channel.get("updated", 0), reverse=True)
+        kept.extend(idle[:idle_channel_cap])
+    return kept
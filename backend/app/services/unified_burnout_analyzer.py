@@ -14,6 +14,7 @@ from collections import defaultdict
 from ..core.rootly_client import RootlyAPIClient
 from ..core.pagerduty_client import PagerDutyAPIClient
 from ..core.cbi_config import calculate_composite_cbi_score, calculate_personal_burnout, calculate_work_related_burnout, generate_cbi_score_reasoning
+from ..core.daily_health import incident_health_score
 from .ai_burnout_analyzer import get_ai_burnout_analyzer
 from .github_correlation_service import GitHubCorrelationService
 
@@ -1130,31 +1131,11 @@ class UnifiedBurnoutAnalyzer:
                 if assigned_to and assigned_to.get("id"):
                     incident_users.add(str(assigned_to["id"]))
                 
-                # 2. If no assigned user, check raw incident data for acknowledgments and assignments
-                if not incident_users and "raw_data" in incident:
-                    raw_incident = incident["raw_data"]
-                    
-                    # Check all assignments (not just first)
-                    assignments = raw_incident.get("assignments", [])
-                    for assignment in assignments:
-                        assignee = assignment.get("assignee", {})
-                        if assignee and assignee.get("id"):
-                            incident_users.add(str(assignee["id"]))
-                    
-                    # Check acknowledgments (who acknowledged the incident)
-                    acknowledgments = raw_incident.get("acknowledgments", [])
-                    for ack in acknowledgments:
-                        acknowledger = ack.get("acknowledger", {})
-                        if acknowledger and acknowledger.get("id"):
-                            incident_users.add(str(acknowledger["id"]))
-                    
-                    # Check escalation policy targets as fallback
-                    escalation_policy = raw_incident.get("escalation_policy", {})
-                    if escalation_policy and escalation_policy.get("escalation_rules"):
-                        for rule in escalation_policy.get("escalation_rules", []):
-                            for target in rule.get("targets", []):
-                                if target.get("type") == "user" and target.get("id"):
-                                    incident_users.add(str(target["id"]))
+                # 2. If no assigned user, fall back to every participant projected at ingest
+                #    (all assignees, acknowledgers, then escalation policy user targets)
+                if not incident_users:
+                    for participant_id in incident.get("participant_ids", []) or []:
+                        incident_users.add(str(participant_id))
             else:
                 # Rootly format
                 attrs = incident.get("attributes", {}) if incident else {}
@@ -4166,37 +4147,13 @@ class UnifiedBurnoutAnalyzer:
             
             day_data = user_daily_data[date]
             
-            # Calculate individual health score based on daily incident load
-            base_score = 8.5  # Start with healthy baseline
-            
             incident_count = day_data.get("incident_count", 0)
             severity_weighted = day_data.get("severity_weighted_count", 0.0)
             after_hours_count = day_data.get("after_hours_count", 0)
             high_severity_count = day_data.get("high_severity_count", 0)
             
-            # Individual scoring penalties
-            # Incident volume penalty (more aggressive for individuals)
-            if incident_count > 0:
-                incident_penalty = min(incident_count * 1.0, 3.0)  # Up to 3 points for high incident days
-                base_score -= incident_penalty
-            
-            # Severity penalty (critical incidents impact individual more heavily)
-            if severity_weighted > incident_count:  # Above-average severity
-                severity_penalty = min((severity_weighted - incident_count) * 0.8, 2.0)
-                base_score -= severity_penalty
-            
-            # After-hours penalty (work-life balance impact)
-            if after_hours_count > 0:
-                after_hours_penalty = min(after_hours_count * 0.7, 1.5)
-                base_score -= after_hours_penalty
-            
-            # High severity penalty (stress impact)
-            if high_severity_count > 0:
-                high_sev_penalty = min(high_severity_count * 1.0, 2.0)
-                base_score -= high_sev_penalty
-            
-            # Floor at 1.0 (10% health) for very bad days
-            daily_health_score = max(base_score, 1.0)
+            # Same incident-load scoring as the stored daily health series
+            daily_health_score = incident_health_score(day_data)
             
             # Calculate contributing factors
             factors = {}
@@ -2,8 +2,10 @@
 Service for syncing all users from Rootly/PagerDuty to UserCorrelation table.
 Ensures all team members can submit burnout surveys regardless of incident involvement.
 """
+import asyncio
 import logging
-from typing import Dict, List, Any
+import os
+from typing import Dict, List, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models import User, UserCorrelation, RootlyIntegration
 from app.core.rootly_client import RootlyAPIClient
@@ -15,6 +17,9 @@ logger = logging.getLogger(__name__)
 class UserSyncService:
     """Service to sync all users from integrations to UserCorrelation table."""
 
+    UPSERT_CHUNK_SIZE = 1000  # Correlations per lookup / upsert statement
+    SYNC_CONCURRENCY = int(os.getenv("USER_SYNC_CONCURRENCY", "4"))  # Integrations fetched at once
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -43,33 +48,42 @@ class UserSyncService:
             if not integration:
                 raise ValueError(f"Integration {integration_id} not found")
 
-            # Fetch users from the platform
-            if integration.platform == "rootly":
-                users = await self._fetch_rootly_users(integration.api_token)
-            elif integration.platform == "pagerduty":
-                users = await self._fetch_pagerduty_users(integration.api_token)
-            else:
-                raise ValueError(f"Unsupported platform: {integration.platform}")
-
-            # Sync users to UserCorrelation
-            stats = self._sync_users_to_correlation(
-                users=users,
-                platform=integration.platform,
-                current_user=current_user,
-                integration_id=str(integration_id)  # Store which integration synced this user
-            )
-
-            logger.info(
-                f"Synced {stats['created']} new users, updated {stats['updated']} existing users "
-                f"from {integration.platform} integration {integration_id}"
-            )
-
-            return stats
+            users = await self._fetch_integration_users(integration)
+            return self._sync_fetched_users(integration, users, current_user)
 
         except Exception as e:
             logger.error(f"Error syncing integration users: {e}")
             raise
 
+    async def _fetch_integration_users(self, integration: RootlyIntegration) -> List[Dict[str, Any]]:
+        """Fetch users from the integration's platform."""
+        if integration.platform == "rootly":
+            return await self._fetch_rootly_users(integration.api_token)
+        elif integration.platform == "pagerduty":
+            return await self._fetch_pagerduty_users(integration.api_token)
+        raise ValueError(f"Unsupported platform: {integration.platform}")
+
+    def _sync_fetched_users(
+        self,
+        integration: RootlyIntegration,
+        users: List[Dict[str, Any]],
+        current_user: User
+    ) -> Dict[str, int]:
+        """Sync an integration's fetched users to UserCorrelation."""
+        stats = self._sync_users_to_correlation(
+            users=users,
+            platform=integration.platform,
+            current_user=current_user,
+            integration_id=str(integration.id)  # Store which integration synced this user
+        )
+
+        logger.info(
+            f"Synced {stats['created']} new users, updated {stats['updated']} existing users "
+            f"from {integration.platform} integration {integration.id}"
+        )
+
+        return stats
+
     async def _fetch_rootly_users(self, api_token: str) -> List[Dict[str, Any]]:
         """Fetch all users from Rootly API."""
         client = RootlyAPIClient(api_token)
@@ -115,9 +129,12 @@ class UserSyncService:
         """
         Sync users to UserCorrelation table.
 
-        Creates new records or updates existing ones.
+        Loads the existing correlations in bulk, then creates or updates them with
+        chunked INSERT ... ON CONFLICT (user_id, email) DO UPDATE statements.
         Uses organization_id for multi-tenancy support.
         """
+        from sqlalchemy.dialects.postgresql import insert
+
         created = 0
         updated = 0
         skipped = 0
@@ -130,40 +147,54 @@ class UserSyncService:
         if not organization_id:
             logger.info(f"User {user_id} has no organization_id - using user_id for isolation (beta mode)")
 
+        emails = list(dict.fromkeys(
+            user["email"].lower().strip() for user in users if user.get("email")
+        ))
+        existing = self._load_correlations(user_id, emails)
+        platform_column = "rootly_email" if platform == "rootly" else "pagerduty_user_id"
+
+        # Users are merged in payload order, so a repeated email is created once and
+        # then updated by its later entries, exactly as one row at a time would be
+        pending: Dict[str, Dict[str, Any]] = {}
         for user in users:
             email = user.get("email")
             if not email:
                 skipped += 1
                 logger.warning(f"Skipping user {user.get('id')} - no email")
                 continue
-
             email = email.lower().strip()
 
-            # Check if correlation already exists
-            # Check by (user_id, email) to match the unique constraint
-            correlation = self.db.query(UserCorrelation).filter(
-                UserCorrelation.user_id == user_id,
-                UserCorrelation.email == email
-            ).first()
-
-            if correlation:
-                # Update existing correlation
-                updated += self._update_correlation(correlation, user, platform, integration_id)
-            else:
-                # Create new correlation
-                correlation = UserCorrelation(
-                    user_id=current_user.id,  # Keep for backwards compatibility
-                    organization_id=organization_id,  # Multi-tenancy key
-                    email=email,
-                    name=user.get("name"),  # Store user's display name
-                    integration_ids=[integration_id] if integration_id else []  # Initialize array
-                )
-                self._update_correlation(correlation, user, platform, integration_id)
-                self.db.add(correlation)
+            current = pending.get(email, existing.get(email))
+            row, changed = self._merge_correlation(current, user, platform, integration_id)
+            if current is None:
                 created += 1
+            elif changed:
+                updated += 1
+            else:
+                continue
+            pending[email] = row
+
+        rows = [
+            {
+                "user_id": user_id,  # Keep for backwards compatibility
+                "organization_id": organization_id,  # Multi-tenancy key (only set on insert)
+                "email": email,
+                **row
+            }
+            for email, row in pending.items()
+        ]
 
-        # Commit all changes
         try:
+            for i in range(0, len(rows), self.UPSERT_CHUNK_SIZE):
+                stmt = insert(UserCorrelation).values(rows[i:i + self.UPSERT_CHUNK_SIZE])
+                self.db.execute(stmt.on_conflict_do_update(
+                    constraint="uq_user_correlation_user_email",
+                    set_={
+                        "name": stmt.excluded.name,
+                        "integration_ids": stmt.excluded.integration_ids,
+                        platform_column: getattr(stmt.excluded, platform_column),
+                    }
+                ))
             self.db.commit()
         except Exception as e:
             self.db.rollback()
@@ -177,43 +208,57 @@ class UserSyncService:
             "total": len(users)
         }
 
-    def _update_correlation(
+    def _load_correlations(self, user_id: int, emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Existing correlations for these emails, keyed by email."""
+        existing = {}
+        for i in range(0, len(emails), self.UPSERT_CHUNK_SIZE):
+            rows = self.db.query(
+                UserCorrelation.email, UserCorrelation.name, UserCorrelation.integration_ids,
+                UserCorrelation.rootly_email, UserCorrelation.pagerduty_user_id
+            ).filter(
+                UserCorrelation.user_id == user_id,
+                UserCorrelation.email.in_(emails[i:i + self.UPSERT_CHUNK_SIZE])
+            ).all()
+            existing.update({row.email: row._asdict() for row in rows})
+        return existing
+
+    def _merge_correlation(
         self,
-        correlation: UserCorrelation,
+        current: Optional[Dict[str, Any]],
         user: Dict[str, Any],
         platform: str,
         integration_id: str = None
-    ) -> int:
+    ) -> Tuple[Dict[str, Any], bool]:
         """
-        Update a UserCorrelation record with platform-specific data.
-        Returns 1 if updated, 0 if no changes.
+        Merge platform data for one user into its existing correlation values.
+        Returns the merged column values and whether anything changed.
         """
+        current = current or {}
+        integration_ids = list(current.get("integration_ids") or [])
+        name = current.get("name")
+        row = {
+            "rootly_email": current.get("rootly_email"),
+            "pagerduty_user_id": current.get("pagerduty_user_id"),
+        }
         updated = False
 
         # Update integration_ids array - add if not already present
-        if integration_id:
-            if not correlation.integration_ids:
-                correlation.integration_ids = [integration_id]
-                updated = True
-            elif integration_id not in correlation.integration_ids:
-                correlation.integration_ids = correlation.integration_ids + [integration_id]
-                updated = True
+        if integration_id and integration_id not in integration_ids:
+            integration_ids.append(integration_id)
+            updated = True
 
         # Update name if available and different
-        if user.get("name") and correlation.name != user["name"]:
-            correlation.name = user["name"]
+        if user.get("name") and name != user["name"]:
+            name = user["name"]
             updated = True
 
-        if platform == "rootly":
-            if not correlation.rootly_email or correlation.rootly_email != user["email"]:
-                correlation.rootly_email = user["email"]
-                updated = True
-        elif platform == "pagerduty":
-            if not correlation.pagerduty_user_id or correlation.pagerduty_user_id != user["id"]:
-                correlation.pagerduty_user_id = user["id"]
-                updated = True
+        platform_column = "rootly_email" if platform == "rootly" else "pagerduty_user_id"
+        platform_value = user["email"] if platform == "rootly" else user["id"]
+        if row[platform_column] != platform_value:
+            row[platform_column] = platform_value
+            updated = True
 
-        return 1 if updated else 0
+        return {"name": name, "integration_ids": integration_ids, **row}, updated
 
     def sync_users_from_list(
         self,
@@ -247,6 +292,8 @@ class UserSyncService:
         """
         Sync users from ALL of the user's integrations.
 
+        Users are fetched from every integration concurrently (SYNC_CONCURRENCY at a time),
+        then written one integration after another on this service's session.
         Useful for initial setup or bulk sync.
         """
         integrations = self.db.query(RootlyIntegration).filter(
@@ -262,12 +309,22 @@ class UserSyncService:
             "errors": []
         }
 
-        for integration in integrations:
+        semaphore = asyncio.Semaphore(self.SYNC_CONCURRENCY)
+
+        async def bounded_fetch(integration: RootlyIntegration):
+            async with semaphore:
+                return await self._fetch_integration_users(integration)
+
+        fetched = await asyncio.gather(
+            *[bounded_fetch(integration) for integration in integrations],
+            return_exceptions=True
+        )
+
+        for integration, users in zip(integrations, fetched):
             try:
-                stats = await self.sync_integration_users(
-                    integration_id=integration.id,
-                    current_user=current_user
-                )
+                if isinstance(users, Exception):
+                    raise users
+                stats = self._sync_fetched_users(integration, users, current_user)
                 total_stats["integrations_synced"] += 1
                 total_stats["total_created"] += stats["created"]
                 total_stats["total_updated"] += stats["updated"]
@@ -399,6 +399,247 @@ class MigrationRunner:
                     """
                 ]
             },
+            {
+                "name": "011_create_integration_data_store",
+                "description": "Create integration_records and integration_sync_states tables for the persistent incident/user/shift store",
+                "sql": [
+                    """
+                    CREATE TABLE IF NOT EXISTS integration_records (
+                        id SERIAL PRIMARY KEY,
+                        integration_key VARCHAR(64) NOT NULL,
+                        platform VARCHAR(20) NOT NULL,
+                        record_type VARCHAR(20) NOT NULL,
+                        record_id VARCHAR(100) NOT NULL,
+                        occurred_at TIMESTAMP WITH TIME ZONE,
+                        source_updated_at TIMESTAMP WITH TIME ZONE,
+                        payload JSON NOT NULL,
+                        synced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        CONSTRAINT uq_integration_record UNIQUE (integration_key, record_type, record_id)
+                    )
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS ix_integration_records_window
+                    ON integration_records(integration_key, record_type, occurred_at)
+                    """,
+                    """
+                    CREATE TABLE IF NOT EXISTS integration_sync_states (
+                        id SERIAL PRIMARY KEY,
+                        integration_key VARCHAR(64) NOT NULL,
+                        platform VARCHAR(20) NOT NULL,
+                        record_type VARCHAR(20) NOT NULL,
+                        coverage_start TIMESTAMP WITH TIME ZONE,
+                        high_water_mark TIMESTAMP WITH TIME ZONE,
+                        last_synced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        CONSTRAINT uq_integration_sync_state UNIQUE (integration_key, record_type)
+                    )
+                    """
+                ]
+            },
+            {
+                "name": "012_create_slack_history_store",
+                "description": "Create slack_channel_cursors and slack_message_metadata tables for incremental Slack harvesting",
+                "sql": [
+                    """
+                    CREATE TABLE IF NOT EXISTS slack_channel_cursors (
+                        id SERIAL PRIMARY KEY,
+                        workspace_mapping_id INTEGER NOT NULL REFERENCES slack_workspace_mappings(id) ON DELETE CASCADE,
+                        channel_id VARCHAR(20) NOT NULL,
+                        coverage_start_ts DOUBLE PRECISION,
+                        latest_ts DOUBLE PRECISION,
+                        last_harvested_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        CONSTRAINT uq_slack_channel_cursor UNIQUE (workspace_mapping_id, channel_id)
+                    )
+                    """,
+                    """
+                    CREATE TABLE IF NOT EXISTS slack_message_metadata (
+                        id BIGSERIAL PRIMARY KEY,
+                        workspace_mapping_id INTEGER NOT NULL REFERENCES slack_workspace_mappings(id) ON DELETE CASCADE,
+                        channel_id VARCHAR(20) NOT NULL,
+                        ts VARCHAR(20) NOT NULL,
+                        sent_at TIMESTAMP WITH TIME ZONE NOT NULL,
+                        user_id VARCHAR(20),
+                        bot_id VARCHAR(20),
+                        thread_ts VARCHAR(20),
+                        author_name VARCHAR(255),
+                        sentiment DOUBLE PRECISION,
+                        stress_indicator BOOLEAN DEFAULT FALSE,
+                        text TEXT,
+                        CONSTRAINT uq_slack_message_metadata UNIQUE (workspace_mapping_id, channel_id, ts)
+                    )
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS ix_slack_message_metadata_window
+                    ON slack_message_metadata(workspace_mapping_id, sent_at)
+                    """
+                ]
+            },
+            {
+                "name": "013_create_github_daily_commits",
+                "description": "Create github_daily_commits table for stored per-day commit histograms",
+                "sql": [
+                    """
+                    CREATE TABLE IF NOT EXISTS github_daily_commits (
+                        id SERIAL PRIMARY KEY,
+                        github_username VARCHAR(100) NOT NULL,
+                        timezone VARCHAR(50) NOT NULL DEFAULT 'author_local',
+                        date DATE NOT NULL,
+                        commits INTEGER NOT NULL DEFAULT 0,
+                        after_hours_commits INTEGER NOT NULL DEFAULT 0,
+                        weekend_commits INTEGER NOT NULL DEFAULT 0,
+                        is_final BOOLEAN NOT NULL DEFAULT FALSE,
+                        fetched_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        CONSTRAINT uq_github_daily_commits UNIQUE (github_username, timezone, date)
+                    )
+                    """
+                ]
+            },
+            {
+                "name": "014_create_github_member_profiles",
+                "description": "Create github_member_profiles table for persisted organization member profiles",
+                "sql": [
+                    """
+                    CREATE TABLE IF NOT EXISTS github_member_profiles (
+                        id SERIAL PRIMARY KEY,
+                        organization VARCHAR(100) NOT NULL,
+                        login VARCHAR(100) NOT NULL,
+                        name VARCHAR(255),
+                        public_email VARCHAR(255),
+                        updated_at TIMESTAMP WITH TIME ZONE,
+                        seen_at TIMESTAMP WITH TIME ZONE NOT NULL,
+                        profile_fetched_at TIMESTAMP WITH TIME ZONE,
+                        CONSTRAINT uq_github_member_profile UNIQUE (organization, login)
+                    )
+                    """
+                ]
+            },
+            {
+                "name": "015_index_latest_integration_mappings",
+                "description": "Index integration_mappings for latest-mapping-per-email lookups",
+                "sql": [
+                    """
+                    CREATE INDEX IF NOT EXISTS ix_integration_mappings_latest
+                    ON integration_mappings(user_id, target_platform, source_identifier, created_at DESC)
+                    """
+                ]
+            },
+            {
+                "name": "016_unique_integration_mapping_attempts",
+                "description": "Deduplicate integration_mappings and enforce one row per attempt key for batched upserts",
+                "sql": [
+                    """
+                    DELETE FROM integration_mappings
+                    WHERE EXISTS (
+                        SELECT 1 FROM integration_mappings newer
+                        WHERE newer.id > integration_mappings.id
+                          AND newer.user_id = integration_mappings.user_id
+                          AND newer.analysis_id IS NOT DISTINCT FROM integration_mappings.analysis_id
+                          AND newer.source_platform = integration_mappings.source_platform
+                          AND newer.source_identifier = integration_mappings.source_identifier
+                          AND newer.target_platform = integration_mappings.target_platform
+                    )
+                    """,
+                    """
+                    CREATE UNIQUE INDEX IF NOT EXISTS uq_integration_mappings_attempt
+                    ON integration_mappings(user_id, analysis_id, source_platform, source_identifier, target_platform)
+                    WHERE analysis_id IS NOT NULL
+                    """,
+                    """
+                    CREATE UNIQUE INDEX IF NOT EXISTS uq_integration_mappings_attempt_no_analysis
+                    ON integration_mappings(user_id, source_platform, source_identifier, target_platform)
+                    WHERE analysis_id IS NULL
+                    """
+                ]
+            },
+            {
+                "name": "017_create_normalized_analysis_results",
+                "description": "Split analysis results into summary, member, member-daily and team-daily tables",
+                "sql": [
+                    """
+                    CREATE TABLE IF NOT EXISTS analysis_summaries (
+                        analysis_id INTEGER PRIMARY KEY REFERENCES analyses(id) ON DELETE CASCADE,
+                        summary JSONB NOT NULL,
+                        member_count INTEGER NOT NULL DEFAULT 0,
+                        stored_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                    )
+                    """,
+                    """
+                    CREATE TABLE IF NOT EXISTS analysis_members (
+                        id SERIAL PRIMARY KEY,
+                        analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+                        position INTEGER NOT NULL,
+                        member_email VARCHAR(255),
+                        user_name VARCHAR(255),
+                        risk_level VARCHAR(20),
+                        burnout_score DOUBLE PRECISION,
+                        incident_count INTEGER,
+                        data JSONB NOT NULL,
+                        CONSTRAINT uq_analysis_member_position UNIQUE (analysis_id, position)
+                    )
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS ix_analysis_members_email
+                    ON analysis_members(analysis_id, member_email)
+                    """,
+                    """
+                    CREATE TABLE IF NOT EXISTS analysis_member_daily (
+                        analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+                        member_email VARCHAR(255) NOT NULL,
+                        date DATE NOT NULL,
+                        data JSONB NOT NULL,
+                        PRIMARY KEY (analysis_id, member_email, date)
+                    )
+                    """,
+                    """
+                    CREATE TABLE IF NOT EXISTS analysis_team_daily (
+                        analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+                        date DATE NOT NULL,
+                        data JSONB NOT NULL,
+                        PRIMARY KEY (analysis_id, date)
+                    )
+                    """
+                ]
+            },
+            {
+                "name": "018_index_analysis_listing",
+                "description": "Index analyses for keyset-paginated listing and most-recent lookups",
+                "sql": [
+                    """
+                    CREATE INDEX IF NOT EXISTS ix_analyses_user_created
+                    ON analyses(user_id, created_at DESC, id DESC)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS ix_analyses_org_status_created
+                    ON analyses(organization_id, status, created_at DESC)
+                    """
+                ]
+            },
+            {
+                "name": "019_add_analysis_results_version",
+                "description": "Version analysis results so completed analyses can be served with ETags",
+                "sql": [
+                    """
+                    ALTER TABLE analyses
+                    ADD COLUMN IF NOT EXISTS results_version INTEGER NOT NULL DEFAULT 1
+                    """
+                ]
+            },
+            {
+                "name": "020_create_analysis_member_health",
+                "description": "Store each member's daily health series in compact binary form",
+                "sql": [
+                    """
+                    CREATE TABLE IF NOT EXISTS analysis_member_health (
+                        analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+                        member_email VARCHAR(255) NOT NULL,
+                        start_date DATE NOT NULL,
+                        health BYTEA NOT NULL,
+                        team_health BYTEA NOT NULL,
+                        factors BYTEA NOT NULL,
+                        PRIMARY KEY (analysis_id, member_email)
+                    )
+                    """
+                ]
+            },
             # Add future migrations here with incrementing numbers
             # {
             #     "name": "009_add_user_preferences",
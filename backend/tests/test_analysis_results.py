@@ -0,0 +1,127 @@
+"""
+Unit tests for splitting analysis results into normalized rows.
+"""
+
+import unittest
+import sys
+import os
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.exc import IntegrityError
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from core.analysis_results import split_analysis_results, team_members, parse_fields, project_fields
+from app.services.analysis_results_store import AnalysisResultsStore
+
+
+class TestSplitAnalysisResults(unittest.TestCase):
+    """Test that each slice ends up in its own rows and the summary keeps the rest."""
+
+    def setUp(self):
+        self.results = {
+            "team_health": {"overall_score": 7.2},
+            "metadata": {"days_analyzed": 2},
+            "team_analysis": {
+                "members": [
+                    {"user_email": "Ada@Example.com", "user_name": "Ada", "risk_level": "high", "burnout_score": 61.5, "incident_count": 4},
+                    {"user_name": "No Email", "burnout_score": None},
+                ],
+                "organization_name": "Acme",
+            },
+            "daily_trends": [
+                {"date": "2025-01-02", "overall_score": 8.0},
+                {"date": "2025-01-01", "overall_score": 7.0},
+                {"overall_score": 1.0},
+            ],
+            "individual_daily_data": {
+                "Ada@Example.com": {"2025-01-01": {"incident_count": 1}, "not-a-date": {}},
+            },
+        }
+
+    def test_summary_excludes_split_parts(self):
+        summary, _, _, _ = split_analysis_results(self.results)
+        self.assertEqual(summary["team_health"], {"overall_score": 7.2})
+        self.assertEqual(summary["team_analysis"], {"organization_name": "Acme"})
+        self.assertNotIn("daily_trends", summary)
+        self.assertNotIn("individual_daily_data", summary)
+        self.assertIn("members", self.results["team_analysis"])  # input is not modified
+
+    def test_members_keep_order_and_lowercase_email(self):
+        _, members, _, _ = split_analysis_results(self.results)
+        self.assertEqual([m["position"] for m in members], [0, 1])
+        self.assertEqual(members[0]["member_email"], "ada@example.com")
+        self.assertEqual(members[0]["risk_level"], "high")
+        self.assertIsNone(members[1]["member_email"])
+        self.assertIsNone(members[1]["burnout_score"])
+
+    def test_daily_series(self):
+        _, _, member_daily, team_daily = split_analysis_results(self.results)
+        self.assertEqual(member_daily, [{"member_email": "ada@example.com", "date": date(2025, 1, 1), "data": {"incident_count": 1}}])
+        self.assertEqual([row["date"] for row in team_daily], [date(2025, 1, 1), date(2025, 1, 2)])
+
+    def test_legacy_list_team_analysis(self):
+        results = {"team_analysis": [{"email": "bob@example.com"}]}
+        summary, members, _, _ = split_analysis_results(results)
+        self.assertEqual(team_members(results), [{"email": "bob@example.com"}])
+        self.assertEqual(members[0]["member_email"], "bob@example.com")
+        self.assertEqual(summary["team_analysis"], {})
+
+
+class TestFieldProjection(unittest.TestCase):
+    """Test fields= parsing and projection through nested lists."""
+
+    def test_parse_fields(self):
+        self.assertEqual(parse_fields(" team_health, team_analysis.members.burnout_score,,team_health"),
+                         [["team_health"], ["team_analysis", "members", "burnout_score"]])
+        self.assertEqual(parse_fields(None), [])
+
+    def test_project_fields(self):
+        results = {
+            "team_health": {"overall_score": 7.2},
+            "team_analysis": {"members": [{"user_name": "Ada", "burnout_score": 61.5}, {"user_name": "Bob"}], "organization_name": "Acme"},
+            "daily_trends": [{"date": "2025-01-01"}],
+        }
+        projected = project_fields(results, parse_fields("team_health,team_analysis.members.burnout_score,missing"))
+        self.assertEqual(projected, {
+            "team_health": {"overall_score": 7.2},
+            "team_analysis": {"members": [{"burnout_score": 61.5}, {}]},
+        })
+        self.assertIs(project_fields(results, []), results)
+
+
+
+class TestEnsureBackfill(unittest.TestCase):
+    """ensure() runs from read endpoints; a concurrent backfill of the same analysis is not a failure."""
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(results={"team_health": {}})
+        self.store = AnalysisResultsStore(self.db)
+
+    def ensure(self, replace_error, stored_after):
+        with patch.object(self.store, "_has_summary", side_effect=[False, stored_after]), \
+                patch.object(self.store, "_replace", side_effect=replace_error) as replace:
+            result = self.store.ensure(7)
+        replace.assert_called_once_with(7, {"team_health": {}})
+        return result
+
+    def test_backfills_on_first_read(self):
+        self.assertTrue(self.ensure(None, stored_after=True))
+        self.db.rollback.assert_not_called()
+
+    def test_lost_race_rereads_stored_rows(self):
+        duplicate = IntegrityError("INSERT INTO analysis_summaries", {}, Exception("duplicate key"))
+        self.assertTrue(self.ensure(duplicate, stored_after=True))
+        self.db.rollback.assert_called_once()
+
+    def test_other_write_failures_report_missing_rows(self):
+        self.assertFalse(self.ensure(RuntimeError("connection lost"), stored_after=True))
+        self.db.rollback.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
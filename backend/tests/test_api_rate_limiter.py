@@ -0,0 +1,82 @@
+"""
+Unit tests for the shared integration API rate limiter.
+
+Tests token bucket refill, header-driven blocking and Retry-After parsing.
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from core.api_rate_limiter import (
+    TokenBucket,
+    IntegrationRateLimiter,
+    parse_retry_after,
+    parse_rate_limit_reset,
+    MAX_BLOCK_SECONDS
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test token bucket accounting."""
+
+    def test_bucket_drains_then_refills(self):
+        bucket = TokenBucket(capacity=2, refill_per_second=1.0)
+        now = bucket.updated_at
+        self.assertEqual(bucket.reserve(now), 0.0)
+        self.assertEqual(bucket.reserve(now), 0.0)
+        self.assertAlmostEqual(bucket.reserve(now), 1.0)
+        self.assertEqual(bucket.reserve(now + 1.0), 0.0)
+
+    def test_block_is_capped_and_never_shortened(self):
+        bucket = TokenBucket(capacity=5, refill_per_second=1.0)
+        now = bucket.updated_at
+        bucket.block_for(10_000, now)
+        self.assertAlmostEqual(bucket.reserve(now), MAX_BLOCK_SECONDS)
+        bucket.block_for(1, now)
+        self.assertAlmostEqual(bucket.reserve(now), MAX_BLOCK_SECONDS)
+
+
+class TestIntegrationRateLimiter(unittest.TestCase):
+    """Test provider response feedback."""
+
+    def test_429_with_retry_after_blocks_bucket(self):
+        limiter = IntegrationRateLimiter()
+        wait = limiter.record_response("slack", "xoxb-test", "tier3", 429, {"Retry-After": "30"})
+        self.assertIsNotNone(wait)
+        self.assertGreater(wait, 29)
+        self.assertEqual(limiter.metrics["throttled_responses"], 1)
+
+    def test_successful_response_is_not_throttled(self):
+        limiter = IntegrationRateLimiter()
+        wait = limiter.record_response("github", "ghp_test", "core", 200, {"X-RateLimit-Remaining": "4000"})
+        self.assertIsNone(wait)
+
+    def test_buckets_are_separate_per_token_and_bucket(self):
+        limiter = IntegrationRateLimiter()
+        limiter.penalize("github", "token-a", "search", 60)
+        waited = asyncio.run(limiter.acquire("github", "token-a", "core"))
+        self.assertEqual(waited, 0.0)
+        waited = asyncio.run(limiter.acquire("github", "token-b", "search"))
+        self.assertEqual(waited, 0.0)
+
+
+class TestHeaderParsing(unittest.TestCase):
+    """Test Retry-After and X-RateLimit-Reset parsing."""
+
+    def test_retry_after_seconds(self):
+        self.assertEqual(parse_retry_after("12"), 12.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("not a date"))
+
+    def test_reset_accepts_relative_delay(self):
+        self.assertEqual(parse_rate_limit_reset("45"), 45.0)
+        self.assertIsNone(parse_rate_limit_reset(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
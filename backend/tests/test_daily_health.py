@@ -0,0 +1,54 @@
+"""
+Unit tests for compact daily health series.
+"""
+
+import unittest
+import sys
+import os
+from datetime import date
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from core.daily_health import DailyHealthSeries, incident_health_score, factor_mask, HAS_DATA, INCIDENTS, AFTER_HOURS, WEEKEND
+
+
+class TestDailyHealthSeries(unittest.TestCase):
+    """Test scoring, packing and slicing of a member's series."""
+
+    def setUp(self):
+        self.daily = {
+            "2025-01-01": {"incident_count": 2, "severity_weighted_count": 2.0, "after_hours_count": 1, "has_data": True, "health_score": 40, "team_health": 30},
+            "2025-01-03": {"incident_count": 0, "has_data": False, "health_score": 12, "team_health": 25},
+            "not-a-date": {"incident_count": 9},
+        }
+
+    def test_precalculated_scores_round_trip(self):
+        series = DailyHealthSeries.from_daily_data(self.daily)
+        self.assertEqual(len(series), 3)  # 2025-01-02 is a gap
+        restored = DailyHealthSeries.from_bytes(**series.to_bytes())
+        self.assertEqual(restored.by_date(), {
+            "2025-01-01": (40, 30, HAS_DATA | INCIDENTS | AFTER_HOURS),
+            "2025-01-03": (12, 25, 0),
+        })
+        self.assertEqual([day for day, *_ in restored.days(start=date(2025, 1, 2))], [date(2025, 1, 3)])
+
+    def test_fractional_scores_are_stored_exactly(self):
+        daily = {"2025-01-01": {"has_data": True, "health_score": 73.456789, "team_health": 61.1}}
+        series = DailyHealthSeries.from_daily_data(daily)
+        stored = series.to_bytes()
+        self.assertEqual(len(stored["health"]), 8)
+        restored = DailyHealthSeries.from_bytes(**stored)
+        self.assertEqual(restored.by_date()["2025-01-01"], (73.456789, 61.1, HAS_DATA))
+
+    def test_scores_from_incident_load_without_precalculated(self):
+        daily = {"2025-01-04": {"incident_count": 1, "severity_weighted_count": 1.0, "weekend_count": 1, "has_data": True}}
+        series = DailyHealthSeries.from_daily_data(daily, {"2025-01-04": 7.0})
+        self.assertEqual(series.by_date()["2025-01-04"], (75, 70, HAS_DATA | INCIDENTS | WEEKEND))
+        self.assertEqual(incident_health_score({}), 8.5)
+        self.assertEqual(factor_mask({"incident_count": 3}), 0)
+        self.assertIsNone(DailyHealthSeries.from_daily_data({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
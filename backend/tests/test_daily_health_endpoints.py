@@ -0,0 +1,208 @@
+"""
+Unit tests for the team and per-member daily health endpoints.
+"""
+
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from fastapi import Request, Response
+
+from app.api.endpoints import analyses
+from app.core.analysis_results import split_analysis_results
+from app.core.daily_health import DailyHealthSeries
+from app.services.analysis_results_store import AnalysisResultsStore
+
+
+class FakeResultsStore:
+    """AnalysisResultsStore readers over an in-memory results document."""
+
+    def __init__(self, results, stored_health=True):
+        self.summary, members, member_daily, team_daily = split_analysis_results(results)
+        self.members = [row["data"] for row in members]
+        self.member_daily = {}
+        for row in member_daily:
+            self.member_daily.setdefault(row["member_email"], {})[row["date"].isoformat()] = row["data"]
+        self.team_daily = [row["data"] for row in team_daily]
+        # Analyses stored before health series existed have no rows here
+        health_rows = AnalysisResultsStore._health_rows(results, team_daily) if stored_health else []
+        self.health = {
+            row["member_email"]: DailyHealthSeries.from_bytes(row["start_date"], row["health"], row["team_health"], row["factors"])
+            for row in health_rows
+        }
+        self.team_daily_reads = 0
+
+    def ensure(self, analysis_id):
+        return True
+
+    def get_summary(self, analysis_id):
+        return self.summary
+
+    def get_members(self, analysis_id):
+        return self.members
+
+    def get_member(self, analysis_id, email):
+        return next((m for m in self.members if m["user_email"].lower() == email.lower()), None)
+
+    def get_member_daily(self, analysis_id, email):
+        return dict(self.member_daily.get(email.lower(), {}))
+
+    def get_members_daily(self, analysis_id):
+        return {email: dict(days) for email, days in self.member_daily.items()}
+
+    def get_member_health(self, analysis_id, email):
+        return self.health.get(email.lower())
+
+    def get_members_health(self, analysis_id):
+        return dict(self.health)
+
+    def get_team_daily(self, analysis_id):
+        self.team_daily_reads += 1
+        return self.team_daily
+
+
+def request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def read_body(response):
+    if hasattr(response, "body_iterator"):
+        return b"".join([chunk async for chunk in response.body_iterator])
+    return response.body
+
+
+class DailyHealthEndpointTest(unittest.TestCase):
+    """Calls the endpoint coroutines with a fake store and a completed analysis."""
+
+    RESULTS = {
+        "period_summary": {"days_analyzed": 3},
+        "team_analysis": {"members": [
+            {"user_email": "Alice@Example.com", "user_name": "Alice", "incident_count": 2},
+            {"user_email": "bob@example.com", "user_name": "Bob", "incident_count": 1},
+            {"user_name": "No Email"},
+        ]},
+        "daily_trends": [
+            {"date": "2025-01-01", "overall_score": 7.0},
+            {"date": "2025-01-02", "overall_score": 6.5},
+            {"date": "2025-01-03", "overall_score": 8.0},
+        ],
+        "individual_daily_data": {
+            # Pre-calculated by the analyzer
+            "alice@example.com": {
+                "2025-01-01": {"incident_count": 2, "severity_weighted_count": 3.0, "has_data": True, "health_score": 41.5, "team_health": 70},
+                "2025-01-02": {"incident_count": 0, "has_data": False, "health_score": 88, "team_health": 65},
+            },
+            # Scored from incident load against daily_trends
+            "bob@example.com": {
+                "2025-01-01": {"incident_count": 0, "has_data": False},
+                "2025-01-03": {"incident_count": 1, "severity_weighted_count": 1.0, "after_hours_count": 1, "has_data": True},
+            },
+        },
+    }
+    EMAILS = ["alice@example.com", "bob@example.com"]
+
+    def setUp(self):
+        self.analysis = SimpleNamespace(id=7, status="completed", results_version=3)
+        self.db = MagicMock()
+        self.db.query.return_value.options.return_value.filter.return_value.first.return_value = self.analysis
+        self.user = SimpleNamespace(organization_id=1)
+
+    def use_store(self, store):
+        patcher = patch.object(analyses, "AnalysisResultsStore", return_value=store)
+        self.store_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        return store
+
+    def team(self, stream=False, if_none_match=None):
+        response = asyncio.run(analyses.get_team_daily_health(
+            7, request(if_none_match), Response(), stream=stream, current_user=self.user, db=self.db
+        ))
+        return response, asyncio.run(read_body(response))
+
+    def team_members(self, stream=False):
+        response, body = self.team(stream=stream)
+        if stream:
+            return [json.loads(line) for line in body.splitlines()]
+        document = json.loads(body)
+        self.assertEqual(document["data"]["total_members"], len(document["data"]["members"]))
+        return document["data"]["members"]
+
+    def member(self, email):
+        result = asyncio.run(analyses.get_member_daily_health(
+            7, email, request(), Response(), current_user=self.user, db=self.db
+        ))
+        self.assertEqual(result["status"], "success")
+        return result["data"]
+
+
+class TestTeamDailyHealth(DailyHealthEndpointTest):
+    """The batch endpoint returns the per-member endpoint's data for every member."""
+
+    def test_matches_member_endpoint(self):
+        self.use_store(FakeResultsStore(self.RESULTS))
+        members = self.team_members()
+        self.assertEqual([m["member_email"] for m in members], self.EMAILS)
+        for email, data in zip(self.EMAILS, members):
+            self.assertEqual(data, self.member(email))
+        self.assertEqual(members[0]["daily_health"][0]["health_score"], 41.5)
+
+    def test_stream_matches_single_document(self):
+        self.use_store(FakeResultsStore(self.RESULTS))
+        response, _ = self.team(stream=True)
+        self.assertEqual(response.media_type, "application/x-ndjson")
+        self.assertIn("etag", response.headers)
+        self.assertEqual(self.team_members(stream=True), self.team_members())
+
+    def test_not_modified(self):
+        self.use_store(FakeResultsStore(self.RESULTS))
+        response, _ = self.team()
+        etag = response.headers["etag"]
+
+        self.store_class.reset_mock()
+        response, _ = self.team(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+        self.store_class.assert_not_called()
+
+        # A new results version invalidates the ETag
+        self.analysis.results_version += 1
+        response, _ = self.team(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    def test_stored_series_skip_team_daily(self):
+        store = self.use_store(FakeResultsStore(self.RESULTS))
+        self.team_members()
+        self.team_members(stream=True)
+        self.assertEqual(store.team_daily_reads, 0)
+
+
+class TestOldAnalysisDailyHealth(DailyHealthEndpointTest):
+    """Analyses without stored series score members on read, loading daily_trends once."""
+
+    def test_team_daily_scores_members_without_precalculated_health(self):
+        store = self.use_store(FakeResultsStore(self.RESULTS, stored_health=False))
+        members = self.team_members()
+        self.assertEqual(store.team_daily_reads, 1)
+
+        bob = {day["date"]: day for day in members[1]["daily_health"]}
+        self.assertEqual((bob["2025-01-01"]["health_score"], bob["2025-01-01"]["team_health"]), (0, 70))
+        self.assertEqual((bob["2025-01-03"]["health_score"], bob["2025-01-03"]["team_health"]), (68, 80))
+
+        for email, data in zip(self.EMAILS, members):
+            self.assertEqual(data, self.member(email))
+        self.assertEqual(self.team_members(stream=True), members)
+
+    def test_precalculated_health_needs_no_team_daily(self):
+        results = dict(self.RESULTS, individual_daily_data={"alice@example.com": self.RESULTS["individual_daily_data"]["alice@example.com"]})
+        store = self.use_store(FakeResultsStore(results, stored_health=False))
+        members = self.team_members()
+        self.assertEqual(store.team_daily_reads, 0)
+        self.assertEqual(members[0], self.member("alice@example.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
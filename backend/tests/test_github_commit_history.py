@@ -0,0 +1,128 @@
+"""
+Unit tests for stored per-day GitHub commit histograms.
+"""
+
+import asyncio
+import threading
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from app.services.github_collector import GitHubCollector
+from app.services.github_commit_history import (
+    AUTHOR_LOCAL_TZ, GitHubCommitHistoryStore, build_histogram, search_range_for, window_days
+)
+
+
+class TestHistogramHelpers(unittest.TestCase):
+    """Day windows, search ranges and bucketing."""
+
+    def test_window_days_is_inclusive_and_stops_at_today(self):
+        start = datetime(2025, 1, 30, 22, 0, tzinfo=timezone.utc)
+        self.assertEqual(window_days(start, datetime(2025, 2, 2, 1, 0, tzinfo=timezone.utc), "UTC"),
+                         [date(2025, 1, 30), date(2025, 1, 31), date(2025, 2, 1), date(2025, 2, 2)])
+        # 22:00 UTC is already the next day in Tokyo
+        self.assertEqual(window_days(start, start, "Asia/Tokyo"), [date(2025, 1, 31)])
+
+        today = datetime.now(timezone.utc).date()
+        future = window_days(datetime.now(timezone.utc) - timedelta(days=1), datetime.now(timezone.utc) + timedelta(days=5), "UTC")
+        self.assertEqual(future[-1], today)
+
+    def test_missing_days_skips_only_final_rows(self):
+        days = [date(2025, 1, d) for d in (1, 2, 3)]
+        stored = {
+            date(2025, 1, 1): {"commits": 2, "is_final": True},
+            date(2025, 1, 2): {"commits": 0, "is_final": False},
+        }
+        self.assertEqual(GitHubCommitHistoryStore.missing_days(stored, days), [date(2025, 1, 2), date(2025, 1, 3)])
+
+    def test_search_range_pads_a_day_each_side(self):
+        self.assertEqual(search_range_for([date(2025, 3, 1), date(2025, 3, 4)]), (date(2025, 2, 28), date(2025, 3, 5)))
+
+    def test_build_histogram_uses_author_offset_or_timezone(self):
+        tz = timezone(timedelta(hours=-8))
+        commits = [
+            datetime(2025, 1, 3, 20, 0, tzinfo=tz),   # Friday evening locally, Saturday 04:00 UTC
+            datetime(2025, 1, 3, 10, 0, tzinfo=tz),   # Friday working hours
+        ]
+        local = build_histogram(commits, AUTHOR_LOCAL_TZ)
+        self.assertEqual(local, {date(2025, 1, 3): {"commits": 2, "after_hours_commits": 1, "weekend_commits": 0}})
+
+        utc = build_histogram(commits, "UTC")
+        self.assertEqual(utc[date(2025, 1, 4)], {"commits": 1, "after_hours_commits": 1, "weekend_commits": 1})
+        self.assertEqual(utc[date(2025, 1, 3)], {"commits": 1, "after_hours_commits": 1, "weekend_commits": 0})
+
+
+class TestFinalDays(unittest.TestCase):
+    """Days are final only once they were old enough at fetch time."""
+
+    def setUp(self):
+        self.store = GitHubCommitHistoryStore("UTC")
+        self.fetched_at = datetime(2025, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+    def test_recent_days_stay_open(self):
+        days = [self.fetched_at.date() - timedelta(days=n) for n in range(6)]
+        rows = self.store.day_rows("Octocat", days, {days[0]: {"commits": 3}}, True, self.fetched_at)
+        final = {row["date"]: row["is_final"] for row in rows}
+        for day in days:
+            age = (self.fetched_at.date() - day).days
+            self.assertEqual(final[day], age >= self.store.FINAL_AFTER_DAYS, day)
+        self.assertEqual(rows[0]["github_username"], "octocat")
+        self.assertEqual(rows[0]["commits"], 3)
+        self.assertEqual(rows[1]["commits"], 0)
+
+    def test_truncated_search_is_never_final(self):
+        old_day = self.fetched_at.date() - timedelta(days=30)
+        rows = self.store.day_rows("octocat", [old_day], {}, False, self.fetched_at)
+        self.assertFalse(rows[0]["is_final"])
+
+
+class TestFetchDailyCommitDays(unittest.TestCase):
+    """A failed write is reported so the team timeline is not aggregated from partial rows."""
+
+    def fetch(self, saved):
+        collector = GitHubCollector()
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(days=2)
+        today = end.date()
+        histogram = {today: {"commits": 4, "after_hours_commits": 1, "weekend_commits": 0}}
+        with patch.object(GitHubCommitHistoryStore, "load_days", return_value={}), \
+                patch.object(GitHubCommitHistoryStore, "save_days", return_value=saved), \
+                patch.object(collector, "_search_daily_commits", AsyncMock(return_value=(histogram, True))):
+            return asyncio.run(collector.fetch_daily_commit_days("octocat", start, end, "token", "UTC"))
+
+    def test_reports_whether_days_were_stored(self):
+        days, stored = self.fetch(saved=True)
+        self.assertTrue(stored)
+        self.assertEqual(len(days), 3)
+        self.assertEqual(days[-1]["commits"], 4)
+
+        days, stored = self.fetch(saved=False)
+        self.assertFalse(stored)
+        self.assertEqual(days[-1]["commits"], 4)
+
+    def test_store_calls_run_off_the_event_loop(self):
+        collector = GitHubCollector()
+        end = datetime.now(timezone.utc)
+        threads = {}
+
+        def record(name, result):
+            def call(*args, **kwargs):
+                threads[name] = threading.get_ident()
+                return result
+            return call
+
+        async def run():
+            with patch.object(GitHubCommitHistoryStore, "load_days", side_effect=record("load_days", {})), \
+                    patch.object(GitHubCommitHistoryStore, "save_days", side_effect=record("save_days", True)), \
+                    patch.object(collector, "_search_daily_commits", AsyncMock(return_value=({}, True))):
+                await collector.fetch_daily_commit_days("octocat", end - timedelta(days=2), end, "token", "UTC")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        self.assertEqual(set(threads), {"load_days", "save_days"})
+        self.assertNotIn(loop_thread, threads.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for batched GitHub GraphQL contribution collection.
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from app.services.github_graphql_collector import GitHubGraphQLCollector, _summarize_contributions
+
+
+def commit_days(*days):
+    """commitContributionsByRepository with one repository holding (occurredAt, commitCount) nodes."""
+    return [{"contributions": {"nodes": [{"occurredAt": at, "commitCount": count} for at, count in days]}}]
+
+
+class FakeResponse:
+    def __init__(self, status, body=None):
+        self.status = status
+        self.headers = {}
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.payloads = []
+
+    def post(self, url, headers=None, json=None):
+        self.payloads.append(json)
+        return self.response
+
+
+class TestQueryBuilder(unittest.TestCase):
+
+    def test_aliases_each_login_and_includes_fragment(self):
+        query = GitHubGraphQLCollector._build_query({"u0": "octocat", "u1": "hubot"})
+        self.assertIn('u0: user(login: "octocat") { ...BurnoutContributions }', query)
+        self.assertIn('u1: user(login: "hubot") { ...BurnoutContributions }', query)
+        self.assertTrue(query.startswith("query($from: DateTime!, $to: DateTime!) {"))
+        self.assertIn("rateLimit { cost remaining resetAt }", query)
+        self.assertIn("fragment BurnoutContributions on User", query)
+        self.assertIn("commitContributionsByRepository(maxRepositories: 100)", query)
+
+
+class TestSummarizeContributions(unittest.TestCase):
+    """Commit days and PR/review hours are in the user's timezone, not UTC."""
+
+    def test_days_follow_local_midnight(self):
+        # Midnight at UTC+1 is 23:00Z the previous day; at UTC-8 it is 08:00Z the same day
+        east = _summarize_contributions({"commitContributionsByRepository": commit_days(
+            ("2025-01-03T23:00:00Z", 2),  # Saturday 4 January locally
+            ("2025-01-05T23:00:00Z", 1),  # Monday 6 January
+        )})
+        self.assertEqual(east["daily_commits"], {"2025-01-04": 2, "2025-01-06": 1})
+
+        west = _summarize_contributions({"commitContributionsByRepository": commit_days(("2025-01-04T08:00:00Z", 3))})
+        self.assertEqual(west["daily_commits"], {"2025-01-04": 3})
+
+    def test_days_across_repositories_are_summed(self):
+        repos = commit_days(("2025-01-06T00:00:00Z", 1)) + commit_days(("2025-01-06T00:00:00Z", 4), ("2025-01-07T00:00:00Z", 2))
+        summary = _summarize_contributions({"commitContributionsByRepository": repos, "totalCommitContributions": 7})
+        self.assertEqual(summary["daily_commits"], {"2025-01-06": 5, "2025-01-07": 2})
+        self.assertEqual(summary["total_commits"], 7)
+
+    def test_activity_times_use_the_commit_offset(self):
+        summary = _summarize_contributions({
+            "commitContributionsByRepository": commit_days(("2025-01-06T08:00:00Z", 1), ("2025-01-07T08:00:00Z", 1)),
+            "pullRequestContributions": {"nodes": [{"occurredAt": "2025-01-06T18:30:00Z"}]},
+            "pullRequestReviewContributions": {"nodes": [{"occurredAt": "2025-01-07T02:00:00Z"}, {"occurredAt": None}]},
+            "totalPullRequestContributions": 1,
+            "totalPullRequestReviewContributions": 2,
+        })
+        hours = [ts.hour for ts in summary["activity_timestamps"]]
+        self.assertEqual(hours, [10, 18])  # 18:30Z and 02:00Z at UTC-8
+        self.assertEqual(summary["activity_timestamps"][0].utcoffset(), timedelta(hours=-8))
+        self.assertEqual((summary["total_pull_requests"], summary["total_reviews"]), (1, 2))
+
+    def test_no_commits_means_no_activity_times(self):
+        summary = _summarize_contributions({"pullRequestContributions": {"nodes": [{"occurredAt": "2025-01-06T18:30:00Z"}]}})
+        self.assertEqual(summary["activity_timestamps"], [])
+        self.assertEqual(summary["daily_commits"], {})
+
+
+class TestRunBatch(unittest.TestCase):
+    """Parsing a batch response: unknown logins and truncated commit days are left for REST."""
+
+    def setUp(self):
+        limiter = "app.services.github_graphql_collector.integration_rate_limiter"
+        for patcher in (patch(f"{limiter}.acquire", AsyncMock()), patch(f"{limiter}.record_response"), patch(f"{limiter}.penalize")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_batch(self, body, status=200):
+        collector = GitHubGraphQLCollector("token")
+        session = FakeSession(FakeResponse(status, body))
+        start, end = datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 31, tzinfo=timezone.utc)
+        result = asyncio.run(collector._run_batch(session, ["octocat", "ghost", "busy"], start, end))
+        return collector, session, result
+
+    def test_parses_users_and_skips_missing_or_truncated(self):
+        body = {
+            "data": {
+                "u0": {"login": "octocat", "contributionsCollection": {
+                    "totalCommitContributions": 3,
+                    "totalRepositoriesWithContributedCommits": 1,
+                    "commitContributionsByRepository": commit_days(("2025-01-06T00:00:00Z", 3)),
+                }},
+                "u1": None,
+                "u2": {"login": "busy", "contributionsCollection": {
+                    "totalCommitContributions": 500,  # more than the returned repositories hold
+                    "commitContributionsByRepository": commit_days(("2025-01-06T00:00:00Z", 40)),
+                }},
+                "rateLimit": {"cost": 2, "remaining": 4000, "resetAt": "2025-01-31T00:00:00Z"},
+            },
+            "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a User with the login of 'ghost'."}],
+        }
+        collector, session, result = self.run_batch(body)
+        self.assertEqual(list(result), ["octocat"])
+        self.assertEqual(result["octocat"]["daily_commits"], {"2025-01-06": 3})
+        self.assertEqual(result["octocat"]["repositories_touched"], 1)
+        self.assertEqual(collector.points_spent, 2)
+        self.assertEqual(session.payloads[0]["variables"], {"from": "2025-01-01T00:00:00+00:00", "to": "2025-01-31T00:00:00+00:00"})
+
+    def test_http_error_fails_the_batch(self):
+        _, _, result = self.run_batch(None, status=502)
+        self.assertIsNone(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
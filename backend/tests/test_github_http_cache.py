@@ -0,0 +1,123 @@
+"""
+Unit tests for the GitHub conditional-request cache.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from app.core.api_rate_limiter import integration_rate_limiter
+from app.core.github_http_cache import CachedResponse, GitHubHTTPCache, github_conditional_get, github_http_cache
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None, body=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = json.dumps(body).encode("utf-8") if body is not None else b""
+
+    async def read(self):
+        return self._body
+
+    async def json(self):
+        return json.loads(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Answers GETs from a queue of responses and records the request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.request_headers = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.request_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+class TestLRU(unittest.TestCase):
+    """Entries are bounded by count and size, least recently used first."""
+
+    def test_evicts_least_recently_used_by_count(self):
+        cache = GitHubHTTPCache(max_entries=2, max_bytes=1000)
+        cache.put("a", {"v": 1}, 10, etag='"a"')
+        cache.put("b", {"v": 2}, 10, etag='"b"')
+        cache.get("a")  # a is now the most recent
+        cache.put("c", {"v": 3}, 10, etag='"c"')
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_evicts_by_size_and_skips_unvalidated_or_oversized(self):
+        cache = GitHubHTTPCache(max_entries=10, max_bytes=100)
+        cache.put("a", {}, 60, etag='"a"')
+        cache.put("b", {}, 60, etag='"b"')
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats()["bytes"], 60)
+        cache.put("c", {}, 10)  # no validator
+        cache.put("d", {}, 500, etag='"d"')  # larger than the cache
+        self.assertIsNone(cache.get("c"))
+        self.assertIsNone(cache.get("d"))
+
+    def test_replacing_an_entry_keeps_byte_count(self):
+        cache = GitHubHTTPCache(max_entries=10, max_bytes=100)
+        cache.put("a", {}, 40, etag='"1"')
+        cache.put("a", {}, 30, etag='"2"')
+        self.assertEqual(cache.get_stats()["bytes"], 30)
+        self.assertEqual(cache.conditional_headers(cache.get("a")), {"If-None-Match": '"2"'})
+
+
+class TestConditionalGet(unittest.TestCase):
+    """A 304 is served from cache and its rate-limit permit is refunded."""
+
+    URL = "https://api.github.com/users/octocat"
+    TOKEN = "token-http-cache-test"
+
+    def setUp(self):
+        github_http_cache.clear()
+        self.addCleanup(github_http_cache.clear)
+
+    async def fetch(self, session):
+        async with github_conditional_get(session, self.URL, self.TOKEN, {"Accept": "application/json"}) as resp:
+            return resp.status, await resp.json(), isinstance(resp, CachedResponse) and resp.not_modified
+
+    def test_not_modified_is_served_from_cache_and_refunded(self):
+        session = FakeSession(
+            FakeResponse(200, {"ETag": '"v1"'}, {"login": "octocat"}),
+            FakeResponse(304, {"ETag": '"v1"'}),
+        )
+        before = github_http_cache.get_stats()
+        with patch.object(integration_rate_limiter, "refund", wraps=integration_rate_limiter.refund) as refund:
+            first = asyncio.run(self.fetch(session))
+            self.assertEqual(first, (200, {"login": "octocat"}, False))
+            refund.assert_not_called()
+
+            second = asyncio.run(self.fetch(session))
+            self.assertEqual(second, (200, {"login": "octocat"}, True))
+            refund.assert_called_once_with("github", self.TOKEN, "core")
+
+        self.assertNotIn("If-None-Match", session.request_headers[0])
+        self.assertEqual(session.request_headers[1]["If-None-Match"], '"v1"')
+        after = github_http_cache.get_stats()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+
+    def test_errors_are_passed_through_uncached(self):
+        session = FakeSession(FakeResponse(404, {}, {"message": "Not Found"}))
+        with patch.object(integration_rate_limiter, "refund") as refund:
+            status, body, _ = asyncio.run(self.fetch(session))
+        self.assertEqual((status, body), (404, {"message": "Not Found"}))
+        refund.assert_not_called()
+        self.assertEqual(github_http_cache.get_stats()["entries"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for GitHubMappingService cached mapping lookups.
+"""
+
+import asyncio
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
+
+from app.models.integration_mapping import IntegrationMapping
+from app.services import enhanced_github_collector
+from app.services.enhanced_github_collector import collect_team_github_data_with_mapping
+from app.services.github_mapping_service import GitHubMappingService
+
+
+class TestCachedMappings(unittest.TestCase):
+    """The latest mapping per email is picked, whichever lookup chunk the email falls in."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        # The partial unique indexes are Postgres-only; SQLite would enforce them on every row
+        with patch.object(IntegrationMapping.__table__, "indexes", set()):
+            IntegrationMapping.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.addCleanup(self.db.close)
+        self.now = datetime(2025, 3, 1, 12, 0)
+
+        rows = [
+            # (user_id, email, target_identifier, hours ago)
+            (1, "alice@example.com", "alice-old", 48),
+            (1, "alice@example.com", "alice", 1),
+            (1, "alice@example.com", "alice-older", 96),
+            (1, "bob@example.com", "bob", 5),
+            (1, "carol@example.com", "carol-old", 30),
+            (1, "carol@example.com", "carol", 2),
+            (2, "dave@example.com", "other-users-dave", 1),
+        ]
+        self.db.add_all([
+            IntegrationMapping(
+                user_id=user_id, analysis_id=i, source_platform="rootly", source_identifier=email,
+                target_platform="github", target_identifier=target, mapping_successful=True,
+                created_at=self.now - timedelta(hours=hours_ago)
+            )
+            for i, (user_id, email, target, hours_ago) in enumerate(rows, start=1)
+        ])
+        self.db.commit()
+
+        with patch.object(GitHubMappingService, "__init__", return_value=None):
+            self.service = GitHubMappingService()
+        self.service.db = self.db
+
+    def latest(self, emails, user_id=1):
+        return {email: row.target_identifier for email, row in self.service._get_cached_mappings(emails, user_id).items()}
+
+    def test_latest_row_per_email(self):
+        emails = ["alice@example.com", "bob@example.com", "carol@example.com", "dave@example.com", "nobody@example.com"]
+        self.assertEqual(self.latest(emails), {"alice@example.com": "alice", "bob@example.com": "bob", "carol@example.com": "carol"})
+
+    def test_latest_row_per_email_across_chunks(self):
+        emails = ["carol@example.com", "alice@example.com", "bob@example.com", "alice@example.com"]
+        with patch.object(GitHubMappingService, "LOOKUP_CHUNK_SIZE", 1):
+            self.assertEqual(self.latest(emails), {"alice@example.com": "alice", "bob@example.com": "bob", "carol@example.com": "carol"})
+
+    def test_index_matches_migration(self):
+        index = next(ix for ix in IntegrationMapping.__table__.indexes if ix.name == "ix_integration_mappings_latest")
+        self.assertIn("(user_id, target_platform, source_identifier, created_at DESC)",
+                      str(CreateIndex(index).compile(dialect=postgresql.dialect())))
+
+    def test_single_email_lookup(self):
+        self.assertEqual(self.service._get_cached_mapping("alice@example.com", 1).target_identifier, "alice")
+        self.assertEqual(self.service._get_cached_mapping("dave@example.com", 2).target_identifier, "other-users-dave")
+        self.assertIsNone(self.service._get_cached_mapping("dave@example.com", 1))
+
+
+class TestSmartCachingEntryPoint(unittest.TestCase):
+    """email_to_name reaches the caching service, and its cache misses don't re-enter it."""
+
+    EMAILS = ["alice@example.com"]
+    EMAIL_TO_NAME = {"alice@example.com": "Alice Smith"}
+
+    def setUp(self):
+        patcher = patch.dict(os.environ, {"GITHUB_FAST_MODE": "false", "USE_SMART_GITHUB_CACHING": "true"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_smart_caching_receives_email_to_name(self):
+        smart = AsyncMock(return_value={"alice@example.com": {"username": "alice"}})
+        original = AsyncMock(return_value={})
+        with patch.object(GitHubMappingService, "__init__", return_value=None), \
+                patch.object(GitHubMappingService, "get_smart_github_data", smart), \
+                patch.object(enhanced_github_collector, "original_collect_team_github_data", original):
+            result = asyncio.run(collect_team_github_data_with_mapping(
+                self.EMAILS, 30, "token", user_id=1, email_to_name=self.EMAIL_TO_NAME
+            ))
+        self.assertEqual(result, {"alice@example.com": {"username": "alice"}})
+        self.assertEqual(smart.await_args.kwargs["email_to_name"], self.EMAIL_TO_NAME)
+        original.assert_not_called()
+
+    def test_cache_misses_use_the_uncached_collector(self):
+        original = AsyncMock(return_value={})
+        with patch.object(GitHubMappingService, "__init__", return_value=None), \
+                patch.object(GitHubMappingService, "_get_cached_mappings", return_value={}), \
+                patch.object(enhanced_github_collector, "BatchMappingRecorder"), \
+                patch.object(enhanced_github_collector, "original_collect_team_github_data", original), \
+                patch.object(GitHubMappingService, "get_smart_github_data",
+                             side_effect=GitHubMappingService.get_smart_github_data, autospec=True) as smart:
+            asyncio.run(collect_team_github_data_with_mapping(
+                self.EMAILS, 30, "token", user_id=1, email_to_name=self.EMAIL_TO_NAME
+            ))
+        smart.assert_called_once()
+        original.assert_awaited_once_with(self.EMAILS, 30, "token", 1, email_to_name=self.EMAIL_TO_NAME)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Unit tests for the persisted GitHub organization profile crawler.
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import aiohttp
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.github_member_profile import GitHubMemberProfile
+from app.services.github_profile_crawler import GitHubOrgProfileCrawler
+
+MEMBERS_URL = "https://api.github.com/orgs/acme/members?per_page=100&page=1"
+
+
+def profile_url(login):
+    return f"https://api.github.com/users/{login}"
+
+
+def stored_row(login, seen_age, profile_age=None, name=None):
+    """A _load_rows row whose member list and profile were stored the given timedeltas ago."""
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        login=login, name=name, public_email=None, seen_at=now - seen_age,
+        profile_fetched_at=now - profile_age if profile_age is not None else None,
+    )
+
+
+class FakeResponse:
+    def __init__(self, status, data=None):
+        self.status = status
+        self.headers = {}
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Records GET calls and answers from a {url: (status, data)} table (404 otherwise)."""
+
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+        self.calls = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append((url, kwargs))
+        return FakeResponse(*self.responses.get(url, (404, None)))
+
+
+class TestRequestTimeout(unittest.TestCase):
+    """The crawler's timeout applies per request, so it also holds on a shared session."""
+
+    def test_timeout_is_passed_to_every_request(self):
+        timeout = aiohttp.ClientTimeout(total=30, connect=10)
+        crawler = GitHubOrgProfileCrawler("token-timeout", {"Accept": "application/json"}, timeout=timeout)
+        session = FakeSession({"https://api.github.com/users/octocat": (200, {"name": "Octo Cat"})})
+        profile = asyncio.run(crawler._fetch_profile("octocat", session))
+        self.assertEqual(profile, {"name": "Octo Cat"})
+        asyncio.run(crawler._fetch_org_logins("acme", session))
+        self.assertEqual([kwargs.get("timeout") for _, kwargs in session.calls], [timeout, timeout])
+
+    def test_no_timeout_keeps_session_default(self):
+        crawler = GitHubOrgProfileCrawler("token-default", {"Accept": "application/json"})
+        session = FakeSession()
+        asyncio.run(crawler._fetch_profile("octocat", session))
+        self.assertNotIn("timeout", session.calls[0][1])
+
+
+
+class TestStoredProfileTTLs(unittest.TestCase):
+    """Stored member lists and profiles are reused until their TTLs expire."""
+
+    def setUp(self):
+        self.saved_members, self.saved_profiles = [], []
+        for name, value in (
+            ("_save_members", lambda org, logins: self.saved_members.append(set(logins))),
+            ("_save_profiles", lambda org, profiles: self.saved_profiles.append(dict(profiles))),
+        ):
+            patcher = patch.object(GitHubOrgProfileCrawler, name, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def crawl(self, rows, session):
+        crawler = GitHubOrgProfileCrawler("token-ttl", {})
+        with patch.object(crawler, "_load_rows", return_value=rows):
+            profiles = asyncio.run(crawler.get_member_profiles("acme", session))
+        return {profile["username"]: profile["name"] for profile in profiles}
+
+    def test_fresh_rows_make_no_requests(self):
+        session = FakeSession()
+        rows = [stored_row("octocat", timedelta(minutes=5), timedelta(hours=1), name="Octo Cat")]
+        self.assertEqual(self.crawl(rows, session), {"octocat": "octo cat"})
+        self.assertEqual(session.calls, [])
+        self.assertEqual((self.saved_members, self.saved_profiles), ([], []))
+
+    def test_expired_profile_is_refetched(self):
+        stale = timedelta(seconds=GitHubOrgProfileCrawler.PROFILE_TTL_SECONDS + 60)
+        rows = [
+            stored_row("octocat", timedelta(minutes=5), stale, name="Old Name"),
+            stored_row("hubot", timedelta(minutes=5), timedelta(hours=1), name="Hubot"),
+        ]
+        session = FakeSession({profile_url("octocat"): (200, {"name": "New Name"})})
+        self.assertEqual(self.crawl(rows, session), {"octocat": "new name", "hubot": "hubot"})
+        self.assertEqual([url for url, _ in session.calls], [profile_url("octocat")])
+        self.assertEqual(self.saved_profiles, [{"octocat": {"name": "New Name"}}])
+
+    def test_expired_member_list_is_relisted(self):
+        stale = timedelta(seconds=GitHubOrgProfileCrawler.MEMBERS_TTL_SECONDS + 60)
+        rows = [stored_row("octocat", stale, timedelta(hours=1), name="Octo Cat"),
+                stored_row("departed", stale, timedelta(hours=1), name="Gone")]
+        session = FakeSession({
+            MEMBERS_URL: (200, [{"login": "octocat"}, {"login": "newcomer"}]),
+            profile_url("newcomer"): (200, {"name": "New Comer"}),
+        })
+        self.assertEqual(self.crawl(rows, session), {"octocat": "octo cat", "newcomer": "new comer"})
+        self.assertEqual(self.saved_members, [{"octocat", "newcomer"}])
+        self.assertEqual(self.saved_profiles, [{"newcomer": {"name": "New Comer"}}])
+
+    def test_failed_listing_keeps_stale_members(self):
+        stale = timedelta(seconds=GitHubOrgProfileCrawler.MEMBERS_TTL_SECONDS + 60)
+        rows = [stored_row("octocat", stale, timedelta(hours=1), name="Octo Cat")]
+        self.assertEqual(self.crawl(rows, FakeSession()), {"octocat": "octo cat"})
+        self.assertEqual(self.saved_members, [])
+
+
+class TestStoredMemberList(unittest.TestCase):
+    """Writes against an in-memory SQLite database shared with the crawler's worker threads."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        GitHubMemberProfile.__table__.create(engine)
+        patcher = patch("app.models.SessionLocal", sessionmaker(bind=engine))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.crawler = GitHubOrgProfileCrawler("token-store", {})
+
+    def stored(self):
+        return {row.login: row.name for row in self.crawler._load_rows("acme")}
+
+    def test_departed_members_are_deleted(self):
+        asyncio.run(self.crawler._current_members("acme", FakeSession({MEMBERS_URL: (200, [{"login": "octocat"}, {"login": "hubot"}])}), []))
+        self.crawler._save_profiles("acme", {"octocat": {"name": "Octo Cat"}, "hubot": {"name": "Hubot"}})
+        self.assertEqual(self.stored(), {"octocat": "Octo Cat", "hubot": "Hubot"})
+
+        asyncio.run(self.crawler._current_members("acme", FakeSession({MEMBERS_URL: (200, [{"login": "octocat"}])}), []))
+        self.assertEqual(self.stored(), {"octocat": "Octo Cat"})
+
+    def test_unavailable_store_is_not_written(self):
+        session = FakeSession({MEMBERS_URL: (200, [{"login": "octocat"}])})
+        with patch.object(self.crawler, "_save_members") as save_members:
+            logins = asyncio.run(self.crawler._current_members("acme", session, None))
+        self.assertEqual(logins, {"octocat"})
+        save_members.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+Unit tests for analysis ETags and If-None-Match matching.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from core.http_caching import analysis_etag, etag_matches, private_cache_headers
+
+
+class TestAnalysisETags(unittest.TestCase):
+    """Test that tags change with the results version and match like If-None-Match should."""
+
+    def test_etag_depends_on_version_and_resource(self):
+        etag = analysis_etag(42, 1)
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertNotEqual(etag, analysis_etag(42, 2))
+        self.assertNotEqual(etag, analysis_etag(42, 1, "daily-trends"))
+        self.assertEqual(analysis_etag(42, None), etag)
+
+    def test_if_none_match(self):
+        etag = analysis_etag(7, 3)
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches(analysis_etag(7, 2), etag))
+        self.assertFalse(etag_matches(None, etag))
+
+    def test_headers_are_private(self):
+        headers = private_cache_headers(analysis_etag(1, 1))
+        self.assertTrue(headers["Cache-Control"].startswith("private"))
+        self.assertIn("Authorization", headers["Vary"])
+
+
+if __name__ == '__main__':
+    unittest.main()
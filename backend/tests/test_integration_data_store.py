@@ -0,0 +1,161 @@
+"""
+Unit tests for IntegrationDataStore sync state (coverage and high-water mark).
+"""
+
+import asyncio
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.integration_data_store import IntegrationDataStore
+from app.core.pagerduty_client import PagerDutyDataCollector
+from app.core.rootly_client import RootlyAPIClient
+from app.models.integration_record import IntegrationSyncState
+
+
+class SQLiteIntegrationDataStore(IntegrationDataStore):
+    """Store bound to an in-memory SQLite database instead of SessionLocal."""
+
+    def __init__(self, session_factory):
+        super().__init__("rootly", "test-token")
+        self._session_factory = session_factory
+
+    def _session(self):
+        return self._session_factory()
+
+
+class TestSyncStateCoverage(unittest.TestCase):
+    """A short window followed by a longer one must never be served with a hole."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        IntegrationSyncState.__table__.create(engine)
+        self.store = SQLiteIntegrationDataStore(sessionmaker(bind=engine))
+        self.now = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+    def days_ago(self, days):
+        return self.now - timedelta(days=days)
+
+    def test_first_sync_sets_coverage_and_hwm(self):
+        self.assertFalse(self.store.covers(self.store.get_sync_state("shift"), self.days_ago(30)))
+        self.store.update_sync_state("shift", high_water_mark=self.days_ago(20), coverage_start=self.days_ago(30))
+        state = self.store.get_sync_state("shift")
+        self.assertEqual(state["coverage_start"], self.days_ago(30))
+        self.assertEqual(state["high_water_mark"], self.days_ago(20))
+        self.assertTrue(self.store.covers(state, self.days_ago(30)))
+        self.assertFalse(self.store.covers(state, self.days_ago(31)))
+
+    def test_short_window_after_hwm_does_not_leave_a_hole(self):
+        # 30-day window synced 20 days ago
+        self.store.update_sync_state("shift", high_water_mark=self.days_ago(20), coverage_start=self.days_ago(50))
+        # A 3-day window now only fetched [now-3d, now]; [hwm, now-3d) was never read
+        self.store.update_sync_state("shift", high_water_mark=self.now, coverage_start=self.days_ago(3))
+        state = self.store.get_sync_state("shift")
+        self.assertEqual(state["high_water_mark"], self.days_ago(20))
+        self.assertEqual(state["coverage_start"], self.days_ago(50))
+
+        # A fetch that continues from the high-water mark (minus overlap) closes the gap
+        self.store.update_sync_state("shift", high_water_mark=self.now, coverage_start=self.days_ago(34),
+                                     fetched_since=self.days_ago(34))
+        self.assertEqual(self.store.get_sync_state("shift")["high_water_mark"], self.now)
+
+    def test_historical_window_before_coverage_does_not_extend_it(self):
+        self.store.update_sync_state("shift", high_water_mark=self.now, coverage_start=self.days_ago(30))
+        # [now-90d, now-60d] does not touch [now-30d, now]
+        self.store.update_sync_state("shift", high_water_mark=self.days_ago(60), coverage_start=self.days_ago(90))
+        state = self.store.get_sync_state("shift")
+        self.assertEqual(state["coverage_start"], self.days_ago(30))
+        self.assertFalse(self.store.covers(state, self.days_ago(90)))
+
+        # A backfill that reaches the current coverage start extends it
+        self.store.update_sync_state("shift", high_water_mark=self.days_ago(30), coverage_start=self.days_ago(90))
+        state = self.store.get_sync_state("shift")
+        self.assertEqual(state["coverage_start"], self.days_ago(90))
+        self.assertEqual(state["high_water_mark"], self.now)
+
+
+
+class ThreadRecordingStore(IntegrationDataStore):
+    """Never-synced store that records which thread each database method ran on."""
+
+    def __init__(self, platform):
+        super().__init__(platform, "test-token")
+        self.threads = {}
+
+    def record(self, name):
+        self.threads.setdefault(name, set()).add(threading.get_ident())
+
+    def get_sync_state(self, record_type):
+        self.record("get_sync_state")
+        return None
+
+    def update_sync_state(self, record_type, high_water_mark, coverage_start=None, fetched_since=None):
+        self.record("update_sync_state")
+
+    def upsert_records(self, record_type, records):
+        self.record("upsert_records")
+        return True
+
+    def replace_records(self, record_type, records):
+        self.record("replace_records")
+        return True
+
+    def load_records(self, record_type, since=None, until=None, limit=None):
+        self.record("load_records")
+        return []
+
+
+class TestCollectorsRunStoreOffEventLoop(unittest.TestCase):
+    """Blocking store calls run in worker threads, so concurrent user and incident syncs overlap."""
+
+    EXPECTED_CALLS = {"get_sync_state", "update_sync_state", "upsert_records", "replace_records", "load_records"}
+
+    def assert_off_loop(self, store, loop_thread):
+        self.assertEqual(set(store.threads), self.EXPECTED_CALLS)
+        for name, threads in store.threads.items():
+            self.assertNotIn(loop_thread, threads, name)
+
+    def test_pagerduty_collector(self):
+        collector = PagerDutyDataCollector("pd-test-token")
+        store = collector.store = ThreadRecordingStore("pagerduty")
+        collector.client.last_incident_fetch_complete = True
+        now = datetime.now(timezone.utc)
+
+        async def run():
+            with patch.object(collector.client, "get_users", AsyncMock(return_value=[{"id": "P1"}])), \
+                    patch.object(collector.client, "get_incidents", AsyncMock(return_value=[{"id": "I1"}])):
+                await asyncio.gather(
+                    collector._get_users_with_store(limit=1000),
+                    collector._get_incidents_with_store(since=now - timedelta(days=30), until=now),
+                )
+            return threading.get_ident()
+
+        self.assert_off_loop(store, asyncio.run(run()))
+
+    def test_rootly_client(self):
+        client = RootlyAPIClient("rootly-test-token")
+        store = ThreadRecordingStore("rootly")
+        client.last_incident_fetch_complete = client.last_shift_fetch_complete = True
+        now = datetime.now(timezone.utc)
+
+        async def run():
+            with patch.object(client, "_get_data_store", return_value=store), \
+                    patch.object(client, "get_users", AsyncMock(return_value=[{"id": "U1"}])), \
+                    patch.object(client, "get_incidents", AsyncMock(return_value=[{"id": "I1"}])), \
+                    patch.object(client, "_fetch_on_call_shifts", AsyncMock(return_value=[{"id": "S1"}])):
+                await asyncio.gather(
+                    client._get_users_with_store(limit=100),
+                    client._get_incidents_with_store(days_back=30, limit=100),
+                    client.get_on_call_shifts(now - timedelta(days=7), now),
+                )
+            return threading.get_ident()
+
+        self.assert_off_loop(store, asyncio.run(run()))
+
+
+if __name__ == '__main__':
+    unittest.main()
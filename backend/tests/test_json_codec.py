@@ -0,0 +1,45 @@
+"""
+Unit tests for the shared JSON codec.
+"""
+
+import unittest
+import sys
+import os
+from datetime import date, datetime, timezone
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from core.json_codec import dumps, dumps_bytes, dumps_with_raw, loads
+
+
+class TestJsonCodec(unittest.TestCase):
+    """Test the types analysis results contain round-trip with either backend."""
+
+    def test_round_trip(self):
+        data = {"team_health": {"overall_score": 7.5}, "members": [{"name": "Ada", "ok": True, "x": None}]}
+        self.assertEqual(loads(dumps(data)), data)
+        self.assertEqual(loads(dumps_bytes(data)), data)
+
+    def test_datetimes_and_sets(self):
+        encoded = loads(dumps({
+            "at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "day": date(2025, 1, 2),
+            "users_involved": {"b@example.com", "a@example.com"},
+        }))
+        self.assertTrue(encoded["at"].startswith("2025-01-02T03:04:05"))
+        self.assertEqual(encoded["day"], "2025-01-02")
+        self.assertEqual(encoded["users_involved"], ["a@example.com", "b@example.com"])
+
+    def test_unknown_type_raises(self):
+        with self.assertRaises(TypeError):
+            dumps({"x": object()})
+
+    def test_raw_fields_are_embedded_verbatim(self):
+        body = dumps_with_raw({"id": 1, "status": "completed"}, {"analysis_data": '{"team_health": {"score": 7}}', "config": None})
+        self.assertEqual(loads(body), {"id": 1, "status": "completed", "analysis_data": {"team_health": {"score": 7}}, "config": None})
+        self.assertEqual(loads(dumps_with_raw({}, {"analysis_data": b"[1]"})), {"analysis_data": [1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for batched mapping recording and the migration that dedupes attempts.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Analysis, IntegrationMapping, User
+from app.services.mapping_recorder import BatchMappingRecorder
+from migrations.migration_runner import MigrationRunner
+
+
+def migration_sql(name):
+    """SQL statements of one migration, as run_all_migrations would run them."""
+    statements = {}
+    with patch.object(MigrationRunner, "__init__", return_value=None):
+        runner = MigrationRunner()
+    with patch.object(runner, "run_sql_migration", side_effect=lambda migration, sql: statements.setdefault(migration, sql)):
+        runner.run_all_migrations()
+    return statements[name]
+
+
+class MappingTableTest(unittest.TestCase):
+    """users, analyses and integration_mappings in SQLite, without the model's Postgres-only indexes."""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        User.__table__.create(self.engine)
+        Analysis.__table__.create(self.engine)
+        with patch.object(IntegrationMapping.__table__, "indexes", set()):
+            IntegrationMapping.__table__.create(self.engine)
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO users (id, email) VALUES (1, 'owner@example.com')")
+            conn.exec_driver_sql("INSERT INTO analyses (id, uuid, user_id, results_version) VALUES (10, 'a10', 1, 1)")
+        self.db = sessionmaker(bind=self.engine)()
+        self.addCleanup(self.db.close)
+
+    def run_migration_016(self):
+        with self.engine.begin() as conn:
+            for sql in migration_sql("016_unique_integration_mapping_attempts"):
+                conn.execute(text(sql))
+
+    def stored(self):
+        rows = self.db.query(IntegrationMapping).order_by(IntegrationMapping.id).all()
+        return [(row.analysis_id, row.source_identifier, row.target_identifier) for row in rows]
+
+
+class TestDedupeMigration(MappingTableTest):
+    """Migration 016 keeps the newest row per attempt key before adding the unique indexes."""
+
+    def test_keeps_newest_row_per_key(self):
+        rows = [
+            # (id, analysis_id, source_identifier, target_identifier)
+            (1, 10, "alice@example.com", "alice-old"),
+            (2, None, "alice@example.com", "alice-null-old"),
+            (3, 10, "alice@example.com", "alice"),
+            (4, 10, "bob@example.com", "bob"),
+            (5, None, "alice@example.com", "alice-null"),
+        ]
+        with self.engine.begin() as conn:
+            conn.execute(IntegrationMapping.__table__.insert(), [
+                {"id": id_, "user_id": 1, "analysis_id": analysis_id, "source_platform": "rootly",
+                 "source_identifier": email, "target_platform": "github", "target_identifier": target,
+                 "mapping_successful": True, "data_collected": False}
+                for id_, analysis_id, email, target in rows
+            ])
+
+        self.run_migration_016()
+
+        self.assertEqual(self.stored(), [
+            (10, "alice@example.com", "alice"),
+            (10, "bob@example.com", "bob"),
+            (None, "alice@example.com", "alice-null"),
+        ])
+
+
+class TestBatchMappingRecorder(MappingTableTest):
+    """flush() writes one row per attempt key through the two partial-index upserts."""
+
+    def setUp(self):
+        super().setUp()
+        self.run_migration_016()
+        self.recorder = BatchMappingRecorder(self.db)
+
+    def record(self, analysis_id, email, target, user_id=1):
+        self.recorder.record_mapping_attempt(
+            user_id, analysis_id, "rootly", email, "github",
+            mapping_successful=target is not None, target_identifier=target
+        )
+
+    def test_last_attempt_per_key_wins(self):
+        self.record(10, "alice@example.com", "first")
+        self.record(10, "alice@example.com", "second")
+        self.record(10, "bob@example.com", "bob")
+        self.assertEqual(len(self.recorder), 2)
+        self.assertEqual(self.recorder.flush(), 2)
+        self.assertEqual(len(self.recorder), 0)
+        self.assertEqual(self.stored(), [(10, "alice@example.com", "second"), (10, "bob@example.com", "bob")])
+
+    def test_unknown_user_or_analysis_is_dropped(self):
+        self.record(10, "alice@example.com", "alice")
+        self.record(10, "ghost@example.com", "ghost", user_id=2)
+        self.record(99, "bob@example.com", "bob")
+        self.record(None, "carol@example.com", "carol", user_id=2)
+        self.assertEqual(self.recorder.flush(), 1)
+        self.assertEqual(self.stored(), [(10, "alice@example.com", "alice")])
+
+    def test_rows_with_and_without_analysis_upsert_separately(self):
+        self.record(10, "alice@example.com", "with-analysis")
+        self.record(None, "alice@example.com", "without-analysis")
+        self.assertEqual(self.recorder.flush(), 2)
+
+        self.record(10, "alice@example.com", "with-analysis-2")
+        self.record(None, "alice@example.com", None)
+        self.assertEqual(self.recorder.flush(), 2)
+
+        self.assertEqual(self.stored(), [(10, "alice@example.com", "with-analysis-2"), (None, "alice@example.com", None)])
+        rows = {row.analysis_id: row for row in self.db.query(IntegrationMapping).all()}
+        self.assertTrue(rows[10].mapping_successful)
+        self.assertFalse(rows[None].mapping_successful)
+
+    def test_empty_flush_writes_nothing(self):
+        self.assertEqual(self.recorder.flush(), 0)
+        self.assertEqual(self.stored(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Unit tests for the blocking name index used by GitHub and Slack name matching.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from core.name_index import NameIndex, normalize_name, name_trigrams
+
+
+class TestNameIndex(unittest.TestCase):
+    """Test candidate blocking and exact lookups."""
+
+    def setUp(self):
+        members = [("spencerhcheng", "Spencer Cheng"), ("jsingh", "Jasmeet Singh"), ("qrousseau", "Quentin Rousseau")]
+        members += [(f"user{i}", f"Member Number{i}") for i in range(500)]
+        self.index = NameIndex(members)
+
+    def test_normalize_and_trigrams(self):
+        self.assertEqual(normalize_name("  O'Brien,  Pat "), "o brien pat")
+        self.assertIn("  a", name_trigrams("al"))
+
+    def test_exact_ignores_order_and_punctuation(self):
+        self.assertEqual(self.index.exact("cheng, spencer"), {"spencerhcheng"})
+
+    def test_candidates_are_bounded_and_ranked(self):
+        candidates = self.index.candidates("Spencer Chen", k=5)
+        self.assertLessEqual(len(candidates), 5)
+        self.assertEqual(candidates[0], "spencerhcheng")
+
+    def test_best_matches_only_scores_candidates(self):
+        calls = []
+
+        def scorer(query, name):
+            calls.append(name)
+            return 1.0 if name == "Jasmeet Singh" else 0.1
+
+        matches = self.index.best_matches("Jasmeet Singh", scorer, k=10, threshold=0.5)
+        self.assertEqual(matches[0][0], "jsingh")
+        self.assertLessEqual(len(calls), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
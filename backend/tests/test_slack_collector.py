@@ -0,0 +1,358 @@
+"""
+Unit tests for SlackCollector message parsing.
+"""
+
+import asyncio
+import re
+import statistics
+import threading
+import unittest
+import unittest.mock
+from datetime import datetime, timedelta
+
+from app.services import slack_collector
+from app.services.slack_collector import SlackCollector
+
+
+def baseline_extract_name(message_text):
+    """The original uncompiled name extraction, kept to check the compiled patterns against."""
+    match = re.search(r'\*\*([^*]+)\*\*', message_text)
+    if match:
+        return match.group(1).strip()
+    for pattern in (
+        r'(?:^|\s)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+here\b',
+        r'(?:^|\s)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+jumping\s+in\b',
+        r'(?:^|[.!?]\s+)([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+here(?:\s*[-–—]|\s*\.|\s*,|\s*$)',
+    ):
+        match = re.search(pattern, message_text)
+        if match:
+            potential_name = match.group(1).strip()
+            if potential_name.lower() not in ['team', 'everyone', 'all', 'someone']:
+                return potential_name
+    return None
+
+
+class TestExtractName(unittest.TestCase):
+    """Compiled name extraction returns exactly what the original patterns did."""
+
+    MESSAGES = [
+        "**Spencer Cheng** | Platform",
+        "**Team** | Everyone",
+        "**  Jasmeet  ** | SRE",
+        "Jasmeet here - looking at the alerts now",
+        "Jasmeet Singh here, on it",
+        "Spencer jumping in - rolling back",
+        "Thanks for the PR. Sylvain here - checking logs",
+        "Sorry team - Sylvain here.",
+        "Team here, anyone around?",
+        "Everyone jumping in please",
+        "Just saw the alerts... Quentin here",
+        "Weihan here",
+        "someone here?",
+        "hey all, nobody is named here",
+        "Alex Mingoia jumping in",
+        "Ibrahim herein lies the problem",
+        "",
+        "**Christo Mitov** here too. Alex here",
+    ]
+
+    def setUp(self):
+        self.collector = SlackCollector()
+
+    def test_matches_baseline_on_every_case(self):
+        for message in self.MESSAGES:
+            with self.subTest(message=message):
+                self.assertEqual(self.collector._extract_name_from_slack_message(message), baseline_extract_name(message))
+
+    def test_partial_names_are_not_expanded(self):
+        self.assertEqual(self.collector._extract_name_from_slack_message("Jasmeet here - on it"), "Jasmeet")
+        self.assertIsNone(self.collector._correlate_slack_message_to_user("Jasmeet here - on it"))
+
+
+class TestCompactMessage(unittest.TestCase):
+    """Messages are reduced to metadata; only analysed members' messages are scored."""
+
+    def setUp(self):
+        self.collector = SlackCollector()
+
+    def test_member_message_is_scored_and_text_dropped(self):
+        compact = self.collector._compact_message({'ts': '1.0', 'user': 'U1', 'text': 'Overloaded again, this is terrible'}, members={'U1'})
+        self.assertLess(compact['sentiment'], 0)
+        self.assertTrue(compact['stress_indicator'])
+        self.assertNotIn('text', compact)
+
+    def test_non_member_message_is_not_scored(self):
+        with unittest.mock.patch.object(self.collector.sentiment_analyzer, 'polarity_scores') as scorer:
+            compact = self.collector._compact_message({'ts': '1.0', 'user': 'U2', 'text': 'great work'}, keep_text=True, members={'U1'})
+        scorer.assert_not_called()
+        self.assertIsNone(compact['sentiment'])
+        self.assertIsNone(compact['stress_indicator'])
+        self.assertEqual(compact['text'], 'great work')
+
+    def test_bot_message_naming_a_responder_is_scored(self):
+        compact = self.collector._compact_message({'ts': '1.0', 'bot_id': 'B1', 'text': 'Spencer here - great news, fixed'}, members={'U1'})
+        self.assertEqual(compact['author_name'], 'Spencer')
+        self.assertGreater(compact['sentiment'], 0)
+        self.assertFalse(compact['stress_indicator'])
+
+    def test_everything_is_scored_without_a_member_list(self):
+        compact = self.collector._compact_message({'ts': '1.0', 'user': 'U2', 'text': 'great work'})
+        self.assertGreater(compact['sentiment'], 0)
+        empty = self.collector._compact_message({'ts': '2.0', 'user': 'U2', 'text': ''})
+        self.assertIsNone(empty['sentiment'])
+        self.assertFalse(empty['stress_indicator'])
+
+
+def baseline_user_metrics(collector, user_id, all_messages, days_analyzed):
+    """The original per-message counting of _process_user_messages over raw Slack messages."""
+    user_display_name = None
+    for name, slack_id in collector.name_to_slack_mappings.items():
+        if slack_id == user_id:
+            user_display_name = name
+            break
+    is_name_based_user = user_id == user_display_name
+
+    total = after_hours = weekend = negative = positive = stress = 0
+    scores = []
+    for messages in all_messages.values():
+        user_messages = []
+        if not is_name_based_user:
+            user_messages += [msg for msg in messages if msg.get('user') == user_id]
+        if user_display_name:
+            user_messages += [msg for msg in messages if msg.get('bot_id') and msg.get('text')
+                              and baseline_extract_name(msg['text']) == user_display_name]
+        total += len(user_messages)
+        for msg in user_messages:
+            msg_dt = datetime.fromtimestamp(float(msg.get('ts', 0)))
+            after_hours += msg_dt.hour < 9 or msg_dt.hour >= 17
+            weekend += msg_dt.weekday() >= 5
+            text = msg.get('text', '')
+            if text:
+                score = collector.sentiment_analyzer.polarity_scores(text)['compound']
+                scores.append(score)
+                negative += score <= -0.05
+                positive += score >= 0.05
+                stress += any(keyword in text.lower() for keyword in collector.STRESS_KEYWORDS)
+
+    return {
+        'total_messages': total,
+        'messages_per_day': round(total / days_analyzed, 1),
+        'after_hours_percentage': round(after_hours / total, 3) if total else 0,
+        'weekend_percentage': round(weekend / total, 3) if total else 0,
+        'avg_sentiment': round(sum(scores) / len(scores), 3) if scores else 0.0,
+        'negative_sentiment_ratio': round(negative / total, 3) if total else 0.0,
+        'positive_sentiment_ratio': round(positive / total, 3) if total else 0.0,
+        'stress_indicator_ratio': round(stress / total, 3) if total else 0.0,
+        'sentiment_volatility': round(statistics.stdev(scores), 3) if len(scores) > 1 else 0.0,
+    }
+
+
+class TestAccumulatedTotalsMatchBaseline(unittest.TestCase):
+    """Per-user results from the single aggregation pass equal the original per-message computation."""
+
+    TEXTS = [
+        'Deploy went great, thanks all!', 'I am exhausted and overwhelmed with this incident',
+        'ok', 'urgent: prod is down, need help asap', 'Looks fine to me', '', 'terrible day, frustrated',
+    ]
+
+    def build_messages(self):
+        start = datetime(2025, 1, 6, 6, 0)  # a Monday morning
+        messages = {'incidents': [], 'backend': [], 'random': []}
+        for i in range(120):
+            ts = str((start + timedelta(hours=i * 5 + i % 3)).timestamp())
+            text = self.TEXTS[i % len(self.TEXTS)]
+            channel = list(messages)[i % 3]
+            if i % 5 == 0:
+                messages[channel].append({'ts': ts, 'bot_id': 'B1', 'text': f'**Spencer Cheng** | {text}'})
+            elif i % 7 == 0:
+                messages[channel].append({'ts': ts, 'bot_id': 'B1', 'text': f'Jasmeet here - {text}'})
+            else:
+                messages[channel].append({'ts': ts, 'user': ['U1', 'U2'][i % 2], 'text': text, 'thread_ts': ts})
+        return messages
+
+    def test_user_and_name_based_totals_match(self):
+        collector = SlackCollector()
+        raw = self.build_messages()
+        compact = {channel: [collector._compact_message(msg) for msg in msgs] for channel, msgs in raw.items()}
+        accumulators = collector._aggregate_messages_by_user(compact)
+        start, end = datetime(2025, 1, 6), datetime(2025, 2, 5)
+
+        for user_id in ('U1', 'U2', 'Spencer Cheng', 'Jasmeet Singh', 'U_NOBODY'):
+            with self.subTest(user_id=user_id):
+                metrics = collector._process_user_messages(user_id, f'{user_id}@example.com', start, end, accumulators, 3)['metrics']
+                expected = baseline_user_metrics(collector, user_id, raw, (end - start).days)
+                self.assertEqual({key: metrics[key] for key in expected}, expected)
+        self.assertGreater(baseline_user_metrics(collector, 'Spencer Cheng', raw, 30)['total_messages'], 0)
+
+
+class FakeResponse:
+    def __init__(self, status, data=None):
+        self.status = status
+        self.headers = {}
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSlackSession:
+    """conversations.history from per-(channel, cursor) queues of responses; 429s are explicit entries."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, headers=None, params=None):
+        key = (params['channel'], params.get('cursor'))
+        self.requests.append(key)
+        return self.pages[key].pop(0)
+
+
+def history_page(messages, next_cursor=None):
+    return FakeResponse(200, {
+        'ok': True,
+        'messages': [{'ts': ts, 'user': 'U1', 'text': 'hi'} for ts in messages],
+        'has_more': bool(next_cursor),
+        'response_metadata': {'next_cursor': next_cursor or ''},
+    })
+
+
+class TestIterChannelHistories(unittest.TestCase):
+    """Concurrent history harvest: cursors, rate-limit retries and giving up."""
+
+    def setUp(self):
+        self.collector = SlackCollector()
+        limiter = 'app.services.slack_collector.integration_rate_limiter'
+        acquire = unittest.mock.patch(f'{limiter}.acquire', unittest.mock.AsyncMock())
+        record = unittest.mock.patch(f'{limiter}.record_response', side_effect=lambda *args: 0 if args[3] == 429 else None)
+        acquire.start()
+        record.start()
+        self.addCleanup(acquire.stop)
+        self.addCleanup(record.stop)
+
+    def harvest(self, session, channel_ids, windows=None):
+        channels = [{'id': channel_id, 'name': channel_id.lower()} for channel_id in channel_ids]
+        windows = windows or {channel_id: (100.0, 200.0) for channel_id in channel_ids}
+
+        async def collect():
+            return {channel['id']: result async for channel, result in
+                    self.collector._iter_channel_histories(session, {}, 'xoxb-test', channels, windows)}
+
+        return asyncio.run(collect())
+
+    def test_follows_cursors_across_pages(self):
+        session = FakeSlackSession({
+            ('C1', None): [history_page(['1', '2'], next_cursor='p2')],
+            ('C1', 'p2'): [history_page(['3'], next_cursor='p3')],
+            ('C1', 'p3'): [history_page(['4'])],
+            ('C2', None): [history_page(['5'])],
+        })
+        results = self.harvest(session, ['C1', 'C2'])
+        self.assertEqual([msg['ts'] for msg in results['C1']['messages']], ['1', '2', '3', '4'])
+        self.assertEqual([msg['ts'] for msg in results['C2']['messages']], ['5'])
+        for result in results.values():
+            self.assertFalse(result['rate_limited'])
+            self.assertIsNone(result['error'])
+
+    def test_retries_a_rate_limited_page(self):
+        session = FakeSlackSession({
+            ('C1', None): [history_page(['1'], next_cursor='p2')],
+            ('C1', 'p2'): [FakeResponse(429), history_page(['2'])],
+        })
+        result = self.harvest(session, ['C1'])['C1']
+        self.assertEqual([msg['ts'] for msg in result['messages']], ['1', '2'])
+        self.assertFalse(result['rate_limited'])
+        self.assertEqual(session.requests, [('C1', None), ('C1', 'p2'), ('C1', 'p2')])
+
+    def test_gives_up_after_max_retries_keeping_partial_messages(self):
+        retries = SlackCollector.HISTORY_MAX_RETRIES
+        session = FakeSlackSession({
+            ('C1', None): [history_page(['1'], next_cursor='p2')],
+            ('C1', 'p2'): [FakeResponse(429) for _ in range(retries + 1)],
+            ('C2', None): [history_page(['9'])],
+        })
+        results = self.harvest(session, ['C1', 'C2'])
+        self.assertTrue(results['C1']['rate_limited'])
+        self.assertEqual([msg['ts'] for msg in results['C1']['messages']], ['1'])
+        self.assertEqual(session.requests.count(('C1', 'p2')), retries + 1)
+        self.assertFalse(results['C2']['rate_limited'])
+
+    def test_errors_are_reported_per_channel(self):
+        session = FakeSlackSession({('C1', None): [FakeResponse(500)]})
+        results = self.harvest(session, ['C1', 'C3'], windows={'C1': (100.0, 200.0)})
+        self.assertEqual(list(results), ['C1'])  # channels without a window are not fetched
+        self.assertEqual(results['C1']['error'], 'HTTP 500 for #c1')
+
+
+
+class ThreadRecordingStore:
+    """A history store that records which thread each call ran on."""
+
+    store_text = False
+
+    def __init__(self):
+        self.threads = {}
+
+    def record(self, name):
+        self.threads.setdefault(name, set()).add(threading.get_ident())
+
+    def get_cursors(self, channel_ids):
+        self.record('get_cursors')
+        return {}
+
+    def unscored_channels(self, channel_ids, user_ids, start_ts, end_ts):
+        self.record('unscored_channels')
+        return set()
+
+    def save_harvest(self, channel_id, messages, oldest, latest):
+        self.record('save_harvest')
+        return True
+
+    def prune_expired_if_due(self):
+        self.record('prune_expired_if_due')
+
+    def load_messages(self, channel_ids, start_ts, end_ts):
+        self.record('load_messages')
+        return {channel_id: [{'ts': '150.0', 'user': 'U1'}] for channel_id in channel_ids}
+
+
+class TestHistoryStoreOffEventLoop(unittest.TestCase):
+    """Blocking history store calls run in worker threads so other channel harvests keep going."""
+
+    def test_store_calls_do_not_run_on_the_event_loop(self):
+        collector = SlackCollector()
+        store = ThreadRecordingStore()
+        channels = [{'id': 'C1', 'name': 'incidents'}, {'id': 'C2', 'name': 'oncall'}]
+
+        async def histories(session, headers, token, channels, windows):
+            for channel in channels:
+                yield channel, {'messages': [{'ts': '150.0', 'user': 'U1', 'text': 'hi'}], 'rate_limited': False, 'error': None}
+
+        async def run():
+            loop_thread = threading.get_ident()
+            with unittest.mock.patch.object(slack_collector.SlackWorkspaceDirectory, 'for_token',
+                                            unittest.mock.AsyncMock(return_value=unittest.mock.Mock(channels=channels))), \
+                    unittest.mock.patch.object(slack_collector.SlackHistoryStore, 'for_token', unittest.mock.AsyncMock(return_value=store)), \
+                    unittest.mock.patch.object(collector, '_prune_channels', unittest.mock.AsyncMock(return_value=channels)), \
+                    unittest.mock.patch.object(collector, '_iter_channel_histories', histories):
+                result = await collector._fetch_all_slack_messages(
+                    'xoxb-test', datetime.fromtimestamp(100), datetime.fromtimestamp(200), member_ids={'U1'}
+                )
+            return loop_thread, result
+
+        loop_thread, result = asyncio.run(run())
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(sorted(result['messages']), ['incidents', 'oncall'])
+        self.assertEqual(set(store.threads), {'get_cursors', 'unscored_channels', 'save_harvest', 'prune_expired_if_due', 'load_messages'})
+        for name, threads in store.threads.items():
+            self.assertNotIn(loop_thread, threads, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the incremental Slack history store.
+"""
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.slack_history import SlackMessageMetadata
+from app.services import slack_history_store
+from app.services.slack_history_store import SlackHistoryStore
+
+
+class TestPlanFetch(unittest.TestCase):
+    """Only the uncovered tail of a window is fetched."""
+
+    def test_no_cursor_fetches_whole_window(self):
+        self.assertEqual(SlackHistoryStore.plan_fetch(None, 100.0, 200.0), (100.0, 200.0))
+
+    def test_covered_window_fetches_only_tail(self):
+        cursor = {"coverage_start_ts": 50.0, "latest_ts": 150.0}
+        self.assertEqual(SlackHistoryStore.plan_fetch(cursor, 100.0, 200.0), (150.0, 200.0))
+        self.assertIsNone(SlackHistoryStore.plan_fetch(cursor, 100.0, 120.0))
+
+    def test_window_before_coverage_is_refetched(self):
+        cursor = {"coverage_start_ts": 150.0, "latest_ts": 250.0}
+        self.assertEqual(SlackHistoryStore.plan_fetch(cursor, 100.0, 200.0), (100.0, 200.0))
+
+
+class TestStoredMessages(unittest.TestCase):
+    """Reads against an in-memory SQLite database."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        SlackMessageMetadata.__table__.create(engine)
+        self.session_factory = sessionmaker(bind=engine)
+        patcher = patch("app.models.SessionLocal", self.session_factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = SlackHistoryStore(workspace_mapping_id=1)
+
+        rows = [
+            # (channel, ts, user, sentiment, stress_indicator)
+            ("C1", "1000.0001", "U1", 0.5, False),
+            ("C1", "1100.0001", "U2", None, None),   # stored unscored
+            ("C2", "1200.0001", "U1", -0.3, True),
+            ("C2", "5000.0001", "U2", None, None),   # outside the window
+            ("C3", "1300.0001", "U3", None, None),
+        ]
+        # Inserted as save_harvest does, so an explicit None stays NULL instead of taking the column default
+        with engine.begin() as conn:
+            conn.execute(SlackMessageMetadata.__table__.insert(), [
+                {
+                    "id": i, "workspace_mapping_id": 1, "channel_id": channel, "ts": ts,
+                    "sent_at": datetime.fromtimestamp(float(ts), tz=timezone.utc),
+                    "user_id": user, "sentiment": sentiment, "stress_indicator": stress, "text": "hello",
+                }
+                for i, (channel, ts, user, sentiment, stress) in enumerate(rows, start=1)
+            ])
+
+    def test_load_messages_groups_by_channel_within_window(self):
+        messages = self.store.load_messages(["C1", "C2", "C9"], 900.0, 2000.0)
+        self.assertEqual(sorted(messages), ["C1", "C2", "C9"])
+        self.assertEqual([msg["ts"] for msg in messages["C2"]], ["1200.0001"])
+        self.assertEqual(messages["C9"], [])
+        scored = next(msg for msg in messages["C1"] if msg["user"] == "U1")
+        self.assertEqual(scored["sentiment"], 0.5)
+        self.assertNotIn("text", scored)
+
+    def test_text_only_loaded_when_stored(self):
+        store = SlackHistoryStore(workspace_mapping_id=1, store_text=True)
+        messages = store.load_messages(["C2"], 900.0, 2000.0)
+        self.assertEqual(messages["C2"][0]["text"], "hello")
+
+    def test_unscored_channels_only_for_requested_members(self):
+        self.assertEqual(self.store.unscored_channels(["C1", "C2", "C3"], {"U2"}, 900.0, 2000.0), {"C1"})
+        self.assertEqual(self.store.unscored_channels(["C1", "C2", "C3"], {"U1"}, 900.0, 2000.0), set())
+        self.assertEqual(self.store.unscored_channels(["C1", "C2", "C3"], {"U2", "U3"}, 900.0, 6000.0), {"C1", "C2", "C3"})
+        self.assertEqual(self.store.unscored_channels(["C1"], set(), 900.0, 2000.0), set())
+
+    def test_read_failure_is_reported(self):
+        with patch("app.models.SessionLocal", side_effect=None) as session_local:
+            session_local.return_value.query.side_effect = RuntimeError("down")
+            self.assertIsNone(self.store.load_messages(["C1"], 900.0, 2000.0))
+            self.assertEqual(self.store.unscored_channels(["C1"], {"U2"}, 900.0, 2000.0), set())
+
+
+
+class TestPruneInterval(unittest.TestCase):
+    """Retention pruning runs at most once per interval per workspace."""
+
+    def setUp(self):
+        slack_history_store._GLOBAL_LAST_PRUNE.clear()
+        self.addCleanup(slack_history_store._GLOBAL_LAST_PRUNE.clear)
+
+    def test_prunes_once_per_interval_per_workspace(self):
+        with patch.object(SlackHistoryStore, "prune_expired") as prune:
+            SlackHistoryStore(workspace_mapping_id=1).prune_expired_if_due()
+            SlackHistoryStore(workspace_mapping_id=1).prune_expired_if_due()
+            SlackHistoryStore(workspace_mapping_id=2).prune_expired_if_due()
+            self.assertEqual(prune.call_count, 2)
+
+            slack_history_store._GLOBAL_LAST_PRUNE[1] -= SlackHistoryStore.PRUNE_INTERVAL_SECONDS + 1
+            SlackHistoryStore(workspace_mapping_id=1).prune_expired_if_due()
+            self.assertEqual(prune.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
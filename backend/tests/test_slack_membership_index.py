@@ -0,0 +1,108 @@
+"""
+Unit tests for Slack channel membership pruning.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.services import slack_membership_index
+from app.services.slack_membership_index import SlackMembershipIndex, prune_channels_by_membership
+
+# channel ID -> members
+WORKSPACE = {
+    "C_ONCALL": {"U_ALICE", "U_BOB", "U_OUTSIDER"},
+    "C_BACKEND": {"U_BOB"},
+    "C_RANDOM": {"U_OUTSIDER", "U_OTHER"},
+    "C_MARKETING": {"U_OTHER"},
+    "C_EMPTY": set(),
+    "C_FRONTEND": {"U_CAROL"},
+}
+CHANNELS = [{"id": channel_id, "name": channel_id.lower(), "updated": i} for i, channel_id in enumerate(WORKSPACE)]
+
+
+class FakeSlack:
+    """Answers users.conversations and conversations.members from WORKSPACE."""
+
+    def __init__(self, fail_methods=()):
+        self.fail_methods = set(fail_methods)
+        self.calls = []
+
+    async def paginate(self, session, token, headers, method, bucket, params, key, max_retries):
+        self.calls.append(method)
+        if method in self.fail_methods:
+            return None
+        if method == "users.conversations":
+            return [{"id": channel_id} for channel_id, members in WORKSPACE.items() if params["user"] in members]
+        if method == "conversations.members":
+            return sorted(WORKSPACE[params["channel"]])
+        raise AssertionError(f"unexpected method {method}")
+
+
+class TestMembershipPruning(unittest.TestCase):
+    """Pruned channels never contain a team member; unknown membership keeps every channel."""
+
+    def setUp(self):
+        slack_membership_index._GLOBAL_MEMBERSHIP_CACHE.clear()
+        self.addCleanup(slack_membership_index._GLOBAL_MEMBERSHIP_CACHE.clear)
+
+    def prune(self, team, fake, idle_channel_cap=0):
+        with patch.object(slack_membership_index, "paginate_slack_method", fake.paginate):
+            relevant = asyncio.run(SlackMembershipIndex("xoxb-test").get_relevant_channel_ids(
+                None, {}, set(team), [channel["id"] for channel in CHANNELS]
+            ))
+        return relevant, prune_channels_by_membership(CHANNELS, relevant, idle_channel_cap)
+
+    def assert_pruned_channels_have_no_members(self, team, kept):
+        kept_ids = {channel["id"] for channel in kept}
+        for channel_id, members in WORKSPACE.items():
+            self.assertEqual(channel_id in kept_ids, bool(members & set(team)), channel_id)
+
+    def test_per_user_lookup(self):
+        fake = FakeSlack()
+        relevant, kept = self.prune({"U_BOB"}, fake)
+        self.assertEqual(relevant, {"C_ONCALL", "C_BACKEND"})
+        self.assertEqual(fake.calls, ["users.conversations"])
+        self.assert_pruned_channels_have_no_members({"U_BOB"}, kept)
+
+    def test_full_index_when_most_channels_are_needed(self):
+        team = {"U_ALICE", "U_BOB", "U_CAROL"}
+        fake = FakeSlack()
+        relevant, kept = self.prune(team, fake)
+        self.assertEqual(fake.calls, ["conversations.members"] * len(WORKSPACE))
+        self.assertEqual(relevant, {"C_ONCALL", "C_BACKEND", "C_FRONTEND"})
+        self.assert_pruned_channels_have_no_members(team, kept)
+
+    def test_per_user_failure_keeps_every_channel(self):
+        relevant, kept = self.prune({"U_BOB"}, FakeSlack(fail_methods={"users.conversations"}))
+        self.assertIsNone(relevant)
+        self.assertEqual(kept, CHANNELS)
+
+    def test_full_index_failure_falls_back_to_per_user_lookups(self):
+        team = {"U_ALICE", "U_BOB", "U_CAROL"}
+        fake = FakeSlack(fail_methods={"conversations.members"})
+        relevant, kept = self.prune(team, fake)
+        self.assertIn("users.conversations", fake.calls)
+        self.assertEqual(relevant, {"C_ONCALL", "C_BACKEND", "C_FRONTEND"})
+        self.assert_pruned_channels_have_no_members(team, kept)
+
+    def test_both_lookups_failing_keeps_every_channel(self):
+        relevant, kept = self.prune({"U_ALICE", "U_BOB", "U_CAROL"}, FakeSlack(fail_methods={"conversations.members", "users.conversations"}))
+        self.assertIsNone(relevant)
+        self.assertEqual(kept, CHANNELS)
+
+    def test_exception_keeps_every_channel(self):
+        async def broken(*args, **kwargs):
+            raise RuntimeError("network down")
+
+        with patch.object(slack_membership_index, "paginate_slack_method", broken):
+            relevant = asyncio.run(SlackMembershipIndex("xoxb-test").get_relevant_channel_ids(None, {}, {"U_BOB"}, ["C_ONCALL"]))
+        self.assertIsNone(relevant)
+
+    def test_idle_channel_cap_keeps_most_recent_idle_channels(self):
+        relevant, kept = self.prune({"U_BOB"}, FakeSlack(), idle_channel_cap=2)
+        self.assertEqual([channel["id"] for channel in kept], ["C_ONCALL", "C_BACKEND", "C_FRONTEND", "C_EMPTY"])
+
+
+if __name__ == '__main__':
+    unittest.main()
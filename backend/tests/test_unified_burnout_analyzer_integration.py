@@ -179,7 +179,7 @@ class TestMapUserIncidents:
             {"id": "P2", "name": "Jane Smith"}
         ]
 
-        # PagerDuty format: assigned_to is checked first, raw_data only if no assigned_to
+        # PagerDuty format: assigned_to is checked first, participant_ids only if no assigned_to
         incidents = [
             {
                 "id": "PD1",
@@ -194,10 +194,8 @@ class TestMapUserIncidents:
             {
                 "id": "PD3",
                 "title": "Network issue",
-                # No assigned_to, so checks raw_data
-                "raw_data": {
-                    "acknowledgments": [{"acknowledger": {"id": "P1"}}]  # P1 acknowledged
-                }
+                # No assigned_to, so checks participants projected at ingest
+                "participant_ids": ["P1"]  # P1 acknowledged
             }
         ]
 
@@ -841,5 +839,62 @@ class TestEnhancementMethods:
         assert result["after_hours_percentage"] == 0.2
 
 
+class TestIngestProjection:
+    """Tests for the ingest-time projection of PagerDuty/Rootly records"""
+
+    def test_pagerduty_projection_keeps_participants(self):
+        """Projected PD incidents keep participants and drop expanded payloads"""
+        from app.core.pagerduty_client import PagerDutyAPIClient, PagerDutyDataCollector
+
+        raw_incident = {
+            "id": "PD9",
+            "title": "Queue backlog",
+            "status": "resolved",
+            "urgency": "high",
+            "created_at": "2024-01-15T10:30:00Z",
+            "description": "x" * 1000,
+            "service": {"id": "S1", "summary": "Payments", "html_url": "https://example.pagerduty.com"},
+            "acknowledgements": [{"acknowledger": {"id": "P2", "type": "user_reference", "summary": "Jane"}}],
+            "escalation_policy": {
+                "summary": "Primary",
+                "escalation_rules": [{"targets": [{"id": "P3", "type": "user_reference"}]}]
+            },
+        }
+
+        projected = PagerDutyAPIClient.project_incident(raw_incident)
+        assert "description" not in projected
+        assert projected["service"] == {"id": "S1", "summary": "Payments"}
+
+        collector = PagerDutyDataCollector.__new__(PagerDutyDataCollector)
+        normalized = collector._normalize_with_enhanced_assignment_extraction([projected], [])
+        incident = normalized["incidents"][0]
+        assert "raw_data" not in incident
+        assert incident["participant_ids"] == ["P2", "P3"]
+        assert incident["severity"] == "sev1"
+
+    def test_rootly_projection_keeps_analyzer_fields(self):
+        """Projected Rootly incidents keep timestamps, severity and participants"""
+        from app.core.rootly_client import RootlyAPIClient
+
+        raw_incident = {
+            "id": "1",
+            "type": "incidents",
+            "attributes": {
+                "created_at": "2024-01-15T10:30:00Z",
+                "title": "DB down",
+                "summary": "long summary",
+                "severity": {"data": {"id": "s1", "attributes": {"name": "SEV1", "description": "..."}}},
+                "user": {"data": {"id": "42", "attributes": {"email": "a@example.com", "phone": "555"}}},
+            },
+        }
+
+        projected = RootlyAPIClient.project_incident(raw_incident)
+        attrs = projected["attributes"]
+        assert "summary" not in attrs
+        assert attrs["severity"]["data"]["attributes"] == {"name": "SEV1"}
+        assert attrs["user"]["data"]["id"] == "42"
+        assert attrs["user"]["data"]["attributes"] == {"email": "a@example.com"}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+"""
+Unit tests for syncing integration users to UserCorrelation.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import UserCorrelation
+from app.services.user_sync_service import UserSyncService
+
+
+class BaselineUserSync:
+    """The original row-by-row sync, kept to check the set-based rewrite against."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def sync(self, users, platform, current_user, integration_id=None):
+        created = updated = skipped = 0
+        for user in users:
+            email = user.get("email")
+            if not email:
+                skipped += 1
+                continue
+            email = email.lower().strip()
+            correlation = self.db.query(UserCorrelation).filter(
+                UserCorrelation.user_id == current_user.id,
+                UserCorrelation.email == email
+            ).first()
+            if correlation:
+                updated += self._update_correlation(correlation, user, platform, integration_id)
+            else:
+                correlation = UserCorrelation(
+                    user_id=current_user.id,
+                    organization_id=current_user.organization_id,
+                    email=email,
+                    name=user.get("name"),
+                    integration_ids=[integration_id] if integration_id else []
+                )
+                self._update_correlation(correlation, user, platform, integration_id)
+                self.db.add(correlation)
+                created += 1
+        self.db.commit()
+        return {"created": created, "updated": updated, "skipped": skipped, "total": len(users)}
+
+    def _update_correlation(self, correlation, user, platform, integration_id=None):
+        updated = False
+        if integration_id:
+            if not correlation.integration_ids:
+                correlation.integration_ids = [integration_id]
+                updated = True
+            elif integration_id not in correlation.integration_ids:
+                correlation.integration_ids = correlation.integration_ids + [integration_id]
+                updated = True
+        if user.get("name") and correlation.name != user["name"]:
+            correlation.name = user["name"]
+            updated = True
+        if platform == "rootly":
+            if not correlation.rootly_email or correlation.rootly_email != user["email"]:
+                correlation.rootly_email = user["email"]
+                updated = True
+        elif platform == "pagerduty":
+            if not correlation.pagerduty_user_id or correlation.pagerduty_user_id != user["id"]:
+                correlation.pagerduty_user_id = user["id"]
+                updated = True
+        return 1 if updated else 0
+
+
+def correlation_db():
+    """In-memory SQLite session with user_correlations and its (user_id, email) unique constraint."""
+    engine = create_engine("sqlite://")
+    UserCorrelation.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE UNIQUE INDEX uq_user_correlation_user_email ON user_correlations (user_id, email)")
+    return sessionmaker(bind=engine)()
+
+
+def stored(db):
+    return {
+        row.email: (row.name, row.rootly_email, row.pagerduty_user_id, row.integration_ids)
+        for row in db.query(UserCorrelation).order_by(UserCorrelation.email).all()
+    }
+
+
+class TestSyncMatchesRowByRow(unittest.TestCase):
+    """Counts and stored rows match the original one-query-per-user sync."""
+
+    OWNER = SimpleNamespace(id=1, organization_id=None)
+
+    def setUp(self):
+        self.db = correlation_db()
+        self.baseline_db = correlation_db()
+        self.addCleanup(self.db.close)
+        self.addCleanup(self.baseline_db.close)
+        self.service = UserSyncService(self.db)
+        self.baseline = BaselineUserSync(self.baseline_db)
+
+    def sync(self, users, platform, integration_id):
+        stats = self.service.sync_users_from_list(users, platform, self.OWNER, integration_id)
+        expected = self.baseline.sync(users, platform, self.OWNER, integration_id)
+        self.assertEqual(stats, expected)
+        self.assertEqual(stored(self.db), stored(self.baseline_db))
+        return stats
+
+    def test_created_updated_and_skipped(self):
+        rootly_users = [
+            {"id": "r1", "email": "Alice@Example.com ", "name": "Alice"},
+            {"id": "r2", "email": "bob@example.com", "name": "Bob"},
+            {"id": "r3", "email": None, "name": "No Email"},
+        ]
+        self.assertEqual(self.sync(rootly_users, "rootly", "1"), {"created": 2, "updated": 0, "skipped": 1, "total": 3})
+
+        # Unchanged users are neither updated nor rewritten
+        self.assertEqual(self.sync(rootly_users, "rootly", "1"), {"created": 0, "updated": 0, "skipped": 1, "total": 3})
+
+        renamed = [{"id": "r2", "email": "bob@example.com", "name": "Robert"}, {"id": "r4", "email": "carol@example.com", "name": None}]
+        self.assertEqual(self.sync(renamed, "rootly", "1"), {"created": 1, "updated": 1, "skipped": 0, "total": 2})
+        self.assertEqual(stored(self.db)["bob@example.com"][0], "Robert")
+        self.assertIsNone(stored(self.db)["carol@example.com"][0])
+
+    def test_integration_ids_are_merged(self):
+        self.sync([{"id": "r1", "email": "alice@example.com", "name": "Alice"}], "rootly", "1")
+        stats = self.sync([{"id": "P1", "email": "alice@example.com", "name": "Alice"}], "pagerduty", "2")
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(stored(self.db)["alice@example.com"], ("Alice", "alice@example.com", "P1", ["1", "2"]))
+
+        # Re-syncing an integration already listed leaves the array alone
+        stats = self.sync([{"id": "P1", "email": "alice@example.com", "name": "Alice"}], "pagerduty", "2")
+        self.assertEqual(stats["updated"], 0)
+        self.assertEqual(stored(self.db)["alice@example.com"][3], ["1", "2"])
+
+    def test_duplicate_emails_in_one_payload(self):
+        users = [
+            {"id": "P1", "email": "alice@example.com", "name": "Alice"},
+            {"id": "P1", "email": "ALICE@example.com", "name": "Alice"},
+            {"id": "P9", "email": "alice@example.com", "name": "Alice Smith"},
+        ]
+        self.assertEqual(self.sync(users, "pagerduty", "2"), {"created": 1, "updated": 1, "skipped": 0, "total": 3})
+        self.assertEqual(stored(self.db)["alice@example.com"], ("Alice Smith", None, "P9", ["2"]))
+
+        # Against an existing row, each changing duplicate counts as an update
+        self.assertEqual(self.sync(users, "pagerduty", "2"), {"created": 0, "updated": 2, "skipped": 0, "total": 3})
+
+
+class TestSyncAllIntegrations(unittest.TestCase):
+    """Integrations are fetched concurrently; one failure doesn't stop the others."""
+
+    def test_failing_integration_does_not_abort_the_others(self):
+        integrations = [SimpleNamespace(id=i, platform="rootly") for i in (1, 2, 3)]
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = integrations
+        service = UserSyncService(db)
+
+        async def fetch(integration):
+            if integration.id == 2:
+                raise RuntimeError("401 Unauthorized")
+            return [{"id": f"u{integration.id}", "email": f"user{integration.id}@example.com"}]
+
+        stats_by_id = {1: {"created": 1, "updated": 0, "skipped": 0}, 3: {"created": 2, "updated": 1, "skipped": 1}}
+        with patch.object(service, "_fetch_integration_users", AsyncMock(side_effect=fetch)), \
+                patch.object(service, "_sync_fetched_users", side_effect=lambda integration, users, owner: stats_by_id[integration.id]) as write:
+            result = asyncio.run(service.sync_all_integrations(SimpleNamespace(id=1, organization_id=None)))
+
+        self.assertEqual([call.args[0].id for call in write.call_args_list], [1, 3])
+        self.assertEqual(result["integrations_synced"], 2)
+        self.assertEqual((result["total_created"], result["total_updated"], result["total_skipped"]), (3, 1, 1))
+        self.assertEqual(result["errors"], ["Failed to sync integration 2: 401 Unauthorized"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1738,7 +1738,7 @@ export default function Dashboard() {
                     onClick={() => {
                       updateURLWithAnalysis(null)
                       if (previousAnalyses.length > 0) {
-                        setCurrentAnalysis(previousAnalyses[0])
+                        loadSpecificAnalysis(String(previousAnalyses[0].uuid || previousAnalyses[0].id))
                         updateURLWithAnalysis(previousAnalyses[0].uuid || previousAnalyses[0].id)
                       }
                     }}
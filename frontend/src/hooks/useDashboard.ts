@@ -32,6 +32,7 @@ export default function useDashboard() {
   const [currentAnalysis, setCurrentAnalysis] = useState<AnalysisResult | null>(null)
   const [previousAnalyses, setPreviousAnalyses] = useState<AnalysisResult[]>([])
   const [hasMoreAnalyses, setHasMoreAnalyses] = useState(true)
+  const [analysesCursor, setAnalysesCursor] = useState<string | null>(null)
   const [loadingMoreAnalyses, setLoadingMoreAnalyses] = useState(false)
   const [totalAnalysesCount, setTotalAnalysesCount] = useState(0)
   const [selectedMember, setSelectedMember] = useState<OrganizationMember | null>(null)
@@ -467,14 +468,15 @@ export default function useDashboard() {
       let response
       try {
         const limit = 3
-        const offset = append ? previousAnalyses.length : 0
+        // Keyset pagination: continue after the last page's cursor, start from the top otherwise
+        const page = append && analysesCursor ? `cursor=${encodeURIComponent(analysesCursor)}` : `offset=${append ? previousAnalyses.length : 0}`
 
         // Add timeout to prevent indefinite waiting
         const controller = new AbortController()
         const timeoutId = setTimeout(() => controller.abort(), 10000) // 10 second timeout
 
         try {
-          response = await fetch(`${API_BASE}/analyses?limit=${limit}&offset=${offset}`, {
+          response = await fetch(`${API_BASE}/analyses?limit=${limit}&${page}`, {
             headers: {
               'Authorization': `Bearer ${authToken}`
             },
@@ -513,7 +515,8 @@ export default function useDashboard() {
         }
 
         setTotalAnalysesCount(data.total || newAnalyses.length)
-        setHasMoreAnalyses(newAnalyses.length === 3 && (!data.total || previousAnalyses.length + newAnalyses.length < data.total))
+        setAnalysesCursor(data.next_cursor || null)
+        setHasMoreAnalyses(Boolean(data.next_cursor))
 
         // If no specific analysis is loaded and we have analyses, load the most recent one (only for initial load)
         if (!append) {
@@ -522,7 +525,8 @@ export default function useDashboard() {
 
           if (!analysisId && data.analyses && data.analyses.length > 0 && !currentAnalysis) {
             const mostRecentAnalysis = data.analyses[0] // Analyses should be ordered by created_at desc
-            setCurrentAnalysis(mostRecentAnalysis)
+            // The list only carries ids and status; fetch the full analysis
+            loadSpecificAnalysis(String(mostRecentAnalysis.uuid || mostRecentAnalysis.id))
             // Platform mappings will be fetched by the dedicated useEffect
           }
         }